@@ -141,6 +141,15 @@ def create_app() -> Flask:
     with app.app_context():
         db.create_all()
 
+        # FTS5 virtual tables aren't part of the ORM metadata; importing the module
+        # also registers the hooks that keep the index in sync.
+        from app.services.search_index import ensure_search_table
+        try:
+            with db.engine.begin() as conn:
+                ensure_search_table(conn)
+        except Exception as e:
+            print(f"[startup] Could not create search index table: {e}")
+
         from app.models import AppConfig
         from sqlalchemy.exc import OperationalError
 
@@ -284,7 +293,10 @@ def create_app() -> Flask:
     register_commands(app)
 
     from flask import request, redirect, url_for, session, jsonify
-    from app.models import AppConfig
+    from app.services.config_cache import get_config_snapshot, invalidate_config_cache
+
+    # The cache is per process; a fresh app must not see another app's snapshot.
+    invalidate_config_cache()
 
     _api_token = os.getenv('LITKEEPER_API_TOKEN', '')
 
@@ -306,19 +318,19 @@ def create_app() -> Flask:
     @app.before_request
     def enforce_pin_lock():
         from flask import make_response as _make_response
-        from app.models.webauthn import WebAuthnCredential
         # X-Api-Key-authenticated requests (iOS app) are already validated by enforce_api_token
         if _api_token and request.headers.get('X-Api-Key') == _api_token:
             return
         exempt_prefixes = ('/auth/', '/static/', '/favicon', '/settings/theme-preference', '/opds')
         if request.path.startswith(exempt_prefixes):
             return
-        cred_count = WebAuthnCredential.query.count()
+        # Cached: in steady state the lock check runs no queries.
+        config = get_config_snapshot()
+        cred_count = config.credential_count
         if cred_count == 0:
             return
         # Transition mode: PIN was set but no passkeys registered yet — stay open
-        pin_cfg = AppConfig.query.filter_by(key='pin_enabled').first()
-        if pin_cfg and pin_cfg.get_value() and cred_count == 0:
+        if config.pin_enabled and cred_count == 0:
             return
         lock_url = url_for('auth.lock', next=request.full_path)
         def _lock_response():
@@ -332,8 +344,7 @@ def create_app() -> Flask:
             return redirect(lock_url)
         if not session.get('unlocked'):
             return _lock_response()
-        timeout_cfg = AppConfig.query.filter_by(key='auto_lock_timeout').first()
-        minutes = int(timeout_cfg.value) if timeout_cfg else 0
+        minutes = config.auto_lock_timeout
         if minutes > 0:
             if time.time() - session.get('last_activity', 0) > minutes * 60:
                 session['unlocked'] = False
@@ -343,15 +354,11 @@ def create_app() -> Flask:
     @app.context_processor
     def inject_auth_state():
         try:
-            from app.models.webauthn import WebAuthnCredential
-            cred_count = WebAuthnCredential.query.count()
-            pin_cfg = AppConfig.query.filter_by(key='pin_enabled').first()
-            in_pin_transition = bool(pin_cfg and pin_cfg.get_value()) and cred_count == 0
-            timeout_cfg = AppConfig.query.filter_by(key='auto_lock_timeout').first()
+            config = get_config_snapshot()
             return {
-                'credentials_registered': cred_count > 0,
-                'in_pin_transition': in_pin_transition,
-                'auto_lock_timeout': int(timeout_cfg.value) if timeout_cfg else 0,
+                'credentials_registered': config.credential_count > 0,
+                'in_pin_transition': config.pin_enabled and config.credential_count == 0,
+                'auto_lock_timeout': config.auto_lock_timeout,
             }
         except Exception:
             return {'credentials_registered': False, 'in_pin_transition': False, 'auto_lock_timeout': 0}
@@ -370,6 +377,7 @@ def create_app() -> Flask:
                         from app.services.bulk_format_generator import BulkFormatGeneratorService
                         from app.models import Story, StoryFormat, AppConfig
                         from app.models.base import db
+                        from app.models.tombstone import next_library_change_seq
                         from datetime import datetime
 
                         # One-time migration: bump updated_at on all epub stories so the
@@ -383,7 +391,9 @@ def create_app() -> Flask:
                             if epub_story_ids:
                                 now = datetime.utcnow()
                                 Story.query.filter(Story.id.in_(epub_story_ids)).update(
-                                    {Story.updated_at: now}, synchronize_session=False
+                                    {Story.updated_at: now,
+                                     Story.change_seq: next_library_change_seq(db.session)},
+                                    synchronize_session=False
                                 )
                                 flag = AppConfig(
                                     key=migration_key, value='true',
@@ -508,6 +518,21 @@ def create_app() -> Flask:
 
         _backfill_missing_covers_background()
 
+        def _sync_search_index_background():
+            import threading
+            def _run():
+                with app.app_context():
+                    try:
+                        from app.services.search_index import sync_search_index
+                        result = sync_search_index()
+                        if result['indexed'] or result['removed']:
+                            print(f"[startup] Search index: {result['indexed']} stories indexed, {result['removed']} removed")
+                    except Exception as e:
+                        print(f"[startup] Search index sync error: {e}")
+            threading.Thread(target=_run, daemon=True).start()
+
+        _sync_search_index_background()
+
         def _backfill_seen_urls_background():
             """
             One-time startup migration: populate seen_literotica_urls from every
@@ -625,6 +650,11 @@ def create_app() -> Flask:
         metadata_worker.start()
         atexit.register(metadata_worker.stop)
 
+        from app.services.update_check_worker import UpdateCheckWorker
+        app.update_check_worker = UpdateCheckWorker(app)
+        app.update_check_worker.start()
+        atexit.register(app.update_check_worker.stop)
+
         from app.services.background_automation import BackgroundAutomation
         automation = BackgroundAutomation(app)
         app.automation = automation
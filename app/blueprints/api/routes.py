@@ -1,16 +1,19 @@
 from __future__ import annotations
-from flask import Blueprint, request, jsonify, send_from_directory, current_app, abort, Flask, render_template
+from flask import Blueprint, request, jsonify, send_file, current_app, abort, Flask, render_template
 from flask.typing import ResponseReturnValue
 from app.services import download_story_and_create_files, log_error, log_url, log_action, generate_cover_image, extract_cover_from_epub, get_library_data
 from app.utils import get_epub_directory, get_html_directory, get_cover_directory
 from app.utils.security import validate_file_in_directory
 from app.validators import StoryDownloadRequest, StoryMetadataUpdate
 from app.services.story_downloader import download_story, fetch_story_metadata
+from app.services.library import get_library_changes, get_library_high_water, encode_library_cursor, decode_library_cursor
 from app.services.metadata_refresh_service import MetadataRefreshService
+from app.services.cover_variants import COVER_SIZES, cover_variant
 from pydantic import ValidationError
 import os
 import sqlite3
 import base64
+import hashlib
 from datetime import datetime
 import traceback
 import json
@@ -268,13 +271,61 @@ def download() -> ResponseReturnValue:
 
 @api.route("/library", methods=["GET"])
 def get_library() -> ResponseReturnValue:
+    """
+    Full library listing, or a delta when called with ?since=<cursor>.
+
+    Every response carries a cursor for the next delta request and a weak ETag;
+    a matching If-None-Match gets a 304 without loading any stories. Delta
+    responses list changed stories plus the ids of deleted ones.
+    """
+    since_cursor = request.args.get('since')
     try:
-        stories = get_library_data()
-        return jsonify({"stories": stories})
+        since = decode_library_cursor(since_cursor) if since_cursor else None
+    except ValueError:
+        return jsonify({"error": "Invalid sync cursor"}), 400
+
+    try:
+        high_water = get_library_high_water()
+        cursor = encode_library_cursor(high_water)
+        etag = hashlib.sha1(f"{since_cursor or ''}|{cursor}".encode()).hexdigest()[:20]
+
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        if since is not None:
+            stories, deleted = get_library_changes(since, high_water)
+            response = jsonify({"stories": stories, "deleted": deleted, "cursor": cursor})
+        else:
+            response = jsonify({"stories": get_library_data(), "cursor": cursor})
+        response.set_etag(etag, weak=True)
+        return response
     except Exception as e:
         log_error(f"Error fetching library: {str(e)}\n{traceback.format_exc()}")
         return jsonify({"stories": []})
 
+def _accepts_webp() -> bool:
+    # Only an explicit image/webp counts: OPDS readers and scripts send */*
+    # without being able to decode WebP.
+    return any(value == 'image/webp' for value in request.accept_mimetypes.values())
+
+
+def _send_cover(cover_directory: str, filename: str) -> ResponseReturnValue:
+    """
+    Serve a cover in the ?size= variant (thumb, grid or full; default full),
+    as WebP when the client asks for it. The ETag comes from the cover's
+    stat, so revalidation is a 304 without reading any image bytes.
+    """
+    size = request.args.get('size', 'full')
+    if size not in COVER_SIZES:
+        abort(400)
+    variant = cover_variant(os.path.join(cover_directory, filename), size, webp=_accepts_webp())
+    response = send_file(variant.path, mimetype=variant.mimetype, etag=variant.etag, conditional=True)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response.vary.add('Accept')
+    return response
+
 @api.route("/story/<int:story_id>/cover")
 def get_story_cover(story_id: int) -> ResponseReturnValue:
     from app.models import Story
@@ -291,22 +342,14 @@ def get_story_cover(story_id: int) -> ResponseReturnValue:
     cover_path = os.path.join(cover_directory, filename)
     os.makedirs(cover_directory, exist_ok=True)
 
-    cache_headers = {
-        'Cache-Control': 'public, max-age=31536000, immutable',
-    }
-
     if os.path.exists(cover_path):
-        response = send_from_directory(cover_directory, filename, mimetype='image/jpeg')
-        response.headers.update(cache_headers)
-        return response
+        return _send_cover(cover_directory, filename)
 
     epub_path = os.path.join(get_epub_directory(), f"{story.id}_{story.filename_base}.epub")
     if os.path.exists(epub_path):
         try:
             if extract_cover_from_epub(epub_path, cover_path):
-                response = send_from_directory(cover_directory, filename, mimetype='image/jpeg')
-                response.headers.update(cache_headers)
-                return response
+                return _send_cover(cover_directory, filename)
         except Exception as e:
             log_error(f"Error extracting cover from EPUB for story {story_id}: {str(e)}")
 
@@ -326,12 +369,9 @@ def get_cover(filename: str) -> ResponseReturnValue:
         abort(403)
 
     cover_path = os.path.join(cover_directory, filename)
-    _cover_cache_headers = {'Cache-Control': 'public, max-age=31536000, immutable'}
 
     if os.path.exists(cover_path):
-        r = send_from_directory(cover_directory, filename, mimetype='image/jpeg')
-        r.headers.update(_cover_cache_headers)
-        return r
+        return _send_cover(cover_directory, filename)
 
     os.makedirs(cover_directory, exist_ok=True)
 
@@ -385,17 +425,13 @@ def get_cover(filename: str) -> ResponseReturnValue:
     if os.path.exists(epub_path):
         try:
             if extract_cover_from_epub(epub_path, cover_path):
-                r = send_from_directory(cover_directory, filename, mimetype='image/jpeg')
-                r.headers.update(_cover_cache_headers)
-                return r
+                return _send_cover(cover_directory, filename)
         except Exception as e:
             log_error(f"Error extracting cover from EPUB: {str(e)}\n{traceback.format_exc()}")
 
     try:
         generate_cover_image(title, author, cover_path)
-        r = send_from_directory(cover_directory, filename, mimetype='image/jpeg')
-        r.headers.update(_cover_cache_headers)
-        return r
+        return _send_cover(cover_directory, filename)
     except Exception as e:
         log_error(f"Error generating cover: {str(e)}\n{traceback.format_exc()}")
         abort(500)
@@ -761,7 +797,7 @@ def update_story_metadata(story_id: int) -> ResponseReturnValue:
                     _json.dump(story_data, f, ensure_ascii=False, indent=2)
                 os.replace(tmp_path, json_fmt.file_path)
 
-                json_fmt.json_data = _json.dumps(story_data, ensure_ascii=False)
+                json_fmt.file_size = os.path.getsize(json_fmt.file_path)
                 db.session.commit()
                 log_action(f"Updated JSON file for story: {story.title}")
             except Exception as json_error:
@@ -1178,14 +1214,49 @@ def regenerate_cover(story_id: int) -> ResponseReturnValue:
             "message": "Failed to regenerate cover"
         }), 500
 
+def _bulk_story_files(story, cover_dir: str) -> dict[str, tuple[str, str]]:
+    """Map 'epub' / 'html' / 'cover' to (filename, path) for the files this story has on disk."""
+    files = {}
+    epub_fmt = next((f for f in story.formats if f.format_type == 'epub'), None)
+    if epub_fmt and os.path.exists(epub_fmt.file_path):
+        files['epub'] = (os.path.basename(epub_fmt.file_path), epub_fmt.file_path)
+
+    json_fmt = next((f for f in story.formats if f.format_type == 'json'), None)
+    if json_fmt and os.path.exists(json_fmt.file_path):
+        files['html'] = (os.path.basename(json_fmt.file_path), json_fmt.file_path)
+
+    cover_filename = f"{story.id}_{story.filename_base}.jpg"
+    cover_path = os.path.join(cover_dir, cover_filename)
+    if os.path.exists(cover_path):
+        files['cover'] = (cover_filename, cover_path)
+    return files
+
+
+def _bulk_story_etag(story, files: dict[str, tuple[str, str]]) -> str:
+    """Per-story validator: changes whenever the story row or any of its files change."""
+    parts = [str(story.updated_at)]
+    for kind in sorted(files):
+        st = os.stat(files[kind][1])
+        parts.append(f"{kind}:{st.st_size}:{st.st_mtime_ns}")
+    digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()[:16]
+    return f"{story.id}-{digest}"
+
+
 @api.route("/download/bulk", methods=['GET'])
 def download_bulk() -> ResponseReturnValue:
-    """Bulk content download — returns base64-encoded epub, html, and cover for each requested story ID.
+    """Bulk content download of epub, html and cover for each requested story ID.
 
     Used by the iOS app to fetch multiple stories in a single request, avoiding per-story
     requests that trigger CrowdSec rate-limiting rules.
+
+    With ?format=zip (or Accept: application/zip) the files are streamed from disk as a
+    STORED zip: manifest.json first, then <id>/<filename> entries. Otherwise the legacy
+    JSON body with base64-encoded files is returned. Every story gets an ETag; send them
+    back in If-None-Match and unchanged stories are listed under 'unchanged' instead of
+    being resent.
     """
     from app.models import Story
+    from app.services.zip_stream import stream_zip
 
     ids_param = request.args.get('ids', '')
     if not ids_param:
@@ -1199,46 +1270,69 @@ def download_bulk() -> ResponseReturnValue:
     if not story_ids:
         return jsonify({'stories': {}})
 
+    as_zip = (request.args.get('format') == 'zip'
+              or request.accept_mimetypes.best_match(['application/json', 'application/zip']) == 'application/zip')
+
     stories = Story.query.filter(Story.id.in_(story_ids)).all()
-    epub_dir = get_epub_directory()
-    html_dir = get_html_directory()
     cover_dir = get_cover_directory()
 
-    result = {}
+    changed = []
+    unchanged = []
     for story in stories:
-        entry = {}
-
-        epub_fmt = next((f for f in story.formats if f.format_type == 'epub'), None)
-        if epub_fmt and os.path.exists(epub_fmt.file_path):
-            try:
-                with open(epub_fmt.file_path, 'rb') as f:
-                    entry['epub'] = base64.b64encode(f.read()).decode('ascii')
-                entry['epub_filename'] = os.path.basename(epub_fmt.file_path)
-            except Exception as e:
-                log_error(f"Bulk download: error reading epub for story {story.id}: {e}")
-
-        json_fmt = next((f for f in story.formats if f.format_type == 'json'), None)
-        if json_fmt and os.path.exists(json_fmt.file_path):
+        try:
+            files = _bulk_story_files(story, cover_dir)
+            etag = _bulk_story_etag(story, files)
+        except OSError as e:
+            log_error(f"Bulk download: error reading files for story {story.id}: {e}")
+            continue
+        if request.if_none_match.contains_weak(etag):
+            unchanged.append(story.id)
+        else:
+            changed.append((story, files, etag))
+
+    if as_zip:
+        # Open every file before writing the manifest, so it only lists entries
+        # that are actually in the archive.
+        manifest = {'stories': {}, 'unchanged': unchanged}
+        entries = []
+        for story, files, etag in changed:
+            entry = {'etag': etag}
+            for kind, (filename, path) in files.items():
+                try:
+                    handle = open(path, 'rb')
+                except OSError as e:
+                    log_error(f"Bulk download: error reading {kind} for story {story.id}: {e}")
+                    continue
+                entry[f'{kind}_filename'] = filename
+                entry[kind] = f"{story.id}/{filename}"
+                entries.append((entry[kind], handle))
+            manifest['stories'][str(story.id)] = entry
+
+        def _stream():
             try:
-                with open(json_fmt.file_path, 'rb') as f:
-                    entry['html'] = base64.b64encode(f.read()).decode('ascii')
-                entry['html_filename'] = os.path.basename(json_fmt.file_path)
-            except Exception as e:
-                log_error(f"Bulk download: error reading html for story {story.id}: {e}")
+                yield from stream_zip([('manifest.json', json.dumps(manifest).encode('utf-8'))] + entries)
+            finally:
+                # stream_zip closes each file as it goes; this covers an aborted download.
+                for _, handle in entries:
+                    handle.close()
+
+        response = current_app.response_class(_stream(), mimetype='application/zip')
+        response.headers['Content-Disposition'] = 'attachment; filename="litkeeper-bulk.zip"'
+        return response
 
-        cover_filename = f"{story.id}_{story.filename_base}.jpg"
-        cover_path = os.path.join(cover_dir, cover_filename)
-        if os.path.exists(cover_path):
+    result = {}
+    for story, files, etag in changed:
+        entry = {'etag': etag}
+        for kind, (filename, path) in files.items():
             try:
-                with open(cover_path, 'rb') as f:
-                    entry['cover'] = base64.b64encode(f.read()).decode('ascii')
-                entry['cover_filename'] = cover_filename
+                with open(path, 'rb') as f:
+                    entry[kind] = base64.b64encode(f.read()).decode('ascii')
+                entry[f'{kind}_filename'] = filename
             except Exception as e:
-                log_error(f"Bulk download: error reading cover for story {story.id}: {e}")
-
+                log_error(f"Bulk download: error reading {kind} for story {story.id}: {e}")
         result[str(story.id)] = entry
 
-    return jsonify({'stories': result})
+    return jsonify({'stories': result, 'unchanged': unchanged})
 
 
 # ---------------------------------------------------------------------------
@@ -1635,6 +1729,30 @@ def api_toggle_auto_update() -> ResponseReturnValue:
         return jsonify({"success": False, "message": "Internal server error"}), 500
 
 
+
+@api.route('/settings/update-check-progress', methods=['GET'])
+def api_get_update_check_progress() -> ResponseReturnValue:
+    """Progress of the most recent (or ?run_id=) scheduled update-check run."""
+    try:
+        from app.services.story_update_checker import get_update_check_progress
+        progress = get_update_check_progress(request.args.get('run_id'))
+        if not progress:
+            return jsonify({"success": False, "message": "No update check run found"}), 404
+        return jsonify({"success": True, **progress})
+    except Exception as e:
+        log_error(f"Error getting update check progress: {str(e)}")
+        return jsonify({"success": False, "message": "Internal server error"}), 500
+
+@api.route('/settings/http-cache-stats', methods=['GET'])
+def api_get_http_cache_stats() -> ResponseReturnValue:
+    """Hit/miss counters and size of the shared HTTP response cache."""
+    try:
+        from app.services.http_client import response_cache
+        return jsonify({"success": True, **response_cache.stats()})
+    except Exception as e:
+        log_error(f"Error getting HTTP cache stats: {str(e)}")
+        return jsonify({"success": False, "message": "Internal server error"}), 500
+
 @api.route('/settings/auto-watch-enabled', methods=['GET'])
 def api_get_auto_watch_enabled() -> ResponseReturnValue:
     """Get the auto-download-from-watched-authors server setting."""
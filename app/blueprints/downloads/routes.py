@@ -1,10 +1,8 @@
 from __future__ import annotations
-import io
 import json
 import os
 import re
-import zipfile
-from flask import Blueprint, send_file, send_from_directory, abort, render_template, make_response
+from flask import Blueprint, Response, send_file, send_from_directory, abort, render_template, make_response
 from flask.typing import ResponseReturnValue
 from app.services import log_error
 from app.utils import get_epub_directory, get_html_directory
@@ -56,40 +54,35 @@ def export_epub(story_id: int) -> ResponseReturnValue:
 @downloads.route("/export/all")
 def export_all_epubs() -> ResponseReturnValue:
     from app.models import Story
+    from app.services.zip_stream import stream_zip
     epub_dir = get_epub_directory()
 
     stories = Story.query.all()
 
-    buf = io.BytesIO()
+    entries: list[tuple[str, str]] = []
     seen_names: dict[str, int] = {}
 
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for story in stories:
-            epub_fmt = next((f for f in story.formats if f.format_type == 'epub'), None)
-            if not epub_fmt or not epub_fmt.file_path or not os.path.exists(epub_fmt.file_path):
-                continue
-            if not validate_file_in_directory(epub_dir, os.path.basename(epub_fmt.file_path)):
-                continue
-
-            name = _friendly_epub_filename(story)
-            # Deduplicate names within the zip
-            if name in seen_names:
-                seen_names[name] += 1
-                base, ext = name.rsplit('.', 1)
-                name = f'{base} ({seen_names[name]}).{ext}'
-            else:
-                seen_names[name] = 0
-
-            # Read bytes first so Python can write a complete local header without
-            # a trailing data descriptor record, which Archive Utility rejects.
-            with open(epub_fmt.file_path, 'rb') as f:
-                zf.writestr(name, f.read())
-
-    data = buf.getvalue()
-    response = make_response(data)
-    response.headers['Content-Type'] = 'application/zip'
+    for story in stories:
+        epub_fmt = next((f for f in story.formats if f.format_type == 'epub'), None)
+        if not epub_fmt or not epub_fmt.file_path or not os.path.exists(epub_fmt.file_path):
+            continue
+        if not validate_file_in_directory(epub_dir, os.path.basename(epub_fmt.file_path)):
+            continue
+
+        name = _friendly_epub_filename(story)
+        # Deduplicate names within the zip
+        if name in seen_names:
+            seen_names[name] += 1
+            base, ext = name.rsplit('.', 1)
+            name = f'{base} ({seen_names[name]}).{ext}'
+        else:
+            seen_names[name] = 0
+        entries.append((name, epub_fmt.file_path))
+
+    # EPUBs are already deflated, so entries are STORED and streamed straight
+    # from disk; stream_zip writes complete local headers (no data descriptors).
+    response = Response(stream_zip(entries), mimetype='application/zip')
     response.headers['Content-Disposition'] = 'attachment; filename="litkeeper-library.zip"'
-    response.headers['Content-Length'] = str(len(data))
     return response
 
 
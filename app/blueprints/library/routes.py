@@ -2,7 +2,7 @@ from __future__ import annotations
 from flask import Blueprint, render_template, request, send_from_directory, jsonify, abort, make_response
 from flask.typing import ResponseReturnValue
 from app.models import Story
-from app.services import download_story_and_create_files, log_error, log_action, get_all_category_names, get_stories_page
+from app.services import download_story_and_create_files, log_error, log_action, get_all_category_names, get_stories_page, get_stories_after
 from app.services.epub_service import EpubService
 from app.services.system_checks import check_mount_warning, check_legacy_mounts
 from app.utils import get_html_directory, get_epub_directory
@@ -24,6 +24,53 @@ def _get_auto_watch_enabled() -> bool:
     return cfg.get_value() if cfg else False
 
 
+def _first_library_page() -> tuple[list[dict], int, str | None]:
+    """
+    First page of the default library view: (stories, total_stories, next_url).
+
+    The total shown in the header is counted here, once; the infinite-scroll
+    pages behind next_url follow keyset cursors and never count.
+    """
+    stories, next_cursor = get_stories_after(per_page=PER_PAGE)
+    total_stories = Story.query.count()
+    next_url = (
+        f"/library/filter?{urlencode({'cursor': next_cursor, 'sort_by': 'date', 'sort_order': 'desc', 'category': 'all', 'search': ''})}"
+        if next_cursor else None
+    )
+    return stories, total_stories, next_url
+
+
+def _get_banner_sync_status() -> dict | None:
+    """
+    Return the sync status to show in the banner, or None to hide it.
+
+    Reads the snapshot stored by the background automation rather than checking
+    the filesystem, so the cost does not grow with library size.
+    """
+    from app.services.migration.sync_checker import load_sync_snapshot
+    from flask import current_app
+
+    sync_status = load_sync_snapshot()
+    if not sync_status:
+        return None
+
+    log_action(f"[BANNER] Cached sync status ({sync_status.get('checked_at')}): in_sync={sync_status['in_sync']}, orphaned_files={sync_status['orphaned_files_count']}, orphaned_db={sync_status['orphaned_db_count']}")
+
+    if not sync_status['in_sync'] and hasattr(current_app, 'automation'):
+        log_action(f"[BANNER] Automation state: has_completed_first_run={current_app.automation.has_completed_first_run}, is_processing={current_app.automation.is_processing}")
+
+        if current_app.automation.is_processing:
+            log_action("[BANNER] Automation is currently processing, hiding banner")
+            return None
+        if sync_status['orphaned_files_count'] > 0:
+            log_action(f"[BANNER] Found {sync_status['orphaned_files_count']} orphaned files, triggering automation and hiding banner")
+            current_app.automation.trigger_immediate_run()
+            return None
+        log_action("[BANNER] Only orphaned DB records (no files to import), showing banner")
+
+    return sync_status
+
+
 @library.route("/", methods=["GET", "POST"])
 def index() -> ResponseReturnValue:
     if request.method == "POST":
@@ -44,59 +91,28 @@ def index() -> ResponseReturnValue:
             legacy_info = check_legacy_mounts()
             if enable_library:
                 categories = get_all_category_names()
-                stories, total_stories = get_stories_page(page=1, per_page=PER_PAGE)
-                has_more = total_stories > PER_PAGE
+                stories, total_stories, next_url = _first_library_page()
             else:
-                categories, stories, total_stories, has_more = [], [], 0, False
-            next_url = (
-                f"/library/filter?{urlencode({'page': 2, 'sort_by': 'date', 'sort_order': 'desc', 'category': 'all', 'search': ''})}"
-                if has_more else None
-            )
+                categories, stories, total_stories, next_url = [], [], 0, None
+            has_more = next_url is not None
             return render_template("index.html", stories=stories, categories=categories, error=error_msg, mount_warning=mount_warning, legacy_info=legacy_info, enable_library=enable_library, total_stories=total_stories, has_more=has_more, next_url=next_url, auto_watch_enabled=_get_auto_watch_enabled())
 
     enable_library = os.getenv('ENABLE_LIBRARY', 'true').lower() == 'true'
 
     try:
-        from app.services.migration.file_scanner import FileScanner
-        from app.services.migration.sync_checker import SyncChecker
         from app.models import Story
-        from flask import current_app
 
         mount_warning = check_mount_warning()
         legacy_info = check_legacy_mounts()
 
-        sync_status = None
-
-        if enable_library:
-            sync_checker = SyncChecker()
-            sync_status = sync_checker.check_sync()
-
-            log_action(f"[BANNER] Sync check: in_sync={sync_status['in_sync']}, orphaned_files={sync_status['orphaned_files_count']}, orphaned_db={sync_status['orphaned_db_count']}")
-
-            if not sync_status['in_sync'] and hasattr(current_app, 'automation'):
-                log_action(f"[BANNER] Automation state: has_completed_first_run={current_app.automation.has_completed_first_run}, is_processing={current_app.automation.is_processing}")
-
-                if current_app.automation.is_processing:
-                    log_action("[BANNER] Automation is currently processing, hiding banner")
-                    sync_status = None
-                elif sync_status['orphaned_files_count'] > 0:
-                    log_action(f"[BANNER] Found {sync_status['orphaned_files_count']} orphaned files, triggering automation and hiding banner")
-                    current_app.automation.trigger_immediate_run()
-                    sync_status = None
-                else:
-                    log_action("[BANNER] Only orphaned DB records (no files to import), showing banner")
+        sync_status = _get_banner_sync_status() if enable_library else None
 
         if enable_library:
             categories = get_all_category_names()
-            stories, total_stories = get_stories_page(page=1, per_page=PER_PAGE)
-            has_more = total_stories > PER_PAGE
+            stories, total_stories, next_url = _first_library_page()
         else:
-            categories, stories, total_stories, has_more = [], [], 0, False
-
-        next_url = (
-            f"/library/filter?{urlencode({'page': 2, 'sort_by': 'date', 'sort_order': 'desc', 'category': 'all', 'search': ''})}"
-            if has_more else None
-        )
+            categories, stories, total_stories, next_url = [], [], 0, None
+        has_more = next_url is not None
 
         open_modal_story = None
         open_modal_id = request.args.get('open_modal', type=int)
@@ -135,31 +151,12 @@ def index() -> ResponseReturnValue:
 @library.route('/sync-banner')
 def sync_banner():
     """Return just the sync banner HTML (for dynamic loading via HTMX)."""
-    from app.services.migration.sync_checker import SyncChecker
-    from flask import current_app
-
     enable_library = os.getenv('ENABLE_LIBRARY', 'true').lower() == 'true'
 
     if not enable_library:
         return '', 204
 
-    sync_checker = SyncChecker()
-    sync_status = sync_checker.check_sync()
-
-    log_action(f"[BANNER] Sync check: in_sync={sync_status['in_sync']}, orphaned_files={sync_status['orphaned_files_count']}, orphaned_db={sync_status['orphaned_db_count']}")
-
-    if not sync_status['in_sync'] and hasattr(current_app, 'automation'):
-        log_action(f"[BANNER] Automation state: has_completed_first_run={current_app.automation.has_completed_first_run}, is_processing={current_app.automation.is_processing}")
-
-        if current_app.automation.is_processing:
-            log_action("[BANNER] Automation is currently processing, hiding banner")
-            sync_status = None
-        elif sync_status['orphaned_files_count'] > 0:
-            log_action(f"[BANNER] Found {sync_status['orphaned_files_count']} orphaned files, triggering automation and hiding banner")
-            current_app.automation.trigger_immediate_run()
-            sync_status = None
-        else:
-            log_action("[BANNER] Only orphaned DB records (no files to import), showing banner")
+    sync_status = _get_banner_sync_status()
 
     if not sync_status or sync_status['in_sync']:
         return '', 204
@@ -168,10 +165,11 @@ def sync_banner():
 
 @library.route('/admin/sync/full', methods=['POST'])
 def sync_full() -> ResponseReturnValue:
-    from app.services.migration.sync_checker import SyncChecker
+    from app.services.migration.sync_checker import SyncChecker, save_sync_snapshot
     try:
         checker = SyncChecker()
         result = checker.full_sync()
+        save_sync_snapshot(checker.check_sync())
         log_action(f"[SYNC] Full sync completed: {result['records_cleaned']} records cleaned, {result['files_added']} files added.")
         return '', 200
     except Exception as e:
@@ -206,11 +204,7 @@ def filter_library() -> ResponseReturnValue:
             max_pages=max_pages,
         )
 
-        page = request.args.get('page', 1, type=int)
-        page_stories, total = get_stories_page(
-            page=page,
-            per_page=PER_PAGE,
-            search=validated.search,
+        filters = dict(
             category=validated.category,
             sort_by=validated.sort_by,
             sort_order=validated.sort_order,
@@ -219,10 +213,20 @@ def filter_library() -> ResponseReturnValue:
             min_pages=validated.min_pages,
             max_pages=validated.max_pages,
         )
-        has_more = (page * PER_PAGE) < total
+        page = request.args.get('page', 1, type=int)
+        cursor = request.args.get('cursor') or None
+        if validated.search:
+            # Search results are ranked, not sorted, so they keep offset paging.
+            page_stories, total = get_stories_page(page=page, per_page=PER_PAGE, search=validated.search, **filters)
+            has_more = (page * PER_PAGE) < total
+            next_page = {'page': page + 1}
+        else:
+            page_stories, next_cursor = get_stories_after(cursor, per_page=PER_PAGE, **filters)
+            has_more = next_cursor is not None
+            next_page = {'cursor': next_cursor}
 
         next_url_params: dict = {
-            'page': page + 1,
+            **next_page,
             'search': validated.search,
             'category': validated.category,
             'sort_by': validated.sort_by,
@@ -238,7 +242,7 @@ def filter_library() -> ResponseReturnValue:
             next_url_params['max_pages'] = validated.max_pages
         next_url = f"/library/filter?{urlencode(next_url_params)}"
 
-        template = "_library_more.html" if page > 1 else "_library_content.html"
+        template = "_library_more.html" if page > 1 or cursor else "_library_content.html"
         return render_template(template, stories=page_stories, queue_only=validated.queue_only, has_more=has_more, next_url=next_url)
     except ValidationError as e:
         log_error(f"Validation error in library filter: {str(e)}")
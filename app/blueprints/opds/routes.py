@@ -114,8 +114,9 @@ def _append_story_entry(feed: ET.Element, story: Story) -> None:
 
     # Cover image
     cover_href = url_for('api.get_story_cover', story_id=story.id, _external=True)
+    thumb_href = url_for('api.get_story_cover', story_id=story.id, size='thumb', _external=True)
     _link(entry, 'http://opds-spec.org/image', cover_href, 'image/jpeg')
-    _link(entry, 'http://opds-spec.org/image/thumbnail', cover_href, 'image/jpeg')
+    _link(entry, 'http://opds-spec.org/image/thumbnail', thumb_href, 'image/jpeg')
 
     # EPUB acquisition — served via OPDS route so auth gate applies
     epub_href = url_for('opds.serve_epub', story_id=story.id, _external=True)
@@ -126,6 +127,38 @@ def _append_story_entry(feed: ET.Element, story: Story) -> None:
         _sub(entry, 'extent', f'{story.word_count} words', DC_NS)
 
 
+def _title_page(q, endpoint: str, feed: ET.Element, **url_args) -> list:
+    """
+    One PAGE_SIZE page of ``q`` in title order, keyset-paginated.
+
+    ?after=<cursor> resumes right after the (title, id) of the previous page's
+    last story, so deep pages cost the same as the first and no COUNT runs.
+    Adds 'first' and 'next' links to ``feed`` as needed. Unknown cursors
+    get a 400.
+    """
+    from app.services.library import decode_keyset_cursor, encode_keyset_cursor, keyset_after
+
+    after = request.args.get('after')
+    if after:
+        try:
+            title, last_id = decode_keyset_cursor(after, 2)
+        except ValueError:
+            abort(400)
+        q = q.filter(keyset_after(Story.title, Story.id, False, title, last_id))
+
+    stories = q.order_by(Story.title, Story.id).limit(PAGE_SIZE + 1).all()
+
+    if after:
+        _link(feed, 'first', url_for(endpoint, _external=True, **url_args),
+              'application/atom+xml;profile=opds-catalog')
+    if len(stories) > PAGE_SIZE:
+        last = stories[PAGE_SIZE - 1]
+        _link(feed, 'next',
+              url_for(endpoint, after=encode_keyset_cursor([last.title, last.id]), _external=True, **url_args),
+              'application/atom+xml;profile=opds-catalog')
+    return stories[:PAGE_SIZE]
+
+
 def _nav_entry(feed: ET.Element, title: str, href: str, content: str) -> None:
     entry = ET.SubElement(feed, f'{{{OPDS_NS}}}entry')
     _sub(entry, 'title', title)
@@ -190,21 +223,8 @@ def new_arrivals():
 
 @opds_bp.route('/catalog')
 def catalog():
-    page = max(1, request.args.get('page', 1, type=int))
-    q = _epub_stories_query().order_by(Story.title)
-    total = q.count()
-    stories = q.offset((page - 1) * PAGE_SIZE).limit(PAGE_SIZE).all()
-
     feed = _feed('urn:litkeeper:catalog:all', 'All Stories', '2020-01-01T00:00:00Z')
-
-    if page > 1:
-        _link(feed, 'previous',
-              url_for('opds.catalog', page=page - 1, _external=True),
-              'application/atom+xml;profile=opds-catalog')
-    if page * PAGE_SIZE < total:
-        _link(feed, 'next',
-              url_for('opds.catalog', page=page + 1, _external=True),
-              'application/atom+xml;profile=opds-catalog')
+    stories = _title_page(_epub_stories_query(), 'opds.catalog', feed)
 
     for story in stories:
         _append_story_entry(feed, story)
@@ -231,21 +251,9 @@ def categories():
 @opds_bp.route('/category/<int:category_id>')
 def category(category_id: int):
     cat = Category.query.get_or_404(category_id)
-    page = max(1, request.args.get('page', 1, type=int))
-    q = _epub_stories_query().filter(Story.category_id == category_id).order_by(Story.title)
-    total = q.count()
-    stories = q.offset((page - 1) * PAGE_SIZE).limit(PAGE_SIZE).all()
-
     feed = _feed(f'urn:litkeeper:category:{category_id}', cat.name, '2020-01-01T00:00:00Z')
-
-    if page > 1:
-        _link(feed, 'previous',
-              url_for('opds.category', category_id=category_id, page=page - 1, _external=True),
-              'application/atom+xml;profile=opds-catalog')
-    if page * PAGE_SIZE < total:
-        _link(feed, 'next',
-              url_for('opds.category', category_id=category_id, page=page + 1, _external=True),
-              'application/atom+xml;profile=opds-catalog')
+    stories = _title_page(_epub_stories_query().filter(Story.category_id == category_id),
+                          'opds.category', feed, category_id=category_id)
 
     for story in stories:
         _append_story_entry(feed, story)
@@ -285,8 +293,8 @@ def rated(rating: int):
         title = f'Rated {rating} Star{"s" if rating != 1 else ""}'
         feed_id = f'urn:litkeeper:rated:{rating}'
 
-    stories = q.order_by(Story.title).limit(PAGE_SIZE).all()
     feed = _feed(feed_id, title, '2020-01-01T00:00:00Z')
+    stories = _title_page(q, 'opds.rated', feed, rating=rating)
     for story in stories:
         _append_story_entry(feed, story)
     return _xml_response(feed)
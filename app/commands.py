@@ -59,7 +59,6 @@ def sync_full():
 def sync_fix_formats():
     """Add missing StoryFormat records for existing EPUB/JSON files (canonical path first, legacy fallback)."""
     import os
-    import json as json_module
     from app.utils import get_epub_directory, get_html_directory, story_epub_path, story_json_path
     from app.models import Story, StoryFormat
     from app.models.base import db
@@ -102,14 +101,11 @@ def sync_fix_formats():
             else:
                 use_json = None
             if use_json:
-                with open(use_json, 'r', encoding='utf-8') as f:
-                    json_data = json_module.load(f)
                 db.session.add(StoryFormat(
                     story_id=story.id,
                     format_type='json',
                     file_path=use_json,
                     file_size=os.path.getsize(use_json),
-                    json_data=json_module.dumps(json_data)
                 ))
                 fixed_count += 1
 
@@ -192,7 +188,6 @@ def sync_adopt_legacy_json():
     """Rename bare JSON files (no ID prefix) to {id}_{name}.json and link them to the DB."""
     import os
     import shutil
-    import json as json_module
     from app.utils import get_html_directory
     from app.models import Story, StoryFormat
     from app.models.base import db
@@ -218,20 +213,16 @@ def sync_adopt_legacy_json():
             os.remove(legacy_path)
 
         existing = StoryFormat.query.filter_by(story_id=story.id, format_type='json').first()
-        with open(id_path, 'r', encoding='utf-8') as f:
-            json_data = json_module.load(f)
-
         if existing:
             existing.file_path = id_path
             existing.file_size = os.path.getsize(id_path)
-            existing.json_data = json_module.dumps(json_data)
+            existing.json_data = None
         else:
             db.session.add(StoryFormat(
                 story_id=story.id,
                 format_type='json',
                 file_path=id_path,
                 file_size=os.path.getsize(id_path),
-                json_data=json_module.dumps(json_data)
             ))
             linked += 1
 
@@ -280,15 +271,6 @@ def sync_inject_descriptions():
                     click.echo(f'\nFailed to patch JSON for {story.filename_base}: {e}', err=True)
                     skipped += 1
 
-            if json_fmt and json_fmt.json_data:
-                try:
-                    data = _json.loads(json_fmt.json_data)
-                    if data.get('description') != description:
-                        data['description'] = description
-                        json_fmt.json_data = _json.dumps(data, ensure_ascii=False)
-                except Exception:
-                    pass
-
             epub_fmt = StoryFormat.query.filter_by(story_id=story.id, format_type='epub').first()
             epub_path = epub_fmt.file_path if epub_fmt else None
             if epub_path and os.path.exists(epub_path):
@@ -665,9 +647,15 @@ def register_commands(app):
 
     @app.cli.command('update-check')
     def update_check():
-        """Trigger a story update check (runs synchronously)."""
-        from app.services.story_update_checker import check_all_stories_for_updates
+        """Queue a story update check and process the queue in the foreground."""
+        from app.services.story_update_checker import check_all_stories_for_updates, get_update_check_progress
+        from app.services.update_check_worker import UpdateCheckWorker
         click.echo('Running update check...')
-        check_all_stories_for_updates(app)
+        run_id = check_all_stories_for_updates(app)
+        UpdateCheckWorker(app).run_until_idle()
+        if run_id:
+            with app.app_context():
+                progress = get_update_check_progress(run_id)
+            click.echo(f"Checked {progress['done']}/{progress['total']} stories: {progress['by_result']}")
         click.echo('Done.')
 
@@ -12,8 +12,12 @@ from .webauthn import WebAuthnCredential
 from .download_queue import DownloadQueueItem
 from .metadata_refresh_queue import MetadataRefreshQueueItem
 from .format_queue import FormatQueueItem
+from .update_check_queue import UpdateCheckQueueItem
 from .seen_url import SeenLiteroticaUrl
 from .story_source import StorySource
+from .story_chapter_hash import StoryChapterHash
+from .file_index import StoryFileIndexEntry
+from .tombstone import StoryTombstone, LibraryChangeCounter
 
 __all__ = [
     'db',
@@ -34,6 +38,11 @@ __all__ = [
     'DownloadQueueItem',
     'MetadataRefreshQueueItem',
     'FormatQueueItem',
+    'UpdateCheckQueueItem',
     'SeenLiteroticaUrl',
     'StorySource',
+    'StoryChapterHash',
+    'StoryFileIndexEntry',
+    'StoryTombstone',
+    'LibraryChangeCounter',
 ]
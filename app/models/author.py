@@ -17,6 +17,11 @@ class Author(BaseModel, TimestampMixin):
 
     stories = db.relationship('Story', back_populates='author', lazy='dynamic')
 
+    __table_args__ = (
+        # Matches the library's case-insensitive author sort.
+        db.Index('ix_authors_name_nocase', name.collate('NOCASE')),
+    )
+
     def __repr__(self):
         return f'<Author {self.name}>'
 
@@ -10,6 +10,11 @@ class Category(BaseModel, TimestampMixin):
 
     stories = db.relationship('Story', back_populates='category', lazy='dynamic')
 
+    __table_args__ = (
+        # Matches the library's case-insensitive category sort.
+        db.Index('ix_categories_name_nocase', name.collate('NOCASE')),
+    )
+
     def __init__(self, **kwargs):
         if 'slug' not in kwargs and 'name' in kwargs:
             kwargs['slug'] = self.create_slug(kwargs['name'])
@@ -33,10 +33,16 @@ class DownloadQueueItem(BaseModel, TimestampMixin):
 
     started_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
+    # Set while 'processing'; once it passes, the item can be reclaimed (see JobQueue).
+    lease_expires_at = db.Column(db.DateTime)
 
     retry_count = db.Column(db.Integer, default=0)
     max_retries = db.Column(db.Integer, default=3)
 
+    __table_args__ = (
+        db.Index('ix_download_queue_claim', 'status', 'scheduled_after', 'created_at'),
+    )
+
     def __repr__(self):
         return f'<DownloadQueueItem {self.id} {self.url} {self.status} {self.job_type}>'
 
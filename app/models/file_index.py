@@ -0,0 +1,38 @@
+from __future__ import annotations
+import json
+from datetime import datetime
+from typing import Optional
+from .base import db
+
+
+class StoryFileIndexEntry(db.Model):
+    """
+    Persistent stat cache for story files on disk.
+
+    FileScanner compares each file's (mtime, size, inode) against its row here and
+    only re-parses files that changed, so scanning an unchanged library costs a
+    directory listing plus one query.
+    """
+    __tablename__ = 'story_file_index'
+
+    path = db.Column(db.String(1024), primary_key=True)
+    file_type = db.Column(db.String(10), nullable=False, index=True)
+    mtime = db.Column(db.Float, nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    inode = db.Column(db.BigInteger, nullable=False, default=0)
+    extracted_metadata = db.Column(db.Text)
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f'<StoryFileIndexEntry {self.path!r}>'
+
+    def get_metadata(self) -> Optional[dict]:
+        if not self.extracted_metadata:
+            return None
+        try:
+            return json.loads(self.extracted_metadata)
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+    def set_metadata(self, metadata: Optional[dict]) -> None:
+        self.extracted_metadata = json.dumps(metadata) if metadata is not None else None
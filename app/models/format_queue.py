@@ -21,6 +21,15 @@ class FormatQueueItem(BaseModel, TimestampMixin):
 
     started_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
+    # Set while 'processing'; once it passes, the item can be reclaimed (see JobQueue).
+    lease_expires_at = db.Column(db.DateTime)
+    # Lease reclaims so far; JobQueue gives up on the item at max_retries.
+    retry_count = db.Column(db.Integer, default=0)
+    max_retries = db.Column(db.Integer, default=3)
+
+    __table_args__ = (
+        db.Index('ix_format_queue_claim', 'status', 'created_at'),
+    )
 
     def to_dict(self) -> dict:
         return {
@@ -17,12 +17,18 @@ class MetadataRefreshQueueItem(BaseModel, TimestampMixin):
     
     started_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
+    # Set while 'processing'; once it passes, the item can be reclaimed (see JobQueue).
+    lease_expires_at = db.Column(db.DateTime)
     
     retry_count = db.Column(db.Integer, default=0)
     max_retries = db.Column(db.Integer, default=3)
     
     story = db.relationship('Story', back_populates='metadata_refresh_jobs', foreign_keys=[story_id])
 
+    __table_args__ = (
+        db.Index('ix_metadata_refresh_queue_claim', 'status', 'created_at'),
+    )
+
     def __repr__(self):
         return f'<MetadataRefreshQueueItem {self.id} story_id={self.story_id} {self.status}>'
 
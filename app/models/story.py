@@ -5,6 +5,9 @@ from typing import Optional
 
 class Story(BaseModel, TimestampMixin):
     __tablename__ = 'stories'
+    __table_args__ = (
+        db.Index('ix_stories_updated_at', 'updated_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(500), nullable=False, index=True)
@@ -28,6 +31,11 @@ class Story(BaseModel, TimestampMixin):
     auto_update_enabled = db.Column(db.Boolean, default=True, nullable=False)
     last_update_check_at = db.Column(db.DateTime)
     content_hash = db.Column(db.String(64))
+    # Validators and first-page fingerprint from the last update probe that
+    # found the story in sync (see StoryUpdateChecker.probe_story_page).
+    update_probe_etag = db.Column(db.String(255))
+    update_probe_last_modified = db.Column(db.String(64))
+    update_probe_hash = db.Column(db.String(64))
     is_combined = db.Column(db.Boolean, default=False, nullable=False)
     
     auto_refresh_excluded = db.Column(db.Boolean, default=False, nullable=False)
@@ -43,15 +51,19 @@ class Story(BaseModel, TimestampMixin):
     queued_at = db.Column(db.DateTime, nullable=True, index=True)
     last_opened_at = db.Column(db.DateTime, nullable=True, index=True)
     description = db.Column(db.Text, nullable=True)
+    # Commit-ordered position in the library change log; see LibraryChangeCounter.
+    change_seq = db.Column(db.Integer, nullable=False, default=0, server_default='0', index=True)
 
     author = db.relationship('Author', back_populates='stories', lazy='joined')
     category = db.relationship('Category', back_populates='stories', lazy='joined')
     tags = db.relationship('Tag', secondary='story_tags', back_populates='stories', lazy='subquery')
-    formats = db.relationship('StoryFormat', back_populates='story', cascade='all, delete-orphan', lazy='subquery')
+    formats = db.relationship('StoryFormat', back_populates='story', cascade='all, delete-orphan', lazy='selectin')
     reading_progress = db.relationship('ReadingProgress', back_populates='story', uselist=False, cascade='all, delete-orphan')
     highlights = db.relationship('Highlight', back_populates='story', cascade='all, delete-orphan', lazy='dynamic')
     metadata_refresh_jobs = db.relationship('MetadataRefreshQueueItem', back_populates='story', cascade='all, delete-orphan', lazy='dynamic')
+    update_check_jobs = db.relationship('UpdateCheckQueueItem', back_populates='story', cascade='all, delete-orphan', lazy='dynamic')
     sources = db.relationship('StorySource', back_populates='story', cascade='all, delete-orphan', order_by='StorySource.position', lazy='select')
+    chapter_hashes = db.relationship('StoryChapterHash', back_populates='story', cascade='all, delete-orphan', order_by='StoryChapterHash.chapter_no', lazy='select')
 
     def __repr__(self):
         return f'<Story {self.title}>'
@@ -0,0 +1,18 @@
+from __future__ import annotations
+from .base import db, BaseModel
+
+
+class StoryChapterHash(BaseModel):
+    """Digest of one chapter's text as last downloaded, so updates can tell which chapters changed."""
+    __tablename__ = 'story_chapter_hashes'
+
+    story_id = db.Column(db.Integer, db.ForeignKey('stories.id', ondelete='CASCADE'), primary_key=True)
+    chapter_no = db.Column(db.Integer, primary_key=True)
+    # sha256 hex of the whitespace-normalized title and text; see app.services.chapter_hashes.
+    hash = db.Column(db.String(64), nullable=False)
+    word_count = db.Column(db.Integer, nullable=False, default=0)
+
+    story = db.relationship('Story', back_populates='chapter_hashes')
+
+    def __repr__(self):
+        return f'<StoryChapterHash story_id={self.story_id} chapter={self.chapter_no}>'
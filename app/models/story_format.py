@@ -1,4 +1,7 @@
 from __future__ import annotations
+import json
+import os
+from typing import Optional
 from .base import db, BaseModel, TimestampMixin
 
 class StoryFormat(BaseModel, TimestampMixin):
@@ -11,8 +14,15 @@ class StoryFormat(BaseModel, TimestampMixin):
     file_path = db.Column(db.String(512), nullable=False)
     file_size = db.Column(db.Integer)
     file_hash = db.Column(db.String(64))
+    # Fingerprint of the DB metadata and the file's size/mtime as of the last
+    # metadata sync that found or left the file matching the DB. While it
+    # still matches, the startup sync and repair passes skip the file unread.
+    metadata_hash = db.Column(db.String(40))
 
-    json_data = db.Column(db.Text)
+    # Legacy copy of the story JSON. The file at file_path is the source of truth;
+    # the column is deferred so listing queries never pull story bodies, and new
+    # rows leave it NULL (see migration 20261017a, which clears existing copies).
+    json_data = db.deferred(db.Column(db.Text))
 
     story = db.relationship('Story', back_populates='formats')
 
@@ -23,3 +33,12 @@ class StoryFormat(BaseModel, TimestampMixin):
 
     def __repr__(self):
         return f'<StoryFormat {self.format_type} for story_id={self.story_id}>'
+
+    def load_json_data(self) -> Optional[dict]:
+        """Load the story JSON from disk, falling back to a legacy DB copy if present."""
+        if self.file_path and os.path.exists(self.file_path):
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        if self.json_data:
+            return json.loads(self.json_data)
+        return None
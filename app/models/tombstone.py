@@ -0,0 +1,144 @@
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from .base import db
+
+# session.info key holding the change sequence claimed by the open transaction.
+_CHANGE_SEQ_KEY = 'library_change_seq'
+
+
+class LibraryChangeCounter(db.Model):
+    """
+    Single-row counter that orders library changes by commit.
+
+    Every transaction that changes the library bumps it once and stamps the
+    new value on the stories and tombstones it writes (change_seq). SQLite
+    holds the write lock from that bump until commit, so a later commit always
+    gets a larger value. updated_at can't give that guarantee: it is stamped at
+    flush time, and a slow transaction may commit after a faster one that
+    flushed later, landing behind a cursor a client already holds.
+    """
+    __tablename__ = 'library_change_counter'
+
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f'<LibraryChangeCounter {self.value}>'
+
+
+class StoryTombstone(db.Model):
+    """
+    Records a deleted story so delta sync clients can drop it.
+
+    /api/library?since=<cursor> reports every tombstone newer than the cursor
+    alongside the changed stories. Rows are written by the before_flush hook
+    below whenever a Story is deleted through the ORM.
+    """
+    __tablename__ = 'story_tombstones'
+
+    id = db.Column(db.Integer, primary_key=True)
+    story_id = db.Column(db.Integer, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    change_seq = db.Column(db.Integer, nullable=False, default=0, server_default='0', index=True)
+
+    def __repr__(self) -> str:
+        return f'<StoryTombstone story_id={self.story_id}>'
+
+
+def next_library_change_seq(session) -> int:
+    """
+    The change sequence for the session's current transaction.
+
+    The first call in a transaction bumps LibraryChangeCounter on the session's
+    connection; later calls in the same transaction reuse that value.
+    """
+    seq = session.info.get(_CHANGE_SEQ_KEY)
+    if seq is None:
+        counter = LibraryChangeCounter.__table__
+        conn = session.connection()
+        bumped = conn.execute(
+            update(counter).where(counter.c.id == 1).values(value=counter.c.value + 1)
+        ).rowcount
+        if not bumped:
+            conn.execute(insert(counter).values(id=1, value=1))
+        seq = conn.execute(select(counter.c.value).where(counter.c.id == 1)).scalar_one()
+        session.info[_CHANGE_SEQ_KEY] = seq
+    return seq
+
+
+def _changed(obj, *attrs: str) -> bool:
+    """True if any of the named column attributes has a pending change."""
+    state = inspect(obj)
+    return state.persistent and any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_library_changes(session, flush_context, instances) -> None:
+    """
+    Keep Story.updated_at meaningful for delta sync.
+
+    The column's onupdate only fires when a stories row itself is written. A
+    library entry also shows its tags, formats, sources, author and category,
+    so changes to any of those bump the owning story here. Deleted stories
+    leave a tombstone. Everything touched is stamped with the transaction's
+    change_seq, which is what sync cursors compare against.
+    """
+    from .author import Author
+    from .category import Category
+    from .story import Story
+    from .story_format import StoryFormat
+    from .story_source import StorySource
+    from .tag import Tag, story_tags
+
+    now = datetime.utcnow()
+    touched_ids: set[int] = set()
+    touched_where = []
+
+    for obj in session.dirty:
+        if isinstance(obj, Story):
+            # Collection-only changes (tags, sources) don't trigger onupdate.
+            if session.is_modified(obj, include_collections=True):
+                obj.updated_at = now
+                obj.change_seq = next_library_change_seq(session)
+        elif isinstance(obj, (StoryFormat, StorySource)):
+            if obj.story_id is not None and session.is_modified(obj):
+                touched_ids.add(obj.story_id)
+        elif isinstance(obj, Author) and _changed(obj, 'name', 'literotica_url'):
+            touched_where.append(Story.author_id == obj.id)
+        elif isinstance(obj, Category) and _changed(obj, 'name'):
+            touched_where.append(Story.category_id == obj.id)
+        elif isinstance(obj, Tag) and _changed(obj, 'name'):
+            touched_where.append(Story.id.in_(
+                db.select(story_tags.c.story_id).where(story_tags.c.tag_id == obj.id)
+            ))
+
+    for obj in session.new:
+        if isinstance(obj, Story):
+            obj.change_seq = next_library_change_seq(session)
+        elif isinstance(obj, (StoryFormat, StorySource)) and obj.story_id is not None:
+            touched_ids.add(obj.story_id)
+
+    for obj in session.deleted:
+        if isinstance(obj, Story):
+            session.add(StoryTombstone(story_id=obj.id, deleted_at=now,
+                                       change_seq=next_library_change_seq(session)))
+        elif isinstance(obj, (StoryFormat, StorySource)) and obj.story_id is not None:
+            touched_ids.add(obj.story_id)
+
+    touched_ids -= {obj.id for obj in session.deleted if isinstance(obj, Story)}
+    if touched_ids:
+        touched_where.append(Story.id.in_(touched_ids))
+    if touched_where:
+        session.connection().execute(
+            update(Story.__table__)
+            .where(db.or_(*touched_where))
+            .values(updated_at=now, change_seq=next_library_change_seq(session))
+        )
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _release_change_seq(session) -> None:
+    session.info.pop(_CHANGE_SEQ_KEY, None)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+from .base import db, BaseModel, TimestampMixin
+
+
+class UpdateCheckQueueItem(BaseModel, TimestampMixin):
+    """One story's check in a scheduled update-check run, processed by UpdateCheckWorker."""
+    __tablename__ = 'update_check_queue'
+
+    id = db.Column(db.Integer, primary_key=True)
+    story_id = db.Column(db.Integer, db.ForeignKey('stories.id', ondelete='CASCADE'), nullable=False, index=True)
+    # Every item enqueued by one check_all_stories_for_updates() call shares a run_id.
+    run_id = db.Column(db.String(32), nullable=False, index=True)
+    status = db.Column(db.String(50), nullable=False, default='pending', index=True)
+    # unchanged | updated | update_failed, once completed
+    result = db.Column(db.String(20))
+
+    progress_message = db.Column(db.String(255))
+    error_message = db.Column(db.Text)
+    # e.g. "3 -> 4 chapters" for an updated story; used in the run summary.
+    summary = db.Column(db.String(255))
+
+    scheduled_after = db.Column(db.DateTime)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    # Set while 'processing'; once it passes, the item can be reclaimed (see JobQueue).
+    lease_expires_at = db.Column(db.DateTime)
+    retry_count = db.Column(db.Integer, default=0)
+    max_retries = db.Column(db.Integer, default=3)
+
+    story = db.relationship('Story', back_populates='update_check_jobs', foreign_keys=[story_id])
+
+    __table_args__ = (
+        db.Index('ix_update_check_queue_claim', 'status', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f'<UpdateCheckQueueItem {self.id} story_id={self.story_id} {self.status}>'
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'story_id': self.story_id,
+            'run_id': self.run_id,
+            'status': self.status,
+            'result': self.result,
+            'progress_message': self.progress_message,
+            'error_message': self.error_message,
+            'summary': self.summary,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+        }
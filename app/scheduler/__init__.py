@@ -4,7 +4,7 @@ from apscheduler.triggers.cron import CronTrigger
 from flask import Flask
 import os
 import random
-import time
+from datetime import datetime, timedelta
 from typing import Optional
 
 _scheduler: Optional[BackgroundScheduler] = None
@@ -66,13 +66,11 @@ def init_scheduler(app: Flask) -> None:
     try:
         trigger = CronTrigger.from_crontab(cron_schedule)
         
-        jitter_seconds = random.randint(0, 3600)
-        jitter_minutes = jitter_seconds // 60
-        
         def delayed_update_check():
-            app.logger.info(f"Auto-update triggered, waiting {jitter_minutes} minutes (jitter) before starting...")
-            time.sleep(jitter_seconds)
-            check_all_stories_for_updates(app)
+            # Jitter is applied to the queued items rather than slept off here.
+            jitter_seconds = random.randint(0, 3600)
+            app.logger.info(f"Auto-update triggered, queuing checks to start in {jitter_seconds // 60} minutes (jitter)")
+            check_all_stories_for_updates(app, start_after=datetime.utcnow() + timedelta(seconds=jitter_seconds))
         
         _scheduler.add_job(
             func=delayed_update_check,
@@ -8,7 +8,10 @@ from .html_generator import create_html_file
 from .cover_generator import generate_cover_image, extract_cover_from_epub
 from .file_operations import copy_to_external_path
 from .story_processor import download_story_and_create_files, StoryProcessingResult
-from .library import get_library_data, get_all_category_names, get_stories_page
+from .library import (
+    get_library_data, get_all_category_names, get_stories_page, get_stories_after, project_library_dicts,
+    get_library_changes, get_library_high_water, encode_library_cursor, decode_library_cursor,
+)
 
 __all__ = [
     'log_action',
@@ -29,6 +32,12 @@ __all__ = [
     'download_story_and_create_files',
     'StoryProcessingResult',
     'get_library_data',
+    'project_library_dicts',
+    'get_library_changes',
+    'get_library_high_water',
+    'encode_library_cursor',
+    'decode_library_cursor',
     'get_all_category_names',
     'get_stories_page',
+    'get_stories_after',
 ]
@@ -6,6 +6,7 @@ import html as html_module
 from typing import Optional
 from bs4 import BeautifulSoup
 from .story_downloader import get_session
+from .page_extractor import make_soup
 from .logger import log_action, log_error
 
 _STORY_SLUG_RE = re.compile(r"""url:["']([a-z0-9][a-z0-9-]{4,80})["']""")
@@ -99,8 +100,8 @@ class AuthorScraper:
             log_error(f"[AuthorScraper] Error fetching page for preview: {e}")
             return []
 
-        soup = BeautifulSoup(html_text, 'html.parser')
-        results, series_to_chapters, series_titles = self._parse_works_html_impl(html_text)
+        soup = make_soup(html_text)
+        results, series_to_chapters, series_titles = self._parse_works_html_impl(html_text, soup)
         hydration_meta = self._extract_metadata_from_script_soup(soup)
         dom_meta = self._extract_dom_metadata(soup)
 
@@ -381,16 +382,20 @@ class AuthorScraper:
         results, _, _ = self._parse_works_html_impl(html)
         return results
 
-    def _parse_works_html_impl(self, html: str) -> tuple[list[dict], dict[str, set[str]], dict[str, str]]:
+    def _parse_works_html_impl(
+        self, html: str, soup: Optional[BeautifulSoup] = None
+    ) -> tuple[list[dict], dict[str, set[str]], dict[str, str]]:
         """
         Parse the author's works/submissions page.
 
+        Pass soup when the caller has already parsed html, to avoid a second parse.
+
         Returns:
             results            — all story entries including series chapter entries
             series_to_chapters — maps series URL -> set of chapter URLs (authoritative, from DOM)
             series_titles      — maps series URL -> display title
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = soup or make_soup(html)
         results: list[dict] = []
         seen_series: set[str] = set()
         seen_story: set[str] = set()
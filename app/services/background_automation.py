@@ -116,47 +116,100 @@ class BackgroundAutomation:
                 time.sleep(1)
     
     def _heal_missing_formats(self):
-        """Repair stale StoryFormat paths and queue generation of missing EPUB/JSON formats."""
+        """
+        Repair stale StoryFormat paths and queue generation of missing EPUB/JSON formats.
+
+        Uses a fixed number of set-based queries per cycle (story formats, pending
+        format jobs, one batched insert) and a single os.scandir() per story directory
+        instead of per-story queries and stat calls.
+        """
         try:
             import os
             from app.models import Story, StoryFormat, FormatQueueItem
             from app.models.base import db
             from app.services.story_processor import link_story_formats
             from app.services.migration.migrate_covers_to_id_prefix import migrate_covers_to_id_prefix
+            from app.utils import get_epub_directory, get_html_directory
 
             # Rename any legacy cover files ({filename_base}.jpg → {id}_{filename_base}.jpg)
             migrate_covers_to_id_prefix()
 
-            stories = Story.query.all()
-            paths_fixed = 0
-            epub_queued = 0
-            json_queued = 0
+            story_dirs = {get_epub_directory(), get_html_directory()}
 
-            for story in stories:
-                # Heal if formats are missing entirely or any recorded path no longer exists
-                needs_link = not story.formats or any(not os.path.exists(f.file_path) for f in story.formats)
-                if needs_link:
+            def _scan_story_dirs() -> set:
+                paths = set()
+                for directory in story_dirs:
+                    if not os.path.isdir(directory):
+                        continue
+                    with os.scandir(directory) as it:
+                        paths.update(entry.path for entry in it)
+                return paths
+
+            def _load_formats() -> dict:
+                formats = {}
+                rows = (
+                    db.session.query(Story.id, StoryFormat.format_type, StoryFormat.file_path)
+                    .outerjoin(StoryFormat, StoryFormat.story_id == Story.id)
+                    .all()
+                )
+                for story_id, format_type, file_path in rows:
+                    story_formats = formats.setdefault(story_id, {})
+                    if format_type:
+                        story_formats[format_type] = file_path
+                return formats
+
+            on_disk = _scan_story_dirs()
+
+            def _exists(path: str) -> bool:
+                if os.path.dirname(path) in story_dirs:
+                    return path in on_disk
+                return os.path.exists(path)  # legacy path outside the story directories
+
+            formats = _load_formats()
+
+            # Heal if formats are missing entirely or any recorded path no longer exists
+            needs_link = [
+                story_id for story_id, story_formats in formats.items()
+                if not story_formats or any(not _exists(p) for p in story_formats.values())
+            ]
+            if needs_link:
+                for story in Story.query.filter(Story.id.in_(needs_link)).all():
                     link_story_formats(story)
-                    paths_fixed += 1
-
-                json_fmt = StoryFormat.query.filter_by(story_id=story.id, format_type='json').first()
-                epub_fmt = StoryFormat.query.filter_by(story_id=story.id, format_type='epub').first()
-                json_ok = json_fmt and os.path.exists(json_fmt.file_path)
-                epub_ok = epub_fmt and os.path.exists(epub_fmt.file_path)
-
+                on_disk = _scan_story_dirs()
+                formats = _load_formats()
+            paths_fixed = len(needs_link)
+
+            wanted = set()
+            for story_id, story_formats in formats.items():
+                json_ok = 'json' in story_formats and _exists(story_formats['json'])
+                epub_ok = 'epub' in story_formats and _exists(story_formats['epub'])
                 if json_ok and not epub_ok:
-                    if not FormatQueueItem.query.filter_by(story_id=story.id, job_type='generate_epub', status='pending').first():
-                        db.session.add(FormatQueueItem(story_id=story.id, job_type='generate_epub', method='auto'))
-                        epub_queued += 1
-
+                    wanted.add((story_id, 'generate_epub'))
                 if epub_ok and not json_ok:
-                    if not FormatQueueItem.query.filter_by(story_id=story.id, job_type='generate_json', status='pending').first():
-                        db.session.add(FormatQueueItem(story_id=story.id, job_type='generate_json', method='auto'))
-                        json_queued += 1
-
-            if epub_queued or json_queued:
+                    wanted.add((story_id, 'generate_json'))
+
+            pending = set()
+            if wanted:
+                pending = set(
+                    db.session.query(FormatQueueItem.story_id, FormatQueueItem.job_type)
+                    .filter(
+                        FormatQueueItem.status == 'pending',
+                        FormatQueueItem.job_type.in_(['generate_epub', 'generate_json']),
+                    )
+                    .all()
+                )
+
+            to_queue = sorted(wanted - pending)
+            if to_queue:
+                db.session.add_all([
+                    FormatQueueItem(story_id=story_id, job_type=job_type, method='auto')
+                    for story_id, job_type in to_queue
+                ])
                 db.session.commit()
 
+            epub_queued = sum(1 for _, job_type in to_queue if job_type == 'generate_epub')
+            json_queued = len(to_queue) - epub_queued
+
             log_action(f"[AUTOMATION] Format heal: {paths_fixed} path(s) repaired, {epub_queued} EPUB + {json_queued} JSON job(s) queued.")
 
         except Exception as e:
@@ -220,10 +273,11 @@ class BackgroundAutomation:
 
     def _auto_add_stories(self):
         try:
-            from app.services.migration.sync_checker import SyncChecker
+            from app.services.migration.sync_checker import SyncChecker, save_sync_snapshot
 
             sync_checker = SyncChecker()
             sync_status = sync_checker.check_sync()
+            changed = False
 
             orphaned_count = sync_status['orphaned_files_count']
             duplicate_count = sync_status.get('duplicate_files_count', 0)
@@ -236,6 +290,7 @@ class BackgroundAutomation:
                 added_count = sync_checker.add_orphaned_files()
 
                 if added_count > 0:
+                    changed = True
                     log_action(f"[AUTOMATION] Successfully added {added_count} stories to library")
                 else:
                     log_action(f"[AUTOMATION] No new stories added (duplicates or errors)")
@@ -245,9 +300,14 @@ class BackgroundAutomation:
             if duplicate_count > 0:
                 removed = sync_checker.cleanup_confirmed_duplicates()
                 if removed:
+                    changed = True
                     log_action(f"[AUTOMATION] Removed {removed} confirmed-duplicate file group(s) from filesystem.")
 
+            # Publish the post-cycle state for the homepage banner
+            save_sync_snapshot(sync_checker.check_sync() if changed else sync_status)
+
         except Exception as e:
+            db.session.rollback()
             log_error(f"[AUTOMATION] Error auto-adding stories: {str(e)}")
     
     def _auto_refresh_metadata(self):
@@ -374,6 +434,7 @@ class BackgroundAutomation:
             import re
             from app.utils import get_cover_directory, get_epub_directory, get_html_directory
             from app.models import Story
+            from app.services.cover_variants import remove_cover_variants
 
             cover_dir = get_cover_directory()
             if not os.path.exists(cover_dir):
@@ -416,7 +477,9 @@ class BackgroundAutomation:
                     continue
 
                 try:
-                    os.remove(os.path.join(cover_dir, filename))
+                    cover_path = os.path.join(cover_dir, filename)
+                    remove_cover_variants(cover_path)
+                    os.remove(cover_path)
                     removed += 1
                     log_action(f"[AUTOMATION] Removed orphaned cover: {filename}")
                 except Exception as e:
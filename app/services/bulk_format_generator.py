@@ -1,16 +1,54 @@
 from __future__ import annotations
+import hashlib
 import json
 import os
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
 from datetime import datetime
 from app.models import Story, StoryFormat, db
 from app.services.format_generator import FormatGeneratorService
 from app.services.metadata_refresh_service import MetadataRefreshService
-from app.services.cover_generator import generate_cover_image
+from app.services.cover_generator import render_covers
 from app.services.epub_service import EpubService
 from app.services.logger import log_action, log_error
 from app.utils import get_data_directory, get_cover_directory, get_epub_directory
-from sqlalchemy.orm import joinedload
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import joinedload, selectinload
+
+# Stories whose cover_filename is committed together during cover regeneration.
+COVER_COMMIT_BATCH = 50
+
+
+def _story_metadata(story: Story) -> tuple:
+    """The DB metadata that sync_metadata_to_files() writes into a story's files."""
+    return (
+        story.title or '',
+        story.author.name if story.author else '',
+        story.category.name if story.category else None,
+        sorted(t.name for t in story.tags),
+        story.description or None,
+    )
+
+
+def _metadata_fingerprint(metadata: tuple, file_path: str) -> Optional[str]:
+    """Hash of the DB metadata and the file's size and mtime; None if the file is missing."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    key = json.dumps([*metadata, st.st_size, st.st_mtime_ns], ensure_ascii=False)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _store_metadata_hashes(hashes: dict) -> None:
+    # Bookkeeping only: a Core update, so the story isn't marked as changed for delta sync.
+    if not hashes:
+        return
+    table = StoryFormat.__table__
+    db.session.execute(
+        update(table).where(table.c.id == bindparam('format_id')).values(metadata_hash=bindparam('fingerprint')),
+        [{'format_id': format_id, 'fingerprint': fingerprint} for format_id, fingerprint in hashes.items()],
+    )
 
 
 class BulkFormatGeneratorService:
@@ -222,29 +260,48 @@ class BulkFormatGeneratorService:
 
         self._write_log(f"Found {total} stories to regenerate covers for")
 
+        jobs = []
+        stories_by_cover = {}
         for story in stories:
-            try:
-                author_name = story.author.name if story.author else 'Unknown Author'
-                cover_filename = f"{story.id}_{story.filename_base}.jpg"
-                cover_path = os.path.join(cover_dir, cover_filename)
-
-                category_name = story.category.name if story.category else None
-                generate_cover_image(story.title, author_name, cover_path, category=category_name)
-
-                epub_fmt = next((f for f in story.formats if f.format_type == 'epub'), None)
-                if epub_fmt and os.path.exists(epub_fmt.file_path):
-                    EpubService.update_epub_cover(epub_fmt.file_path, cover_path)
-
-                story.cover_filename = cover_filename
-                db.session.commit()
+            cover_filename = f"{story.id}_{story.filename_base}.jpg"
+            cover_path = os.path.join(cover_dir, cover_filename)
+            author_name = story.author.name if story.author else 'Unknown Author'
+            category_name = story.category.name if story.category else None
+            jobs.append((story.title, author_name, cover_path, category_name))
+            stories_by_cover[cover_path] = story
+
+        # Rendering fans out over a process pool; EPUB updates and commits stay here.
+        pending = 0
+        try:
+            for cover_path, render_error in render_covers(jobs):
+                story = stories_by_cover[cover_path]
+                try:
+                    if render_error:
+                        raise RuntimeError(render_error)
+
+                    epub_fmt = next((f for f in story.formats if f.format_type == 'epub'), None)
+                    if epub_fmt and os.path.exists(epub_fmt.file_path):
+                        EpubService.update_epub_cover(epub_fmt.file_path, cover_path)
+
+                    story.cover_filename = os.path.basename(cover_path)
+                    pending += 1
+                    if pending >= COVER_COMMIT_BATCH:
+                        db.session.commit()
+                        pending = 0
 
-                successful += 1
-                self._write_log(f"✓ Regenerated cover for: {story.title}")
-            except Exception as e:
-                failed += 1
-                error_msg = f"✗ Failed cover for: {story.title} - {str(e)}"
-                self._write_log(error_msg, "error")
-                errors.append({"story_id": story.id, "title": story.title, "error": str(e)})
+                    successful += 1
+                    self._write_log(f"✓ Regenerated cover for: {story.title}")
+                except Exception as e:
+                    failed += 1
+                    error_msg = f"✗ Failed cover for: {story.title} - {str(e)}"
+                    self._write_log(error_msg, "error")
+                    errors.append({"story_id": story.id, "title": story.title, "error": str(e)})
+        except BrokenProcessPool as e:
+            # A render worker died; keep the covers that were already done.
+            remaining = total - successful - failed
+            failed += remaining
+            self._write_log(f"Cover render pool failed, {remaining} covers not regenerated: {str(e)}", "error")
+        db.session.commit()
 
         summary = f"Cover regeneration complete: {successful} successful, {failed} failed out of {total} total"
         self._write_log(summary)
@@ -312,8 +369,23 @@ class BulkFormatGeneratorService:
 
         self._write_log(f"Found {total} EPUB files to inspect")
 
+        # Files unchanged since the metadata sync last checked them were already
+        # repaired (or written clean) and are skipped without being opened.
+        verified = {
+            fmt.file_path
+            for fmt in StoryFormat.query.filter(
+                StoryFormat.format_type == 'epub', StoryFormat.metadata_hash.isnot(None)
+            ).options(joinedload(StoryFormat.story).selectinload(Story.tags),
+                      joinedload(StoryFormat.story).joinedload(Story.author),
+                      joinedload(StoryFormat.story).joinedload(Story.category))
+            if fmt.metadata_hash == _metadata_fingerprint(_story_metadata(fmt.story), fmt.file_path)
+        }
+
         for filename in epub_files:
             epub_path = os.path.join(epub_dir, filename)
+            if epub_path in verified:
+                skipped += 1
+                continue
             try:
                 modified = EpubService.repair_metadata_chapter(epub_path)
                 if modified:
@@ -347,23 +419,31 @@ class BulkFormatGeneratorService:
         """Find stories whose JSON/EPUB content is stale vs the DB, and repair them in-place."""
         self._write_log("Starting metadata sync check (DB → JSON/EPUB)")
 
-        stories = Story.query.options(joinedload(Story.formats)).all()
+        stories = Story.query.options(
+            joinedload(Story.formats), joinedload(Story.author), joinedload(Story.category), selectinload(Story.tags),
+        ).all()
         total = len(stories)
         synced = 0
         already_ok = 0
         errors: list[dict] = []
+        fresh_hashes: dict[int, str] = {}
 
         for story in stories:
             try:
-                db_title = story.title or ''
-                db_author = story.author.name if story.author else ''
-                db_category = story.category.name if story.category else None
-                db_tags = sorted(t.name for t in story.tags)
-                db_description = story.description or None
+                metadata = _story_metadata(story)
+                db_title, db_author, db_category, db_tags, db_description = metadata
 
                 json_fmt = next((f for f in story.formats if f.format_type == 'json'), None)
                 epub_fmt = next((f for f in story.formats if f.format_type == 'epub'), None)
 
+                # Skip without reading anything when neither the DB metadata nor
+                # the files changed since the last sync.
+                files = [f for f in (json_fmt, epub_fmt) if f and os.path.exists(f.file_path)]
+                if files and all(f.metadata_hash and f.metadata_hash == _metadata_fingerprint(metadata, f.file_path)
+                                 for f in files):
+                    already_ok += 1
+                    continue
+
                 needs_sync = False
 
                 if json_fmt and os.path.exists(json_fmt.file_path):
@@ -411,10 +491,13 @@ class BulkFormatGeneratorService:
 
                 if not needs_sync:
                     already_ok += 1
+                    for f in files:
+                        fresh_hashes[f.id] = _metadata_fingerprint(metadata, f.file_path)
                     continue
 
                 self._write_log(f"Syncing: [{story.id}] {db_title}")
 
+                written = []
                 if json_fmt and os.path.exists(json_fmt.file_path):
                     try:
                         with open(json_fmt.file_path, 'r', encoding='utf-8') as f:
@@ -428,23 +511,27 @@ class BulkFormatGeneratorService:
                         with open(tmp, 'w', encoding='utf-8') as f:
                             json.dump(data, f, ensure_ascii=False, indent=2)
                         os.replace(tmp, json_fmt.file_path)
-                        json_fmt.json_data = json.dumps(data, ensure_ascii=False)
+                        json_fmt.file_size = os.path.getsize(json_fmt.file_path)
+                        written.append(json_fmt)
                     except Exception as e:
                         self._write_log(f"  JSON patch failed for story {story.id}: {e}", "error")
 
                 if epub_fmt and os.path.exists(epub_fmt.file_path):
-                    EpubService.update_epub_metadata(
+                    if EpubService.update_epub_metadata(
                         epub_fmt.file_path,
                         title=db_title,
                         author=db_author or 'Unknown Author',
                         category=db_category,
                         tags=db_tags,
                         description=db_description,
-                    )
+                    ):
+                        written.append(epub_fmt)
 
                 story.updated_at = datetime.utcnow()
                 db.session.commit()
                 synced += 1
+                for f in written:
+                    fresh_hashes[f.id] = _metadata_fingerprint(metadata, f.file_path)
 
             except Exception as e:
                 db.session.rollback()
@@ -452,6 +539,9 @@ class BulkFormatGeneratorService:
                 self._write_log(msg, "error")
                 errors.append({"story_id": story.id, "error": str(e)})
 
+        _store_metadata_hashes(fresh_hashes)
+        db.session.commit()
+
         summary = f"Metadata sync complete: {synced} synced, {already_ok} already up-to-date, {len(errors)} errors out of {total} stories"
         self._write_log(summary)
         return {
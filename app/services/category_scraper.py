@@ -3,6 +3,7 @@ import html as html_module
 import re
 from bs4 import BeautifulSoup
 from .story_downloader import get_session
+from .page_extractor import make_soup
 from .logger import log_action, log_error
 
 # (slug, display_label, top_path)
@@ -107,7 +108,7 @@ class CategoryScraper:
             log_error(f"[CategoryScraper] Fetch failed: {e}")
             return {'stories': [], 'page': page, 'total_pages': 1}
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        soup = make_soup(resp.text)
         stories = self._parse_top_page(soup)
         total_pages = self._parse_total_pages(soup)
         log_action(f"[CategoryScraper] Parsed {len(stories)} stories, {total_pages} total pages")
@@ -136,7 +137,7 @@ class CategoryScraper:
             except Exception as e:
                 log_error(f"[CategoryScraper] Fetch failed: {e}")
                 return {'stories': [], 'page': 1, 'total_pages': 1}
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = make_soup(resp.text)
             stories = self._parse_spa_stories(soup)
             log_action(f"[CategoryScraper] Parsed {len(stories)} global newest stories")
             return {'stories': stories, 'page': 1, 'total_pages': 1}
@@ -151,7 +152,7 @@ class CategoryScraper:
             log_error(f"[CategoryScraper] Fetch failed: {e}")
             return {'stories': [], 'page': page, 'total_pages': 1}
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        soup = make_soup(resp.text)
         parse_mode = 'read' if mode == 'most_read' else 'rated'
         stories = self._parse_top_page(soup, parse_mode=parse_mode)
         total_pages = self._parse_total_pages(soup)
@@ -263,7 +264,7 @@ class CategoryScraper:
             log_error(f"[CategoryScraper] Fetch failed: {e}")
             return []
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        soup = make_soup(resp.text)
         return self._parse_spa_stories(soup)
 
     def _parse_spa_stories(self, soup: BeautifulSoup) -> list[dict]:
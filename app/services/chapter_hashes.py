@@ -0,0 +1,81 @@
+from __future__ import annotations
+import hashlib
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy import delete, insert
+
+
+class ChapterDigest(NamedTuple):
+    number: int
+    title: Optional[str]
+    content: str
+    hash: str
+    word_count: int
+
+
+def hash_chapter(title: Optional[str], content: str) -> str:
+    """
+    Digest of a chapter's title and text with whitespace runs collapsed, so
+    the parser re-wrapping or re-spacing paragraphs doesn't count as an edit.
+    """
+    normalized = ' '.join((title or '').split()) + '\n' + ' '.join(content.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def chapter_digests(story_content: str) -> List[ChapterDigest]:
+    """
+    Split story content into chapters and digest each one.
+
+    Chapters are numbered from 1 as in the JSON and EPUB. Content without
+    chapter markers (a single-part story) is one untitled chapter 1.
+    """
+    from .story_downloader import split_story_chapters
+
+    pieces = split_story_chapters(story_content)
+    if len(pieces) == 1:
+        chapters = [(None, pieces[0])]
+    else:
+        chapters = []
+        for text in pieces[1:]:
+            title_end = text.find("\n\n")
+            chapters.append((None, text) if title_end == -1 else (text[:title_end], text[title_end + 2:]))
+
+    return [
+        ChapterDigest(number, title, content, hash_chapter(title, content), len(content.split()))
+        for number, (title, content) in enumerate(chapters, 1)
+    ]
+
+
+def stored_chapter_hashes(story_id: int) -> Dict[int, str]:
+    """chapter_no -> hash as last saved for the story (empty if never saved)."""
+    from app.models import StoryChapterHash, db
+
+    return dict(db.session.query(StoryChapterHash.chapter_no, StoryChapterHash.hash)
+                .filter(StoryChapterHash.story_id == story_id))
+
+
+def changed_chapters(stored: Dict[int, str], digests: List[ChapterDigest]) -> List[int]:
+    """Numbers of chapters that are new or differ from ``stored``."""
+    return [d.number for d in digests if stored.get(d.number) != d.hash]
+
+
+def save_chapter_hashes(story_id: int, digests: List[ChapterDigest], replace: bool = True) -> None:
+    """
+    Store the story's chapter digests in the current transaction.
+
+    With ``replace`` the story's previous rows are dropped first; without it
+    only the given chapters are written (e.g. parts just appended). Core
+    statements, so the story itself isn't marked as changed.
+    """
+    from app.models import StoryChapterHash, db
+
+    table = StoryChapterHash.__table__
+    numbers = [d.number for d in digests]
+    condition = table.c.story_id == story_id
+    if not replace:
+        condition = condition & table.c.chapter_no.in_(numbers)
+    db.session.execute(delete(table).where(condition))
+    if digests:
+        db.session.execute(insert(table), [
+            {'story_id': story_id, 'chapter_no': d.number, 'hash': d.hash, 'word_count': d.word_count}
+            for d in digests
+        ])
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Writes through this process's sessions invalidate the cache on commit. The
+# TTL bounds how long a write from another process (reset_pin.py,
+# reset_webauthn.py) can go unnoticed.
+CONFIG_CACHE_TTL = 60.0
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """AppConfig values (typed via get_value()) plus the passkey count."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    credential_count: int = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.values.get(key)
+        return default if value is None else value
+
+    @property
+    def pin_enabled(self) -> bool:
+        return bool(self.get('pin_enabled', False))
+
+    @property
+    def auto_lock_timeout(self) -> int:
+        return int(self.get('auto_lock_timeout', 0))
+
+
+_lock = threading.Lock()
+_snapshot: Optional[ConfigSnapshot] = None
+_loaded_at = 0.0
+# Bumped by every invalidation, so a load that overlapped one isn't cached.
+_generation = 0
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """
+    Cached AppConfig and WebAuthn state for the per-request auth hooks.
+
+    Loading costs two queries; after that requests read the cached snapshot
+    until a commit touches app_config or webauthn_credentials, or the TTL
+    lapses. Must be called inside an app context.
+    """
+    global _snapshot, _loaded_at
+
+    with _lock:
+        if _snapshot is not None and time.monotonic() - _loaded_at < CONFIG_CACHE_TTL:
+            return _snapshot
+        generation = _generation
+
+    from app.models import AppConfig, WebAuthnCredential
+
+    snapshot = ConfigSnapshot(
+        values={cfg.key: cfg.get_value() for cfg in AppConfig.query.all()},
+        credential_count=WebAuthnCredential.query.count(),
+    )
+    with _lock:
+        # A commit that landed mid-load may not be in this snapshot; use it
+        # for this call but let the next one reload.
+        if _generation == generation:
+            _snapshot = snapshot
+            _loaded_at = time.monotonic()
+    return snapshot
+
+
+def invalidate_config_cache() -> None:
+    """Drop the cached snapshot; the next get_config_snapshot() reloads it."""
+    global _snapshot, _generation
+    with _lock:
+        _snapshot = None
+        _generation += 1
+
+
+_DIRTY_KEY = 'config_cache_dirty'
+_CACHED_TABLES = ('app_config', 'webauthn_credentials')
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_config_writes(session, flush_context) -> None:
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if getattr(obj, '__tablename__', None) in _CACHED_TABLES:
+            session.info[_DIRTY_KEY] = True
+            return
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _note_config_bulk_writes(orm_execute_state) -> None:
+    # Query.update()/delete() (e.g. reset_webauthn.py) bypass the flush.
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table.name in _CACHED_TABLES:
+        orm_execute_state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_config_writes(session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate_config_cache()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_config_writes(session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 import os
 import hashlib
+import multiprocessing
 import traceback
 import logging
 import warnings
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Tuple
 import ebooklib
 import ebooklib.epub as epub
 from .logger import log_error
@@ -24,70 +28,91 @@ def abbreviate_category(name: str) -> str:
     return name
 
 
-def generate_cover_image(title: str, author: str, cover_path: str, category: Optional[str] = None) -> None:
-    """
-    Generate a cover image with a gradient background, a simulated spine effect,
-    and styled text that mimics the provided design.
+_PALETTES = (
+    # --- The Dark Academia Collection (Deep, moody jewel tones) ---
+    {'bg': (15, 25, 45),  'accent': (190, 200, 215), 'spine': (25, 40, 65)},  # Midnight Blue & Silver
+    {'bg': (12, 35, 25),  'accent': (210, 185, 120), 'spine': (20, 50, 35)},  # Deep Emerald & Gold
+    {'bg': (45, 15, 20),  'accent': (225, 180, 170), 'spine': (65, 25, 30)},  # Oxblood & Rose Gold
+    {'bg': (35, 15, 35),  'accent': (230, 215, 190), 'spine': (50, 25, 50)},  # Royal Plum & Champagne
+    {'bg': (15, 40, 45),  'accent': (215, 160, 120), 'spine': (25, 55, 60)},  # Dark Teal & Copper
+    # --- The Antiquarian Library (Warm, earthy, vintage leather vibes) ---
+    {'bg': (30, 20, 15),  'accent': (180, 150, 100), 'spine': (45, 30, 22)},  # Espresso & Antique Brass
+    {'bg': (35, 40, 25),  'accent': (190, 175, 130), 'spine': (50, 55, 35)},  # Olive Grove & Tarnished Gold
+    {'bg': (40, 45, 50),  'accent': (220, 220, 225), 'spine': (55, 60, 65)},  # Slate Grey & Pearl
+    {'bg': (60, 25, 15),  'accent': (230, 215, 195), 'spine': (80, 35, 22)},  # Rust & Parchment
+    {'bg': (50, 45, 40),  'accent': (200, 195, 190), 'spine': (65, 60, 55)},  # Deep Taupe & Warm Silver
+    # --- The Collector's Edition (Rich, vibrant, and highly saturated) ---
+    {'bg': (20, 40, 80),  'accent': (235, 195, 100), 'spine': (30, 55, 100)},  # Lapis Lazuli & Bright Gold
+    {'bg': (75, 15, 20),  'accent': (240, 210, 150), 'spine': (95, 22, 28)},  # Crimson & Pale Gold
+    {'bg': (20, 50, 30),  'accent': (240, 235, 220), 'spine': (30, 65, 40)},  # Forest Green & Ivory
+    {'bg': (55, 30, 70),  'accent': (215, 215, 225), 'spine': (70, 42, 88)},  # Amethyst & Platinum
+    {'bg': (10, 55, 65),  'accent': (200, 150, 100), 'spine': (15, 70, 82)},  # Peacock Blue & Bronze
+    # --- The Soft Classics (Muted, dreamy, and sophisticated) ---
+    {'bg': (85, 55, 60),  'accent': (245, 230, 215), 'spine': (105, 70, 75)},  # Dusty Rose & Cream
+    {'bg': (55, 70, 60),  'accent': (225, 225, 200), 'spine': (70, 88, 75)},  # Sage Green & White Gold
+    {'bg': (45, 50, 75),  'accent': (200, 205, 220), 'spine': (60, 65, 95)},  # Muted Indigo & Silver
+    {'bg': (65, 45, 35),  'accent': (240, 200, 180), 'spine': (82, 58, 45)},  # Warm Sepia & Soft Peach
+    {'bg': (50, 65, 80),  'accent': (235, 230, 220), 'spine': (65, 82, 100)},  # Fog Blue & Linen
+)
+
+_FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "fonts", "PlayfairDisplay-Regular.ttf")
+
+# Layout is drawn at 2x and downsampled for smoother text and rules.
+_CANVAS_SIZE = (1200, 1600)
+_OUTPUT_SIZE = (600, 800)
+_SPINE_WIDTH = 40
+_TITLE_FONT_SIZE = 154
+_AUTHOR_FONT_SIZE = 116
+_CATEGORY_FONT_SIZE = 90
+
+# Below this many covers a process pool costs more than it saves.
+_MIN_POOL_BATCH = 8
+
+
+@lru_cache(maxsize=None)
+def _font(size: int) -> ImageFont.ImageFont:
+    """Playfair Display at ``size``, loaded once per process."""
+    try:
+        return ImageFont.truetype(_FONT_PATH, size)
+    except Exception:
+        logging.warning("Using default font as Playfair Display not found")
+        return ImageFont.load_default()
 
-    Args:
-        title: The title of the story.
-        author: The author's name.
-        cover_path: The file path to save the generated cover.
-        category: Optional category name; rendered as a badge when covers_show_category is enabled.
-    """
+
+def _show_category_setting() -> bool:
     try:
-        width, height = 1200, 1600
-
-        palettes = [
-            # --- The Dark Academia Collection (Deep, moody jewel tones) ---
-            {'bg': (15, 25, 45),  'accent': (190, 200, 215), 'spine': (25, 40, 65)},  # Midnight Blue & Silver
-            {'bg': (12, 35, 25),  'accent': (210, 185, 120), 'spine': (20, 50, 35)},  # Deep Emerald & Gold
-            {'bg': (45, 15, 20),  'accent': (225, 180, 170), 'spine': (65, 25, 30)},  # Oxblood & Rose Gold
-            {'bg': (35, 15, 35),  'accent': (230, 215, 190), 'spine': (50, 25, 50)},  # Royal Plum & Champagne
-            {'bg': (15, 40, 45),  'accent': (215, 160, 120), 'spine': (25, 55, 60)},  # Dark Teal & Copper
-            # --- The Antiquarian Library (Warm, earthy, vintage leather vibes) ---
-            {'bg': (30, 20, 15),  'accent': (180, 150, 100), 'spine': (45, 30, 22)},  # Espresso & Antique Brass
-            {'bg': (35, 40, 25),  'accent': (190, 175, 130), 'spine': (50, 55, 35)},  # Olive Grove & Tarnished Gold
-            {'bg': (40, 45, 50),  'accent': (220, 220, 225), 'spine': (55, 60, 65)},  # Slate Grey & Pearl
-            {'bg': (60, 25, 15),  'accent': (230, 215, 195), 'spine': (80, 35, 22)},  # Rust & Parchment
-            {'bg': (50, 45, 40),  'accent': (200, 195, 190), 'spine': (65, 60, 55)},  # Deep Taupe & Warm Silver
-            # --- The Collector's Edition (Rich, vibrant, and highly saturated) ---
-            {'bg': (20, 40, 80),  'accent': (235, 195, 100), 'spine': (30, 55, 100)},  # Lapis Lazuli & Bright Gold
-            {'bg': (75, 15, 20),  'accent': (240, 210, 150), 'spine': (95, 22, 28)},  # Crimson & Pale Gold
-            {'bg': (20, 50, 30),  'accent': (240, 235, 220), 'spine': (30, 65, 40)},  # Forest Green & Ivory
-            {'bg': (55, 30, 70),  'accent': (215, 215, 225), 'spine': (70, 42, 88)},  # Amethyst & Platinum
-            {'bg': (10, 55, 65),  'accent': (200, 150, 100), 'spine': (15, 70, 82)},  # Peacock Blue & Bronze
-            # --- The Soft Classics (Muted, dreamy, and sophisticated) ---
-            {'bg': (85, 55, 60),  'accent': (245, 230, 215), 'spine': (105, 70, 75)},  # Dusty Rose & Cream
-            {'bg': (55, 70, 60),  'accent': (225, 225, 200), 'spine': (70, 88, 75)},  # Sage Green & White Gold
-            {'bg': (45, 50, 75),  'accent': (200, 205, 220), 'spine': (60, 65, 95)},  # Muted Indigo & Silver
-            {'bg': (65, 45, 35),  'accent': (240, 200, 180), 'spine': (82, 58, 45)},  # Warm Sepia & Soft Peach
-            {'bg': (50, 65, 80),  'accent': (235, 230, 220), 'spine': (65, 82, 100)},  # Fog Blue & Linen
-        ]
-
-        palette = palettes[int(hashlib.md5(title.encode()).hexdigest(), 16) % len(palettes)]
+        from .config_cache import get_config_snapshot
+        return bool(get_config_snapshot().get('covers_show_category', False))
+    except Exception:
+        # No app context (e.g. a pool worker) or no database: leave the badge off.
+        return False
+
+
+class CoverRenderer:
+    """
+    Draws generated covers. Fonts are cached per process, and the
+    covers_show_category setting is read once when the renderer is built
+    (pass ``show_category`` to skip the lookup, as pool workers do).
+    """
+
+    def __init__(self, show_category: Optional[bool] = None):
+        self.show_category = _show_category_setting() if show_category is None else show_category
+
+    def render(self, title: str, author: str, cover_path: str, category: Optional[str] = None) -> None:
+        """Draw one cover and save it to ``cover_path``. Raises on failure."""
+        width, height = _CANVAS_SIZE
+        title_font = _font(_TITLE_FONT_SIZE)
+        author_font = _font(_AUTHOR_FONT_SIZE)
+
+        palette = _PALETTES[int(hashlib.md5(title.encode()).hexdigest(), 16) % len(_PALETTES)]
         bg, accent, spine_color = palette['bg'], palette['accent'], palette['spine']
 
         image = Image.new("RGB", (width, height), bg)
         draw = ImageDraw.Draw(image, 'RGBA')
 
-        spine_width = 40
+        spine_width = _SPINE_WIDTH
         draw.rectangle([(0, 0), (spine_width, height)], fill=spine_color)
 
-        try:
-            title_font_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "fonts", "PlayfairDisplay-Regular.ttf")
-            author_font_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "fonts", "PlayfairDisplay-Regular.ttf")
-            
-            if not os.path.exists(title_font_path) or not os.path.exists(author_font_path):
-                raise Exception(f"Playfair Display fonts not found")
-
-            title_font = ImageFont.truetype(title_font_path, 154)
-            author_font = ImageFont.truetype(author_font_path, 116)
-        except Exception:
-            title_font = ImageFont.load_default()
-            author_font = ImageFont.load_default()
-            logging.warning("Using default font as Playfair Display not found")
-
         display_title = title.upper()
         max_text_width = width - (spine_width + 100)
 
@@ -111,16 +136,13 @@ def generate_cover_image(title: str, author: str, cover_path: str, category: Opt
         if current_line:
             lines.append(' '.join(current_line))
 
-        total_text_height = sum(
-            draw.textbbox((0, 0), line, font=title_font)[3] - draw.textbbox((0, 0), line, font=title_font)[1]
-            for line in lines
-        )
+        line_boxes = [draw.textbbox((0, 0), line, font=title_font) for line in lines]
+        total_text_height = sum(bbox[3] - bbox[1] for bbox in line_boxes)
         total_text_height += 40 * (len(lines) - 1)
 
         current_y = (height // 3) - (total_text_height // 2)
 
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=title_font)
+        for line, bbox in zip(lines, line_boxes):
             line_width = bbox[2] - bbox[0]
             line_height = bbox[3] - bbox[1]
             x = (width - line_width) // 2
@@ -134,47 +156,123 @@ def generate_cover_image(title: str, author: str, cover_path: str, category: Opt
         author_width = author_bbox[2] - author_bbox[0]
         draw.text(((width - author_width) // 2, author_y), author, fill=(255, 255, 255), font=author_font)
 
-        if category:
-            try:
-                from app.models.config import AppConfig
-                cfg = AppConfig.query.filter_by(key='covers_show_category').first()
-                show_category = cfg.get_value() if cfg else False
-            except Exception:
-                show_category = False
-
-            if show_category:
-                abbrev = abbreviate_category(category)
-                try:
-                    cat_font = ImageFont.truetype(title_font_path, 90)
-                except Exception:
-                    cat_font = ImageFont.load_default()
-
-                cat_bbox = draw.textbbox((0, 0), abbrev, font=cat_font)
-                cat_w = cat_bbox[2] - cat_bbox[0]
-                cat_h = cat_bbox[3] - cat_bbox[1]
-
-                # Center vertically in the gap between title bottom and author
-                gap_center_y = (title_bottom_y + author_y) // 2
-                cat_y = gap_center_y - cat_h // 2 - cat_bbox[1]
-                cat_x = (width - cat_w) // 2 - cat_bbox[0]
-
-                # Thin decorative lines flanking the text
-                line_y = gap_center_y
-                line_color = (*accent, 160)
-                margin = spine_width + 80
-                text_margin = 30
-                draw.line([(margin, line_y), (cat_x - text_margin, line_y)], fill=line_color, width=2)
-                draw.line([(cat_x + cat_w + text_margin, line_y), (width - margin, line_y)], fill=line_color, width=2)
-
-                draw.text((cat_x, cat_y), abbrev, fill=(255, 255, 255), font=cat_font)
-
-        image = image.resize((600, 800), Image.Resampling.LANCZOS)
+        if category and self.show_category:
+            abbrev = abbreviate_category(category)
+            cat_font = _font(_CATEGORY_FONT_SIZE)
+
+            cat_bbox = draw.textbbox((0, 0), abbrev, font=cat_font)
+            cat_w = cat_bbox[2] - cat_bbox[0]
+            cat_h = cat_bbox[3] - cat_bbox[1]
+
+            # Center vertically in the gap between title bottom and author
+            gap_center_y = (title_bottom_y + author_y) // 2
+            cat_y = gap_center_y - cat_h // 2 - cat_bbox[1]
+            cat_x = (width - cat_w) // 2 - cat_bbox[0]
+
+            # Thin decorative lines flanking the text
+            line_y = gap_center_y
+            line_color = (*accent, 160)
+            margin = spine_width + 80
+            text_margin = 30
+            draw.line([(margin, line_y), (cat_x - text_margin, line_y)], fill=line_color, width=2)
+            draw.line([(cat_x + cat_w + text_margin, line_y), (width - margin, line_y)], fill=line_color, width=2)
+
+            draw.text((cat_x, cat_y), abbrev, fill=(255, 255, 255), font=cat_font)
+
+        image = image.resize(_OUTPUT_SIZE, Image.Resampling.LANCZOS)
         image.save(cover_path, "JPEG", quality=95, optimize=True)
 
+
+def generate_cover_image(title: str, author: str, cover_path: str, category: Optional[str] = None) -> None:
+    """
+    Generate a cover image with a gradient background, a simulated spine effect,
+    and styled text that mimics the provided design.
+
+    Args:
+        title: The title of the story.
+        author: The author's name.
+        cover_path: The file path to save the generated cover.
+        category: Optional category name; rendered as a badge when covers_show_category is enabled.
+    """
+    try:
+        # Without a category there is no badge, so skip the settings lookup.
+        renderer = CoverRenderer() if category else CoverRenderer(show_category=False)
+        renderer.render(title, author, cover_path, category)
     except Exception as e:
         error_msg = f"Error generating cover image: {str(e)}\n{traceback.format_exc()}"
         log_error(error_msg)
 
+
+_worker_renderer: Optional[CoverRenderer] = None
+
+
+def _init_render_worker(show_category: bool) -> None:
+    global _worker_renderer
+    _worker_renderer = CoverRenderer(show_category=show_category)
+
+
+def _render_job(job: Tuple[str, str, str, Optional[str]]) -> Tuple[str, Optional[str]]:
+    title, author, cover_path, category = job
+    try:
+        _worker_renderer.render(title, author, cover_path, category)
+        return cover_path, None
+    except Exception as e:
+        return cover_path, str(e)
+
+
+@contextmanager
+def _children_skip_background_workers():
+    """
+    Spawned children re-import the parent's main script, and run.py calls
+    create_app() at import time. Set SKIP_BACKGROUND_WORKERS while the pool
+    is alive so those app instances don't start their own queue workers.
+    """
+    previous = os.environ.get('SKIP_BACKGROUND_WORKERS')
+    os.environ['SKIP_BACKGROUND_WORKERS'] = 'true'
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop('SKIP_BACKGROUND_WORKERS', None)
+        else:
+            os.environ['SKIP_BACKGROUND_WORKERS'] = previous
+
+
+def render_covers(
+    jobs: Iterable[Tuple[str, str, str, Optional[str]]],
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Render many covers, fanning out over a process pool.
+
+    ``jobs`` are (title, author, cover_path, category) tuples. Yields
+    (cover_path, error) per job in input order; error is None on success. The covers_show_category setting is resolved once here and
+    handed to every worker. Workers are spawned rather than forked, so the
+    parent's database connections and threads never leak into them.
+    """
+    jobs = list(jobs)
+    renderer = CoverRenderer()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(jobs) < _MIN_POOL_BATCH:
+        for title, author, cover_path, category in jobs:
+            try:
+                renderer.render(title, author, cover_path, category)
+                yield cover_path, None
+            except Exception as e:
+                yield cover_path, str(e)
+        return
+
+    context = multiprocessing.get_context('spawn')
+    # Workers are started on demand while map() runs, so the override has to
+    # last for the pool's whole lifetime, not just its construction.
+    with _children_skip_background_workers(), \
+            ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_render_worker,
+                                initargs=(renderer.show_category,)) as pool:
+        chunksize = max(1, min(64, len(jobs) // (workers * 4)))
+        yield from pool.map(_render_job, jobs, chunksize=chunksize)
+
+
 def extract_cover_from_epub(epub_path: str, cover_path: str) -> bool:
     """
     Extract cover image from an EPUB file.
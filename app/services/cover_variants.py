@@ -0,0 +1,105 @@
+from __future__ import annotations
+import glob
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from PIL import Image
+from .logger import log_error
+
+# Bounding boxes for ?size=. 'full' is the stored 600x800 cover itself.
+COVER_SIZES: Dict[str, Optional[Tuple[int, int]]] = {
+    'thumb': (150, 200),
+    'grid': (300, 400),
+    'full': None,
+}
+
+# Derived files live next to the covers, in a dot-directory so code that lists
+# covers/*.jpg never sees them.
+VARIANT_DIRNAME = '.variants'
+
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+
+@dataclass(frozen=True)
+class CoverVariant:
+    path: str
+    mimetype: str
+    etag: str
+
+
+def _variant_etag(cover_path: str, st: os.stat_result, size: str, webp: bool) -> str:
+    # Derived from the source cover's stat, so it is known before any variant exists.
+    key = f"{os.path.basename(cover_path)}:{st.st_size}:{st.st_mtime_ns}:{size}:{'webp' if webp else 'jpeg'}"
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def _render_variant(cover_path: str, variant_path: str, box: Optional[Tuple[int, int]], webp: bool) -> None:
+    os.makedirs(os.path.dirname(variant_path), exist_ok=True)
+    with Image.open(cover_path) as source:
+        image = source.convert('RGB')
+    if box:
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+
+    # Write beside the target and rename, so a concurrent request never serves half a file.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(variant_path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if webp:
+                image.save(f, 'WEBP', quality=WEBP_QUALITY, method=4)
+            else:
+                image.save(f, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(tmp_path, variant_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def cover_variant(cover_path: str, size: str = 'full', webp: bool = False) -> CoverVariant:
+    """
+    Return the file to serve for a cover at ``size`` (a COVER_SIZES key), as WebP if asked.
+
+    Variants are rendered on first request and cached on disk under
+    VARIANT_DIRNAME; a variant older than its cover is rendered again, so a
+    regenerated cover never serves a stale thumbnail. If a variant cannot be
+    rendered the original JPEG is returned.
+    """
+    if size not in COVER_SIZES:
+        raise ValueError(f"Unknown cover size: {size!r}")
+
+    st = os.stat(cover_path)
+    original = CoverVariant(cover_path, 'image/jpeg', _variant_etag(cover_path, st, 'full', False))
+    if size == 'full' and not webp:
+        return original
+
+    stem = os.path.splitext(os.path.basename(cover_path))[0]
+    ext = 'webp' if webp else 'jpg'
+    variant_path = os.path.join(os.path.dirname(cover_path), VARIANT_DIRNAME, f"{stem}.{size}.{ext}")
+
+    try:
+        fresh = os.stat(variant_path).st_mtime_ns >= st.st_mtime_ns
+    except FileNotFoundError:
+        fresh = False
+    if not fresh:
+        try:
+            _render_variant(cover_path, variant_path, COVER_SIZES[size], webp)
+        except OSError as e:
+            log_error(f"Could not render {size} cover variant for {cover_path}: {e}")
+            return original
+
+    return CoverVariant(variant_path, 'image/webp' if webp else 'image/jpeg',
+                        _variant_etag(cover_path, st, size, webp))
+
+
+def remove_cover_variants(cover_path: str) -> None:
+    """Delete every cached variant of a cover (call when the cover itself is deleted)."""
+    stem = os.path.splitext(os.path.basename(cover_path))[0]
+    pattern = os.path.join(os.path.dirname(cover_path), VARIANT_DIRNAME, f"{glob.escape(stem)}.*")
+    for variant_path in glob.glob(pattern):
+        try:
+            os.remove(variant_path)
+        except OSError as e:
+            log_error(f"Failed to delete cover variant {variant_path}: {e}")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import os
+import queue
 import threading
 import time
 import traceback
@@ -7,87 +8,115 @@ from datetime import datetime, timedelta
 from typing import Optional
 from flask import Flask
 from app.services.http_client import global_rate_limiter
+from app.services.job_queue import JobQueue
 
 DEFAULT_MAX_DAILY_DOWNLOADS = 25
+DEFAULT_WORKER_SLOTS = 2
 
 class DownloadQueueWorker:
-    """Background worker for processing download queue"""
+    """Background worker for processing download queue.
+
+    Each of `slots` fetch threads claims a pending item through JobQueue and
+    downloads it, then hands the result to a single file-creation thread so
+    EPUB/JSON/cover generation never holds up the next network fetch. Request
+    pacing across all slots comes from global_rate_limiter.
+    """
+
+    def __init__(self, app: Flask, poll_interval: int = 60, slots: Optional[int] = None):
+        from app.models import DownloadQueueItem
 
-    def __init__(self, app: Flask, poll_interval: int = 60):
         self.app = app
+        self.queue = JobQueue(DownloadQueueItem)
         self.poll_interval = poll_interval
-        self.thread: Optional[threading.Thread] = None
+        self.slots = slots or self._get_worker_slots()
+        self.threads: list[threading.Thread] = []
+        self.file_thread: Optional[threading.Thread] = None
         self.running = False
         self._stop_event = threading.Event()
-        self._wake_event = threading.Event()
+        self._wake_events = [threading.Event() for _ in range(self.slots)]
+        # Bounded so fetchers pause rather than pile up downloads in memory
+        # when file creation falls behind.
+        self._file_jobs: queue.Queue = queue.Queue(maxsize=self.slots)
+        # Serializes the daily-cap check with the claim: the cap counts items in
+        # 'processing', so two slots must not both pass the check and then claim.
+        self._claim_lock = threading.Lock()
         self._last_rate_limit_reset_date: Optional[str] = None
 
     def start(self):
-        """Start the background worker thread"""
-        if self.thread and self.thread.is_alive():
+        """Start the fetch slots and the file-creation thread"""
+        if any(t.is_alive() for t in self.threads):
             return
 
-        self._recover_stale_jobs()
-
         self.running = True
         self._stop_event.clear()
-        self.thread = threading.Thread(target=self._worker_loop, daemon=True, name="DownloadQueueWorker")
-        self.thread.start()
-
-    def _recover_stale_jobs(self):
-        """Reset jobs stuck in 'processing' state (from crashes/restarts)"""
-        from app.models import DownloadQueueItem, db
-        from datetime import datetime, timedelta
-
-        with self.app.app_context():
-            from .logger import log_action, log_error
-            try:
-                stale_cutoff = datetime.utcnow() - timedelta(minutes=10)
-                stale_items = DownloadQueueItem.query.filter(
-                    DownloadQueueItem.status == 'processing',
-                    DownloadQueueItem.started_at < stale_cutoff
-                ).all()
-
-                if stale_items:
-                    log_action(f"[DOWNLOAD WORKER] Recovering {len(stale_items)} stale jobs")
-                    for item in stale_items:
-                        item.status = 'pending'
-                        item.started_at = None
-                        item.progress_message = 'Reset from stale processing state'
-                    db.session.commit()
-            except Exception as e:
-                db.session.rollback()
-                log_error(f"[DOWNLOAD WORKER] Could not recover stale jobs (migrations pending?): {e}")
+        self.threads = [
+            threading.Thread(target=self._worker_loop, args=(slot,), daemon=True, name=f"DownloadQueueWorker-{slot}")
+            for slot in range(self.slots)
+        ]
+        self.file_thread = threading.Thread(target=self._file_loop, daemon=True, name="DownloadQueueWorker-files")
+        for thread in self.threads + [self.file_thread]:
+            thread.start()
 
     def stop(self):
-        """Stop the background worker thread"""
+        """Stop all worker threads"""
         self.running = False
         self._stop_event.set()
-        self._wake_event.set()
-        if self.thread:
-            self.thread.join(timeout=10)
+        for event in self._wake_events:
+            event.set()
+        for thread in self.threads + ([self.file_thread] if self.file_thread else []):
+            thread.join(timeout=10)
+        # Jobs never picked up stop renewing, so their leases lapse and they are reclaimed.
+        while True:
+            try:
+                job = self._file_jobs.get_nowait()
+            except queue.Empty:
+                break
+            release_lease = job.pop('release_lease', None)
+            if release_lease:
+                release_lease()
 
     def wake(self):
-        """Interrupt the current sleep cycle and process the queue immediately."""
-        self._wake_event.set()
+        """Interrupt every slot's sleep cycle and process the queue immediately."""
+        for event in self._wake_events:
+            event.set()
 
-    def _worker_loop(self):
-        """Main worker loop"""
+    def _worker_loop(self, slot: int = 0):
+        """Fetch loop for one slot; keeps claiming items until the queue is drained."""
         from .logger import log_action, log_error
 
-        log_action("Download queue worker started")
+        log_action(f"Download queue worker slot {slot} started")
+        wake_event = self._wake_events[slot]
 
         while self.running and not self._stop_event.is_set():
+            claimed = False
             try:
                 with self.app.app_context():
-                    self._process_next_item()
+                    claimed = self._process_next_item()
             except Exception as e:
                 log_error(f"Error in download queue worker: {str(e)}\n{traceback.format_exc()}")
 
-            self._wake_event.wait(self.poll_interval)
-            self._wake_event.clear()
+            if claimed:
+                continue
+
+            wake_event.wait(self.poll_interval)
+            wake_event.clear()
 
-        log_action("Download queue worker stopped")
+        log_action(f"Download queue worker slot {slot} stopped")
+
+    def _file_loop(self):
+        """Create story files for downloads handed over by the fetch slots."""
+        from .logger import log_error
+
+        while self.running and not self._stop_event.is_set():
+            try:
+                job = self._file_jobs.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                with self.app.app_context():
+                    self._finish_item(job)
+            except Exception as e:
+                log_error(f"Error in download file stage: {str(e)}\n{traceback.format_exc()}")
 
     def _get_daily_cap(self) -> int:
         try:
@@ -95,6 +124,12 @@ class DownloadQueueWorker:
         except (KeyError, ValueError):
             return DEFAULT_MAX_DAILY_DOWNLOADS
 
+    def _get_worker_slots(self) -> int:
+        try:
+            return max(1, int(os.environ['DOWNLOAD_WORKER_SLOTS']))
+        except (KeyError, ValueError):
+            return DEFAULT_WORKER_SLOTS
+
     def _reset_rate_limited_items(self):
         """Requeue rate-limited items that should now be allowed to proceed."""
         from app.models import DownloadQueueItem, db
@@ -133,124 +168,140 @@ class DownloadQueueWorker:
                 db.session.commit()
 
     def _daily_downloads_today(self) -> int:
-        """Count completed downloads since midnight UTC."""
+        """Count downloads completed since midnight UTC, plus those still in flight."""
         from app.models import DownloadQueueItem
         today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
         return DownloadQueueItem.query.filter(
-            DownloadQueueItem.status == 'completed',
-            DownloadQueueItem.completed_at >= today_start
+            (DownloadQueueItem.status == 'processing') |
+            ((DownloadQueueItem.status == 'completed') & (DownloadQueueItem.completed_at >= today_start))
         ).count()
 
-    def _process_next_item(self):
-        """Process the next pending item in the queue"""
+    def _process_next_item(self) -> bool:
+        """Claim and download the next pending item.
+
+        Returns True if an item was handled (the queue may hold more work),
+        False if the slot should sleep.
+        """
         from app.models import DownloadQueueItem, db
-        from .logger import log_action, log_error
-        from sqlalchemy import select
+        from .logger import log_action
 
-        self._reset_rate_limited_items()
+        with self._claim_lock:
+            self._reset_rate_limited_items()
 
-        now = datetime.utcnow()
-        item = db.session.execute(
-            select(DownloadQueueItem)
-            .filter(
-                DownloadQueueItem.status == 'pending',
-                (DownloadQueueItem.scheduled_after == None) | (DownloadQueueItem.scheduled_after <= now)
-            )
-            .order_by(DownloadQueueItem.created_at.asc())
-            .limit(1)
-        ).scalar_one_or_none()
+            daily_cap = self._get_daily_cap()
+            if self._daily_downloads_today() >= daily_cap:
+                now = datetime.utcnow()
+                pending = DownloadQueueItem.query.filter(
+                    DownloadQueueItem.status == 'pending',
+                    (DownloadQueueItem.scheduled_after == None) | (DownloadQueueItem.scheduled_after <= now)
+                ).all()
+                if pending:
+                    log_action(f"[DOWNLOAD WORKER] Daily cap of {daily_cap} reached — marking pending items as rate_limited")
+                    for it in pending:
+                        it.status = 'rate_limited'
+                        it.progress_message = f'Daily download limit of {daily_cap} reached. Resumes tomorrow.'
+                        it.completed_at = datetime.utcnow()
+                    db.session.commit()
+                return False
 
-        if not item:
-            return
+            item = self.queue.claim_next(progress_message='Starting download...')
+            if not item:
+                return False
 
         item_id = item.id
-
-        daily_cap = self._get_daily_cap()
-        if self._daily_downloads_today() >= daily_cap:
-            log_action(f"[DOWNLOAD WORKER] Daily cap of {daily_cap} reached — marking pending items as rate_limited")
-            pending = DownloadQueueItem.query.filter(
-                DownloadQueueItem.status == 'pending',
-                (DownloadQueueItem.scheduled_after == None) | (DownloadQueueItem.scheduled_after <= now)
-            ).all()
-            for it in pending:
-                it.status = 'rate_limited'
-                it.progress_message = f'Daily download limit of {daily_cap} reached. Resumes tomorrow.'
-                it.completed_at = datetime.utcnow()
-            db.session.commit()
-            return
-
         log_action(f"Processing download queue item {item_id}: {item.url} (job_type={item.job_type})")
 
         global_rate_limiter.wait_if_needed()
 
-        item.status = 'processing'
-        item.started_at = datetime.utcnow()
-        item.progress_message = 'Starting download...'
-        db.session.commit()
-
         try:
-            downloaded = True
-            if item.job_type == 'author':
-                self._process_author_scan(item)
-            elif item.job_type == 'multi':
-                downloaded = self._download_and_save_multi(item)
-            else:
-                downloaded = self._download_and_save(item)
-
-            if item.job_type != 'author' and not downloaded:
-                item.status = 'skipped'
-            else:
-                item.status = 'completed'
-                item.progress_message = 'Download completed successfully'
-            item.completed_at = datetime.utcnow()
-            db.session.commit()
+            with self.queue.keep_alive(item_id):
+                if item.job_type == 'author':
+                    self._process_author_scan(item)
+                    self._complete_item(item, downloaded=True)
+                    return True
+
+                if item.job_type == 'multi':
+                    job = self._download_multi(item)
+                else:
+                    job = self._download_single(item)
+
+                if job is None:
+                    self._complete_item(item, downloaded=False)
+                    return True
+
+                item.progress_message = 'Waiting for file creation...'
+                db.session.commit()
+                # Keep the lease alive while the job waits behind other file builds;
+                # _finish_item releases it once the file stage picks the job up.
+                job['release_lease'] = self.queue.hold(item_id)
+                self._file_jobs.put(job)
 
-            log_action(f"Successfully completed download queue item {item.id}")
+        except Exception as e:
+            self._handle_failure(item_id, str(e))
 
-            if item.job_type != 'author' and downloaded:
-                from .notifier import send_notification
-                send_notification(f"Story Downloaded: '{item.title or 'Story'}' has been added to your library")
+        return True
 
-        except Exception as e:
-            error_msg = str(e)
+    def _complete_item(self, item, downloaded: bool):
+        """Mark a claimed item finished and notify for new downloads."""
+        from app.models import db
+        from .logger import log_action
 
-            db.session.rollback()
+        if item.job_type != 'author' and not downloaded:
+            item.status = 'skipped'
+        else:
+            item.status = 'completed'
+            item.progress_message = 'Download completed successfully'
+        item.completed_at = datetime.utcnow()
+        db.session.commit()
 
-            item = db.session.get(DownloadQueueItem, item_id)
-            if not item:
-                log_error(f"Failed to process download queue item {item_id}: Item no longer exists")
-                return
+        log_action(f"Successfully completed download queue item {item.id}")
 
-            log_error(f"Failed to process download queue item {item_id}: {error_msg}\n{traceback.format_exc()}")
+        if item.job_type != 'author' and downloaded:
+            from .notifier import send_notification
+            send_notification(f"Story Downloaded: '{item.title or 'Story'}' has been added to your library")
 
-            item.retry_count += 1
+    def _handle_failure(self, item_id: int, error_msg: str):
+        """Roll back and either requeue the item for retry or mark it failed. Call from an except block."""
+        from app.models import DownloadQueueItem, db
+        from .logger import log_action, log_error
 
-            if item.retry_count >= item.max_retries:
-                item.status = 'failed'
-                item.error_message = f"Failed after {item.retry_count} attempts: {error_msg}"
-                item.completed_at = datetime.utcnow()
-                log_action(f"Download queue item {item_id} failed permanently after {item.retry_count} retries")
-            else:
-                item.status = 'pending'
-                item.error_message = f"Attempt {item.retry_count} failed: {error_msg}"
-                log_action(f"Download queue item {item_id} will be retried (attempt {item.retry_count + 1}/{item.max_retries})")
+        db.session.rollback()
 
-            db.session.commit()
+        item = db.session.get(DownloadQueueItem, item_id)
+        if not item:
+            log_error(f"Failed to process download queue item {item_id}: Item no longer exists")
+            return
+
+        log_error(f"Failed to process download queue item {item_id}: {error_msg}\n{traceback.format_exc()}")
 
-    def _download_and_save(self, item):
-        """Download a single story URL and save to database.
+        item.retry_count += 1
 
-        Returns True if the story was downloaded, False if skipped as already seen.
+        if item.retry_count >= item.max_retries:
+            item.status = 'failed'
+            item.error_message = f"Failed after {item.retry_count} attempts: {error_msg}"
+            item.completed_at = datetime.utcnow()
+            log_action(f"Download queue item {item_id} failed permanently after {item.retry_count} retries")
+        else:
+            item.status = 'pending'
+            item.error_message = f"Attempt {item.retry_count} failed: {error_msg}"
+            log_action(f"Download queue item {item_id} will be retried (attempt {item.retry_count + 1}/{item.max_retries})")
+
+        db.session.commit()
+
+    def _download_single(self, item) -> Optional[dict]:
+        """Download a single story URL.
+
+        Returns the file-stage job, or None if the URL was skipped as already seen.
         """
         from app.models import db, SeenLiteroticaUrl
         from .story_downloader import download_story
-        from .logger import log_action, log_error
+        from .logger import log_action
 
         if item.job_type != 'redownload' and SeenLiteroticaUrl.query.filter_by(url=item.url).first():
             log_action(f"Skipping already-seen URL: {item.url}")
             item.progress_message = 'Skipped: already downloaded as part of a series'
             db.session.commit()
-            return False
+            return None
 
         item.progress_message = 'Downloading story content...'
         db.session.commit()
@@ -269,48 +320,33 @@ class DownloadQueueWorker:
         item.downloaded_pages = page_count
         db.session.commit()
 
-        item.progress_message = 'Creating files...'
-        db.session.commit()
-
         # Redownloads should always regenerate both formats to keep the library complete.
         formats = item.get_formats()
         if item.job_type == 'redownload':
             formats = ['epub', 'html']
 
-        from .story_processor import _create_story_files
-        result = _create_story_files(
-            story_content=story_content,
-            story_title=title,
-            story_author=author,
-            story_category=category,
-            story_tags=tags,
-            source_url=item.url,
-            author_url=author_url,
-            page_count=page_count,
-            formats=formats,
-            series_url=series_url,
-            story_description=story_description
-        )
-
-        if not result.get('success'):
-            raise Exception(result.get('message', 'Failed to create story files'))
-
-        from app.models import Story
-        story = Story.query.filter_by(literotica_url=item.url).first()
-        if story:
-            item.story_id = story.id
-            db.session.commit()
-            # Ensure any missing format is queued for generation after a download.
-            self._ensure_complete_formats(story)
-
-        log_action(f"Successfully saved story '{title}' from queue item {item.id}")
-        return True
-
-    def _download_and_save_multi(self, item):
-        """Download and combine multiple URLs into a single story."""
+        return {
+            'item_id': item.id,
+            'combined_urls': None,
+            'files': dict(
+                story_content=story_content,
+                story_title=title,
+                story_author=author,
+                story_category=category,
+                story_tags=tags,
+                source_url=item.url,
+                author_url=author_url,
+                page_count=page_count,
+                formats=formats,
+                series_url=series_url,
+                story_description=story_description
+            ),
+        }
+
+    def _download_multi(self, item) -> dict:
+        """Download and combine multiple URLs into a single story's file-stage job."""
         from app.models import db
         from .story_downloader import download_and_combine_stories
-        from .logger import log_action, log_error
 
         extra = item.get_extra_urls()
         all_urls = [item.url] + extra
@@ -332,45 +368,72 @@ class DownloadQueueWorker:
         item.downloaded_pages = page_count
         db.session.commit()
 
-        item.progress_message = 'Creating files...'
-        db.session.commit()
-
+        return {
+            'item_id': item.id,
+            'combined_urls': all_urls,
+            'files': dict(
+                story_content=story_content,
+                story_title=title,
+                story_author=author,
+                story_category=category,
+                story_tags=tags,
+                source_url=item.url,
+                author_url=author_url,
+                page_count=page_count,
+                formats=item.get_formats(),
+                series_url=series_url,
+                story_description=story_description,
+                all_authors=all_authors,
+                all_tags=all_tags
+            ),
+        }
+
+    def _finish_item(self, job: dict):
+        """File stage: write the story files for a downloaded item and complete it."""
+        from app.models import DownloadQueueItem, Story, StorySource, db
         from .story_processor import _create_story_files
-        result = _create_story_files(
-            story_content=story_content,
-            story_title=title,
-            story_author=author,
-            story_category=category,
-            story_tags=tags,
-            source_url=item.url,
-            author_url=author_url,
-            page_count=page_count,
-            formats=item.get_formats(),
-            series_url=series_url,
-            story_description=story_description,
-            all_authors=all_authors,
-            all_tags=all_tags
-        )
-
-        if not result.get('success'):
-            raise Exception(result.get('message', 'Failed to create combined story files'))
-
-        from app.models import Story, StorySource
-        story = Story.query.filter_by(literotica_url=item.url).first()
-        if story:
-            story.is_combined = True
-            story.chapter_count = len(all_urls)
-            story.auto_refresh_excluded = True
-            story.auto_refresh_exclusion_reason = "User-created combined story — cannot be auto-refreshed"
-            story.auto_refresh_exclusion_type = 'combined'
-            story.auto_update_enabled = False
-            item.story_id = story.id
-            story.sources = [StorySource(url=url, position=pos) for pos, url in enumerate(all_urls)]
+        from .logger import log_action, log_error
+
+        item_id = job['item_id']
+        release_lease = job.pop('release_lease', None)
+        if release_lease:
+            release_lease()
+        item = db.session.get(DownloadQueueItem, item_id)
+        if not item:
+            log_error(f"Downloaded queue item {item_id} no longer exists; discarding")
+            return
+
+        try:
+            item.progress_message = 'Creating files...'
             db.session.commit()
-            self._ensure_complete_formats(story)
 
-        log_action(f"Successfully saved combined story '{title}' from queue item {item.id}")
-        return True
+            with self.queue.keep_alive(item_id):
+                result = _create_story_files(**job['files'])
+            if not result.get('success'):
+                raise Exception(result.get('message', 'Failed to create story files'))
+
+            story = Story.query.filter_by(literotica_url=item.url).first()
+            if story:
+                all_urls = job['combined_urls']
+                if all_urls:
+                    story.is_combined = True
+                    story.chapter_count = len(all_urls)
+                    story.auto_refresh_excluded = True
+                    story.auto_refresh_exclusion_reason = "User-created combined story — cannot be auto-refreshed"
+                    story.auto_refresh_exclusion_type = 'combined'
+                    story.auto_update_enabled = False
+                    story.sources = [StorySource(url=url, position=pos) for pos, url in enumerate(all_urls)]
+                item.story_id = story.id
+                db.session.commit()
+                # Ensure any missing format is queued for generation after a download.
+                self._ensure_complete_formats(story)
+
+            kind = 'combined story' if job['combined_urls'] else 'story'
+            log_action(f"Successfully saved {kind} '{item.title}' from queue item {item.id}")
+            self._complete_item(item, downloaded=True)
+
+        except Exception as e:
+            self._handle_failure(item_id, str(e))
 
     def _ensure_complete_formats(self, story):
         """After a download completes, queue any missing format generation jobs."""
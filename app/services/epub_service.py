@@ -102,104 +102,98 @@ class EpubService:
                 log_error(f"EPUB file not found: {epub_path}")
                 return False
 
-            import tempfile
-            import shutil
+            from html import escape as _he
             from .epub_generator import format_metadata_content
-
-            DC = 'http://purl.org/dc/elements/1.1/'
-            OPF = 'http://www.idpf.org/2007/opf'
+            from .zip_stream import patch_zip
 
             new_metadata_content = format_metadata_content(category, tags, description, all_authors)
             new_metadata_xhtml = EpubService._XHTML_WRAPPER.format(
                 title='Story Information',
                 body=new_metadata_content,
             ).encode('utf-8')
-
-            temp_dir = tempfile.mkdtemp()
-            temp_epub = os.path.join(temp_dir, 'temp.epub')
-
-            try:
-                with zipfile.ZipFile(epub_path, 'r') as zip_in:
-                    with zipfile.ZipFile(temp_epub, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                        for item in zip_in.infolist():
-                            data = zip_in.read(item.filename)
-                            name = item.filename.lower()
-
-                            if name.endswith('content.opf') or name.endswith('package.opf'):
-                                try:
-                                    from html import escape as _he
-                                    text = data.decode('utf-8')
-                                    et = _he(title)
-                                    ea = _he(author)
-                                    text = re.sub(
-                                        r'(<dc:title[^>]*>)[^<]*(</dc:title>)',
-                                        lambda m: f'{m.group(1)}{et}{m.group(2)}',
-                                        text, count=1,
-                                    )
-                                    text = re.sub(
-                                        r'(<dc:creator[^>]*>)[^<]*(</dc:creator>)',
-                                        lambda m: f'{m.group(1)}{ea}{m.group(2)}',
-                                        text, count=1,
-                                    )
-                                    data = text.encode('utf-8')
-                                except Exception as opf_err:
-                                    log_error(f"OPF patch failed: {opf_err}")
-
-                            elif name.endswith('nav.xhtml'):
-                                try:
-                                    from html import escape as _he
-                                    et = _he(title)
-                                    text = data.decode('utf-8')
-                                    text = re.sub(
-                                        r'(<title>)[^<]*(</title>)',
-                                        lambda m: f'{m.group(1)}{et}{m.group(2)}',
-                                        text, count=1,
-                                    )
-                                    text = re.sub(
-                                        r'(<h2[^>]*>)[^<]*(</h2>)',
-                                        lambda m: f'{m.group(1)}{et}{m.group(2)}',
-                                        text, count=1,
-                                    )
-                                    data = text.encode('utf-8')
-                                except Exception as nav_err:
-                                    log_error(f"nav.xhtml patch failed: {nav_err}")
-
-                            elif name.endswith('toc.ncx'):
-                                try:
-                                    NCX_NS = 'http://www.daisy.org/z3986/2005/ncx/'
-                                    # Save and restore whichever URI held the default
-                                    # (empty) prefix before we claim it for NCX — this
-                                    # prevents permanent pollution of the global ET
-                                    # namespace map (OPDS relies on Atom being default).
-                                    _prev_default = next(
-                                        (uri for uri, pfx in list(ET._namespace_map.items()) if pfx == ''),
-                                        None
-                                    )
-                                    ET.register_namespace('', NCX_NS)
-                                    root = ET.fromstring(data.decode('utf-8'))
-                                    doc_title = root.find(f'{{{NCX_NS}}}docTitle')
-                                    if doc_title is not None:
-                                        text_el = doc_title.find(f'{{{NCX_NS}}}text')
-                                        if text_el is not None:
-                                            text_el.text = title
-                                    data = ET.tostring(root, encoding='utf-8', xml_declaration=True)
-                                    ET._namespace_map.pop(NCX_NS, None)
-                                    if _prev_default:
-                                        ET.register_namespace('', _prev_default)
-                                except Exception as ncx_err:
-                                    log_error(f"toc.ncx patch failed: {ncx_err}")
-
-                            elif 'metadata.xhtml' in name:
-                                data = new_metadata_xhtml
-
-                            zip_out.writestr(item, data)
-
-                shutil.move(temp_epub, epub_path)
-                return True
-
-            finally:
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
+            et = _he(title)
+            ea = _he(author)
+
+            def patch_opf(data: bytes) -> Optional[bytes]:
+                try:
+                    text = data.decode('utf-8')
+                    text = re.sub(
+                        r'(<dc:title[^>]*>)[^<]*(</dc:title>)',
+                        lambda m: f'{m.group(1)}{et}{m.group(2)}',
+                        text, count=1,
+                    )
+                    text = re.sub(
+                        r'(<dc:creator[^>]*>)[^<]*(</dc:creator>)',
+                        lambda m: f'{m.group(1)}{ea}{m.group(2)}',
+                        text, count=1,
+                    )
+                    return text.encode('utf-8')
+                except Exception as opf_err:
+                    log_error(f"OPF patch failed: {opf_err}")
+                    return None
+
+            def patch_nav(data: bytes) -> Optional[bytes]:
+                try:
+                    text = data.decode('utf-8')
+                    text = re.sub(
+                        r'(<title>)[^<]*(</title>)',
+                        lambda m: f'{m.group(1)}{et}{m.group(2)}',
+                        text, count=1,
+                    )
+                    text = re.sub(
+                        r'(<h2[^>]*>)[^<]*(</h2>)',
+                        lambda m: f'{m.group(1)}{et}{m.group(2)}',
+                        text, count=1,
+                    )
+                    return text.encode('utf-8')
+                except Exception as nav_err:
+                    log_error(f"nav.xhtml patch failed: {nav_err}")
+                    return None
+
+            def patch_ncx(data: bytes) -> Optional[bytes]:
+                try:
+                    NCX_NS = 'http://www.daisy.org/z3986/2005/ncx/'
+                    # Save and restore whichever URI held the default
+                    # (empty) prefix before we claim it for NCX — this
+                    # prevents permanent pollution of the global ET
+                    # namespace map (OPDS relies on Atom being default).
+                    _prev_default = next(
+                        (uri for uri, pfx in list(ET._namespace_map.items()) if pfx == ''),
+                        None
+                    )
+                    ET.register_namespace('', NCX_NS)
+                    root = ET.fromstring(data.decode('utf-8'))
+                    doc_title = root.find(f'{{{NCX_NS}}}docTitle')
+                    if doc_title is not None:
+                        text_el = doc_title.find(f'{{{NCX_NS}}}text')
+                        if text_el is not None:
+                            text_el.text = title
+                    data = ET.tostring(root, encoding='utf-8', xml_declaration=True)
+                    ET._namespace_map.pop(NCX_NS, None)
+                    if _prev_default:
+                        ET.register_namespace('', _prev_default)
+                    return data
+                except Exception as ncx_err:
+                    log_error(f"toc.ncx patch failed: {ncx_err}")
+                    return None
+
+            # Only these small members are rewritten; chapters and images are
+            # copied across still compressed.
+            patches = {}
+            with zipfile.ZipFile(epub_path, 'r') as zf:
+                for name in zf.namelist():
+                    lower = name.lower()
+                    if lower.endswith('content.opf') or lower.endswith('package.opf'):
+                        patches[name] = patch_opf
+                    elif lower.endswith('nav.xhtml'):
+                        patches[name] = patch_nav
+                    elif lower.endswith('toc.ncx'):
+                        patches[name] = patch_ncx
+                    elif 'metadata.xhtml' in lower:
+                        patches[name] = lambda data: new_metadata_xhtml
+
+            patch_zip(epub_path, patches)
+            return True
 
         except Exception as e:
             log_error(f"Error updating EPUB metadata: {str(e)}\n{traceback.format_exc()}")
@@ -225,32 +219,18 @@ class EpubService:
                 log_error(f"Cover image not found: {cover_image_path}")
                 return False
 
-            import tempfile
-            import shutil
+            from .zip_stream import patch_zip
 
             with open(cover_image_path, 'rb') as cover_file:
                 new_cover_data = cover_file.read()
 
-            temp_dir = tempfile.mkdtemp()
-            temp_epub = os.path.join(temp_dir, 'temp.epub')
-
-            try:
-                with zipfile.ZipFile(epub_path, 'r') as zip_in:
-                    with zipfile.ZipFile(temp_epub, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                        for item in zip_in.infolist():
-                            data = zip_in.read(item.filename)
-
-                            if 'cover.jpg' in item.filename.lower():
-                                zip_out.writestr(item.filename, new_cover_data)
-                            else:
-                                zip_out.writestr(item, data)
-
-                shutil.move(temp_epub, epub_path)
-                return True
-
-            finally:
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
+            with zipfile.ZipFile(epub_path, 'r') as zf:
+                patches = {
+                    name: lambda data: new_cover_data
+                    for name in zf.namelist() if 'cover.jpg' in name.lower()
+                }
+            patch_zip(epub_path, patches)
+            return True
 
         except Exception as e:
             error_msg = f"Error updating EPUB cover: {str(e)}\n{traceback.format_exc()}"
@@ -297,6 +277,11 @@ class EpubService:
 
         return content, changed
 
+    @staticmethod
+    def _repaired_bytes(data: bytes, fallback_title: str) -> Optional[bytes]:
+        repaired, changed = EpubService._repair_xhtml(data.decode('utf-8'), fallback_title)
+        return repaired.encode('utf-8') if changed else None
+
     @staticmethod
     def repair_metadata_chapter(epub_path: str) -> bool:
         """Repair all XHTML chapters in an existing EPUB so Readium can parse them.
@@ -307,40 +292,148 @@ class EpubService:
             if not os.path.exists(epub_path):
                 return False
 
-            import tempfile
-            import shutil
+            from .zip_stream import patch_zip
 
-            replacements: dict[str, bytes] = {}
+            patches = {}
             with zipfile.ZipFile(epub_path, 'r') as zf:
                 for name in zf.namelist():
-                    if not name.endswith('.xhtml'):
-                        continue
-                    original = zf.read(name).decode('utf-8')
-                    fallback = name.rsplit('/', 1)[-1].replace('.xhtml', '').replace('_', ' ').title()
-                    repaired, changed = EpubService._repair_xhtml(original, fallback)
-                    if changed:
-                        replacements[name] = repaired.encode('utf-8')
-
-            if not replacements:
-                return False
+                    if name.endswith('.xhtml'):
+                        fallback = name.rsplit('/', 1)[-1].replace('.xhtml', '').replace('_', ' ').title()
+                        patches[name] = lambda data, fallback=fallback: EpubService._repaired_bytes(data, fallback)
 
-            temp_dir = tempfile.mkdtemp()
-            temp_epub = os.path.join(temp_dir, 'temp.epub')
-            try:
-                with zipfile.ZipFile(epub_path, 'r') as zip_in:
-                    with zipfile.ZipFile(temp_epub, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                        for item in zip_in.infolist():
-                            if item.filename in replacements:
-                                zip_out.writestr(item.filename, replacements[item.filename])
-                            else:
-                                zip_out.writestr(item, zip_in.read(item.filename))
-                shutil.move(temp_epub, epub_path)
-                return True
-            finally:
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
+            return patch_zip(epub_path, patches)
 
         except Exception as e:
             error_msg = f"Error repairing EPUB chapters: {str(e)}\n{traceback.format_exc()}"
             log_error(error_msg)
             return False
+
+    @staticmethod
+    def _append_child(parent, tag: str, attrib: dict):
+        """Append an element to ``parent``, indented like its existing children."""
+        from lxml import etree
+
+        child = etree.SubElement(parent, tag, attrib)
+        previous = child.getprevious()
+        if previous is not None:
+            child.tail = previous.tail
+            before = previous.getprevious()
+            previous.tail = before.tail if before is not None else parent.text
+        return child
+
+    @staticmethod
+    def append_epub_chapters(epub_path: str, chapters: list[tuple[int, Optional[str], str]]) -> bool:
+        """Add (number, title, content) chapters to the end of an existing EPUB.
+
+        Each chapter becomes a new member, and content.opf, nav.xhtml and
+        toc.ncx get an entry for it; every other member is copied across
+        still compressed. Returns False, leaving the book untouched, if its
+        layout doesn't allow a clean append (e.g. the chapter file exists).
+        """
+        return EpubService.patch_epub_chapters(epub_path, appended=chapters)
+
+    @staticmethod
+    def patch_epub_chapters(epub_path: str, replaced: Optional[list[tuple[int, Optional[str], str]]] = None,
+                            appended: Optional[list[tuple[int, Optional[str], str]]] = None) -> bool:
+        """Rewrite and/or append (number, title, content) chapters in one pass over the EPUB.
+
+        Replaced chapters must already exist as chapter_<number>.xhtml and keep
+        their title, so the navigation documents stay as they are; appended ones
+        are added as in append_epub_chapters(). Returns False, leaving the book
+        untouched, when that doesn't hold.
+        """
+        replaced, chapters = replaced or [], appended or []
+        try:
+            from lxml import etree
+            from .epub_generator import chapter_document
+            from .zip_stream import patch_zip
+
+            OPF_NS = 'http://www.idpf.org/2007/opf'
+            XHTML_NS = 'http://www.w3.org/1999/xhtml'
+            NCX_NS = 'http://www.daisy.org/z3986/2005/ncx/'
+
+            with zipfile.ZipFile(epub_path, 'r') as zf:
+                names = zf.namelist()
+                opf_name = next((n for n in names if n.lower().endswith(('content.opf', 'package.opf'))), None)
+                if opf_name is None:
+                    raise ValueError("no package document")
+                base = opf_name.rpartition('/')[0]
+                base = f'{base}/' if base else ''
+                nav_name = next((n for n in names if n == f'{base}nav.xhtml'), None)
+                ncx_name = next((n for n in names if n == f'{base}toc.ncx'), None)
+                opf = etree.fromstring(zf.read(opf_name)).getroottree()
+                nav = etree.fromstring(zf.read(nav_name)).getroottree() if nav_name else None
+                ncx = etree.fromstring(zf.read(ncx_name)).getroottree() if ncx_name else None
+
+            manifest = opf.find(f'{{{OPF_NS}}}manifest')
+            spine = opf.find(f'{{{OPF_NS}}}spine')
+            if manifest is None or spine is None:
+                raise ValueError("package document has no manifest or spine")
+            for modified in opf.iterfind(f'.//{{{OPF_NS}}}meta[@property="dcterms:modified"]'):
+                modified.text = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+            used_ids = {item.get('id') for item in manifest}
+            used_hrefs = {item.get('href') for item in manifest}
+
+            toc_list = None
+            if nav is not None:
+                toc_list = next(iter(nav.xpath(
+                    '//x:nav[@epub:type="toc"]/x:ol',
+                    namespaces={'x': XHTML_NS, 'epub': 'http://www.idpf.org/2007/ops'},
+                )), None)
+                if toc_list is None:
+                    raise ValueError("nav.xhtml has no table of contents")
+            nav_map = ncx.find(f'{{{NCX_NS}}}navMap') if ncx is not None else None
+            play_orders = [int(p.get('playOrder')) for p in nav_map.iter(f'{{{NCX_NS}}}navPoint')
+                           if p.get('playOrder', '').isdigit()] if nav_map is not None else []
+
+            additions = {}
+            next_id = len(spine) - 1
+            for number, title, content in chapters:
+                href = f'chapter_{number}.xhtml'
+                if href in used_hrefs or f'{base}{href}' in names:
+                    raise ValueError(f"{href} already exists")
+                while f'chapter_{next_id}' in used_ids:
+                    next_id += 1
+                item_id = f'chapter_{next_id}'
+                used_ids.add(item_id)
+
+                chapter_title, additions[f'{base}{href}'] = chapter_document(number, title, content)
+                EpubService._append_child(manifest, f'{{{OPF_NS}}}item',
+                                          {'href': href, 'id': item_id, 'media-type': 'application/xhtml+xml'})
+                EpubService._append_child(spine, f'{{{OPF_NS}}}itemref', {'idref': item_id})
+                if toc_list is not None:
+                    li = EpubService._append_child(toc_list, f'{{{XHTML_NS}}}li', {})
+                    etree.SubElement(li, f'{{{XHTML_NS}}}a', href=href).text = chapter_title
+                if nav_map is not None:
+                    attrib = {'id': item_id}
+                    if play_orders:
+                        play_orders.append(max(play_orders) + 1)
+                        attrib['playOrder'] = str(play_orders[-1])
+                    point = EpubService._append_child(nav_map, f'{{{NCX_NS}}}navPoint', attrib)
+                    label = etree.SubElement(point, f'{{{NCX_NS}}}navLabel')
+                    etree.SubElement(label, f'{{{NCX_NS}}}text').text = chapter_title
+                    etree.SubElement(point, f'{{{NCX_NS}}}content', src=href)
+
+            def serialized(tree) -> bytes:
+                return etree.tostring(tree, xml_declaration=True, encoding='utf-8')
+
+            patches = {}
+            for number, title, content in replaced:
+                name = f'{base}chapter_{number}.xhtml'
+                if name not in names:
+                    raise ValueError(f"{name} not found")
+                document = chapter_document(number, title, content)[1]
+                patches[name] = lambda data, document=document: document
+            # Always rewritten, for its dcterms:modified.
+            patches[opf_name] = lambda data: serialized(opf)
+            if chapters:
+                if nav is not None:
+                    patches[nav_name] = lambda data: serialized(nav)
+                if ncx is not None:
+                    patches[ncx_name] = lambda data: serialized(ncx)
+            patch_zip(epub_path, patches, additions=additions)
+            return True
+
+        except Exception as e:
+            log_error(f"Error patching chapters in EPUB {epub_path}: {str(e)}\n{traceback.format_exc()}")
+            return False
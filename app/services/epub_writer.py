@@ -0,0 +1,212 @@
+from __future__ import annotations
+import os
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from html import escape
+from typing import List, Optional, Tuple
+
+# Same package layout ebooklib writes, so EpubService's zip edits and
+# extract_cover_from_epub() keep working on books from either writer.
+CONTENT_DIR = 'EPUB'
+
+# mkstemp creates its file 0600; finished books get the mode a plain open()
+# would have given them, so other readers of the epub directory keep access.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+_CONTAINER_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">\n'
+    '  <rootfiles>\n'
+    f'    <rootfile media-type="application/oebps-package+xml" full-path="{CONTENT_DIR}/content.opf"/>\n'
+    '  </rootfiles>\n'
+    '</container>\n'
+)
+
+_COVER_XHTML = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    '<!DOCTYPE html>\n'
+    '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="en" xml:lang="en">\n'
+    '<head><title>Cover</title></head>\n'
+    '<body><img src="cover.jpg" alt="Cover"/></body>\n'
+    '</html>\n'
+)
+
+
+class EpubWriter:
+    """
+    Write an EPUB 3 package straight to a zip file.
+
+    For XHTML we generate ourselves: documents are passed in as finished
+    bytes and written to the archive as they arrive, so only the current
+    chapter is held in memory. ebooklib, by contrast, keeps every chapter
+    until write_epub() and then re-parses each one through lxml.html.
+
+    The book is written to a temporary file beside ``path`` and moved into
+    place by close(); if the ``with`` block raises, nothing is left behind.
+    """
+
+    def __init__(self, path: str, identifier: str, title: str, author: str, language: str = 'en',
+                 contributors: Optional[List[str]] = None, description: Optional[str] = None,
+                 subjects: Optional[List[str]] = None):
+        self.path = path
+        self.identifier = identifier
+        self.title = title
+        self.author = author
+        self.language = language
+        self.contributors = contributors or []
+        self.description = description
+        self.subjects = subjects or []
+
+        # (id, href, media_type, properties) in manifest order
+        self._manifest: List[Tuple[str, str, str, Optional[str]]] = []
+        self._spine: List[str] = []
+        self._toc: List[Tuple[str, str, str]] = []
+        self._has_cover = False
+
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.epub.tmp')
+        os.close(fd)
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED)
+        # The mimetype entry must come first and be stored uncompressed.
+        self._zip.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        self._zip.writestr('META-INF/container.xml', _CONTAINER_XML)
+
+    def __enter__(self) -> EpubWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def _write(self, href: str, data, compress_type: int = zipfile.ZIP_DEFLATED) -> None:
+        self._zip.writestr(f'{CONTENT_DIR}/{href}', data, compress_type=compress_type)
+
+    def set_cover(self, cover_image_path: str) -> None:
+        """Add a JPEG cover image and its cover page."""
+        # JPEG doesn't deflate; store it rather than spend time trying.
+        self._zip.write(cover_image_path, f'{CONTENT_DIR}/cover.jpg', compress_type=zipfile.ZIP_STORED)
+        self._write('cover.xhtml', _COVER_XHTML)
+        self._manifest.append(('cover-img', 'cover.jpg', 'image/jpeg', 'cover-image'))
+        self._manifest.append(('cover', 'cover.xhtml', 'application/xhtml+xml', None))
+        self._has_cover = True
+
+    def add_item(self, item_id: str, href: str, media_type: str, content) -> None:
+        """Add a non-document resource such as a stylesheet."""
+        self._write(href, content)
+        self._manifest.append((item_id, href, media_type, None))
+
+    def add_document(self, href: str, title: str, content: bytes) -> None:
+        """Write a complete XHTML document and append it to the spine and table of contents."""
+        item_id = f'chapter_{len(self._spine)}'
+        self._write(href, content)
+        self._manifest.append((item_id, href, 'application/xhtml+xml', None))
+        self._spine.append(item_id)
+        self._toc.append((item_id, href, title))
+
+    @property
+    def document_count(self) -> int:
+        return len(self._spine)
+
+    def _nav_xhtml(self) -> str:
+        entries = ''.join(
+            f'        <li><a href="{escape(href)}">{escape(title)}</a></li>\n'
+            for _, href, title in self._toc
+        )
+        return (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<!DOCTYPE html>\n'
+            f'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+            f'lang="{self.language}" xml:lang="{self.language}">\n'
+            f'  <head><title>{escape(self.title)}</title></head>\n'
+            '  <body>\n'
+            '    <nav epub:type="toc" id="id" role="doc-toc">\n'
+            f'      <h2>{escape(self.title)}</h2>\n'
+            '      <ol>\n'
+            + entries +
+            '      </ol>\n'
+            '    </nav>\n'
+            '  </body>\n'
+            '</html>\n'
+        )
+
+    def _toc_ncx(self) -> str:
+        # Kept for EPUB 2 readers; EPUB 3 readers use nav.xhtml.
+        points = ''.join(
+            f'    <navPoint id="{item_id}"><navLabel><text>{escape(title)}</text></navLabel>'
+            f'<content src="{escape(href)}"/></navPoint>\n'
+            for item_id, href, title in self._toc
+        )
+        return (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">\n'
+            '  <head>\n'
+            f'    <meta content="{escape(self.identifier)}" name="dtb:uid"/>\n'
+            '    <meta content="0" name="dtb:depth"/>\n'
+            '    <meta content="0" name="dtb:totalPageCount"/>\n'
+            '    <meta content="0" name="dtb:maxPageNumber"/>\n'
+            '  </head>\n'
+            f'  <docTitle><text>{escape(self.title)}</text></docTitle>\n'
+            '  <navMap>\n'
+            + points +
+            '  </navMap>\n'
+            '</ncx>\n'
+        )
+
+    def _content_opf(self) -> str:
+        modified = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        metadata = [
+            f'    <meta property="dcterms:modified">{modified}</meta>',
+            f'    <dc:identifier id="id">{escape(self.identifier)}</dc:identifier>',
+            f'    <dc:title>{escape(self.title)}</dc:title>',
+            f'    <dc:language>{self.language}</dc:language>',
+            f'    <dc:creator id="creator">{escape(self.author)}</dc:creator>',
+        ]
+        metadata += [f'    <dc:contributor>{escape(name)}</dc:contributor>' for name in self.contributors]
+        if self.description:
+            metadata.append(f'    <dc:description>{escape(self.description)}</dc:description>')
+        metadata += [f'    <dc:subject>{escape(subject)}</dc:subject>' for subject in self.subjects]
+        if self._has_cover:
+            metadata.append('    <meta name="cover" content="cover-img"/>')
+
+        manifest = [
+            f'    <item href="{escape(href)}" id="{item_id}" media-type="{media_type}"'
+            + (f' properties="{properties}"' if properties else '') + '/>'
+            for item_id, href, media_type, properties in self._manifest
+        ]
+        spine = [f'    <itemref idref="{item_id}"/>' for item_id in ['nav'] + self._spine]
+
+        return (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<package xmlns="http://www.idpf.org/2007/opf" unique-identifier="id" version="3.0">\n'
+            '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:opf="http://www.idpf.org/2007/opf">\n'
+            + '\n'.join(metadata) + '\n'
+            '  </metadata>\n'
+            '  <manifest>\n'
+            + '\n'.join(manifest) + '\n'
+            '  </manifest>\n'
+            '  <spine toc="ncx">\n'
+            + '\n'.join(spine) + '\n'
+            '  </spine>\n'
+            '</package>\n'
+        )
+
+    def close(self) -> None:
+        """Write the navigation and package documents and move the book into place."""
+        self._write('toc.ncx', self._toc_ncx())
+        self._write('nav.xhtml', self._nav_xhtml())
+        self._manifest.append(('ncx', 'toc.ncx', 'application/x-dtbncx+xml', None))
+        self._manifest.append(('nav', 'nav.xhtml', 'application/xhtml+xml', 'nav'))
+        self._write('content.opf', self._content_opf())
+        self._zip.close()
+        os.chmod(self._tmp_path, _FILE_MODE)
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        """Abandon the book, removing the partial file."""
+        self._zip.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
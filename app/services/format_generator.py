@@ -134,21 +134,17 @@ class FormatGeneratorService:
                 story_description=story_description
             )
 
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-
             existing_json = StoryFormat.query.filter_by(story_id=story.id, format_type='json').first()
             if existing_json:
                 existing_json.file_path = json_path
                 existing_json.file_size = os.path.getsize(json_path)
-                existing_json.json_data = json.dumps(json_data)
+                existing_json.json_data = None
             else:
                 db.session.add(StoryFormat(
                     story_id=story.id,
                     format_type='json',
                     file_path=json_path,
                     file_size=os.path.getsize(json_path),
-                    json_data=json.dumps(json_data)
                 ))
             db.session.commit()
 
@@ -171,7 +167,7 @@ class FormatGeneratorService:
 
     def generate_epub_from_json(self, story_id: int) -> dict:
         """
-        Generate EPUB format from existing JSON data stored in the database.
+        Generate EPUB format from the story's existing JSON file.
         """
         try:
             story = Story.query.get(story_id)
@@ -203,7 +199,8 @@ class FormatGeneratorService:
                     "message": "EPUB format already exists for this story"
                 }
 
-            if not json_format.json_data:
+            story_data = json_format.load_json_data()
+            if not story_data:
                 return {
                     "success": False,
                     "message": "JSON data is empty, cannot generate EPUB"
@@ -211,8 +208,6 @@ class FormatGeneratorService:
 
             log_action(f"Generating EPUB from JSON for story: {story.title}")
 
-            story_data = json.loads(json_format.json_data)
-
             chapters = story_data.get('chapters', [])
             story_content_parts = []
 
@@ -340,21 +335,17 @@ class FormatGeneratorService:
                 story_description=story_description
             )
 
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-
             existing_json = StoryFormat.query.filter_by(story_id=story.id, format_type='json').first()
             if existing_json:
                 existing_json.file_path = json_path
                 existing_json.file_size = os.path.getsize(json_path)
-                existing_json.json_data = json.dumps(json_data)
+                existing_json.json_data = None
             else:
                 db.session.add(StoryFormat(
                     story_id=story.id,
                     format_type='json',
                     file_path=json_path,
                     file_size=os.path.getsize(json_path),
-                    json_data=json.dumps(json_data)
                 ))
             db.session.commit()
 
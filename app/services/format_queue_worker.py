@@ -2,16 +2,20 @@ from __future__ import annotations
 import threading
 import time
 import traceback
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 from flask import Flask
+from app.services.job_queue import JobQueue
 
 
 class FormatQueueWorker:
     """Background worker that processes FormatQueueItem jobs one at a time."""
 
     def __init__(self, app: Flask, poll_interval: int = 60):
+        from app.models.format_queue import FormatQueueItem
+
         self.app = app
+        self.queue = JobQueue(FormatQueueItem)
         self.poll_interval = poll_interval
         self.thread: Optional[threading.Thread] = None
         self.running = False
@@ -21,30 +25,11 @@ class FormatQueueWorker:
     def start(self):
         if self.thread and self.thread.is_alive():
             return
-        self._recover_stale_jobs()
         self.running = True
         self._stop_event.clear()
         self.thread = threading.Thread(target=self._worker_loop, daemon=True, name="FormatQueueWorker")
         self.thread.start()
 
-    def _recover_stale_jobs(self):
-        from app.models import db
-        from app.models.format_queue import FormatQueueItem
-        with self.app.app_context():
-            from .logger import log_action
-            stale_cutoff = datetime.utcnow() - timedelta(minutes=15)
-            stale = FormatQueueItem.query.filter(
-                FormatQueueItem.status == 'processing',
-                FormatQueueItem.started_at < stale_cutoff
-            ).all()
-            if stale:
-                log_action(f"[FORMAT WORKER] Recovering {len(stale)} stale format jobs")
-                for item in stale:
-                    item.status = 'pending'
-                    item.started_at = None
-                    item.progress_message = 'Reset from stale processing state'
-                db.session.commit()
-
     def stop(self):
         self.running = False
         self._stop_event.set()
@@ -72,29 +57,18 @@ class FormatQueueWorker:
     def _process_next_item(self):
         from app.models import db
         from app.models.format_queue import FormatQueueItem
-        from sqlalchemy import select
         from .logger import log_action, log_error
 
-        item = db.session.execute(
-            select(FormatQueueItem)
-            .filter_by(status='pending')
-            .order_by(FormatQueueItem.created_at.asc())
-            .limit(1)
-        ).scalar_one_or_none()
-
+        item = self.queue.claim_next(progress_message='Starting...')
         if not item:
             return
 
         item_id = item.id
         log_action(f"Processing format queue item {item_id}: {item.job_type} for story {item.story_id}")
 
-        item.status = 'processing'
-        item.started_at = datetime.utcnow()
-        item.progress_message = 'Starting...'
-        db.session.commit()
-
         try:
-            self._run_job(item)
+            with self.queue.keep_alive(item_id):
+                self._run_job(item)
             item.status = 'completed'
             item.completed_at = datetime.utcnow()
             item.progress_message = 'Done'
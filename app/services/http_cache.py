@@ -0,0 +1,262 @@
+from __future__ import annotations
+import email.utils
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from curl_cffi.requests import Response
+from curl_cffi.requests.headers import Headers
+
+# Lifetime for responses that carry no Cache-Control max-age or Expires, and
+# the upper bound for those that do. Pages are re-fetched within minutes of
+# each other (series page, first chapter, works API), rarely hours apart.
+DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_MAX_ENTRIES = 256
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Bodies larger than this share of the budget aren't cached at all.
+MAX_ENTRY_SHARE = 0.25
+
+# A request carrying any of these wants the server's answer, not ours.
+_BYPASS_HEADERS = ('if-none-match', 'if-modified-since', 'cache-control', 'range', 'authorization')
+# Request headers that change the response body, so they are part of the key.
+_KEY_HEADERS = ('accept',)
+
+_MAX_AGE = re.compile(r'(?:^|,)\s*max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+_NO_STORE = re.compile(r'(?:^|,)\s*(?:no-store|no-cache)\b', re.IGNORECASE)
+
+
+class CachedEntry(NamedTuple):
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    expires_at: float
+
+
+def response_ttl(headers, default_ttl: float) -> Optional[float]:
+    """
+    Seconds a response may be reused, from its Cache-Control and Expires
+    headers, capped at ``default_ttl``; None when it must not be stored.
+    """
+    cache_control = headers.get('cache-control') or ''
+    if _NO_STORE.search(cache_control) or (headers.get('vary') or '').strip() == '*':
+        return None
+    max_age = _MAX_AGE.search(cache_control)
+    if max_age:
+        ttl = float(max_age.group(1))
+    elif headers.get('expires'):
+        try:
+            expires = email.utils.parsedate_to_datetime(headers['expires']).timestamp()
+            date = headers.get('date')
+            now = email.utils.parsedate_to_datetime(date).timestamp() if date else time.time()
+            ttl = expires - now
+        except (TypeError, ValueError):
+            ttl = 0.0  # An unparseable Expires means already expired.
+    else:
+        ttl = default_ttl
+    ttl = min(ttl, default_ttl)
+    return ttl if ttl > 0 else None
+
+
+class ResponseCache:
+    """
+    TTL-bounded, size-capped store of successful GET responses.
+
+    An LRU in memory bounded by entry count and total body bytes, optionally
+    backed by a SQLite file so entries survive a restart and can be shared
+    with other processes. Thread-safe; hit and miss counters are kept for
+    stats().
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 default_ttl: float = DEFAULT_CACHE_TTL, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, CachedEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'bypassed': 0, 'evictions': 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS http_cache ('
+                ' key TEXT PRIMARY KEY, url TEXT NOT NULL, status_code INTEGER NOT NULL,'
+                ' headers TEXT NOT NULL, content BLOB NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.execute('DELETE FROM http_cache WHERE expires_at <= ?', (time.time(),))
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key: str) -> Optional[CachedEntry]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT url, status_code, headers, content, expires_at FROM http_cache'
+                    ' WHERE key = ? AND expires_at > ?', (key, now)
+                ).fetchone()
+                if row:
+                    entry = CachedEntry(row[0], row[1], json.loads(row[2]), row[3], row[4])
+                    self._remember(key, entry)
+                    self._counters['disk_hits'] += 1
+                    return entry
+
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, key: str, entry: CachedEntry) -> bool:
+        """Store ``entry`` unless it is too large for the budget. Returns whether it was stored."""
+        if len(entry.content) > self.max_bytes * MAX_ENTRY_SHARE:
+            return False
+        with self._lock:
+            self._remember(key, entry)
+            self._counters['stores'] += 1
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO http_cache (key, url, status_code, headers, content, expires_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, entry.url, entry.status_code, json.dumps(entry.headers), entry.content, entry.expires_at),
+                )
+                self._trim_db()
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute('DELETE FROM http_cache')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['disk_hits'] + self._counters['misses']
+            hits = self._counters['hits'] + self._counters['disk_hits']
+            return {
+                **self._counters,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hit_ratio': round(hits / lookups, 3) if lookups else None,
+                'disk': self._db is not None,
+            }
+
+    def _remember(self, key: str, entry: CachedEntry) -> None:
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        self._bytes += len(entry.content)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self._counters['evictions'] += 1
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= len(self._entries.pop(key).content)
+
+    def _trim_db(self) -> None:
+        """Drop expired rows, then the soonest-expiring ones until the file's bodies fit the byte budget."""
+        self._db.execute('DELETE FROM http_cache WHERE expires_at <= ?', (time.time(),))
+        total = self._db.execute('SELECT COALESCE(SUM(LENGTH(content)), 0) FROM http_cache').fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            for key, size in self._db.execute(
+                'SELECT key, LENGTH(content) FROM http_cache ORDER BY expires_at'
+            ).fetchall():
+                self._db.execute('DELETE FROM http_cache WHERE key = ?', (key,))
+                excess -= size
+                if excess <= 0:
+                    break
+
+
+class CachingSession:
+    """
+    The shared session with a ResponseCache in front of GET.
+
+    A plain ``get(url)`` (optionally with params or an Accept header) is
+    answered from the cache while the stored response is fresh; a miss goes
+    to the wrapped session and a 200 response is stored for as long as its
+    cache headers allow. Conditional and other header-bearing requests
+    bypass the cache, as does every other method and attribute, which are
+    passed straight through to the wrapped session.
+    """
+
+    def __init__(self, session, cache: ResponseCache):
+        self._session = session
+        self.cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
+
+    @staticmethod
+    def _key(url: str, params, headers) -> Optional[str]:
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if any(name in headers for name in _BYPASS_HEADERS):
+            return None
+        parts = [url]
+        if params:
+            parts.append(json.dumps(sorted(dict(params).items()), default=str))
+        parts += [f'{name}:{headers[name]}' for name in _KEY_HEADERS if name in headers]
+        return '\n'.join(parts)
+
+    def get(self, url: str, params=None, headers=None, **kwargs):
+        key = self._key(url, params, headers)
+        if key is None:
+            self.cache.count('bypassed')
+            return self._session.get(url, params=params, headers=headers, **kwargs)
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            return _to_response(entry)
+
+        response = self._session.get(url, params=params, headers=headers, **kwargs)
+        if response.status_code == 200:
+            ttl = response_ttl(response.headers, self.cache.default_ttl)
+            if ttl is not None:
+                self.cache.put(key, CachedEntry(
+                    response.url, response.status_code, dict(response.headers.items()), response.content,
+                    time.time() + ttl,
+                ))
+        return response
+
+
+def _to_response(entry: CachedEntry) -> Response:
+    """A fresh Response per hit, so callers setting .encoding don't affect each other."""
+    response = Response()
+    response.url = entry.url
+    response.status_code = entry.status_code
+    response.headers = Headers(entry.headers)
+    response.content = entry.content
+    return response
+
+
+def cache_from_env() -> ResponseCache:
+    """Build the shared cache from HTTP_CACHE_TTL, HTTP_CACHE_MAX_ENTRIES, HTTP_CACHE_MAX_BYTES and HTTP_CACHE_PATH."""
+    def env_number(name: str, default):
+        try:
+            return max(0, type(default)(os.environ[name]))
+        except (KeyError, ValueError):
+            return default
+
+    return ResponseCache(
+        max_entries=env_number('HTTP_CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES),
+        max_bytes=env_number('HTTP_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES),
+        default_ttl=env_number('HTTP_CACHE_TTL', DEFAULT_CACHE_TTL),
+        db_path=os.getenv('HTTP_CACHE_PATH') or None,
+    )
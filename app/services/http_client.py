@@ -2,6 +2,7 @@ from __future__ import annotations
 import time
 import threading
 from curl_cffi import requests
+from .http_cache import CachingSession, cache_from_env
 
 
 class RateLimiter:
@@ -52,9 +53,15 @@ _BROWSER_HEADERS = {
 _session = requests.Session(impersonate="chrome120")
 _session.headers.update(_BROWSER_HEADERS)
 
+# Pages such as a story's first chapter, the series page and the series works
+# API are fetched several times within minutes of each other; GETs through
+# get_session() are answered from this cache while the response is fresh.
+response_cache = cache_from_env()
+_cached_session = CachingSession(_session, response_cache)
+
 # Coordinates request rate across DownloadQueueWorker and MetadataRefreshWorker
 global_rate_limiter = RateLimiter(max_requests=8, time_window=60)
 
 
-def get_session() -> requests.Session:
-    return _session
+def get_session() -> CachingSession:
+    return _cached_session
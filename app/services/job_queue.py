@@ -0,0 +1,169 @@
+from __future__ import annotations
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional
+from flask import current_app
+from sqlalchemy import case, func, select, update
+
+# UPDATE ... RETURNING needs SQLite 3.35+; older builds fall back to select + conditional update.
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+DEFAULT_LEASE = timedelta(minutes=5)
+
+# Used when a row's max_retries is NULL (rows created before the column existed).
+DEFAULT_MAX_RETRIES = 3
+
+
+class JobQueue:
+    """Claim and lease rows of one of the SQLite-backed job tables.
+
+    Used for download_queue, format_queue and metadata_refresh_queue. A claimed
+    row is 'processing' with lease_expires_at in the future. If the worker dies
+    or the process restarts mid-job the lease lapses and the row becomes
+    claimable again, so no startup sweep for stuck jobs is needed. Jobs that can
+    outlast a lease hold it with keep_alive().
+
+    Each reclaim of a lapsed lease counts as a retry. Once retry_count reaches
+    max_retries the row is marked failed instead, so a job that keeps killing
+    the process is not picked up forever.
+    """
+
+    def __init__(self, model, lease: timedelta = DEFAULT_LEASE):
+        self.model = model
+        self.lease = lease
+
+    @property
+    def _retries(self):
+        return func.coalesce(self.model.retry_count, 0)
+
+    @property
+    def _retry_limit(self):
+        return func.coalesce(self.model.max_retries, DEFAULT_MAX_RETRIES)
+
+    def _lapsed(self, now: datetime):
+        model = self.model
+        return (model.status == 'processing') & (model.lease_expires_at < now)
+
+    def _claimable(self, now: datetime):
+        model = self.model
+        runnable = model.status == 'pending'
+        if hasattr(model, 'scheduled_after'):
+            runnable = runnable & ((model.scheduled_after == None) | (model.scheduled_after <= now))
+        return runnable | (self._lapsed(now) & (self._retries < self._retry_limit))
+
+    def _fail_abandoned(self, now: datetime) -> None:
+        """Give up on lapsed rows that have used up their retries."""
+        from app.models import db
+
+        model = self.model
+        db.session.execute(
+            update(model)
+            .where(self._lapsed(now), self._retries >= self._retry_limit)
+            .values(
+                status='failed',
+                lease_expires_at=None,
+                error_message='Abandoned: the worker stopped responding on every attempt',
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def claim_next(self, **values):
+        """
+        Claim the oldest runnable row and return it, or None if there is none.
+
+        On SQLite 3.35+ this is one UPDATE ... RETURNING statement, which takes the
+        write lock before reading, so concurrent workers can never claim the same
+        row. Extra column values (e.g. progress_message) are set in the same
+        statement. Lapsed rows out of retries are failed first. Commits the session.
+        """
+        from app.models import db
+
+        model = self.model
+        now = datetime.utcnow()
+        claimable = self._claimable(now)
+        next_id = (
+            select(model.id)
+            .where(claimable)
+            .order_by(model.created_at.asc(), model.id.asc())
+            .limit(1)
+        )
+        assignments = dict(
+            status='processing',
+            started_at=now,
+            lease_expires_at=now + self.lease,
+            # Reclaiming a lapsed lease uses up one retry.
+            retry_count=case((model.status == 'processing', self._retries + 1), else_=self._retries),
+            **values,
+        )
+        self._fail_abandoned(now)
+
+        if SUPPORTS_RETURNING:
+            item_id = db.session.execute(
+                update(model)
+                .where(model.id == next_id.scalar_subquery(), claimable)
+                .values(**assignments)
+                .returning(model.id)
+                .execution_options(synchronize_session=False)
+            ).scalar_one_or_none()
+        else:
+            item_id = db.session.execute(next_id).scalar_one_or_none()
+            if item_id is not None:
+                claimed = db.session.execute(
+                    update(model)
+                    .where(model.id == item_id, claimable)
+                    .values(**assignments)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if claimed != 1:
+                    item_id = None
+        db.session.commit()
+
+        if item_id is None:
+            return None
+        return db.session.get(model, item_id, populate_existing=True)
+
+    def renew(self, item_id: int) -> None:
+        """Push a held row's lease out by another lease period."""
+        from app.models import db
+
+        model = self.model
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(model)
+                .where(model.id == item_id, model.status == 'processing')
+                .values(lease_expires_at=datetime.utcnow() + self.lease)
+            )
+
+    def hold(self, item_id: int) -> Callable[[], None]:
+        """
+        Renew the row's lease in the background until the returned function is
+        called. For leases that must outlive a single block, e.g. while a job
+        waits in an in-memory hand-off queue.
+        """
+        from .logger import log_error
+
+        app = current_app._get_current_object()
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(self.lease.total_seconds() / 3):
+                try:
+                    with app.app_context():
+                        self.renew(item_id)
+                except Exception as e:
+                    log_error(f"[JOB QUEUE] Could not renew lease on {self.model.__tablename__} item {item_id}: {e}")
+
+        thread = threading.Thread(target=heartbeat, daemon=True, name=f"lease-{self.model.__tablename__}-{item_id}")
+        thread.start()
+        return done.set
+
+    @contextmanager
+    def keep_alive(self, item_id: int) -> Iterator[None]:
+        """Renew the row's lease in the background until the block exits."""
+        release = self.hold(item_id)
+        try:
+            yield
+        finally:
+            release()
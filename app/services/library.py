@@ -1,12 +1,200 @@
 from __future__ import annotations
-from typing import List, Dict, Tuple
+import base64
+import binascii
+import json
+import os
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+LIBRARY_CURSOR_VERSION = 'v2'
+
+
+# Joins tag names and format types inside group_concat(); neither can contain it.
+_LIST_SEP = '\x1f'
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def project_library_dicts(where=None, order_by=()) -> List[Dict]:
+    """
+    Build Story.to_library_dict()-shaped dicts straight from a column query.
+
+    One statement selects the story columns, author, category, the epub row
+    and group_concat()ed tag names and format types; combined stories get a
+    second query for their source URLs. Nothing goes through the ORM identity
+    map, and formats.json_data is never read. ``where`` and ``order_by`` are
+    applied as-is to that statement.
+    """
+    from app.models import Author, Category, Story, StoryFormat, StorySource, Tag, db, story_tags
+    from sqlalchemy import and_, func, select
+
+    epub = StoryFormat.__table__.alias('epub_format')
+    tag_names = (
+        select(func.group_concat(Tag.name, _LIST_SEP))
+        .join(story_tags, story_tags.c.tag_id == Tag.id)
+        .where(story_tags.c.story_id == Story.id)
+        .scalar_subquery()
+    )
+    format_types = (
+        select(func.group_concat(StoryFormat.format_type, _LIST_SEP))
+        .where(StoryFormat.story_id == Story.id)
+        .scalar_subquery()
+    )
+    has_html = (
+        select(StoryFormat.id)
+        .where(StoryFormat.story_id == Story.id, StoryFormat.format_type.in_(('html', 'json')))
+        .exists()
+    )
+
+    stmt = (
+        select(
+            Story.id, Story.title, Story.filename_base, Story.literotica_url, Story.literotica_page_count,
+            Story.word_count, Story.created_at, Story.updated_at, Story.auto_update_enabled,
+            Story.literotica_series_url, Story.chapter_count, Story.rating, Story.literotica_score,
+            Story.literotica_views, Story.literotica_favorites, Story.literotica_comments,
+            Story.in_queue, Story.queued_at, Story.last_opened_at, Story.description,
+            Story.auto_refresh_excluded, Story.auto_refresh_exclusion_reason,
+            Story.auto_refresh_exclusion_type, Story.is_combined,
+            Author.name.label('author_name'), Author.literotica_url.label('author_url'),
+            Category.name.label('category_name'),
+            epub.c.file_path.label('epub_path'), epub.c.file_size.label('epub_size'),
+            tag_names.label('tag_names'), format_types.label('format_types'), has_html.label('has_html'),
+        )
+        .select_from(Story)
+        .outerjoin(Author, Author.id == Story.author_id)
+        .outerjoin(Category, Category.id == Story.category_id)
+        .outerjoin(epub, and_(epub.c.story_id == Story.id, epub.c.format_type == 'epub'))
+    )
+    if where is not None:
+        stmt = stmt.where(where)
+    rows = db.session.execute(stmt.order_by(*order_by)).all()
+
+    sources: Dict[int, List[str]] = {}
+    combined_ids = [row.id for row in rows if row.is_combined]
+    for start in range(0, len(combined_ids), 500):
+        for story_id, url in db.session.execute(
+            select(StorySource.story_id, StorySource.url)
+            .where(StorySource.story_id.in_(combined_ids[start:start + 500]))
+            .order_by(StorySource.story_id, StorySource.position)
+        ):
+            sources.setdefault(story_id, []).append(url)
+
+    return [
+        {
+            'id': row.id,
+            'title': row.title,
+            'author': row.author_name if row.author_name is not None else 'Unknown',
+            'author_url': row.author_url or None,
+            'category': row.category_name,
+            'tags': row.tag_names.split(_LIST_SEP) if row.tag_names else [],
+            'cover': f"{row.id}_{row.filename_base}.jpg",
+            'filename_base': row.filename_base,
+            'formats': row.format_types.split(_LIST_SEP) if row.format_types else [],
+            'epub_file': os.path.basename(row.epub_path) if row.epub_path else None,
+            'html_file': f"{row.id}_{row.filename_base}.html" if row.has_html else None,
+            'source_url': row.literotica_url,
+            'page_count': row.literotica_page_count,
+            'word_count': row.word_count,
+            'size': row.epub_size if row.epub_path else None,
+            'date_added': _iso(row.created_at),
+            'created_at': _iso(row.created_at),
+            'updated_at': _iso(row.updated_at),
+            'auto_update_enabled': row.auto_update_enabled,
+            'series_url': row.literotica_series_url,
+            'is_series': bool(row.literotica_series_url and row.chapter_count > 1),
+            'rating': row.rating,
+            'community_score': row.literotica_score,
+            'views': row.literotica_views,
+            'favorites': row.literotica_favorites,
+            'comments': row.literotica_comments,
+            'in_queue': bool(row.in_queue),
+            'queued_at': _iso(row.queued_at),
+            'last_opened_at': _iso(row.last_opened_at),
+            'description': row.description,
+            'auto_refresh_excluded': bool(row.auto_refresh_excluded),
+            'auto_refresh_exclusion_reason': row.auto_refresh_exclusion_reason,
+            'auto_refresh_exclusion_type': row.auto_refresh_exclusion_type,
+            'source_urls': sources.get(row.id, []) if row.is_combined else None,
+        }
+        for row in rows
+    ]
+
+
+def _library_dicts_for_ids(story_ids: List[int]) -> List[Dict]:
+    """project_library_dicts() for a page of ids, returned in the order given."""
+    from app.models import Story
+
+    if not story_ids:
+        return []
+    by_id = {d['id']: d for d in project_library_dicts(Story.id.in_(story_ids))}
+    return [by_id[story_id] for story_id in story_ids if story_id in by_id]
 
 
 def get_library_data() -> List[Dict]:
-    from app.models import Story, db
-    db.session.expire_all()
-    stories = Story.query.order_by(Story.created_at.desc()).all()
-    return [story.to_library_dict() for story in stories]
+    from app.models import Story
+    return project_library_dicts(order_by=(Story.created_at.desc(), Story.id.desc()))
+
+
+def encode_library_cursor(high_water: Optional[int]) -> str:
+    """Encode a library change sequence as an opaque, URL-safe sync cursor."""
+    raw = f"{LIBRARY_CURSOR_VERSION}:{high_water or 0}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_library_cursor(cursor: str) -> Optional[int]:
+    """
+    Inverse of encode_library_cursor(). Raises ValueError for anything it did not produce.
+
+    Cursors from before the change sequence existed (v1, a timestamp) decode
+    to None, so those clients get one full listing and a current cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed cursor: {cursor!r}") from e
+    version, _, value = raw.partition(':')
+    if version == 'v1':
+        return None
+    if version != LIBRARY_CURSOR_VERSION:
+        raise ValueError(f"Unsupported cursor: {cursor!r}")
+    return int(value)
+
+
+def get_library_high_water() -> int:
+    """
+    Latest committed library change, as a LibraryChangeCounter value.
+
+    Read this before the stories: anything committed later gets a larger
+    value, so it is picked up by the next delta rather than lost.
+    """
+    from app.models import LibraryChangeCounter, db
+
+    return db.session.query(LibraryChangeCounter.value).filter_by(id=1).scalar() or 0
+
+
+def get_library_changes(
+    since: Optional[int],
+    until: int,
+) -> Tuple[List[Dict], List[int]]:
+    """
+    Return (changed_stories, deleted_story_ids) for change sequences in (since, until].
+
+    Clients should apply deletions before the changed stories: a story id that
+    was deleted and then reused shows up in both lists.
+    """
+    from app.models import Story, StoryTombstone, db
+
+    window = Story.change_seq <= until
+    tombstones = db.session.query(StoryTombstone.story_id).filter(StoryTombstone.change_seq <= until)
+    if since is not None:
+        window = db.and_(window, Story.change_seq > since)
+        tombstones = tombstones.filter(StoryTombstone.change_seq > since)
+
+    changed = project_library_dicts(window, order_by=(Story.change_seq.asc(), Story.id.asc()))
+    deleted = sorted({row.story_id for row in tombstones})
+    return changed, deleted
 
 
 def get_all_category_names() -> List[str]:
@@ -21,74 +209,51 @@ def get_all_category_names() -> List[str]:
     return [r[0] for r in rows]
 
 
-def get_stories_page(
-    page: int = 1,
-    per_page: int = 40,
-    search: str = '',
-    category: str = 'all',
-    sort_by: str = 'date',
-    sort_order: str = 'desc',
-    queue_only: bool = False,
-    min_community_score: float = 0.0,
-    min_pages: int = 0,
-    max_pages: int = 0,
-) -> Tuple[List[Dict], int]:
-    """Return (page_stories, total_count). Uses DB-level ops when search is empty."""
-    from app.models import Story, Category, db
-    from sqlalchemy import asc, desc
+def encode_keyset_cursor(values: List) -> str:
+    """Encode the sort key of the last row on a page as an opaque, URL-safe cursor."""
+    raw = json.dumps([_iso(v) if isinstance(v, datetime) else v for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
 
-    # author/category sort require a join that conflicts with the eager-loaded joins;
-    # fall back to Python sort for those two cases only.
-    PYTHON_SORT_FIELDS = {'author', 'category'}
-    use_python_sort = sort_by in PYTHON_SORT_FIELDS
-
-    if search or use_python_sort:
-        query = Story.query
-        if category and category not in ('all', ''):
-            if category == 'uncategorized':
-                query = query.filter(Story.category_id.is_(None))
-            else:
-                query = query.join(Category, Story.category_id == Category.id).filter(Category.name == category)
-        if queue_only:
-            query = query.filter(Story.in_queue == True)  # noqa: E712
-        if min_community_score > 0:
-            query = query.filter(Story.literotica_score >= min_community_score)
-        if min_pages > 0:
-            query = query.filter(Story.literotica_page_count >= min_pages)
-        if max_pages > 0:
-            query = query.filter(Story.literotica_page_count <= max_pages)
-
-        all_stories = [s.to_library_dict() for s in query.all()]
-
-        if search:
-            search_lower = search.lower()
-            scored = []
-            for story in all_stories:
-                score = 0
-                if search_lower in story.get('title', '').lower():
-                    score += 100
-                if search_lower in story.get('author', '').lower():
-                    score += 50
-                if search_lower in (story.get('category') or '').lower():
-                    score += 25
-                if any(search_lower in t.lower() for t in story.get('tags', [])):
-                    score += 10
-                if score > 0:
-                    scored.append((score, story))
-            scored.sort(key=lambda x: x[0], reverse=True)
-            all_stories = [s for _, s in scored]
-        else:
-            def _sort_key(story: dict) -> tuple:
-                if sort_by == 'author':
-                    return (story.get('author', '').lower(),)
-                return (story.get('category', '').lower(),)
-            all_stories.sort(key=_sort_key, reverse=(sort_order == 'desc'))
 
-        total = len(all_stories)
-        start = (page - 1) * per_page
-        return all_stories[start:start + per_page], total
+def decode_keyset_cursor(cursor: str, length: int) -> List:
+    """
+    Inverse of encode_keyset_cursor(). Raises ValueError unless it holds
+    ``length`` scalar values, the last of which (the row id) is an integer.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {cursor!r}") from e
+    if (not isinstance(values, list) or len(values) != length
+            or any(isinstance(v, (list, dict)) for v in values)
+            or not isinstance(values[-1], int) or isinstance(values[-1], bool)):
+        raise ValueError(f"Malformed cursor: {cursor!r}")
+    return values
+
+
+def keyset_after(order_col, id_col, descending: bool, value, last_id: int):
+    """
+    WHERE clause for the rows after (value, last_id) in ORDER BY order_col, id_col.
+
+    Matches the ordering get_stories_page() uses: descending sorts put NULLs
+    last, ascending sorts put them first, and the id breaks ties in the same
+    direction as the sort.
+    """
+    from sqlalchemy import and_, or_
+
+    if descending:
+        if value is None:
+            return and_(order_col.is_(None), id_col < last_id)
+        return or_(order_col < value, and_(order_col == value, id_col < last_id), order_col.is_(None))
+    if value is None:
+        return or_(and_(order_col.is_(None), id_col > last_id), order_col.isnot(None))
+    return or_(order_col > value, and_(order_col == value, id_col > last_id))
+
+
+def _filtered_stories_query(category: str, queue_only: bool, min_community_score: float,
+                            min_pages: int, max_pages: int):
+    from app.models import Story, Category
 
-    # Full DB-level filtering + sorting + pagination
     query = Story.query
 
     if category and category not in ('all', ''):
@@ -106,22 +271,146 @@ def get_stories_page(
         query = query.filter(Story.literotica_page_count >= min_pages)
     if max_pages > 0:
         query = query.filter(Story.literotica_page_count <= max_pages)
+    return query
 
-    col_map = {
-        'date': Story.created_at,
-        'name': Story.title,
-        'length': Story.word_count,
-        'rating': Story.rating,
-        'last_opened': Story.last_opened_at,
-        'community_score': Story.literotica_score,
-        'pages': Story.literotica_page_count,
-    }
-    order_col = col_map.get(sort_by, Story.created_at)
-    if sort_order == 'desc':
-        query = query.order_by(desc(order_col).nullslast())
+
+def _sorted_stories_query(query, sort_by: str, sort_order: str):
+    """Apply the library sort. Returns (query, sort column, descending)."""
+    from app.models import Story, Author, Category
+    from sqlalchemy import asc, desc
+    from sqlalchemy.orm import aliased
+
+    # Author/category sorts join the related table explicitly so they page in SQL
+    # like the rest. The category alias keeps it apart from the join used by the
+    # category filter.
+    if sort_by == 'author':
+        query = query.join(Story.author)
+        order_col = Author.name.collate('NOCASE')
+    elif sort_by == 'category':
+        sort_category = aliased(Category)
+        query = query.outerjoin(sort_category, Story.category)
+        order_col = sort_category.name.collate('NOCASE')
     else:
-        query = query.order_by(asc(order_col).nullsfirst())
+        col_map = {
+            'date': Story.created_at,
+            'name': Story.title,
+            'length': Story.word_count,
+            'rating': Story.rating,
+            'last_opened': Story.last_opened_at,
+            'community_score': Story.literotica_score,
+            'pages': Story.literotica_page_count,
+        }
+        order_col = col_map.get(sort_by, Story.created_at)
+
+    descending = sort_order == 'desc'
+    if descending:
+        query = query.order_by(desc(order_col).nullslast(), Story.id.desc())
+    else:
+        query = query.order_by(asc(order_col).nullsfirst(), Story.id.asc())
+    return query, order_col, descending
+
+
+def get_stories_page(
+    page: int = 1,
+    per_page: int = 40,
+    search: str = '',
+    category: str = 'all',
+    sort_by: str = 'date',
+    sort_order: str = 'desc',
+    queue_only: bool = False,
+    min_community_score: float = 0.0,
+    min_pages: int = 0,
+    max_pages: int = 0,
+) -> Tuple[List[Dict], int]:
+    """Return (page_stories, total_count). Filtering, search and paging run in the DB.
+
+    Searches go through the FTS5 index (see search_index): bm25-ranked, prefix
+    matched, and each result carries a highlighted 'search_snippet'. Deep
+    scrolling through an unsearched library should use get_stories_after(),
+    which neither offsets nor counts.
+    """
+    from app.models import Story
+    from .search_index import SUPPORTS_FTS5, build_match_query, search_story_ids
+
+    query = _filtered_stories_query(category, queue_only, min_community_score, min_pages, max_pages)
+
+    if search and SUPPORTS_FTS5:
+        match = build_match_query(search)
+        if match is None:
+            return [], 0
+        hits, total = search_story_ids(query, match, limit=per_page, offset=(page - 1) * per_page)
+        snippets = dict(hits)
+        page_stories = _library_dicts_for_ids([story_id for story_id, _ in hits])
+        for story_dict in page_stories:
+            story_dict['search_snippet'] = snippets[story_dict['id']]
+        return page_stories, total
 
+    if search:
+        all_stories = project_library_dicts(Story.id.in_(query.with_entities(Story.id).scalar_subquery()))
+
+        search_lower = search.lower()
+        scored = []
+        for story in all_stories:
+            score = 0
+            if search_lower in story.get('title', '').lower():
+                score += 100
+            if search_lower in story.get('author', '').lower():
+                score += 50
+            if search_lower in (story.get('category') or '').lower():
+                score += 25
+            if any(search_lower in t.lower() for t in story.get('tags', [])):
+                score += 10
+            if score > 0:
+                scored.append((score, story))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        all_stories = [s for _, s in scored]
+
+        total = len(all_stories)
+        start = (page - 1) * per_page
+        return all_stories[start:start + per_page], total
+
+    query, _, _ = _sorted_stories_query(query, sort_by, sort_order)
     total = query.count()
-    page_stories = query.offset((page - 1) * per_page).limit(per_page).all()
-    return [s.to_library_dict() for s in page_stories], total
+    page_ids = [row.id for row in query.with_entities(Story.id).offset((page - 1) * per_page).limit(per_page)]
+    return _library_dicts_for_ids(page_ids), total
+
+
+def get_stories_after(
+    cursor: Optional[str] = None,
+    per_page: int = 40,
+    category: str = 'all',
+    sort_by: str = 'date',
+    sort_order: str = 'desc',
+    queue_only: bool = False,
+    min_community_score: float = 0.0,
+    min_pages: int = 0,
+    max_pages: int = 0,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Keyset-paginated library listing: (page_stories, next_cursor).
+
+    ``cursor`` is the next_cursor of the previous page (None for the first);
+    the page starts right after that row's (sort value, id) instead of at an
+    OFFSET, so deep pages cost the same as the first and no COUNT is run.
+    next_cursor is None on the last page. Raises ValueError for a cursor this
+    function did not produce. Searches are ranked, not sorted, and stay on
+    get_stories_page().
+    """
+    from app.models import Story, db
+
+    query = _filtered_stories_query(category, queue_only, min_community_score, min_pages, max_pages)
+    query, order_col, descending = _sorted_stories_query(query, sort_by, sort_order)
+
+    if cursor:
+        value, last_id = decode_keyset_cursor(cursor, 2)
+        if value is not None and isinstance(order_col.type, db.DateTime):
+            value = datetime.fromisoformat(value)
+        query = query.filter(keyset_after(order_col, Story.id, descending, value, last_id))
+
+    # One extra row tells us whether there is a next page without counting.
+    rows = query.with_entities(Story.id, order_col).limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        last_id, last_value = rows[per_page - 1]
+        next_cursor = encode_keyset_cursor([last_value, last_id])
+    return _library_dicts_for_ids([story_id for story_id, _ in rows[:per_page]]), next_cursor
@@ -1,9 +1,9 @@
 from __future__ import annotations
-from bs4 import BeautifulSoup
 from typing import Optional
 from dataclasses import dataclass
 from urllib.parse import quote_plus
 from ..story_downloader import download_story, get_session
+from ..page_extractor import make_soup
 from .rate_limiter import RateLimiter
 
 
@@ -35,7 +35,7 @@ class LiteroticaSearcher:
             response = session.get(author_works_url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = make_soup(response.text)
             results = []
             
             story_links = soup.find_all("a", href=lambda h: h and "/s/" in h)
@@ -197,7 +197,7 @@ class MetadataRefreshService:
             from app.utils import get_html_directory
             from .html_generator import create_html_file
             from .story_downloader import extract_chapter_titles
-            import os, json as _json
+            import os
 
             existing_json = StoryFormat.query.filter_by(
                 story_id=story.id, format_type='json'
@@ -221,14 +221,11 @@ class MetadataRefreshService:
                         page_count=metadata.get('page_count'),
                         filename_base=story.filename_base,
                     )
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        json_data = _json.load(f)
                     json_format = StoryFormat(
                         story_id=story.id,
                         format_type='json',
                         file_path=json_path,
                         file_size=os.path.getsize(json_path),
-                        json_data=_json.dumps(json_data),
                     )
                     db.session.add(json_format)
                     fields_changed.append('html_generated')
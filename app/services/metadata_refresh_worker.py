@@ -6,12 +6,16 @@ from datetime import datetime
 from typing import Optional
 from flask import Flask
 from app.services.http_client import global_rate_limiter
+from app.services.job_queue import JobQueue
 
 class MetadataRefreshWorker:
     """Background worker for processing metadata refresh queue"""
 
     def __init__(self, app: Flask, poll_interval: int = 5):
+        from app.models import MetadataRefreshQueueItem
+
         self.app = app
+        self.queue = JobQueue(MetadataRefreshQueueItem)
         self.poll_interval = poll_interval
         self.thread: Optional[threading.Thread] = None
         self.running = False
@@ -21,46 +25,11 @@ class MetadataRefreshWorker:
         if self.thread and self.thread.is_alive():
             return
 
-        self._recover_stale_jobs()
-        
         self.running = True
         self._stop_event.clear()
         self.thread = threading.Thread(target=self._worker_loop, daemon=True, name="MetadataRefreshWorker")
         self.thread.start()
     
-    def _recover_stale_jobs(self):
-        from app.models import MetadataRefreshQueueItem, db
-        from .logger import log_action
-        from datetime import datetime, timedelta
-        
-        with self.app.app_context():
-            stale_cutoff = datetime.utcnow() - timedelta(minutes=10)
-            
-            stale_items = MetadataRefreshQueueItem.query.filter(
-                MetadataRefreshQueueItem.status == 'processing',
-                MetadataRefreshQueueItem.started_at < stale_cutoff
-            ).all()
-            
-            if stale_items:
-                log_action(f"[METADATA WORKER] Recovering {len(stale_items)} stale processing jobs")
-                for item in stale_items:
-                    item.status = 'pending'
-                    item.started_at = None
-                    item.progress_message = 'Reset from stale processing state'
-                db.session.commit()
-            
-            recent_stuck = MetadataRefreshQueueItem.query.filter(
-                MetadataRefreshQueueItem.status == 'processing'
-            ).all()
-            
-            if recent_stuck:
-                log_action(f"[METADATA WORKER] Found {len(recent_stuck)} items stuck in processing (likely from restart), resetting to pending")
-                for item in recent_stuck:
-                    item.status = 'pending'
-                    item.started_at = None
-                    item.progress_message = 'Reset from restart'
-                db.session.commit()
-
     def stop(self):
         self.running = False
         self._stop_event.set()
@@ -86,15 +55,8 @@ class MetadataRefreshWorker:
     def _process_next_item(self):
         from app.models import MetadataRefreshQueueItem, db
         from .logger import log_action, log_error
-        from sqlalchemy import select
-
-        item = db.session.execute(
-            select(MetadataRefreshQueueItem)
-            .filter_by(status='pending')
-            .order_by(MetadataRefreshQueueItem.created_at.asc())
-            .limit(1)
-        ).scalar_one_or_none()
 
+        item = self.queue.claim_next(progress_message='Starting metadata refresh...')
         if not item:
             return
 
@@ -103,15 +65,10 @@ class MetadataRefreshWorker:
         
         log_action(f"Processing metadata refresh queue item {item_id} for story_id={story_id}")
 
-        global_rate_limiter.wait_if_needed()
-
-        item.status = 'processing'
-        item.started_at = datetime.utcnow()
-        item.progress_message = 'Starting metadata refresh...'
-        db.session.commit()
-
         try:
-            self._refresh_metadata(item)
+            with self.queue.keep_alive(item_id):
+                global_rate_limiter.wait_if_needed()
+                self._refresh_metadata(item)
 
             item.status = 'completed'
             item.completed_at = datetime.utcnow()
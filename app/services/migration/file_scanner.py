@@ -30,6 +30,9 @@ class FileScanner:
         returned filename_base matches the Story.filename_base column. The embedded
         story_id is included in each format entry when present.
 
+        JSON metadata comes from the story_file_index table; only files whose
+        (mtime, size, inode) changed since the last scan are opened and parsed.
+
         Returns:
             List of dicts with structure:
             {
@@ -37,7 +40,7 @@ class FileScanner:
                 'story_id': 42 | None,
                 'formats': [
                     {'type': 'epub', 'path': '/path/to/file.epub', 'size': 12345, 'story_id': 42},
-                    {'type': 'json', 'path': '/path/to/file.json', 'size': 6789, 'json_data': {...}, 'story_id': 42}
+                    {'type': 'json', 'path': '/path/to/file.json', 'size': 6789, 'metadata': {...}, 'story_id': 42}
                 ],
                 'primary_file': '/path/to/primary.epub',
                 'primary_type': 'epub'
@@ -68,34 +71,19 @@ class FileScanner:
 
         json_files = {}
         if os.path.exists(html_dir):
-            for filename in os.listdir(html_dir):
-                if filename.endswith('.json'):
-                    raw_base = filename[:-5]  # strip .json
-                    base, story_id = _strip_id_prefix(raw_base)
-                    full_path = os.path.join(html_dir, filename)
-
-                    try:
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            json_data = json.load(f)
-
-                        entry = {
-                            'type': 'json',
-                            'path': full_path,
-                            'size': os.path.getsize(full_path),
-                            'json_data': json_data,
-                            'story_id': story_id,
-                        }
-                        # Prefer ID-prefixed file when both naming styles exist for the same base
-                        if base not in json_files or (story_id is not None and json_files[base].get('story_id') is None):
-                            json_files[base] = entry
-                    except OSError as e:
-                        from app.services.logger import log_error
-                        log_error(f"[FileScanner] Skipping unreadable file {full_path}: {e}")
-                        continue
-                    except json.JSONDecodeError as e:
-                        from app.services.logger import log_error
-                        log_error(f"[FileScanner] Skipping corrupt JSON at {full_path}: {e}")
-                        continue
+            for full_path, filename, metadata, size in self._scan_json_metadata(html_dir):
+                raw_base = filename[:-5]  # strip .json
+                base, story_id = _strip_id_prefix(raw_base)
+                entry = {
+                    'type': 'json',
+                    'path': full_path,
+                    'size': size,
+                    'metadata': metadata,
+                    'story_id': story_id,
+                }
+                # Prefer ID-prefixed file when both naming styles exist for the same base
+                if base not in json_files or (story_id is not None and json_files[base].get('story_id') is None):
+                    json_files[base] = entry
 
         all_bases = set(epub_files.keys()) | set(json_files.keys())
         story_groups = []
@@ -129,6 +117,101 @@ class FileScanner:
 
         return story_groups
 
+    def _scan_json_metadata(self, html_dir: str) -> List[Tuple[str, str, Dict, int]]:
+        """
+        Return (path, filename, metadata, size) for every readable story JSON in html_dir.
+
+        Unchanged files are served from the persistent index; new or modified files are
+        parsed and written back, and rows for files that disappeared are dropped. If the
+        index table is unavailable every file is parsed, as before.
+        """
+        from app.models import db, StoryFileIndexEntry
+        from sqlalchemy.exc import SQLAlchemyError
+        from app.services.logger import log_error
+        from .metadata_extractor import MetadataExtractor
+
+        on_disk = []
+        with os.scandir(html_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith('.json'):
+                    continue
+                try:
+                    st = dir_entry.stat()
+                except OSError:
+                    continue
+                on_disk.append((dir_entry.path, dir_entry.name, st))
+
+        prefix = os.path.join(html_dir, '')
+        try:
+            # Plain column tuples: no ORM identity-map cost for the (usual) unchanged rows
+            indexed = {
+                row.path: row
+                for row in db.session.query(
+                    StoryFileIndexEntry.path,
+                    StoryFileIndexEntry.mtime,
+                    StoryFileIndexEntry.size,
+                    StoryFileIndexEntry.inode,
+                    StoryFileIndexEntry.extracted_metadata,
+                ).filter(StoryFileIndexEntry.file_type == 'json')
+                if row.path.startswith(prefix)
+            }
+        except SQLAlchemyError:
+            db.session.rollback()
+            indexed = None
+
+        extractor = MetadataExtractor()
+        results = []
+        dirty = False
+
+        for full_path, filename, st in on_disk:
+            row = indexed.get(full_path) if indexed is not None else None
+            if row is not None and (row.mtime, row.size, row.inode) == (st.st_mtime, st.st_size, st.st_ino):
+                if row.extracted_metadata:
+                    results.append((full_path, filename, json.loads(row.extracted_metadata), st.st_size))
+                continue
+
+            metadata = None
+            try:
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    metadata = extractor.extract_from_json(json.load(f))
+            except OSError as e:
+                log_error(f"[FileScanner] Skipping unreadable file {full_path}: {e}")
+                continue
+            except (ValueError, AttributeError) as e:
+                # Indexed with no metadata so a corrupt file is only reported once per change
+                log_error(f"[FileScanner] Skipping corrupt JSON at {full_path}: {e}")
+
+            if indexed is not None:
+                entry = db.session.get(StoryFileIndexEntry, full_path) if row is not None else None
+                if entry is None:
+                    entry = StoryFileIndexEntry(path=full_path, file_type='json')
+                    db.session.add(entry)
+                entry.mtime = st.st_mtime
+                entry.size = st.st_size
+                entry.inode = st.st_ino
+                entry.set_metadata(metadata)
+                dirty = True
+
+            if metadata is not None:
+                results.append((full_path, filename, metadata, st.st_size))
+
+        if indexed is not None:
+            seen = {full_path for full_path, _, _ in on_disk}
+            vanished = [path for path in indexed if path not in seen]
+            for i in range(0, len(vanished), 500):
+                StoryFileIndexEntry.query.filter(
+                    StoryFileIndexEntry.path.in_(vanished[i:i + 500])
+                ).delete(synchronize_session=False)
+                dirty = True
+            if dirty:
+                try:
+                    db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    log_error(f"[FileScanner] Failed to update file index: {e}")
+
+        return results
+
     def get_file_count(self) -> Dict[str, int]:
         """Get counts of EPUB and JSON files"""
         epub_dir = get_epub_directory()
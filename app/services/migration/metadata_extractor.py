@@ -18,8 +18,10 @@ class MetadataExtractor:
             page_count, word_count, chapter_count
         """
         json_format = next((f for f in file_group['formats'] if f['type'] == 'json'), None)
+        if json_format and json_format.get('metadata'):
+            return json_format['metadata']
         if json_format and json_format.get('json_data'):
-            return self._extract_from_json(json_format['json_data'])
+            return self.extract_from_json(json_format['json_data'])
 
         epub_format = next((f for f in file_group['formats'] if f['type'] == 'epub'), None)
         if epub_format:
@@ -27,7 +29,7 @@ class MetadataExtractor:
 
         raise ValueError(f"No valid metadata source for {file_group['filename_base']}")
 
-    def _extract_from_json(self, json_data: Dict) -> Dict:
+    def extract_from_json(self, json_data: Dict) -> Dict:
         """Extract metadata from JSON file"""
         return {
             'title': json_data.get('title', 'Unknown'),
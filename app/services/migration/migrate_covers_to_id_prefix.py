@@ -7,9 +7,11 @@ directly from a shell or admin endpoint.
 """
 from __future__ import annotations
 import os
+from sqlalchemy import update
 from app.models import Story
 from app.models.base import db
 from app.utils import get_cover_directory
+from app.services.cover_variants import remove_cover_variants
 from app.services.logger import log_action, log_error
 
 
@@ -19,43 +21,56 @@ def migrate_covers_to_id_prefix() -> dict:
     naming to "{story.id}_{filename_base}.jpg" and update the cover_filename column.
 
     Safe to run multiple times — skips files already using the new naming convention.
+    Reads story columns in one query and lists the cover directory once, and only
+    writes rows whose cover_filename actually changes.
     Returns a summary dict with counts of renamed, skipped, and failed files.
     """
     cover_dir = get_cover_directory()
+    on_disk = set(os.listdir(cover_dir)) if os.path.isdir(cover_dir) else set()
 
     renamed = 0
     skipped = 0
     failed = 0
+    updates = []
 
-    stories = Story.query.all()
-    for story in stories:
-        old_cover = os.path.join(cover_dir, f"{story.filename_base}.jpg")
-        new_cover = os.path.join(cover_dir, f"{story.id}_{story.filename_base}.jpg")
+    rows = db.session.query(Story.id, Story.filename_base, Story.cover_filename).all()
+    for story_id, filename_base, cover_filename in rows:
+        old_name = f"{filename_base}.jpg"
+        new_name = f"{story_id}_{filename_base}.jpg"
 
-        if os.path.exists(new_cover):
+        if new_name in on_disk:
             # Already migrated; ensure DB record is correct.
-            if story.cover_filename != f"{story.id}_{story.filename_base}.jpg":
-                story.cover_filename = f"{story.id}_{story.filename_base}.jpg"
+            if cover_filename != new_name:
+                updates.append({'id': story_id, 'cover_filename': new_name})
             skipped += 1
             continue
 
-        if os.path.exists(old_cover):
+        if old_name in on_disk:
             try:
-                os.rename(old_cover, new_cover)
-                story.cover_filename = f"{story.id}_{story.filename_base}.jpg"
+                old_path = os.path.join(cover_dir, old_name)
+                # Variants are keyed by the cover's stem and would be orphaned by the rename.
+                remove_cover_variants(old_path)
+                os.rename(old_path, os.path.join(cover_dir, new_name))
+                on_disk.discard(old_name)
+                on_disk.add(new_name)
+                if cover_filename != new_name:
+                    updates.append({'id': story_id, 'cover_filename': new_name})
                 log_action(
-                    f"[migrate-covers] Renamed cover: {story.filename_base}.jpg → "
-                    f"{story.id}_{story.filename_base}.jpg (story {story.id})"
+                    f"[migrate-covers] Renamed cover: {old_name} → {new_name} (story {story_id})"
                 )
                 renamed += 1
             except Exception as e:
-                log_error(f"[migrate-covers] Failed to rename cover for story {story.id}: {e}")
+                log_error(f"[migrate-covers] Failed to rename cover for story {story_id}: {e}")
                 failed += 1
         else:
             # Cover missing on disk; just update the DB record to the new convention
-            story.cover_filename = f"{story.id}_{story.filename_base}.jpg"
+            if cover_filename != new_name:
+                updates.append({'id': story_id, 'cover_filename': new_name})
             skipped += 1
 
+    if updates:
+        db.session.execute(update(Story), updates)
+
     try:
         db.session.commit()
     except Exception as e:
@@ -77,22 +77,16 @@ def migrate_filenames_to_id_prefix() -> dict:
             skipped += 1
         elif os.path.exists(old_json):
             try:
-                import json as _json
                 os.rename(old_json, new_json)
                 if json_fmt:
                     json_fmt.file_path = new_json
                     json_fmt.file_size = os.path.getsize(new_json)
-                    with open(new_json, 'r', encoding='utf-8') as f:
-                        json_fmt.json_data = _json.dumps(_json.load(f))
                 else:
-                    with open(new_json, 'r', encoding='utf-8') as f:
-                        json_data = _json.load(f)
                     db.session.add(StoryFormat(
                         story_id=story.id,
                         format_type='json',
                         file_path=new_json,
                         file_size=os.path.getsize(new_json),
-                        json_data=_json.dumps(json_data)
                     ))
                 log_action(f"[migrate] Renamed JSON: {old_base} → {new_base} (story {story.id})")
                 renamed += 1
@@ -202,17 +202,11 @@ class DatabaseMigrator:
             if existing_format:
                 continue
 
-            json_data = None
-            if format_type == 'json' and format_info.get('json_data'):
-                import json
-                json_data = json.dumps(format_info['json_data'])
-
             story_format = StoryFormat(
                 story_id=story.id,
                 format_type=format_type,
                 file_path=format_info['path'],
                 file_size=format_info.get('size'),
-                json_data=json_data
             )
             db.session.add(story_format)
 
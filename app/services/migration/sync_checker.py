@@ -1,12 +1,59 @@
 from __future__ import annotations
 import os
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
 from app.utils import get_epub_directory, get_html_directory, story_epub_path, story_json_path
 from app.models import Story, StoryFormat
 from .file_scanner import FileScanner
 
 _CANONICAL_FN = {'epub': story_epub_path, 'json': story_json_path}
 
+SYNC_SNAPSHOT_KEY = 'sync_status_snapshot'
+
+
+def save_sync_snapshot(sync_status: Dict) -> Dict:
+    """
+    Persist the counts from a check_sync() result with a timestamp.
+
+    The background automation writes this every cycle so the homepage and the
+    sync banner can read it instead of walking the library on each request.
+    """
+    from app.models import AppConfig
+    from app.models.base import db
+
+    snapshot = {
+        'in_sync': sync_status['in_sync'],
+        'orphaned_db_count': sync_status['orphaned_db_count'],
+        'broken_format_paths_count': sync_status['broken_format_paths_count'],
+        'orphaned_files_count': sync_status['orphaned_files_count'],
+        'duplicate_files_count': sync_status['duplicate_files_count'],
+        'checked_at': datetime.utcnow().isoformat(),
+    }
+    config = AppConfig.query.filter_by(key=SYNC_SNAPSHOT_KEY).first()
+    if not config:
+        config = AppConfig(
+            key=SYNC_SNAPSHOT_KEY,
+            value_type='json',
+            description='Last background filesystem/database sync check',
+        )
+        db.session.add(config)
+    config.set_value(snapshot)
+    db.session.commit()
+    return snapshot
+
+
+def load_sync_snapshot() -> Optional[Dict]:
+    """Return the last stored sync snapshot, or None if no check has run yet."""
+    from app.models import AppConfig
+
+    config = AppConfig.query.filter_by(key=SYNC_SNAPSHOT_KEY).first()
+    if not config or not config.value:
+        return None
+    try:
+        return config.get_value()
+    except ValueError:
+        return None
+
 
 class SyncChecker:
     """Checks filesystem and database sync status"""
@@ -256,17 +303,11 @@ class SyncChecker:
                     story.tags = tag_objects
 
                 for format_info in file_group['formats']:
-                    import json as json_module
-                    json_data_str = None
-                    if format_info.get('json_data'):
-                        json_data_str = json_module.dumps(format_info['json_data'])
-
                     story_format = StoryFormat(
                         story_id=story.id,
                         format_type=format_info['type'],
                         file_path=format_info['path'],
                         file_size=format_info.get('size'),
-                        json_data=json_data_str
                     )
                     db.session.add(story_format)
 
@@ -0,0 +1,199 @@
+from __future__ import annotations
+import html as html_module
+import re
+from typing import Optional
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+BASE_URL = 'https://www.literotica.com'
+
+_PAGE_PARAM_RE = re.compile(r'[?&]page=(\d+)')
+_STAT_ICONS = ('_star_', '_heart_', '_comment_', '_diagram_')
+_VOID_TAGS = frozenset(('area', 'br', 'col', 'embed', 'hr', 'img', 'input', 'source', 'wbr'))
+
+
+def _has_class(fragment: str) -> str:
+    """XPath predicate matching elements whose class attribute contains fragment."""
+    return f"contains(@class, '{fragment}')"
+
+
+# Compiled once; evaluating a compiled XPath skips re-parsing the expression per page.
+_TITLE = etree.XPath(
+    "(//h1[starts-with(@class, '_title_') or contains(@class, ' _title_')])[1]"
+)
+_AUTHOR = etree.XPath(f"(//a[{_has_class('_author__title_')}])[1]")
+_BREADCRUMB_NAMES = etree.XPath(
+    f"(//nav[{_has_class('_breadcrumbs_')}])[1]//span[@itemprop='name']"
+)
+_TAG_LINKS = etree.XPath(f"//a[{_has_class('_tags__link_')}]")
+_OG_DESCRIPTION = etree.XPath("(//meta[@property='og:description'])[1]/@content")
+_WIDGET_INFO = etree.XPath(f"(//div[{_has_class('_widget__info_')}])[1]")
+_ARTICLE_BODY = etree.XPath("(//*[@itemprop='articleBody'])[1]")
+_ARTICLE_CONTENT = etree.XPath(f"(//div[{_has_class('_article__content_')}])[1]")
+_PARAGRAPHS = etree.XPath(".//p[not(.//p)]")
+_PAGINATION_LINKS = etree.XPath(f"//a[{_has_class('_pagination__item_')}]/@href")
+_SERIES_LINK = etree.XPath("(//a[contains(@href, '/series/se/')])[1]/@href")
+_PANELS = etree.XPath(f"//section[{_has_class('_panel_')}]")
+_PANEL_HEADING = etree.XPath(f"(.//h3[{_has_class('_heading_')}])[1]")
+_PANEL_ITEMS = etree.XPath(
+    f"(.//div[{_has_class('_data_list_')}])[1]//div[{_has_class('_item_')}]"
+)
+_HAS_NEXT_PART = etree.XPath(
+    ".//span[contains(text(), 'Next Part')]"
+    " and .//a[contains(@href, '/s/')]"
+)
+_ITEM_STORY_HREF = etree.XPath("(.//a[contains(@href, '/s/')])[1]/@href")
+_STAT_ITEMS = etree.XPath(f"//*[{_has_class('_stats__item_')}]")
+_STAT_ICON = etree.XPath(
+    "(.//*[" + " or ".join(_has_class(icon) for icon in _STAT_ICONS) + "])[1]/@class"
+)
+
+
+def make_soup(markup: str) -> BeautifulSoup:
+    """BeautifulSoup backed by lxml's tree builder, for pages walked with the bs4 API."""
+    return BeautifulSoup(markup, 'lxml')
+
+
+def _absolute(href: str) -> str:
+    return href if href.startswith('http') else BASE_URL + href
+
+
+def _text(element, strip: bool = False) -> str:
+    """Mirror bs4's .text / get_text(strip=True) on an lxml element."""
+    if strip:
+        return ''.join(s.strip() for s in element.itertext())
+    return ''.join(element.itertext())
+
+
+def _inner_html(element) -> str:
+    """
+    Serialize an element's children the way bs4's decode_contents() does.
+
+    Paragraphs end up inside EPUB XHTML, so void tags must come out as <br/>;
+    the XML serializer does that, and giving other empty elements an empty
+    text node keeps them as <em></em> rather than <em/>.
+    """
+    for descendant in element.iterdescendants():
+        if descendant.tag not in _VOID_TAGS and descendant.text is None and not len(descendant):
+            descendant.text = ''
+    parts = [html_module.escape(element.text, quote=False)] if element.text else []
+    for child in element:
+        parts.append(etree.tostring(child, method='xml', encoding='unicode', with_tail=True))
+    return ''.join(parts).strip()
+
+
+def _first(results: list):
+    return results[0] if results else None
+
+
+def _extract_stats(root) -> dict:
+    stats = {'score': None, 'views': None, 'favorites': None, 'comments': None}
+    for item in _STAT_ITEMS(root):
+        icon_class = _first(_STAT_ICON(item))
+        if not icon_class:
+            continue
+        digits = ''.join(ch for ch in _text(item, strip=True) if ch.isdigit() or ch == '.')
+        if not digits:
+            continue
+        try:
+            val = float(digits)
+        except ValueError:
+            continue
+        if '_star_' in icon_class:
+            stats['score'] = val
+        elif '_diagram_' in icon_class:
+            stats['views'] = int(val)
+        elif '_heart_' in icon_class:
+            stats['favorites'] = int(val)
+        elif '_comment_' in icon_class:
+            stats['comments'] = int(val)
+    return stats
+
+
+def _extract_next_part(root) -> Optional[str]:
+    """Next chapter link from the page's 'READ MORE OF THIS SERIES' panel."""
+    for section in _PANELS(root):
+        heading = _first(_PANEL_HEADING(section))
+        if heading is None or _text(heading, strip=True) != 'READ MORE OF THIS SERIES':
+            continue
+        for item in _PANEL_ITEMS(section):
+            if _HAS_NEXT_PART(item):
+                href = _first(_ITEM_STORY_HREF(item))
+                return _absolute(href).split('?')[0] if href else None
+        return None
+    return None
+
+
+def extract_story_page(markup: str, current_page: int = 1) -> dict:
+    """
+    Extract everything the downloader needs from one story page in a single parse.
+
+    Returns a dict with: title, author, author_url, category, tags, description,
+    paragraphs (inner HTML of each body <p>), next_page_url, page_count,
+    series_url, next_part_url, score, views, favorites, comments.
+    """
+    root = lxml_html.fromstring(markup)
+
+    title_tag = _first(_TITLE(root))
+    title = html_module.unescape(_text(title_tag).strip()) if title_tag is not None else None
+
+    author = None
+    author_url = None
+    author_tag = _first(_AUTHOR(root))
+    if author_tag is not None:
+        author = html_module.unescape(_text(author_tag).strip())
+        if author_tag.get('href'):
+            author_url = _absolute(author_tag.get('href'))
+
+    category = None
+    breadcrumb_items = _BREADCRUMB_NAMES(root)
+    if len(breadcrumb_items) >= 2:
+        category = _text(breadcrumb_items[1]).strip()
+        if 'taboo' in category.lower():
+            category = 'I/T'
+
+    tags = [t for t in (_text(a).strip() for a in _TAG_LINKS(root)) if not t.lower().startswith('inc')]
+    if category and category not in tags:
+        tags = [category] + tags
+
+    description = (_first(_OG_DESCRIPTION(root)) or '').strip() or None
+    if description is None:
+        desc_elem = _first(_WIDGET_INFO(root))
+        description = _text(desc_elem, strip=True) if desc_elem is not None else None
+
+    # lxml closes an open <p> when another starts, so Literotica's wrapper
+    # <p data-hk><p align="center">…</p></p> becomes an empty <p> followed by
+    # the real one; empty paragraphs are dropped downstream anyway.
+    paragraphs = []
+    body = _first(_ARTICLE_BODY(root))
+    if body is None:
+        body = _first(_ARTICLE_CONTENT(root))
+    if body is not None:
+        paragraphs = [p for p in (_inner_html(el) for el in _PARAGRAPHS(body)) if p]
+
+    next_page_url = None
+    page_count = 1
+    next_markers = (f'?page={current_page + 1}', f'&page={current_page + 1}')
+    for href in _PAGINATION_LINKS(root):
+        if next_page_url is None and any(marker in href for marker in next_markers):
+            next_page_url = _absolute(href)
+        match = _PAGE_PARAM_RE.search(href)
+        if match:
+            page_count = max(page_count, int(match.group(1)))
+
+    series_href = _first(_SERIES_LINK(root))
+
+    return {
+        'title': title,
+        'author': author,
+        'author_url': author_url,
+        'category': category,
+        'tags': tags,
+        'description': description,
+        'paragraphs': paragraphs,
+        'next_page_url': next_page_url,
+        'page_count': page_count,
+        'series_url': _absolute(series_href) if series_href else None,
+        'next_part_url': _extract_next_part(root),
+        **_extract_stats(root),
+    }
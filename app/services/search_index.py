@@ -0,0 +1,277 @@
+from __future__ import annotations
+import html
+import json
+import re
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+# SQLite builds without FTS5 keep the old in-Python substring search.
+try:
+    sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE fts5_probe USING fts5(x)')
+    SUPPORTS_FTS5 = True
+except sqlite3.OperationalError:
+    SUPPORTS_FTS5 = False
+
+SEARCH_TABLE = 'story_search'
+
+# bm25() weights per column, in table order. Mirrors the old scoring, where a
+# title hit outranked an author hit, which outranked category and tags.
+COLUMN_WEIGHTS = (10.0, 5.0, 2.5, 2.0, 1.0, 0.5)
+
+CREATE_SEARCH_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "title, author, category, tags, description, body, indexed_version UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+INDEX_BATCH_SIZE = 200
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACES_RE = re.compile(r'[ \t]+')
+# snippet() wraps hits in these control characters; _snippet_html() escapes
+# the text and only then turns them into <mark> tags.
+_MARK_OPEN = '\x02'
+_MARK_CLOSE = '\x03'
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def ensure_search_table(conn) -> bool:
+    """Create the FTS5 table if missing. Returns False when FTS5 is unavailable."""
+    if not SUPPORTS_FTS5:
+        return False
+    conn.execute(text(CREATE_SEARCH_TABLE_SQL))
+    return True
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    Turn free-text input into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term, so typing "lov sto" matches
+    "love story", and FTS5 operators in user input are never interpreted.
+    Returns None when the input has no searchable words.
+    """
+    terms = _TERM_RE.findall(search)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _snippet_html(snippet: Optional[str]) -> str:
+    escaped = html.escape(snippet or '')
+    return escaped.replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>')
+
+
+def _story_body(json_path: Optional[str]) -> str:
+    if not json_path:
+        return ''
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            story_data = json.load(f)
+    except (OSError, ValueError):
+        return ''
+    paragraphs = (
+        paragraph
+        for chapter in story_data.get('chapters', [])
+        for paragraph in chapter.get('paragraphs', [])
+    )
+    return html.unescape(_SPACES_RE.sub(' ', _TAG_RE.sub(' ', '\n'.join(paragraphs))))
+
+
+def _story_documents(conn, story_ids: List[int]) -> Dict[int, tuple]:
+    """Build (version, title, author, category, tags, description, body) per story id."""
+    from app.models import Author, Category, Story, StoryFormat, Tag, story_tags
+    from sqlalchemy import String, cast, select
+
+    rows = conn.execute(
+        select(Story.id, cast(Story.updated_at, String), Story.title, Author.name, Category.name, Story.description)
+        .join(Author, Author.id == Story.author_id)
+        .outerjoin(Category, Category.id == Story.category_id)
+        .where(Story.id.in_(story_ids))
+    ).all()
+
+    tags: Dict[int, List[str]] = {}
+    for story_id, tag_name in conn.execute(
+        select(story_tags.c.story_id, Tag.name)
+        .join(Tag, Tag.id == story_tags.c.tag_id)
+        .where(story_tags.c.story_id.in_(story_ids))
+    ):
+        tags.setdefault(story_id, []).append(tag_name)
+
+    json_paths = dict(conn.execute(
+        select(StoryFormat.story_id, StoryFormat.file_path)
+        .where(StoryFormat.story_id.in_(story_ids), StoryFormat.format_type == 'json')
+    ).all())
+
+    return {
+        story_id: (version, title, author or '', category or '', ' '.join(tags.get(story_id, [])),
+                   description or '', _story_body(json_paths.get(story_id)))
+        for story_id, version, title, author, category, description in rows
+    }
+
+
+def refresh_search_index(story_ids: Iterable[int]) -> int:
+    """
+    Re-index the given stories, dropping entries for ids that no longer exist.
+
+    Runs on its own connection, so it is safe to call from an after_commit hook.
+    Returns the number of stories (re)indexed.
+    """
+    from app.models import db
+
+    ids = sorted(set(story_ids))
+    if not ids or not SUPPORTS_FTS5:
+        return 0
+
+    indexed = 0
+    for start in range(0, len(ids), INDEX_BATCH_SIZE):
+        batch = ids[start:start + INDEX_BATCH_SIZE]
+        with db.engine.connect() as conn:
+            documents = _story_documents(conn, batch)
+        with db.engine.begin() as conn:
+            ensure_search_table(conn)
+            conn.execute(
+                text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"),
+                [{'id': story_id} for story_id in batch],
+            )
+            if documents:
+                conn.execute(
+                    text(f"INSERT INTO {SEARCH_TABLE} "
+                         "(rowid, indexed_version, title, author, category, tags, description, body) "
+                         "VALUES (:id, :version, :title, :author, :category, :tags, :description, :body)"),
+                    [
+                        dict(zip(('id', 'version', 'title', 'author', 'category', 'tags', 'description', 'body'),
+                                 (story_id,) + document))
+                        for story_id, document in documents.items()
+                    ],
+                )
+        indexed += len(documents)
+    return indexed
+
+
+def sync_search_index() -> Dict[str, int]:
+    """
+    Bring the whole index up to date: index stories that are missing or whose
+    updated_at moved since they were indexed, and drop orphaned entries.
+
+    Run once at startup; afterwards the commit hook below keeps the index current.
+    """
+    from app.models import db
+
+    if not SUPPORTS_FTS5:
+        return {'indexed': 0, 'removed': 0}
+
+    with db.engine.begin() as conn:
+        ensure_search_table(conn)
+        removed = conn.execute(text(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid NOT IN (SELECT id FROM stories)"
+        )).rowcount
+        stale_ids = [row[0] for row in conn.execute(text(
+            f"SELECT s.id FROM stories s LEFT JOIN {SEARCH_TABLE} f ON f.rowid = s.id "
+            "WHERE f.rowid IS NULL OR f.indexed_version IS NOT CAST(s.updated_at AS VARCHAR)"
+        ))]
+    return {'indexed': refresh_search_index(stale_ids), 'removed': removed}
+
+
+def search_story_ids(query, match: str, limit: int, offset: int) -> Tuple[List[Tuple[int, str]], int]:
+    """
+    Rank stories matching an FTS5 expression with bm25().
+
+    ``query`` is a filtered ORM query over Story (category, queue, score and
+    page filters already applied); only its WHERE clause is used. Returns
+    ([(story_id, snippet_html), ...] for the requested page, total match count).
+    """
+    from app.models import Story
+    from sqlalchemy import column, func, literal_column, table
+
+    fts = table(SEARCH_TABLE, column('rowid'))
+    fts_ref = literal_column(SEARCH_TABLE)
+    matched = (
+        query.with_entities(Story.id)
+        .join(fts, fts.c.rowid == Story.id)
+        .filter(fts_ref.op('MATCH')(match))
+    )
+    total = matched.order_by(None).count()
+
+    rows = (
+        matched.with_entities(
+            Story.id,
+            func.snippet(fts_ref, -1, _MARK_OPEN, _MARK_CLOSE, '…', 12),
+        )
+        .order_by(func.bm25(fts_ref, *COLUMN_WEIGHTS), Story.id)
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+    return [(story_id, _snippet_html(snippet)) for story_id, snippet in rows], total
+
+
+_PENDING_KEY = 'search_index_pending'
+
+# Attributes whose changes alter a story's search document.
+_STORY_INDEXED_ATTRS = ('title', 'description', 'author_id', 'category_id', 'author', 'category', 'tags')
+_FORMAT_INDEXED_ATTRS = ('file_path', 'file_size', 'file_hash')
+
+
+def _history_changed(obj, attrs: Tuple[str, ...]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_search_changes(session, flush_context) -> None:
+    """Note which stories' search documents may have changed in this flush."""
+    from app.models import Author, Category, Story, StoryFormat, Tag, story_tags
+    from sqlalchemy import select
+
+    pending: Set[int] = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Story):
+            pending.add(obj.id)
+        elif isinstance(obj, StoryFormat) and obj.format_type == 'json' and obj.story_id is not None:
+            pending.add(obj.story_id)
+
+    # Most story commits (last_opened_at, rating, queue flags, worker progress) don't
+    # touch indexed text; only re-read the story JSON when something indexed changed.
+    for obj in session.dirty:
+        if isinstance(obj, Story) and _history_changed(obj, _STORY_INDEXED_ATTRS):
+            pending.add(obj.id)
+        elif (isinstance(obj, StoryFormat) and obj.format_type == 'json' and obj.story_id is not None
+                and _history_changed(obj, _FORMAT_INDEXED_ATTRS)):
+            pending.add(obj.story_id)
+
+    # Renaming an author, category or tag changes the text of every story that uses it.
+    for obj in session.dirty:
+        if not isinstance(obj, (Author, Category, Tag)):
+            continue
+        # Collection changes (a story joining an author) show up as dirty too; only names matter.
+        if not _history_changed(obj, ('name',)):
+            continue
+        if isinstance(obj, Author):
+            stmt = select(Story.id).where(Story.author_id == obj.id)
+        elif isinstance(obj, Category):
+            stmt = select(Story.id).where(Story.category_id == obj.id)
+        else:
+            stmt = select(story_tags.c.story_id).where(story_tags.c.tag_id == obj.id)
+        pending.update(session.connection().execute(stmt).scalars())
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_search_changes(session) -> None:
+    from .logger import log_error
+
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not SUPPORTS_FTS5:
+        return
+    try:
+        refresh_search_index(pending)
+    except Exception as e:
+        # The startup sync re-indexes anything left stale here.
+        log_error(f"[SEARCH] Could not update search index for {len(pending)} stories: {e}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_search_changes(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
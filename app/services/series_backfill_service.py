@@ -1,9 +1,9 @@
 from __future__ import annotations
 from typing import Optional, Dict
-from bs4 import BeautifulSoup
 import time
 from app.models import Story, db
 from .story_downloader import get_session
+from .page_extractor import make_soup
 from .logger import log_action, log_error
 
 class SeriesBackfillService:
@@ -53,7 +53,7 @@ class SeriesBackfillService:
             session = get_session()
             response = session.get(story_url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = make_soup(response.text)
 
             for section in soup.find_all("section", class_=lambda c: c and "_panel_" in str(c)):
                 heading = section.find("h3", class_=lambda c: c and "_heading_" in str(c))
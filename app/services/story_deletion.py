@@ -5,6 +5,7 @@ from flask import current_app
 from app.models import Story, SeenLiteroticaUrl, db
 from app.utils import get_epub_directory, get_html_directory, get_cover_directory
 from app.services import log_error
+from app.services.cover_variants import remove_cover_variants
 import traceback
 
 
@@ -42,6 +43,7 @@ class StoryDeletionService:
             
             for cover_name in (f"{story_id}_{filename_base}.jpg", f"{filename_base}.jpg"):
                 cover_file = os.path.join(cover_dir, cover_name)
+                remove_cover_variants(cover_file)
                 if os.path.exists(cover_file):
                     try:
                         os.remove(cover_file)
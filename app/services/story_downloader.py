@@ -1,17 +1,28 @@
 from __future__ import annotations
-from bs4 import BeautifulSoup
 import time
 import random
 import re
 import traceback
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
 from .logger import log_url, log_error
-from .http_client import get_session
+from .http_client import get_session, global_rate_limiter, RateLimiter
+from .page_extractor import extract_story_page
 
 # ASCII 30 "Record Separator" — structurally impossible in scraped HTML text.
 # Format: \x1eCHAPTER:{n}\x1e{bare_title}\n\n{content}
 CHAPTER_SENTINEL = '\x1e'
 
+# Parts of a known series fetched in parallel. Request pacing comes from
+# global_rate_limiter, so this only bounds how many fetch/parse pipelines overlap.
+SERIES_FETCH_WORKERS = 4
+
+
+def _page_pause() -> None:
+    """Polite random pause between page requests that no shared rate limiter paces."""
+    time.sleep(random.uniform(3.0, 8.0))
+
+
 def split_story_chapters(content: str) -> list[str]:
     """Split composite story content into [preamble, ch1, ch2, ...].
 
@@ -22,6 +33,24 @@ def split_story_chapters(content: str) -> list[str]:
     return re.split(r'\n\nChapter \d+: ', content)
 
 
+def iter_story_chapters(content: str) -> Iterator[str]:
+    """Yield the same pieces as split_story_chapters(), one at a time."""
+    pattern = r'\x1eCHAPTER:\d+\x1e' if CHAPTER_SENTINEL in content else r'\n\nChapter \d+: '
+    start = 0
+    for match in re.finditer(pattern, content):
+        yield content[start:match.start()]
+        start = match.end()
+    yield content[start:]
+
+
+def join_story_chapters(chapters: Iterable[tuple[str, str]], first_number: int = 1) -> str:
+    """Build sentinel-format content from (title, content) pairs, numbering from first_number."""
+    return ''.join(
+        f"{CHAPTER_SENTINEL}CHAPTER:{n}{CHAPTER_SENTINEL}{title}\n\n{content}"
+        for n, (title, content) in enumerate(chapters, first_number)
+    )
+
+
 def detect_url_type(url: str) -> tuple[str, Optional[str]]:
     """
     Detect URL type and extract base URL.
@@ -76,13 +105,8 @@ def extract_series_url_from_chapter(chapter_url: str, session: requests.Session)
         log_action(f"Attempting to extract series URL from chapter: {chapter_url}")
         response = session.get(chapter_url, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        series_link = soup.find("a", href=lambda h: h and "/series/se/" in h)
-        if series_link:
-            series_url = series_link.get("href", "")
-            if not series_url.startswith("http"):
-                series_url = "https://www.literotica.com" + series_url
+        series_url = extract_story_page(response.text)['series_url']
+        if series_url:
             log_action(f"Found series URL: {series_url}")
             return series_url
 
@@ -96,16 +120,19 @@ def extract_series_url_from_chapter(chapter_url: str, session: requests.Session)
 def _download_single_chapter(
     chapter_url: str,
     session: requests.Session,
-    is_first_chapter: bool = False
+    is_first_chapter: bool = False,
+    rate_limiter: Optional[RateLimiter] = None
 ) -> tuple[str, dict]:
     """
     Download all pages of a single chapter.
 
+    With a rate_limiter every page request (including the first) waits on it
+    instead of sleeping a random 3-8s between pages.
+
     Returns:
         tuple[chapter_content, metadata_dict]
         metadata_dict contains: author, author_url, category, tags, page_count
     """
-    import html as html_module
     chapter_content = ""
     current_page = 1
     page_count = 0
@@ -122,74 +149,30 @@ def _download_single_chapter(
 
     while current_url:
         try:
+            if rate_limiter:
+                rate_limiter.wait_if_needed()
             response = session.get(current_url, timeout=10)
             response.raise_for_status()
             response.encoding = response.charset_encoding or 'utf-8'
-            soup = BeautifulSoup(response.text, "html.parser")
+            page = extract_story_page(response.text, current_page)
 
             if current_page == 1 and is_first_chapter:
-                author_tag = soup.find("a", class_=lambda c: c and "_author__title_" in str(c))
-                if author_tag:
-                    metadata['author'] = html_module.unescape(author_tag.text.strip())
-                    if author_tag.get('href'):
-                        author_href = author_tag.get('href')
-                        if not author_href.startswith('http'):
-                            metadata['author_url'] = 'https://www.literotica.com' + author_href
-                        else:
-                            metadata['author_url'] = author_href
-
-                breadcrumb = soup.find("nav", class_=lambda c: c and "_breadcrumbs_" in str(c))
-                if breadcrumb:
-                    breadcrumb_items = breadcrumb.find_all("span", itemprop="name")
-                    if len(breadcrumb_items) >= 2:
-                        metadata['category'] = breadcrumb_items[1].text.strip()
-                        if "taboo" in metadata['category'].lower():
-                            metadata['category'] = "I/T"
-
-                tag_elements = soup.find_all("a", class_=lambda c: c and "_tags__link_" in str(c))
-                metadata['tags'] = [tag.text.strip() for tag in tag_elements
-                                   if not tag.text.strip().lower().startswith("inc")]
-                if metadata['category'] and metadata['category'] not in metadata['tags']:
-                    metadata['tags'] = [metadata['category']] + metadata['tags']
-
-                og_desc = soup.find("meta", attrs={"property": "og:description"})
-                if og_desc and og_desc.get("content", "").strip():
-                    metadata['description'] = og_desc.get("content").strip()
-                else:
-                    desc_elem = soup.find("div", class_=lambda c: c and "_widget__info_" in str(c))
-                    metadata['description'] = desc_elem.get_text(strip=True) if desc_elem else None
-
-            content_div = (
-                soup.find(itemprop="articleBody") or
-                soup.find("div", class_=lambda c: c and "_article__content_" in str(c))
-            )
-            if content_div:
-                for paragraph in content_div.find_all("p"):
-                    # Literotica's SSR wraps formatted paragraphs in a bare outer <p data-hk>
-                    # containing a real inner <p align="center"> etc. Python's html.parser
-                    # preserves this nesting (unlike browsers which auto-close the outer <p>),
-                    # causing every such paragraph to appear twice. Skip the outer wrapper.
-                    if paragraph.find("p"):
-                        continue
-                    chapter_content += paragraph.decode_contents().strip() + "\n\n"
+                metadata['author'] = page['author'] or metadata['author']
+                metadata['author_url'] = page['author_url']
+                metadata['category'] = page['category']
+                metadata['tags'] = page['tags']
+                metadata['description'] = page['description']
+
+            for paragraph in page['paragraphs']:
+                chapter_content += paragraph + "\n\n"
 
             page_count += 1
 
-            next_page_link = None
-            pagination_links = soup.find_all("a", class_=lambda c: c and "_pagination__item_" in str(c))
-            for link in pagination_links:
-                href = link.get("href", "")
-                if f"?page={current_page + 1}" in href or f"&page={current_page + 1}" in href:
-                    next_page_link = link
-                    break
-
-            if next_page_link:
-                next_url = next_page_link["href"]
-                if not next_url.startswith("http"):
-                    next_url = "https://www.literotica.com" + next_url
-                current_url = next_url
+            if page['next_page_url']:
+                current_url = page['next_page_url']
                 current_page += 1
-                time.sleep(random.uniform(3.0, 8.0))
+                if not rate_limiter:
+                    _page_pause()
             else:
                 current_url = None
 
@@ -237,37 +220,43 @@ def _download_from_series_page(
         chapter_titles = []
         chapter_contents = []
 
-        for idx, part in enumerate(parts, 1):
-            part_url = part['url']
-            part_title = part['title']
-            log_action(f"Downloading part {idx}/{total_parts}: {part_title}")
-
-            chapter_content, chapter_metadata = _download_single_chapter(
-                part_url,
-                session,
-                is_first_chapter=(idx == 1)
-            )
-
-            if not chapter_content:
-                log_error(f"Failed to download part {idx}", part_url)
-                return None
-
-            chapter_contents.append(chapter_content)
-            chapter_titles.append(part_title)
-            total_pages += chapter_metadata['page_count']
-
-            if idx == 1:
-                story_author = chapter_metadata['author']
-                story_author_url = chapter_metadata['author_url']
-                story_category = chapter_metadata['category']
-                story_tags = chapter_metadata['tags']
-                story_description = chapter_metadata.get('description') or series_description
-
-            time.sleep(random.uniform(3.0, 8.0))
-
-        story_content = ""
-        for i, (title, content) in enumerate(zip(chapter_titles, chapter_contents), 1):
-            story_content += f"{CHAPTER_SENTINEL}CHAPTER:{i}{CHAPTER_SENTINEL}{title}\n\n{content}"
+        # Every part URL is already known, so parts are fetched concurrently:
+        # while one thread parses a page, others are waiting on the network.
+        # The shared rate limiter, not per-part sleeps, sets the overall pace.
+        with ThreadPoolExecutor(max_workers=min(SERIES_FETCH_WORKERS, total_parts)) as executor:
+            futures = [
+                executor.submit(
+                    _download_single_chapter,
+                    part['url'],
+                    session,
+                    is_first_chapter=(idx == 1),
+                    rate_limiter=global_rate_limiter
+                )
+                for idx, part in enumerate(parts, 1)
+            ]
+
+            for idx, (part, future) in enumerate(zip(parts, futures), 1):
+                chapter_content, chapter_metadata = future.result()
+                log_action(f"Downloaded part {idx}/{total_parts}: {part['title']}")
+
+                if not chapter_content:
+                    log_error(f"Failed to download part {idx}", part['url'])
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+
+                chapter_contents.append(chapter_content)
+                chapter_titles.append(part['title'])
+                total_pages += chapter_metadata['page_count']
+
+                if idx == 1:
+                    story_author = chapter_metadata['author']
+                    story_author_url = chapter_metadata['author_url']
+                    story_category = chapter_metadata['category']
+                    story_tags = chapter_metadata['tags']
+                    story_description = chapter_metadata.get('description') or series_description
+
+        story_content = join_story_chapters(zip(chapter_titles, chapter_contents))
 
         clean_title = _clean_series_title(series_title)
 
@@ -358,114 +347,38 @@ def download_story(url: str) -> tuple[Optional[str], Optional[str], Optional[str
                     response.raise_for_status()
                     response.encoding = response.charset_encoding or 'utf-8'
 
-                    soup = BeautifulSoup(response.text, "html.parser")
+                    page = extract_story_page(response.text, current_page)
 
                     if current_page == 1:
-                        title_tag = soup.find("h1", class_=lambda c: c and c.startswith("_title_"))
-                        author_tag = soup.find("a", class_=lambda c: c and "_author__title_" in str(c))
-                        current_title = title_tag.text.strip() if title_tag else "Unknown Chapter"
-
-                        import html
-                        current_title = html.unescape(current_title)
+                        current_title = page['title'] or "Unknown Chapter"
+                        chapter_titles.append(current_title)
 
                         if current_chapter == 1:
                             story_title = current_title
-                            story_author = author_tag.text.strip() if author_tag else story_author
-                            story_author = html.unescape(story_author)
-
-                            if author_tag and author_tag.get('href'):
-                                author_href = author_tag.get('href')
-                                if not author_href.startswith('http'):
-                                    story_author_url = 'https://www.literotica.com' + author_href
-                                else:
-                                    story_author_url = author_href
-
-                            breadcrumb = soup.find("nav", class_=lambda c: c and "_breadcrumbs_" in str(c))
-                            if breadcrumb:
-                                breadcrumb_items = breadcrumb.find_all("span", itemprop="name")
-                                if len(breadcrumb_items) >= 2:
-                                    story_category = breadcrumb_items[1].text.strip()
-                                    if "taboo" in story_category.lower():
-                                        story_category = "I/T"
-
-                            tag_elements = soup.find_all("a", class_=lambda c: c and "_tags__link_" in str(c))
-                            story_tags = [tag.text.strip() for tag in tag_elements
-                                        if not tag.text.strip().lower().startswith("inc")]
-                            if story_category and story_category not in story_tags:
-                                story_tags = [story_category] + story_tags
-
-                            og_desc = soup.find("meta", attrs={"property": "og:description"})
-                            if og_desc and og_desc.get("content", "").strip():
-                                story_description = og_desc.get("content").strip()
-                            else:
-                                desc_elem = soup.find("div", class_=lambda c: c and "_widget__info_" in str(c))
-                                story_description = desc_elem.get_text(strip=True) if desc_elem else None
-
-                    content_div = (
-                        soup.find(itemprop="articleBody") or
-                        soup.find("div", class_=lambda c: c and "_article__content_" in str(c))
-                    )
-                    if content_div:
-                        if current_page == 1:
-                            chapter_titles.append(current_title)
-
-                        for paragraph in content_div.find_all("p"):
-                            if paragraph.find("p"):
-                                continue
-                            current_chapter_content += paragraph.decode_contents().strip() + "\n\n"
+                            story_author = page['author'] or story_author
+                            story_author_url = page['author_url']
+                            story_category = page['category']
+                            story_tags = page['tags']
+                            story_description = page['description']
+
+                    for paragraph in page['paragraphs']:
+                        current_chapter_content += paragraph + "\n\n"
 
                     total_pages += 1
-                    next_page_link = None
-                    pagination_links = soup.find_all("a", class_=lambda c: c and "_pagination__item_" in str(c))
-                    for link in pagination_links:
-                        href = link.get("href", "")
-                        if f"?page={current_page + 1}" in href or f"&page={current_page + 1}" in href:
-                            next_page_link = link
-                            break
-
-                    if next_page_link:
-                        next_url = next_page_link["href"]
-                        if not next_url.startswith("http"):
-                            next_url = "https://www.literotica.com" + next_url
-                        current_url = next_url
+
+                    if page['next_page_url']:
+                        current_url = page['next_page_url']
                         current_page += 1
-                        time.sleep(random.uniform(3.0, 8.0))
+                        _page_pause()
                     else:
                         chapter_contents.append(current_chapter_content)
 
-                        series_section = None
-                        for section in soup.find_all("section", class_=lambda c: c and "_panel_" in str(c)):
-                            heading = section.find("h3", class_=lambda c: c and "_heading_" in str(c))
-                            if heading and heading.get_text(strip=True) == "READ MORE OF THIS SERIES":
-                                series_section = section
-                                break
-
-                        if series_section:
-                            if not series_url:
-                                series_link = series_section.find("a", href=lambda h: h and "/series/se/" in h)
-                                if series_link:
-                                    series_url = series_link.get("href", "")
-                                    if not series_url.startswith("http"):
-                                        series_url = "https://www.literotica.com" + series_url
-
-                            data_list = series_section.find("div", class_=lambda c: c and "_data_list_" in str(c))
-                            if data_list:
-                                items = data_list.find_all("div", class_=lambda c: c and "_item_" in str(c))
-
-                                for item in items:
-                                    next_part_span = item.find("span", string=lambda s: s and "Next Part" in s)
-                                    if next_part_span:
-                                        link = item.find("a", href=lambda h: h and "/s/" in h)
-                                        if link:
-                                            next_url = link.get("href", "")
-                                            if not next_url.startswith("http"):
-                                                next_url = "https://www.literotica.com" + next_url
-
-                                            base_next_url = next_url.split("?")[0]
-
-                                            if base_next_url not in processed_urls:
-                                                chapter_urls.append(base_next_url)
-                                                break
+                        if not series_url:
+                            series_url = page['series_url']
+
+                        next_part_url = page['next_part_url']
+                        if next_part_url and next_part_url not in processed_urls:
+                            chapter_urls.append(next_part_url)
 
                         current_url = None
                         current_page = 1
@@ -481,9 +394,7 @@ def download_story(url: str) -> tuple[Optional[str], Optional[str], Optional[str
                     return None, None, None, None, None, None, None, None, None
 
 
-        story_content = ""
-        for i, (title, content) in enumerate(zip(chapter_titles, chapter_contents), 1):
-            story_content += f"{CHAPTER_SENTINEL}CHAPTER:{i}{CHAPTER_SENTINEL}{title}\n\n{content}"
+        story_content = join_story_chapters(zip(chapter_titles, chapter_contents))
 
         return story_content, story_title, story_author, story_category, story_tags, story_author_url, total_pages, series_url, story_description
 
@@ -499,9 +410,6 @@ def fetch_story_metadata(url: str) -> dict:
     Returns a dict with: title, author, author_url, category, tags, page_count, series_url.
     Returns an empty dict on failure.
     """
-    import html as html_module
-    import re
-
     try:
         session = get_session()
         url = url.split('?')[0]
@@ -509,91 +417,21 @@ def fetch_story_metadata(url: str) -> dict:
         response = session.get(url, timeout=10)
         response.raise_for_status()
         response.encoding = response.charset_encoding or 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        title_tag = soup.find('h1', class_=lambda c: c and c.startswith('_title_'))
-        title = html_module.unescape(title_tag.text.strip()) if title_tag else 'Unknown Title'
-
-        author_tag = soup.find('a', class_=lambda c: c and '_author__title_' in str(c))
-        author = html_module.unescape(author_tag.text.strip()) if author_tag else 'Unknown Author'
-        author_url = None
-        if author_tag and author_tag.get('href'):
-            href = author_tag.get('href')
-            author_url = href if href.startswith('http') else 'https://www.literotica.com' + href
-
-        category = None
-        breadcrumb = soup.find('nav', class_=lambda c: c and '_breadcrumbs_' in str(c))
-        if breadcrumb:
-            items = breadcrumb.find_all('span', itemprop='name')
-            if len(items) >= 2:
-                category = items[1].text.strip()
-                if 'taboo' in category.lower():
-                    category = 'I/T'
-
-        tag_elements = soup.find_all('a', class_=lambda c: c and '_tags__link_' in str(c))
-        tags = [t.text.strip() for t in tag_elements
-                if not t.text.strip().lower().startswith('inc')]
-        if category and category not in tags:
-            tags = [category] + tags
-
-        page_count = 1
-        pagination_links = soup.find_all('a', class_=lambda c: c and '_pagination__item_' in str(c))
-        for link in pagination_links:
-            match = re.search(r'[?&]page=(\d+)', link.get('href', ''))
-            if match:
-                page_count = max(page_count, int(match.group(1)))
-
-        series_url = None
-        series_link = soup.find('a', href=lambda h: h and '/series/se/' in h)
-        if series_link:
-            href = series_link.get('href', '')
-            series_url = href if href.startswith('http') else 'https://www.literotica.com' + href
-
-        og_desc = soup.find("meta", attrs={"property": "og:description"})
-        if og_desc and og_desc.get("content", "").strip():
-            description = og_desc.get("content").strip()
-        else:
-            desc_elem = soup.find('div', class_=lambda c: c and '_widget__info_' in str(c))
-            description = desc_elem.get_text(strip=True) if desc_elem else None
-
-        score = views = favorites = comments = None
-        for item in soup.find_all(class_=lambda c: c and '_stats__item_' in str(c)):
-            icon = item.find(class_=lambda c: c and any(
-                x in str(c) for x in ('_star_', '_heart_', '_comment_', '_diagram_')
-            ))
-            if not icon:
-                continue
-            raw = item.get_text(strip=True)
-            digits = ''.join(ch for ch in raw if ch.isdigit() or ch == '.')
-            if not digits:
-                continue
-            try:
-                val = float(digits)
-            except ValueError:
-                continue
-            cls = ' '.join(icon.get('class', []))
-            if '_star_' in cls:
-                score = val
-            elif '_diagram_' in cls:
-                views = int(val)
-            elif '_heart_' in cls:
-                favorites = int(val)
-            elif '_comment_' in cls:
-                comments = int(val)
+        page = extract_story_page(response.text)
 
         return {
-            'title': title,
-            'author': author,
-            'author_url': author_url,
-            'category': category,
-            'tags': tags,
-            'page_count': page_count,
-            'series_url': series_url,
-            'description': description,
-            'score': score,
-            'views': views,
-            'favorites': favorites,
-            'comments': comments,
+            'title': page['title'] or 'Unknown Title',
+            'author': page['author'] or 'Unknown Author',
+            'author_url': page['author_url'],
+            'category': page['category'],
+            'tags': page['tags'],
+            'page_count': page['page_count'],
+            'series_url': page['series_url'],
+            'description': page['description'],
+            'score': page['score'],
+            'views': page['views'],
+            'favorites': page['favorites'],
+            'comments': page['comments'],
         }
 
     except Exception as e:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import Optional
+import hashlib
 import traceback
 import os
 import shutil
@@ -204,7 +205,6 @@ def link_story_formats(story) -> None:
     legacy "{story.filename_base}.epub/.json" exists (no ID prefix), the file is
     renamed to the canonical path before linking.
     """
-    import json as _json
     from app.models import StoryFormat
     from app.models.base import db
 
@@ -248,22 +248,16 @@ def link_story_formats(story) -> None:
     existing_json = StoryFormat.query.filter_by(story_id=story.id, format_type='json').first()
     if os.path.exists(json_path):
         if not existing_json:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = _json.load(f)
             db.session.add(StoryFormat(
                 story_id=story.id,
                 format_type='json',
                 file_path=json_path,
                 file_size=os.path.getsize(json_path),
-                json_data=_json.dumps(json_data)
             ))
             log_action(f"Added JSON format record for story ID {story.id}")
         elif existing_json.file_path != json_path:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                json_data = _json.load(f)
             existing_json.file_path = json_path
             existing_json.file_size = os.path.getsize(json_path)
-            existing_json.json_data = _json.dumps(json_data)
             log_action(f"Updated JSON path for story ID {story.id}")
 
     db.session.commit()
@@ -398,10 +392,17 @@ def _create_story_files(
             created_files.append(f"HTML: {html_file_name.split('/')[-1]}")
             log_action(f"Created HTML: {html_file_name}")
 
-        # 5. Link file paths to StoryFormat records.
+        # 5. Link file paths to StoryFormat records and record the chapter digests
+        #    the update checker compares against.
         if story is not None:
             try:
                 link_story_formats(story)
+                if story_content:
+                    from app.models.base import db
+                    from .chapter_hashes import chapter_digests, save_chapter_hashes
+                    save_chapter_hashes(story.id, chapter_digests(story_content))
+                    story.content_hash = hashlib.sha256(story_content.encode('utf-8')).hexdigest()
+                    db.session.commit()
             except Exception as e:
                 try:
                     from app.models.base import db
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 import time
 import random
@@ -11,6 +11,9 @@ import shutil
 from flask import Flask
 from app.models import Story, StoryFormat, db
 from app.services.story_downloader import download_story, extract_chapter_titles
+from app.services.chapter_hashes import (
+    ChapterDigest, chapter_digests, changed_chapters, hash_chapter, save_chapter_hashes, stored_chapter_hashes,
+)
 from app.services.logger import log_action, log_error
 from app.services.notifier import send_notification
 from app.services.epub_generator import create_epub_file
@@ -97,10 +100,75 @@ class StoryUpdateChecker:
                 except Exception as e:
                     log_error(f"Failed to prune archive file {old_file}: {e}")
 
-    def check_for_updates(self, story: Story) -> Optional[Dict]:
+    def probe_story_page(self, story: Story) -> Tuple[bool, Dict[str, Optional[str]]]:
+        """
+        Ask for the story's first page only and decide whether a full download is needed.
+
+        The request carries If-None-Match / If-Modified-Since from the last
+        probe that found the story in sync; a 304 means unchanged. Otherwise
+        the page count and a hash of the first page's text are compared with
+        what is stored. Returns (changed, probe_state); the state is only
+        saved once the story is known to be in sync (_save_probe_state), so a
+        rejected or failed update is probed as changed again next time. Any
+        fetch or parse failure counts as changed.
+        """
+        from app.services.http_client import get_session, global_rate_limiter
+        from app.services.page_extractor import extract_story_page
+
+        state = {
+            'etag': story.update_probe_etag,
+            'last_modified': story.update_probe_last_modified,
+            'hash': story.update_probe_hash,
+        }
+        headers = {}
+        if story.update_probe_etag:
+            headers['If-None-Match'] = story.update_probe_etag
+        if story.update_probe_last_modified:
+            headers['If-Modified-Since'] = story.update_probe_last_modified
+
+        try:
+            global_rate_limiter.wait_if_needed()
+            response = get_session().get(story.literotica_url, timeout=10, headers=headers)
+            if response.status_code == 304:
+                return False, state
+            response.raise_for_status()
+            response.encoding = response.charset_encoding or 'utf-8'
+            page = extract_story_page(response.text)
+        except Exception as e:
+            log_error(f"Update probe failed for '{story.title}': {str(e)}", story.literotica_url)
+            return True, state
+
+        first_page = '\n'.join(page['paragraphs'])
+        state = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'hash': hashlib.sha256(f"{page['page_count']}\n{first_page}".encode('utf-8')).hexdigest(),
+        }
+
+        if not page['paragraphs']:
+            return True, state
+        if story.literotica_page_count and page['page_count'] != story.literotica_page_count:
+            return True, state
+        # Without a stored hash (first probe) only the page count can be compared.
+        if story.update_probe_hash and story.update_probe_hash != state['hash']:
+            return True, state
+        return False, state
+
+    def _save_probe_state(self, story: Story, state: Optional[Dict[str, Optional[str]]]) -> None:
+        if state:
+            story.update_probe_etag = state['etag']
+            story.update_probe_last_modified = state['last_modified']
+            story.update_probe_hash = state['hash']
+
+    def check_for_updates(self, story: Story, probe: bool = True) -> Optional[Dict]:
         """
         Check if a story has updates available on Literotica.
 
+        With ``probe`` (the default) a one-request probe of the first page
+        runs first, and the full download only happens when it signals a
+        change. Stories without a content hash yet always get the full
+        download, which initializes it.
+
         Returns:
             Dict with update info if update found, None otherwise
         """
@@ -109,6 +177,16 @@ class StoryUpdateChecker:
             return None
 
         try:
+            probe_state = None
+            if probe and story.content_hash:
+                changed, probe_state = self.probe_story_page(story)
+                if not changed:
+                    self._save_probe_state(story, probe_state)
+                    story.last_update_check_at = datetime.utcnow()
+                    db.session.commit()
+                    log_action(f"No changes for '{story.title}' (first-page probe)")
+                    return None
+
             log_action(f"Checking for updates: '{story.title}'")
 
             story_content, _, _, _, _, _, new_page_count, _, new_description = download_story(story.literotica_url)
@@ -118,12 +196,23 @@ class StoryUpdateChecker:
                 return None
 
             content_hash = hashlib.sha256(story_content.encode('utf-8')).hexdigest()
-
-            new_chapter_count = story_content.count("\n\nChapter ")
+            digests = chapter_digests(story_content)
+            new_chapter_count = len(digests)
+            stored_hashes = stored_chapter_hashes(story.id)
+            changed = None
 
             has_update = False
 
-            if story.content_hash and story.content_hash != content_hash:
+            if stored_hashes:
+                # Per-chapter digests ignore whitespace-only differences and say which chapters changed.
+                changed = changed_chapters(stored_hashes, digests)
+                if len(stored_hashes) > new_chapter_count:
+                    # Chapters were removed; only a full rebuild drops them.
+                    has_update, changed = True, None
+                else:
+                    has_update = bool(changed)
+
+            elif story.content_hash and story.content_hash != content_hash:
                 has_update = True
 
             elif story.literotica_page_count and new_page_count and new_page_count > story.literotica_page_count:
@@ -132,7 +221,7 @@ class StoryUpdateChecker:
             elif story.chapter_count and new_chapter_count > story.chapter_count:
                 has_update = True
 
-            if not story.content_hash:
+            if not story.content_hash and not stored_hashes:
                 log_action(f"Initializing content hash for '{story.title}'")
                 has_update = False
 
@@ -143,6 +232,8 @@ class StoryUpdateChecker:
 
             if not has_update:
                 story.content_hash = content_hash
+                save_chapter_hashes(story.id, digests)
+                self._save_probe_state(story, probe_state)
                 db.session.commit()
                 return None
 
@@ -153,7 +244,9 @@ class StoryUpdateChecker:
                 'old_chapter_count': story.chapter_count,
                 'new_chapter_count': new_chapter_count,
                 'content_hash': content_hash,
-                'story_content': story_content
+                'story_content': story_content,
+                'changed_chapters': changed,
+                'probe_state': probe_state,
             }
 
         except Exception as e:
@@ -170,21 +263,28 @@ class StoryUpdateChecker:
             return self.check_for_updates(story)
 
         try:
+            from app.services.http_client import global_rate_limiter
             from app.services.series_page_checker import SeriesPageChecker
 
             log_action(f"Quick-checking series for '{story.title}'")
+            # SeriesPageChecker doesn't pace itself; the probe and download
+            # paths above take their own tokens.
+            global_rate_limiter.wait_if_needed()
             checker = SeriesPageChecker()
             series_info = checker.check_series_parts(story.literotica_series_url)
 
             if not series_info:
                 log_action(f"Series page check failed for '{story.title}', falling back")
-                return self.check_for_updates(story)
+                return self.check_for_updates(story, probe=False)
 
             new_part_count = series_info['total_parts']
 
             if story.chapter_count and new_part_count > story.chapter_count:
                 log_action(f"Update detected: {story.chapter_count} -> {new_part_count} parts")
-                return self.check_for_updates(story)
+                appendable, update_info = self._fetch_appended_parts(story, series_info)
+                if appendable:
+                    return update_info
+                return self.check_for_updates(story, probe=False)
 
             story.last_update_check_at = datetime.utcnow()
             db.session.commit()
@@ -193,7 +293,196 @@ class StoryUpdateChecker:
 
         except Exception as e:
             log_error(f"Error in series-based update check: {str(e)}")
-            return self.check_for_updates(story)
+            return self.check_for_updates(story, probe=False)
+
+    def _load_story_json(self, story: Story) -> Tuple[Optional[str], Optional[str], Optional[Dict]]:
+        """Return (json_path, epub_path, story_data) when both files exist, else Nones."""
+        import json
+
+        paths = {f.format_type: f.file_path for f in story.formats}
+        json_path, epub_path = paths.get('json'), paths.get('epub')
+        if not (json_path and epub_path and os.path.exists(json_path) and os.path.exists(epub_path)):
+            return None, None, None
+        with open(json_path, encoding='utf-8') as f:
+            return json_path, epub_path, json.load(f)
+
+    def _fetch_appended_parts(self, story: Story, series_info: Dict) -> Tuple[bool, Optional[Dict]]:
+        """
+        Download only the series parts added since the story was stored.
+
+        The story is appendable when its JSON and EPUB exist and its stored
+        chapters match the series' first parts by title; otherwise (False, None)
+        and the caller re-downloads the whole series. For an appendable story
+        returns (True, update_info), or (True, None) if a new part failed to
+        download, so the check is simply repeated next run.
+        """
+        from app.services.http_client import get_session, global_rate_limiter
+        from app.services.story_downloader import _download_single_chapter
+
+        try:
+            _, _, story_data = self._load_story_json(story)
+        except (OSError, ValueError) as e:
+            log_error(f"Could not read stored chapters for '{story.title}': {e}")
+            return False, None
+        if not story_data:
+            return False, None
+
+        stored_titles = [chapter.get('title') for chapter in story_data.get('chapters', [])]
+        parts = series_info['parts']
+        if len(stored_titles) != story.chapter_count or \
+                stored_titles != [part['title'] for part in parts[:len(stored_titles)]]:
+            log_action(f"Stored chapters of '{story.title}' don't match the series, re-downloading it")
+            return False, None
+
+        session = get_session()
+        new_parts = []
+        for part in parts[len(stored_titles):]:
+            content, metadata = _download_single_chapter(part['url'], session, rate_limiter=global_rate_limiter)
+            if not content.strip():
+                log_error(f"Failed to download new part '{part['title']}' of '{story.title}'", part['url'])
+                return True, None
+            new_parts.append({'title': part['title'], 'content': content, 'page_count': metadata['page_count']})
+
+        story.last_update_check_at = datetime.utcnow()
+        db.session.commit()
+        return True, {
+            'has_update': True,
+            'append': True,
+            'old_page_count': story.literotica_page_count,
+            'new_page_count': (story.literotica_page_count or 0) + sum(p['page_count'] for p in new_parts),
+            'old_chapter_count': len(stored_titles),
+            'new_chapter_count': len(stored_titles) + len(new_parts),
+            'new_parts': new_parts,
+            'probe_state': None,
+        }
+
+    def _append_story_parts(self, story: Story, update_info: Dict) -> bool:
+        """
+        Append downloaded parts to the story's JSON and EPUB in place.
+
+        The EPUB gains one member per part (see EpubService.append_epub_chapters);
+        the JSON is rewritten beside the original and only moved into place once
+        the EPUB has been extended, so a failure leaves both files as they were.
+        """
+        import json
+        from app.services.epub_service import EpubService
+        from app.services.story_downloader import join_story_chapters
+
+        json_path, epub_path, story_data = self._load_story_json(story)
+        if not story_data:
+            raise ValueError("stored story files are missing")
+
+        new_parts = update_info['new_parts']
+        first = len(story_data['chapters']) + 1
+        for number, part in enumerate(new_parts, first):
+            story_data['chapters'].append({
+                'number': number,
+                'title': part['title'],
+                'paragraphs': [para.strip() for para in part['content'].split("\n\n") if para.strip()],
+            })
+        added_words = len(join_story_chapters(((p['title'], p['content']) for p in new_parts), first).split())
+        story_data['word_count'] = (story_data.get('word_count') or 0) + added_words
+        story_data['page_count'] = update_info['new_page_count']
+
+        tmp_path = json_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(story_data, f, ensure_ascii=False, indent=2)
+            chapters = [(number, part['title'], part['content']) for number, part in enumerate(new_parts, first)]
+            if not EpubService.append_epub_chapters(epub_path, chapters):
+                return False
+            os.replace(tmp_path, json_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        # Rebuilt from the stored paragraphs, the way a full download of the series is hashed.
+        story_content = join_story_chapters(
+            (chapter['title'], ''.join(f"{para}\n\n" for para in chapter['paragraphs']))
+            for chapter in story_data['chapters']
+        )
+        for story_format in story.formats:
+            if story_format.format_type in ('json', 'epub'):
+                story_format.file_size = os.path.getsize(story_format.file_path)
+        story.literotica_page_count = update_info['new_page_count']
+        story.chapter_count = update_info['new_chapter_count']
+        if story.word_count:
+            story.word_count += added_words
+        story.content_hash = hashlib.sha256(story_content.encode('utf-8')).hexdigest()
+        save_chapter_hashes(story.id, [
+            ChapterDigest(number, part['title'], part['content'], hash_chapter(part['title'], part['content']),
+                          len(part['content'].split()))
+            for number, part in enumerate(new_parts, first)
+        ], replace=False)
+        story.last_metadata_refresh = datetime.utcnow()
+        db.session.commit()
+        return True
+
+    def _patch_changed_chapters(self, story: Story, update_info: Dict) -> bool:
+        """
+        Rewrite only the chapters whose digests changed, appending any new ones.
+
+        Needs chaptered content, both stored files, a stored chapter list that
+        the new content extends, and unchanged titles for the rewritten
+        chapters (so the navigation stays valid). Returns False when any of
+        that doesn't hold, leaving the files untouched.
+        """
+        import json
+        from app.services.epub_service import EpubService
+        from app.services.story_downloader import CHAPTER_SENTINEL
+
+        story_content = update_info['story_content']
+        if CHAPTER_SENTINEL not in story_content:
+            return False
+        json_path, epub_path, story_data = self._load_story_json(story)
+        if not story_data:
+            return False
+
+        digests = {d.number: d for d in chapter_digests(story_content)}
+        stored_chapters = story_data['chapters']
+        if len(stored_chapters) > len(digests):
+            return False
+
+        replaced, appended = [], []
+        for number in update_info['changed_chapters']:
+            digest = digests[number]
+            paragraphs = [para.strip() for para in digest.content.split("\n\n") if para.strip()]
+            if number <= len(stored_chapters):
+                if stored_chapters[number - 1].get('title') != digest.title:
+                    return False
+                stored_chapters[number - 1]['paragraphs'] = paragraphs
+                replaced.append((number, digest.title, digest.content))
+            else:
+                if number != len(stored_chapters) + 1:
+                    return False
+                stored_chapters.append({'number': number, 'title': digest.title, 'paragraphs': paragraphs})
+                appended.append((number, digest.title, digest.content))
+        story_data['word_count'] = len(story_content.split())
+        story_data['page_count'] = update_info['new_page_count']
+
+        tmp_path = json_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(story_data, f, ensure_ascii=False, indent=2)
+            if not EpubService.patch_epub_chapters(epub_path, replaced=replaced, appended=appended):
+                return False
+            os.replace(tmp_path, json_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        for story_format in story.formats:
+            if story_format.format_type in ('json', 'epub'):
+                story_format.file_size = os.path.getsize(story_format.file_path)
+        story.literotica_page_count = update_info['new_page_count']
+        story.chapter_count = update_info['new_chapter_count']
+        story.word_count = story_data['word_count']
+        story.content_hash = update_info['content_hash']
+        save_chapter_hashes(story.id, list(digests.values()))
+        self._save_probe_state(story, update_info.get('probe_state'))
+        story.last_metadata_refresh = datetime.utcnow()
+        db.session.commit()
+        return True
 
     def update_story(self, story: Story, update_info: Dict) -> bool:
         """
@@ -202,6 +491,19 @@ class StoryUpdateChecker:
         Returns:
             True if update successful, False otherwise
         """
+        if update_info.get('append'):
+            try:
+                if self._append_story_parts(story, update_info):
+                    log_action(f"Appended {len(update_info['new_parts'])} new parts to '{story.title}'")
+                    return True
+            except Exception as e:
+                db.session.rollback()
+                log_error(f"Failed to append new parts to '{story.title}': {str(e)}\n{traceback.format_exc()}")
+            log_action(f"Rebuilding '{story.title}' from a full download instead")
+            update_info = self.check_for_updates(story, probe=False)
+            if not (update_info and update_info.get('has_update')):
+                return False
+
         try:
             is_valid, rejection_reason = self._validate_update_content(story, update_info)
             if not is_valid:
@@ -219,6 +521,16 @@ class StoryUpdateChecker:
                 log_error(f"Content validation rejected update for '{story.title}': {rejection_reason}")
                 return False
 
+            if update_info.get('changed_chapters') is not None:
+                try:
+                    if self._patch_changed_chapters(story, update_info):
+                        log_action(f"Patched chapters {update_info['changed_chapters']} of '{story.title}'")
+                        return True
+                except Exception as e:
+                    db.session.rollback()
+                    log_error(f"Failed to patch changed chapters of '{story.title}': {str(e)}\n{traceback.format_exc()}")
+                log_action(f"Rebuilding '{story.title}' in full instead")
+
             log_action(f"Updating story: '{story.title}'")
 
             reading_progress = story.reading_progress
@@ -277,22 +589,19 @@ class StoryUpdateChecker:
                     page_count=update_info['new_page_count']
                 )
 
-                import json
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-
                 json_format = StoryFormat(
                     story_id=story.id,
                     format_type='json',
                     file_path=json_path,
                     file_size=os.path.getsize(json_path),
-                    json_data=json.dumps(json_data)
                 )
                 db.session.add(json_format)
 
                 story.literotica_page_count = update_info['new_page_count']
                 story.chapter_count = update_info['new_chapter_count']
                 story.content_hash = update_info['content_hash']
+                save_chapter_hashes(story.id, chapter_digests(story_content))
+                self._save_probe_state(story, update_info.get('probe_state'))
                 story.last_metadata_refresh = datetime.utcnow()
 
                 db.session.commit()
@@ -323,67 +632,105 @@ class StoryUpdateChecker:
             return False
 
 
-def check_all_stories_for_updates(app: Flask) -> None:
+def check_all_stories_for_updates(app: Flask, start_after: Optional[datetime] = None) -> Optional[str]:
     """
-    Check all enabled stories for updates.
-    Runs in scheduler context with Flask app context.
+    Enqueue an update check for every auto-update story.
+
+    The checks themselves run on UpdateCheckWorker, which sends the summary
+    notification and checks watched authors once the run drains. Stories
+    still queued from an earlier, unfinished run are not enqueued again.
+    ``start_after`` holds the whole run back until that time.
+
+    Returns the run id, or None when nothing was enqueued.
     """
     with app.app_context():
         try:
-            from app.models import AppConfig
-            global_enabled = AppConfig.get_bool('auto_update_enabled', default=False)
-            if not global_enabled:
-                log_action("Scheduled story update check skipped: global auto-update is disabled")
-                return
+            from uuid import uuid4
+            from app.models import UpdateCheckQueueItem
+            from app.services.config_cache import get_config_snapshot
 
-            log_action("Starting scheduled story update check")
+            if not get_config_snapshot().get('auto_update_enabled', False):
+                log_action("Scheduled story update check skipped: global auto-update is disabled")
+                return None
 
-            stories = Story.query.filter(
+            queued = db.session.query(UpdateCheckQueueItem.story_id).filter(
+                UpdateCheckQueueItem.status.in_(('pending', 'processing'))
+            )
+            story_ids = [story_id for (story_id,) in db.session.query(Story.id).filter(
                 Story.auto_update_enabled == True,
                 Story.literotica_url.isnot(None),
-                Story.is_combined == False
-            ).all()
+                Story.is_combined == False,
+                Story.id.notin_(queued)
+            ).order_by(Story.last_update_check_at.asc().nullsfirst(), Story.id)]
 
-            if not stories:
-                log_action("No stories configured for auto-updates")
-                return
-
-            log_action(f"Checking {len(stories)} stories for updates")
+            if not story_ids:
+                log_action("No stories to enqueue for the update check")
+                return None
 
-            checker = StoryUpdateChecker()
-            updates_found = []
+            run_id = uuid4().hex
+            db.session.add_all(
+                UpdateCheckQueueItem(story_id=story_id, run_id=run_id, status='pending', scheduled_after=start_after)
+                for story_id in story_ids
+            )
+            db.session.commit()
 
-            for i, story in enumerate(stories):
-                if i > 0:
-                    delay = random.randint(UPDATE_CHECK_DELAY_MIN_SECONDS, UPDATE_CHECK_DELAY_MAX_SECONDS)
-                    log_action(f"Waiting {delay} seconds before next check (rate limiting)...")
-                    time.sleep(delay)
+            when = f" starting {start_after:%Y-%m-%d %H:%M} UTC" if start_after else ""
+            log_action(f"Queued update checks for {len(story_ids)} stories (run {run_id}){when}")
 
-                update_info = checker.check_for_updates_via_series(story)
+            worker = getattr(app, 'update_check_worker', None)
+            if worker and not start_after:
+                worker.wake()
+            return run_id
 
-                if update_info and update_info.get('has_update'):
-                    log_action(f"Update found for '{story.title}': {update_info['old_chapter_count']} -> {update_info['new_chapter_count']} chapters")
+        except Exception as e:
+            db.session.rollback()
+            log_error(f"Error queuing scheduled update check: {str(e)}\n{traceback.format_exc()}")
+            send_notification(f"Story update check failed: {str(e)}", is_error=True)
+            return None
 
-                    if checker.update_story(story, update_info):
-                        updates_found.append({
-                            'title': story.title,
-                            'old_chapters': update_info['old_chapter_count'],
-                            'new_chapters': update_info['new_chapter_count']
-                        })
 
-            if updates_found:
-                summary_lines = [f"- {u['title']}: {u['old_chapters']} -> {u['new_chapters']} chapters" for u in updates_found]
-                summary = "\n".join(summary_lines)
-                send_notification(f"Story updates found ({len(updates_found)}):\n{summary}")
-                log_action(f"Update check complete: {len(updates_found)} stories updated")
-            else:
-                log_action("Update check complete: no updates found")
+def get_update_check_progress(run_id: Optional[str] = None) -> Optional[Dict]:
+    """
+    Progress of an update-check run (the most recent one by default).
 
-            _check_watched_authors_for_new_stories(app)
+    Returns counts by status and by result, or None if no run exists.
+    """
+    from sqlalchemy import func
+    from app.models import UpdateCheckQueueItem
 
-        except Exception as e:
-            log_error(f"Error in scheduled update check: {str(e)}\n{traceback.format_exc()}")
-            send_notification(f"Story update check failed: {str(e)}", is_error=True)
+    if run_id is None:
+        latest = UpdateCheckQueueItem.query.order_by(UpdateCheckQueueItem.created_at.desc(),
+                                                     UpdateCheckQueueItem.id.desc()).first()
+        if not latest:
+            return None
+        run_id = latest.run_id
+
+    rows = db.session.query(
+        UpdateCheckQueueItem.status, UpdateCheckQueueItem.result, func.count(), func.min(UpdateCheckQueueItem.created_at)
+    ).filter(UpdateCheckQueueItem.run_id == run_id).group_by(
+        UpdateCheckQueueItem.status, UpdateCheckQueueItem.result
+    ).all()
+    if not rows:
+        return None
+
+    by_status: Dict[str, int] = {}
+    by_result: Dict[str, int] = {}
+    for status, result, count, _ in rows:
+        by_status[status] = by_status.get(status, 0) + count
+        if result:
+            by_result[result] = by_result.get(result, 0) + count
+
+    total = sum(by_status.values())
+    remaining = by_status.get('pending', 0) + by_status.get('processing', 0)
+    return {
+        'run_id': run_id,
+        'started_at': min(created for *_, created in rows).isoformat(),
+        'total': total,
+        'done': total - remaining,
+        'remaining': remaining,
+        'by_status': by_status,
+        'by_result': by_result,
+    }
 
 
 def _check_watched_authors_for_new_stories(app: Flask) -> None:
@@ -0,0 +1,221 @@
+from __future__ import annotations
+import os
+import threading
+import traceback
+from datetime import datetime
+from typing import Optional
+from flask import Flask
+from app.services.job_queue import JobQueue
+
+DEFAULT_UPDATE_CHECK_SLOTS = 3
+
+# AppConfig key holding the last run whose summary was sent, so a run is
+# reported once even when several slots drain it at the same moment.
+REPORTED_RUN_KEY = 'update_check_reported_run'
+
+
+class UpdateCheckWorker:
+    """Background worker for the scheduled update check.
+
+    check_all_stories_for_updates() enqueues one UpdateCheckQueueItem per
+    story; each of `slots` threads claims items through JobQueue and checks
+    them. Request pacing across all slots (and the download and metadata
+    workers) comes from global_rate_limiter, which StoryUpdateChecker takes
+    before going upstream, so a run takes as long as its request budget
+    allows rather than a fixed sleep per story. Leases let an interrupted
+    run continue after a restart.
+    """
+
+    def __init__(self, app: Flask, poll_interval: int = 60, slots: Optional[int] = None):
+        from app.models import UpdateCheckQueueItem
+
+        self.app = app
+        self.queue = JobQueue(UpdateCheckQueueItem)
+        self.poll_interval = poll_interval
+        self.slots = slots or self._get_worker_slots()
+        self.threads: list[threading.Thread] = []
+        self.running = False
+        self._stop_event = threading.Event()
+        self._wake_events = [threading.Event() for _ in range(self.slots)]
+        self._report_lock = threading.Lock()
+
+    def start(self):
+        if any(t.is_alive() for t in self.threads):
+            return
+
+        self.running = True
+        self._stop_event.clear()
+        self.threads = [
+            threading.Thread(target=self._worker_loop, args=(slot,), daemon=True, name=f"UpdateCheckWorker-{slot}")
+            for slot in range(self.slots)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.running = False
+        self._stop_event.set()
+        for event in self._wake_events:
+            event.set()
+        for thread in self.threads:
+            thread.join(timeout=10)
+
+    def wake(self):
+        """Interrupt every slot's sleep cycle and process the queue immediately."""
+        for event in self._wake_events:
+            event.set()
+
+    def run_until_idle(self) -> None:
+        """Process runnable items on `slots` threads in the foreground until none are left."""
+        def drain():
+            while True:
+                with self.app.app_context():
+                    if not self._process_next_item():
+                        return
+
+        threads = [threading.Thread(target=drain, name=f"UpdateCheckDrain-{slot}") for slot in range(self.slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _get_worker_slots(self) -> int:
+        try:
+            return max(1, int(os.environ['UPDATE_CHECK_WORKER_SLOTS']))
+        except (KeyError, ValueError):
+            return DEFAULT_UPDATE_CHECK_SLOTS
+
+    def _worker_loop(self, slot: int = 0):
+        from .logger import log_action, log_error
+
+        log_action(f"Update check worker slot {slot} started")
+        wake_event = self._wake_events[slot]
+
+        while self.running and not self._stop_event.is_set():
+            claimed = False
+            try:
+                with self.app.app_context():
+                    claimed = self._process_next_item()
+            except Exception as e:
+                log_error(f"Error in update check worker: {str(e)}\n{traceback.format_exc()}")
+
+            if claimed:
+                continue
+
+            wake_event.wait(self.poll_interval)
+            wake_event.clear()
+
+        log_action(f"Update check worker slot {slot} stopped")
+
+    def _process_next_item(self) -> bool:
+        """Claim and check one item. Returns False when nothing was runnable."""
+        from app.models import UpdateCheckQueueItem, db
+        from .logger import log_error
+
+        item = self.queue.claim_next(progress_message='Checking for updates...')
+        if not item:
+            return False
+
+        item_id = item.id
+        run_id = item.run_id
+
+        try:
+            with self.queue.keep_alive(item_id):
+                self._check_item(item)
+            item.status = 'completed'
+            item.completed_at = datetime.utcnow()
+            item.progress_message = None
+            db.session.commit()
+
+        except Exception as e:
+            error_msg = str(e)
+            db.session.rollback()
+
+            item = db.session.get(UpdateCheckQueueItem, item_id)
+            if not item:
+                log_error(f"Failed to process update check item {item_id}: Item no longer exists")
+                return True
+
+            log_error(f"Failed to process update check item {item_id}: {error_msg}\n{traceback.format_exc()}")
+
+            item.retry_count = (item.retry_count or 0) + 1
+            if item.retry_count >= (item.max_retries or 3):
+                item.status = 'failed'
+                item.error_message = f"Failed after {item.retry_count} attempts: {error_msg}"
+                item.completed_at = datetime.utcnow()
+            else:
+                item.status = 'pending'
+                item.error_message = f"Attempt {item.retry_count} failed: {error_msg}"
+            db.session.commit()
+
+        self._report_progress(run_id)
+        return True
+
+    def _check_item(self, item) -> None:
+        from app.models import Story, db
+        from .config_cache import get_config_snapshot
+        from .logger import log_action
+        from .story_update_checker import StoryUpdateChecker
+
+        # The story or the global switch may have changed since the run was enqueued.
+        story = db.session.get(Story, item.story_id)
+        if (not story or not story.auto_update_enabled or not story.literotica_url
+                or not get_config_snapshot().get('auto_update_enabled', False)):
+            item.result = 'skipped'
+            return
+
+        checker = StoryUpdateChecker()
+        update_info = checker.check_for_updates_via_series(story)
+
+        if not (update_info and update_info.get('has_update')):
+            item.result = 'unchanged'
+            return
+
+        old_chapters = update_info['old_chapter_count']
+        new_chapters = update_info['new_chapter_count']
+        log_action(f"Update found for '{story.title}': {old_chapters} -> {new_chapters} chapters")
+        item.progress_message = 'Downloading update...'
+        db.session.commit()
+
+        if checker.update_story(story, update_info):
+            item.result = 'updated'
+            item.summary = f"{story.title}: {old_chapters} -> {new_chapters} chapters"
+        else:
+            item.result = 'update_failed'
+
+    def _report_progress(self, run_id: str) -> None:
+        """Log the run's progress; once nothing is left, send its summary and run the author checks."""
+        from app.models import AppConfig, UpdateCheckQueueItem, db
+        from .logger import log_action
+        from .notifier import send_notification
+        from .story_update_checker import _check_watched_authors_for_new_stories, get_update_check_progress
+
+        progress = get_update_check_progress(run_id)
+        log_action(f"Update check run {run_id}: {progress['done']}/{progress['total']} stories checked")
+        if progress['remaining']:
+            return
+
+        with self._report_lock:
+            reported = AppConfig.query.filter_by(key=REPORTED_RUN_KEY).first()
+            if reported and reported.value == run_id:
+                return
+            if not reported:
+                reported = AppConfig(key=REPORTED_RUN_KEY, value_type='string',
+                                     description='Last scheduled update-check run whose summary was sent')
+                db.session.add(reported)
+            reported.set_value(run_id)
+            db.session.commit()
+
+        summaries = [
+            summary for (summary,) in db.session.query(UpdateCheckQueueItem.summary)
+            .filter(UpdateCheckQueueItem.run_id == run_id, UpdateCheckQueueItem.result == 'updated')
+            .order_by(UpdateCheckQueueItem.completed_at)
+        ]
+        if summaries:
+            summary = "\n".join(f"- {line}" for line in summaries)
+            send_notification(f"Story updates found ({len(summaries)}):\n{summary}")
+            log_action(f"Update check complete: {len(summaries)} stories updated")
+        else:
+            log_action("Update check complete: no updates found")
+
+        _check_watched_authors_for_new_stories(self.app)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Files up to this size are read once and held while their entry is written;
+# larger ones are read twice (CRC pass, then copy) so memory stays flat.
+SINGLE_READ_LIMIT = 8 * 1024 * 1024
+ZIP_CHUNK_SIZE = 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_ZIP64_END_RECORD = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_LOCATOR = struct.Struct('<IIQI')
+
+_UTF8_FLAG = 0x0800
+_MAX_32 = 0xFFFFFFFF
+_MAX_16 = 0xFFFF
+_VERSION_DEFAULT = 20
+_VERSION_ZIP64 = 45
+_UNIX_FILE_ATTRS = (0o100644 & 0xFFFF) << 16
+
+ZipSource = Union[str, bytes, BinaryIO]
+
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    t = time.localtime(max(timestamp, 315532800))  # DOS dates start in 1980
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def _file_crc(f, size: int) -> int:
+    crc = 0
+    remaining = size
+    while remaining:
+        chunk = f.read(min(ZIP_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise IOError(f"{f.name} shrank while being archived")
+        crc = zlib.crc32(chunk, crc)
+        remaining -= len(chunk)
+    return crc
+
+
+def _copy_file(f, size: int) -> Iterator[bytes]:
+    remaining = size
+    while remaining:
+        chunk = f.read(min(ZIP_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise IOError(f"{f.name} shrank while being archived")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def stream_zip(entries: Iterable[Tuple[str, ZipSource]]) -> Iterator[bytes]:
+    """
+    Yield a STORED zip archive built from (arcname, source) pairs.
+
+    A source is a path on disk, in-memory bytes (e.g. a manifest) or a file
+    already opened in binary mode, which is closed once its entry is written.
+    Callers that must know up front which entries make it into the archive
+    open the files themselves and pass the handles.
+    Every entry's CRC and size are known before its local header is written,
+    so the archive never uses trailing data descriptors, which macOS Archive
+    Utility rejects. Zip64 records are added only when sizes, offsets or the
+    entry count need them. Paths that cannot be opened are skipped.
+    """
+    central: List[bytes] = []
+    offset = 0
+
+    for arcname, source in entries:
+        name = arcname.encode('utf-8')
+
+        if isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+            f = None
+            size = len(data)
+            mtime = time.time()
+        else:
+            if isinstance(source, str):
+                try:
+                    f = open(source, 'rb')
+                except OSError:
+                    continue
+            else:
+                f = source
+            st = os.fstat(f.fileno())
+            size = st.st_size
+            mtime = st.st_mtime
+            data = f.read() if size <= SINGLE_READ_LIMIT else None
+            if data is not None:
+                size = len(data)
+
+        try:
+            crc = zlib.crc32(data) if data is not None else _file_crc(f, size)
+            dos_time, dos_date = _dos_datetime(mtime)
+
+            zip64_size = size >= _MAX_32
+            version = _VERSION_ZIP64 if zip64_size else _VERSION_DEFAULT
+            local_extra = struct.pack('<HHQQ', 1, 16, size, size) if zip64_size else b''
+            header_size = _MAX_32 if zip64_size else size
+
+            yield _LOCAL_HEADER.pack(
+                0x04034B50, version, _UTF8_FLAG, 0, dos_time, dos_date,
+                crc, header_size, header_size, len(name), len(local_extra),
+            ) + name + local_extra
+
+            if data is not None:
+                yield data
+            else:
+                f.seek(0)
+                yield from _copy_file(f, size)
+        finally:
+            if f is not None:
+                f.close()
+
+        zip64_values = []
+        if zip64_size:
+            zip64_values += [size, size]
+        if offset >= _MAX_32:
+            zip64_values.append(offset)
+        central_extra = b''
+        if zip64_values:
+            version = _VERSION_ZIP64
+            central_extra = struct.pack('<HH', 1, 8 * len(zip64_values)) + struct.pack(f'<{len(zip64_values)}Q', *zip64_values)
+
+        central.append(_CENTRAL_HEADER.pack(
+            0x02014B50, (3 << 8) | version, version, _UTF8_FLAG, 0, dos_time, dos_date,
+            crc, header_size, header_size, len(name), len(central_extra), 0, 0, 0,
+            _UNIX_FILE_ATTRS, min(offset, _MAX_32),
+        ) + name + central_extra)
+
+        offset += _LOCAL_HEADER.size + len(name) + len(local_extra) + size
+
+    central_offset = offset
+    central_size = sum(len(record) for record in central)
+    yield from central
+
+    count = len(central)
+    if count >= _MAX_16 or central_size >= _MAX_32 or central_offset >= _MAX_32:
+        zip64_end_offset = central_offset + central_size
+        yield _ZIP64_END_RECORD.pack(
+            0x06064B50, _ZIP64_END_RECORD.size - 12, (3 << 8) | _VERSION_ZIP64, _VERSION_ZIP64,
+            0, 0, count, count, central_size, central_offset,
+        )
+        yield _ZIP64_LOCATOR.pack(0x07064B50, 0, zip64_end_offset, 1)
+
+    yield _END_RECORD.pack(
+        0x06054B50, 0, 0, min(count, _MAX_16), min(count, _MAX_16),
+        min(central_size, _MAX_32), min(central_offset, _MAX_32), 0,
+    )
+
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def patch_zip(path: str, patches: Dict[str, Callable[[bytes], Optional[bytes]]],
+              additions: Optional[Dict[str, bytes]] = None) -> bool:
+    """
+    Rewrite selected members of a zip file in place.
+
+    ``patches`` maps member names to a function taking the member's current
+    content and returning the new content, or None to leave it unchanged.
+    ``additions`` maps new member names to their content; they are deflated
+    and appended after the existing members, in the order given.
+    Every other member is copied as its raw compressed bytes, without being
+    inflated and deflated again, so patching a few small files costs little
+    more than copying the archive. Member order (and so an EPUB's leading
+    mimetype entry) is kept. The new archive is written beside ``path`` and
+    renamed over it. Returns False, leaving the file untouched, when no patch
+    changed anything and there was nothing to add.
+
+    Zip64 and encrypted archives aren't supported, and additions must not
+    name an existing member (ValueError).
+    """
+    additions = additions or {}
+    with zipfile.ZipFile(path) as zf:
+        infos = zf.infolist()
+        replaced: Dict[str, bytes] = {}
+        for info in infos:
+            if info.filename in additions:
+                raise ValueError(f"{path}: {info.filename} already exists")
+            patch = patches.get(info.filename)
+            if patch is None:
+                continue
+            old = zf.read(info)
+            new = patch(old)
+            if new is not None and new != old:
+                replaced[info.filename] = new
+    if not replaced and not additions:
+        return False
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.zip.tmp')
+    try:
+        with open(path, 'rb') as src, os.fdopen(fd, 'wb') as out:
+            central: List[bytes] = []
+            for info in infos:
+                if info.flag_bits & 0x01:
+                    raise ValueError(f"{path}: encrypted member {info.filename}")
+                if max(info.header_offset, info.compress_size, info.file_size) >= _MAX_32:
+                    raise ValueError(f"{path}: zip64 member {info.filename}")
+
+                name = info.filename.encode('utf-8')
+                if info.filename in replaced:
+                    data = replaced[info.filename]
+                    crc, size = zlib.crc32(data), len(data)
+                    # Patched members are deflated if they were before, otherwise stored.
+                    if info.compress_type == zipfile.ZIP_DEFLATED:
+                        data = _deflate(data)
+                        method = zipfile.ZIP_DEFLATED
+                    else:
+                        method = zipfile.ZIP_STORED
+                else:
+                    src.seek(info.header_offset)
+                    header = _LOCAL_HEADER.unpack(src.read(_LOCAL_HEADER.size))
+                    src.seek(header[-2] + header[-1], os.SEEK_CUR)
+                    data = src.read(info.compress_size)
+                    method, crc, size = info.compress_type, info.CRC, info.file_size
+
+                offset = out.tell()
+                dos_time = (info.date_time[3] << 11) | (info.date_time[4] << 5) | (info.date_time[5] // 2)
+                dos_date = ((info.date_time[0] - 1980) << 9) | (info.date_time[1] << 5) | info.date_time[2]
+                # Sizes go in the local header, so no member needs a data descriptor.
+                out.write(_LOCAL_HEADER.pack(
+                    0x04034B50, _VERSION_DEFAULT, _UTF8_FLAG, method, dos_time, dos_date,
+                    crc, len(data), size, len(name), 0,
+                ) + name)
+                out.write(data)
+                central.append(_CENTRAL_HEADER.pack(
+                    0x02014B50, (3 << 8) | _VERSION_DEFAULT, _VERSION_DEFAULT, _UTF8_FLAG, method, dos_time, dos_date,
+                    crc, len(data), size, len(name), 0, 0, 0, 0,
+                    info.external_attr or _UNIX_FILE_ATTRS, offset,
+                ) + name)
+
+            dos_time, dos_date = _dos_datetime(time.time())
+            for arcname, content in additions.items():
+                name = arcname.encode('utf-8')
+                crc, size = zlib.crc32(content), len(content)
+                data = _deflate(content)
+                offset = out.tell()
+                out.write(_LOCAL_HEADER.pack(
+                    0x04034B50, _VERSION_DEFAULT, _UTF8_FLAG, zipfile.ZIP_DEFLATED, dos_time, dos_date,
+                    crc, len(data), size, len(name), 0,
+                ) + name)
+                out.write(data)
+                central.append(_CENTRAL_HEADER.pack(
+                    0x02014B50, (3 << 8) | _VERSION_DEFAULT, _VERSION_DEFAULT, _UTF8_FLAG, zipfile.ZIP_DEFLATED,
+                    dos_time, dos_date, crc, len(data), size, len(name), 0, 0, 0, 0, _UNIX_FILE_ATTRS, offset,
+                ) + name)
+
+            central_offset = out.tell()
+            for record in central:
+                out.write(record)
+            central_size = out.tell() - central_offset
+            if len(central) >= _MAX_16 or out.tell() >= _MAX_32:
+                raise ValueError(f"{path}: patched archive would need zip64")
+            out.write(_END_RECORD.pack(
+                0x06054B50, 0, 0, len(central), len(central), central_size, central_offset, 0,
+            ))
+        # mkstemp creates the file 0600; keep the original's permissions.
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
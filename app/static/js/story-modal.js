@@ -1047,7 +1047,7 @@ async function saveMetadataChanges(storyId) {
 
               const coverImg = container.querySelector(`img[src*="/api/story/${storyId}/cover"]`);
               if (coverImg) {
-                coverImg.src = `/api/story/${storyId}/cover?t=${timestamp}`;
+                coverImg.src = _bustCoverCache(coverImg.src, timestamp);
               }
             }
           } catch (modalError) {
@@ -1114,7 +1114,14 @@ document.body.addEventListener('coverRegenerated', function(evt) {
   const timestamp = new Date().getTime();
   const libraryCovers = document.querySelectorAll(`img[src*="/api/story/${storyId}/cover"]`);
   libraryCovers.forEach(img => {
-    img.src = `/api/story/${storyId}/cover?t=${timestamp}`;
+    img.src = _bustCoverCache(img.src, timestamp);
   });
 });
 
+// Keep the ?size= variant an <img> was showing when forcing a reload.
+function _bustCoverCache(src, timestamp) {
+  const url = new URL(src, window.location.origin);
+  url.searchParams.set('t', timestamp);
+  return url.pathname + url.search;
+}
+
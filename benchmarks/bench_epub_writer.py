@@ -0,0 +1,132 @@
+"""
+Benchmark EPUB creation: ebooklib vs the direct EpubWriter.
+
+Usage:
+    python benchmarks/bench_epub_writer.py [--words 300000] [--chapters 30]
+
+ebooklib = the old create_epub_file() body: EpubHtml per chapter, then
+write_epub(), which re-parses every chapter through lxml.html.
+EpubWriter = create_epub_file() as it is now.
+
+Time is best of three; peak memory is measured separately with tracemalloc,
+which only sees Python allocations (lxml's own trees are not counted, so the
+ebooklib figure is a lower bound).
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+import warnings
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ebooklib.epub as epub
+from app.services.cover_generator import generate_cover_image
+from app.services.epub_generator import _EPUB_CSS, _xhtml, create_epub_file, format_story_content
+from app.services.story_downloader import CHAPTER_SENTINEL, split_story_chapters
+
+warnings.filterwarnings('ignore', module='ebooklib')
+
+_WORDS = ('the quiet harbor kept its lights burning through the long night while '
+          'she <em>waited</em> for the tide &amp; the boats to come home again').split()
+
+
+def _series(words: int, chapters: int) -> str:
+    # Shuffled paragraphs, so the text doesn't compress unrealistically well.
+    rng = random.Random(0)
+    paragraphs_per_chapter = max(1, words // chapters // len(_WORDS))
+    parts = []
+    for n in range(1, chapters + 1):
+        paragraphs = [' '.join(rng.sample(_WORDS, len(_WORDS))) for _ in range(paragraphs_per_chapter)]
+        parts.append(f"{CHAPTER_SENTINEL}CHAPTER:{n}{CHAPTER_SENTINEL}Part {n}\n\n" + '\n\n'.join(paragraphs))
+    return ''.join(parts)
+
+
+def _ebooklib_epub(content: str, output_directory: str, cover_path: str) -> str:
+    book = epub.EpubBook()
+    book.set_identifier(str(uuid.uuid4()))
+    book.set_title('Benchmark Series')
+    book.set_language('en')
+    book.add_author('Bench Author')
+    with open(cover_path, 'rb') as cover_file:
+        book.set_cover('cover.jpg', cover_file.read())
+    book.add_item(epub.EpubItem(uid='style_main', file_name='style/main.css', media_type='text/css',
+                                content=_EPUB_CSS))
+
+    chapters = []
+    for i, chapter_text in enumerate(split_story_chapters(content)[1:], 1):
+        title_end = chapter_text.find('\n\n')
+        chapter_title = f"Chapter {i}: {chapter_text[:title_end]}"
+        body = f'<h1>{chapter_title}</h1>\n{format_story_content(chapter_text[title_end:].strip())}'
+        chapter = epub.EpubHtml(title=chapter_title, file_name=f'chapter_{i}.xhtml',
+                                content=_xhtml(chapter_title, body))
+        book.add_item(chapter)
+        chapters.append(chapter)
+
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.toc = chapters
+    book.spine = ['nav'] + chapters
+    epub_path = os.path.join(output_directory, 'ebooklib.epub')
+    epub.write_epub(epub_path, book, {'epub3_pages': False, 'ignore_ncx': True})
+    return epub_path
+
+
+def _writer_epub(content: str, output_directory: str, cover_path: str) -> str:
+    with patch('app.services.epub_generator.send_notification'):
+        return create_epub_file('Benchmark Series', 'Bench Author', content, output_directory,
+                                cover_image_path=cover_path, filename_base='writer')
+
+
+def _best_of(fn, runs: int = 3) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _peak_mib(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--words', type=int, default=300000)
+    parser.add_argument('--chapters', type=int, default=30)
+    args = parser.parse_args()
+
+    content = _series(args.words, args.chapters)
+    workdir = tempfile.mkdtemp(prefix='litkeeper-bench-')
+    try:
+        cover_path = os.path.join(workdir, 'cover.jpg')
+        generate_cover_image('Benchmark Series', 'Bench Author', cover_path)
+
+        paths = {
+            'ebooklib': lambda: _ebooklib_epub(content, workdir, cover_path),
+            'EpubWriter': lambda: _writer_epub(content, workdir, cover_path),
+        }
+        print(f"{len(content.split()):,} words in {args.chapters} chapters ({len(content) / 1e6:.1f} MB of text)")
+        for name, fn in paths.items():
+            seconds = _best_of(fn)
+            peak = _peak_mib(fn)
+            print(f"{name:>10}: {seconds:6.3f}s  peak {peak:6.1f} MiB  size {os.path.getsize(fn()) / 1024:7.0f} KiB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark library listing serialization: ORM to_library_dict() vs project_library_dicts().
+
+Usage:
+    python benchmarks/bench_library_serializer.py [--stories 1000 10000]
+
+ORM = Story.query ... .all() followed by to_library_dict() per story (the old
+path behind /, /library/filter and /api/library).
+Projection = one column query with group_concat()ed tags and formats.
+"""
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+from app.models import db, Author, Category, Story, StoryFormat, Tag, story_tags
+from app.services.library import project_library_dicts
+
+
+def _populate(stories: int) -> None:
+    now = datetime.utcnow()
+    db.session.execute(insert(Author), [{'id': i, 'name': f'Author {i}'} for i in range(1, 501)])
+    db.session.execute(insert(Category), [{'id': i, 'name': f'Category {i}', 'slug': f'category-{i}'} for i in range(1, 21)])
+    db.session.execute(insert(Tag), [{'id': i, 'name': f'tag{i}', 'slug': f'tag{i}'} for i in range(1, 201)])
+    db.session.execute(insert(Story), [
+        {
+            'id': i, 'title': f'Synthetic Story {i}', 'author_id': i % 500 + 1, 'category_id': i % 20 + 1,
+            'filename_base': f'synthetic_story_{i}', 'word_count': 12000, 'chapter_count': 1,
+            'literotica_url': f'https://www.literotica.com/s/synthetic-story-{i}',
+            'description': 'A synthetic story used for benchmarking. ' * 4,
+            'created_at': now, 'updated_at': now,
+        }
+        for i in range(1, stories + 1)
+    ])
+    db.session.execute(insert(StoryFormat), [
+        {'story_id': i, 'format_type': kind, 'file_path': f'/library/{kind}/{i}.{kind}', 'file_size': 50000,
+         'created_at': now, 'updated_at': now}
+        for i in range(1, stories + 1) for kind in ('epub', 'json')
+    ])
+    db.session.execute(insert(story_tags), [
+        {'story_id': i, 'tag_id': (i + offset) % 200 + 1}
+        for i in range(1, stories + 1) for offset in range(5)
+    ])
+    db.session.commit()
+
+
+def _orm_path() -> list:
+    db.session.expire_all()
+    return [s.to_library_dict() for s in Story.query.order_by(Story.created_at.desc(), Story.id.desc()).all()]
+
+
+def _projection_path() -> list:
+    return project_library_dicts(order_by=(Story.created_at.desc(), Story.id.desc()))
+
+
+def _best_of(fn, runs: int = 3) -> float:
+    timings = []
+    for _ in range(runs):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--stories', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    for count in args.stories:
+        workdir = tempfile.mkdtemp(prefix='litkeeper-bench-')
+        try:
+            app = Flask(__name__)
+            app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+            db.init_app(app)
+
+            with app.app_context():
+                db.create_all()
+                _populate(count)
+                assert len(_orm_path()) == len(_projection_path()) == count
+
+                orm = _best_of(_orm_path)
+                projection = _best_of(_projection_path)
+
+            print(f"{count:>6} stories  ORM: {orm:7.3f}s  projection: {projection:7.3f}s  ({orm / projection:4.1f}x)")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
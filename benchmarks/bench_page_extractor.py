@@ -0,0 +1,113 @@
+"""
+Benchmark story-page extraction: the previous BeautifulSoup/html.parser walk
+vs. page_extractor.extract_story_page() (lxml + compiled XPath, one pass).
+
+Usage:
+    python benchmarks/bench_page_extractor.py [--repeat 2000] [--paragraphs 0]
+
+The page is tests/fixtures/sample_html_response.html. --paragraphs N appends N
+extra body paragraphs, approximating a full-length chapter page.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from app.services.page_extractor import extract_story_page
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'tests', 'fixtures', 'sample_html_response.html',
+)
+
+
+def _legacy_extract(markup: str, current_page: int = 1) -> dict:
+    """The per-page parse story_downloader did before page_extractor existed."""
+    soup = BeautifulSoup(markup, "html.parser")
+
+    author_tag = soup.find("a", class_=lambda c: c and "_author__title_" in str(c))
+    author = author_tag.text.strip() if author_tag else None
+
+    category = None
+    breadcrumb = soup.find("nav", class_=lambda c: c and "_breadcrumbs_" in str(c))
+    if breadcrumb:
+        items = breadcrumb.find_all("span", itemprop="name")
+        if len(items) >= 2:
+            category = items[1].text.strip()
+
+    tag_elements = soup.find_all("a", class_=lambda c: c and "_tags__link_" in str(c))
+    tags = [t.text.strip() for t in tag_elements if not t.text.strip().lower().startswith("inc")]
+
+    og_desc = soup.find("meta", attrs={"property": "og:description"})
+    if og_desc and og_desc.get("content", "").strip():
+        description = og_desc.get("content").strip()
+    else:
+        desc_elem = soup.find("div", class_=lambda c: c and "_widget__info_" in str(c))
+        description = desc_elem.get_text(strip=True) if desc_elem else None
+
+    paragraphs = []
+    content_div = (
+        soup.find(itemprop="articleBody") or
+        soup.find("div", class_=lambda c: c and "_article__content_" in str(c))
+    )
+    if content_div:
+        for paragraph in content_div.find_all("p"):
+            if paragraph.find("p"):
+                continue
+            paragraphs.append(paragraph.decode_contents().strip())
+
+    next_page = None
+    for link in soup.find_all("a", class_=lambda c: c and "_pagination__item_" in str(c)):
+        href = link.get("href", "")
+        if f"?page={current_page + 1}" in href or f"&page={current_page + 1}" in href:
+            next_page = href
+            break
+
+    return {'author': author, 'category': category, 'tags': tags,
+            'description': description, 'paragraphs': paragraphs, 'next_page_url': next_page}
+
+
+def _load_page(extra_paragraphs: int) -> str:
+    with open(FIXTURE, encoding='utf-8') as f:
+        markup = f.read()
+    if extra_paragraphs:
+        filler = ''.join(
+            f'<p>Filler paragraph {i} with <em>some</em> inline markup &amp; entities.</p>\n'
+            for i in range(extra_paragraphs)
+        )
+        markup = markup.replace('</p>\n        </div>', '</p>\n' + filler + '        </div>', 1)
+    return markup
+
+
+def _time(fn, markup: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(markup)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--paragraphs', type=int, default=0)
+    args = parser.parse_args()
+
+    markup = _load_page(args.paragraphs)
+    legacy = _legacy_extract(markup)
+    current = extract_story_page(markup)
+    assert legacy['paragraphs'] == current['paragraphs'], "paragraph output differs"
+
+    print(f"Page size: {len(markup)} bytes, {len(current['paragraphs'])} paragraphs, {args.repeat} iterations")
+    legacy_time = _time(_legacy_extract, markup, args.repeat)
+    current_time = _time(extract_story_page, markup, args.repeat)
+    print(f"html.parser + lambda find_all: {legacy_time * 1e6:9.1f} us/page")
+    print(f"lxml + compiled XPath:         {current_time * 1e6:9.1f} us/page")
+    print(f"Speedup:                       {legacy_time / current_time:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Clear duplicated story JSON from story_formats.json_data
+
+The JSON file on disk is the source of truth; the DB copy doubled storage and
+was pulled into memory by every Story query. The column is kept (deferred in
+the model) so older rows can still be read, but its contents are cleared and
+the freed pages returned to the filesystem.
+
+Rows whose file is missing get the DB copy written back to file_path first;
+a row is only cleared once its file exists, so no story text is lost.
+
+Revision ID: 20261017a
+Revises: 91eb3b2b1034
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+import logging
+import os
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017a'
+down_revision = '91eb3b2b1034'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_columns = {col['name'] for col in inspector.get_columns('story_formats')}
+    if 'json_data' not in existing_columns:
+        return
+
+    rows = conn.execute(sa.text(
+        "SELECT id, file_path FROM story_formats WHERE json_data IS NOT NULL"
+    )).fetchall()
+
+    clearable = []
+    for format_id, file_path in rows:
+        if file_path and not os.path.exists(file_path):
+            json_data = conn.execute(
+                sa.text("SELECT json_data FROM story_formats WHERE id = :id"), {'id': format_id}
+            ).scalar()
+            try:
+                os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(json_data)
+            except OSError as e:
+                logger.warning(f"Keeping json_data for story_formats.id={format_id}: could not write {file_path}: {e}")
+                continue
+        if file_path:
+            clearable.append(format_id)
+
+    # StoryFormat.load_json_data() reads the file at file_path; rows without a
+    # usable file keep their DB copy as the fallback it already reads.
+    if clearable:
+        conn.execute(
+            sa.text("UPDATE story_formats SET json_data = NULL WHERE id = :id"),
+            [{'id': format_id} for format_id in clearable],
+        )
+
+    if conn.dialect.name == 'sqlite':
+        with op.get_context().autocommit_block():
+            op.execute("VACUUM")
+
+
+def downgrade():
+    # Nothing to restore: the story JSON still lives on disk.
+    pass
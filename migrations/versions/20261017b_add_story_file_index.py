@@ -0,0 +1,45 @@
+"""Add story_file_index table for incremental file scans
+
+Revision ID: 20261017b
+Revises: 20261017a
+Create Date: 2026-10-17 00:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017b'
+down_revision = '20261017a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'story_file_index' not in existing_tables:
+        op.create_table(
+            'story_file_index',
+            sa.Column('path', sa.String(length=1024), nullable=False),
+            sa.Column('file_type', sa.String(length=10), nullable=False),
+            sa.Column('mtime', sa.Float(), nullable=False),
+            sa.Column('size', sa.Integer(), nullable=False),
+            sa.Column('inode', sa.BigInteger(), nullable=False),
+            sa.Column('extracted_metadata', sa.Text(), nullable=True),
+            sa.Column('indexed_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('path'),
+        )
+        op.create_index('ix_story_file_index_file_type', 'story_file_index', ['file_type'])
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'story_file_index' in existing_tables:
+        op.drop_index('ix_story_file_index_file_type', table_name='story_file_index')
+        op.drop_table('story_file_index')
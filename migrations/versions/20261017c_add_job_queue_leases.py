@@ -0,0 +1,67 @@
+"""Add lease_expires_at and claim indexes to the job queue tables
+
+Revision ID: 20261017c
+Revises: 20261017b
+Create Date: 2026-10-17 00:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017c'
+down_revision = '20261017b'
+branch_labels = None
+depends_on = None
+
+
+# table -> (claim index name, indexed columns)
+QUEUE_TABLES = {
+    'download_queue': ('ix_download_queue_claim', ['status', 'scheduled_after', 'created_at']),
+    'format_queue': ('ix_format_queue_claim', ['status', 'created_at']),
+    'metadata_refresh_queue': ('ix_metadata_refresh_queue_claim', ['status', 'created_at']),
+}
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    for table, (index_name, index_columns) in QUEUE_TABLES.items():
+        if table not in existing_tables:
+            continue
+        columns = [col['name'] for col in inspector.get_columns(table)]
+        indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            if 'lease_expires_at' not in columns:
+                batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+        if index_name not in indexes:
+            op.create_index(index_name, table, index_columns)
+
+        # Anything still 'processing' was orphaned by the previous run; let it be reclaimed at once.
+        op.execute(
+            f"UPDATE {table} SET lease_expires_at = CURRENT_TIMESTAMP "
+            f"WHERE status = 'processing' AND lease_expires_at IS NULL"
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    for table, (index_name, _) in QUEUE_TABLES.items():
+        if table not in existing_tables:
+            continue
+        columns = [col['name'] for col in inspector.get_columns(table)]
+        indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+
+        if index_name in indexes:
+            op.drop_index(index_name, table_name=table)
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            if 'lease_expires_at' in columns:
+                batch_op.drop_column('lease_expires_at')
@@ -0,0 +1,53 @@
+"""Add story_tombstones table and stories.updated_at index for delta sync
+
+Revision ID: 20261017d
+Revises: 20261017c
+Create Date: 2026-10-17 00:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017d'
+down_revision = '20261017c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'story_tombstones' not in existing_tables:
+        op.create_table(
+            'story_tombstones',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('story_id', sa.Integer(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_story_tombstones_story_id', 'story_tombstones', ['story_id'])
+        op.create_index('ix_story_tombstones_deleted_at', 'story_tombstones', ['deleted_at'])
+
+    if 'stories' in existing_tables:
+        indexes = [idx['name'] for idx in inspector.get_indexes('stories')]
+        if 'ix_stories_updated_at' not in indexes:
+            op.create_index('ix_stories_updated_at', 'stories', ['updated_at'])
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'stories' in existing_tables:
+        indexes = [idx['name'] for idx in inspector.get_indexes('stories')]
+        if 'ix_stories_updated_at' in indexes:
+            op.drop_index('ix_stories_updated_at', table_name='stories')
+
+    if 'story_tombstones' in existing_tables:
+        op.drop_index('ix_story_tombstones_deleted_at', table_name='story_tombstones')
+        op.drop_index('ix_story_tombstones_story_id', table_name='story_tombstones')
+        op.drop_table('story_tombstones')
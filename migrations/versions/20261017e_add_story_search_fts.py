@@ -0,0 +1,33 @@
+"""Add story_search FTS5 table for library search
+
+Revision ID: 20261017e
+Revises: 20261017d
+Create Date: 2026-10-17 00:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017e'
+down_revision = '20261017d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The index is filled on the next startup by search_index.sync_search_index(),
+    # which needs the story JSON files on disk.
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS story_search USING fts5("
+        "title, author, category, tags, description, body, indexed_version UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'story_search' in inspector.get_table_names():
+        op.execute('DROP TABLE story_search')
@@ -0,0 +1,48 @@
+"""Add case-insensitive name indexes for author and category sorting
+
+Revision ID: 20261017f
+Revises: 20261017e
+Create Date: 2026-10-17 00:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017f'
+down_revision = '20261017e'
+branch_labels = None
+depends_on = None
+
+
+# table -> index name
+NAME_INDEXES = {
+    'authors': 'ix_authors_name_nocase',
+    'categories': 'ix_categories_name_nocase',
+}
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    for table, index_name in NAME_INDEXES.items():
+        if table not in existing_tables:
+            continue
+        indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+        if index_name not in indexes:
+            op.create_index(index_name, table, [sa.text('name COLLATE NOCASE')])
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    for table, index_name in NAME_INDEXES.items():
+        if table not in existing_tables:
+            continue
+        indexes = [idx['name'] for idx in inspector.get_indexes(table)]
+        if index_name in indexes:
+            op.drop_index(index_name, table_name=table)
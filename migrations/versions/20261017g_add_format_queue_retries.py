@@ -0,0 +1,45 @@
+"""Add retry_count and max_retries to format_queue for lease reclaims
+
+Revision ID: 20261017g
+Revises: 20261017f
+Create Date: 2026-10-17 00:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017g'
+down_revision = '20261017f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'format_queue' not in inspector.get_table_names():
+        return
+    columns = [col['name'] for col in inspector.get_columns('format_queue')]
+
+    with op.batch_alter_table('format_queue', schema=None) as batch_op:
+        if 'retry_count' not in columns:
+            batch_op.add_column(sa.Column('retry_count', sa.Integer(), nullable=True, server_default='0'))
+        if 'max_retries' not in columns:
+            batch_op.add_column(sa.Column('max_retries', sa.Integer(), nullable=True, server_default='3'))
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'format_queue' not in inspector.get_table_names():
+        return
+    columns = [col['name'] for col in inspector.get_columns('format_queue')]
+
+    with op.batch_alter_table('format_queue', schema=None) as batch_op:
+        if 'max_retries' in columns:
+            batch_op.drop_column('max_retries')
+        if 'retry_count' in columns:
+            batch_op.drop_column('retry_count')
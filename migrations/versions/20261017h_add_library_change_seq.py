@@ -0,0 +1,61 @@
+"""Add a commit-ordered change sequence for library delta sync
+
+stories.change_seq and story_tombstones.change_seq hold the value of
+library_change_counter for the transaction that last touched the row.
+Existing rows start at 0; clients holding an old timestamp cursor get one
+full listing and a sequence cursor back.
+
+Revision ID: 20261017h
+Revises: 20261017g
+Create Date: 2026-10-17 00:07:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017h'
+down_revision = '20261017g'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'library_change_counter' not in existing_tables:
+        op.create_table(
+            'library_change_counter',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('value', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+    for table in ('stories', 'story_tombstones'):
+        if table not in existing_tables:
+            continue
+        existing_columns = {col['name'] for col in inspector.get_columns(table)}
+        if 'change_seq' not in existing_columns:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.add_column(sa.Column('change_seq', sa.Integer(), nullable=False, server_default='0'))
+                batch_op.create_index(f'ix_{table}_change_seq', ['change_seq'], unique=False)
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    for table in ('story_tombstones', 'stories'):
+        if table not in existing_tables:
+            continue
+        existing_columns = {col['name'] for col in inspector.get_columns(table)}
+        if 'change_seq' in existing_columns:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.drop_index(f'ix_{table}_change_seq')
+                batch_op.drop_column('change_seq')
+
+    if 'library_change_counter' in existing_tables:
+        op.drop_table('library_change_counter')
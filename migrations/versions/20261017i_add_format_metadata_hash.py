@@ -0,0 +1,42 @@
+"""Add story_formats.metadata_hash for skipping unchanged files in metadata sync
+
+Existing rows start NULL, so the first sync after upgrade checks every file
+once and records the hash.
+
+Revision ID: 20261017i
+Revises: 20261017h
+Create Date: 2026-10-17 00:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017i'
+down_revision = '20261017h'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'story_formats' not in inspector.get_table_names():
+        return
+
+    existing_columns = {col['name'] for col in inspector.get_columns('story_formats')}
+    if 'metadata_hash' not in existing_columns:
+        with op.batch_alter_table('story_formats', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('metadata_hash', sa.String(length=40), nullable=True))
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'story_formats' not in inspector.get_table_names():
+        return
+
+    existing_columns = {col['name'] for col in inspector.get_columns('story_formats')}
+    if 'metadata_hash' in existing_columns:
+        with op.batch_alter_table('story_formats', schema=None) as batch_op:
+            batch_op.drop_column('metadata_hash')
@@ -0,0 +1,52 @@
+"""Add update probe state to stories
+
+update_probe_etag, update_probe_last_modified and update_probe_hash let the
+scheduled update check ask for a story's first page conditionally and skip
+the full download when nothing changed. Existing rows start NULL; their first
+probe records the state.
+
+Revision ID: 20261017j
+Revises: 20261017i
+Create Date: 2026-10-17 00:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017j'
+down_revision = '20261017i'
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    ('update_probe_etag', 255),
+    ('update_probe_last_modified', 64),
+    ('update_probe_hash', 64),
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'stories' not in inspector.get_table_names():
+        return
+
+    existing_columns = {col['name'] for col in inspector.get_columns('stories')}
+    with op.batch_alter_table('stories', schema=None) as batch_op:
+        for name, length in _COLUMNS:
+            if name not in existing_columns:
+                batch_op.add_column(sa.Column(name, sa.String(length=length), nullable=True))
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'stories' not in inspector.get_table_names():
+        return
+
+    existing_columns = {col['name'] for col in inspector.get_columns('stories')}
+    with op.batch_alter_table('stories', schema=None) as batch_op:
+        for name, _ in reversed(_COLUMNS):
+            if name in existing_columns:
+                batch_op.drop_column(name)
@@ -0,0 +1,65 @@
+"""Add update_check_queue table for queued scheduled update checks
+
+Each scheduled update-check run enqueues one row per auto-update story, which
+UpdateCheckWorker processes with a few concurrent slots under the shared rate
+limiter. Leases let a run pick up where it left off after a restart.
+
+Revision ID: 20261017k
+Revises: 20261017j
+Create Date: 2026-10-17 00:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017k'
+down_revision = '20261017j'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'update_check_queue' not in existing_tables:
+        op.create_table(
+            'update_check_queue',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('story_id', sa.Integer(), nullable=False),
+            sa.Column('run_id', sa.String(length=32), nullable=False),
+            sa.Column('status', sa.String(length=50), nullable=False),
+            sa.Column('result', sa.String(length=20), nullable=True),
+            sa.Column('progress_message', sa.String(length=255), nullable=True),
+            sa.Column('error_message', sa.Text(), nullable=True),
+            sa.Column('summary', sa.String(length=255), nullable=True),
+            sa.Column('scheduled_after', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+            sa.Column('retry_count', sa.Integer(), nullable=True),
+            sa.Column('max_retries', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['story_id'], ['stories.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_update_check_queue_story_id', 'update_check_queue', ['story_id'])
+        op.create_index('ix_update_check_queue_run_id', 'update_check_queue', ['run_id'])
+        op.create_index('ix_update_check_queue_status', 'update_check_queue', ['status'])
+        op.create_index('ix_update_check_queue_claim', 'update_check_queue', ['status', 'created_at'])
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'update_check_queue' in existing_tables:
+        op.drop_index('ix_update_check_queue_claim', table_name='update_check_queue')
+        op.drop_index('ix_update_check_queue_status', table_name='update_check_queue')
+        op.drop_index('ix_update_check_queue_run_id', table_name='update_check_queue')
+        op.drop_index('ix_update_check_queue_story_id', table_name='update_check_queue')
+        op.drop_table('update_check_queue')
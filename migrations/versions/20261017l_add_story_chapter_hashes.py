@@ -0,0 +1,47 @@
+"""Add story_chapter_hashes table for per-chapter change detection
+
+One row per chapter with a digest of its whitespace-normalized text, written
+whenever a story is downloaded or updated. The update checker compares them
+to tell which chapters changed instead of treating any difference in the
+whole-story content_hash as a full rewrite. Existing stories get their rows
+on their next download or update check.
+
+Revision ID: 20261017l
+Revises: 20261017k
+Create Date: 2026-10-17 00:11:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261017l'
+down_revision = '20261017k'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'story_chapter_hashes' not in existing_tables:
+        op.create_table(
+            'story_chapter_hashes',
+            sa.Column('story_id', sa.Integer(), nullable=False),
+            sa.Column('chapter_no', sa.Integer(), nullable=False),
+            sa.Column('hash', sa.String(length=64), nullable=False),
+            sa.Column('word_count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['story_id'], ['stories.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('story_id', 'chapter_no'),
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    if 'story_chapter_hashes' in existing_tables:
+        op.drop_table('story_chapter_hashes')
@@ -35,6 +35,9 @@ def app(temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Flask:
     monkeypatch.setenv("ENABLE_ACTION_LOG", "false")
     monkeypatch.setenv("ENABLE_ERROR_LOG", "false")
     monkeypatch.setenv("ENABLE_URL_LOG", "false")
+    # Queue workers, the scheduler and startup threads would race the tests for
+    # the same rows (and outlive the app), so tests drive workers explicitly.
+    monkeypatch.setenv("SKIP_BACKGROUND_WORKERS", "true")
 
     data_dir = temp_dir / "data"
     data_dir.mkdir()
@@ -48,7 +51,7 @@ def app(temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Flask:
     monkeypatch.setattr(paths_module, "get_epub_directory", lambda: str(data_dir / "epubs"))
     monkeypatch.setattr(paths_module, "get_html_directory", lambda: str(data_dir / "html"))
     monkeypatch.setattr(paths_module, "get_cover_directory", lambda: str(data_dir / "covers"))
-    monkeypatch.setattr(paths_module, "get_logs_directory", lambda: str(data_dir / "logs"))
+    monkeypatch.setattr(paths_module, "get_logs_directory", lambda: str(data_dir / "logs"), raising=False)
 
     flask_app = create_app()
     flask_app.config["TESTING"] = True
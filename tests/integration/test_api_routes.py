@@ -371,6 +371,30 @@ class TestCoverEndpoint:
             assert response.status_code == 200
             assert 'image/jpeg' in response.content_type
 
+    def test_cover_size_variants_and_webp(self, client: FlaskClient, app: Flask) -> None:
+        """?size= serves a downscaled copy, WebP only when asked for, with a stable ETag."""
+        import io
+        from PIL import Image
+
+        with app.app_context():
+            from app.utils import get_cover_directory
+            cover_path = Path(get_cover_directory()) / "variant-story.jpg"
+            Image.new('RGB', (600, 800), (200, 40, 40)).save(cover_path, 'JPEG', quality=95)
+
+        grid = client.get('/api/cover/variant-story.jpg?size=grid', headers={'Accept': '*/*'})
+        assert grid.content_type == 'image/jpeg'
+        assert Image.open(io.BytesIO(grid.data)).size == (300, 400)
+        assert len(grid.data) < cover_path.stat().st_size
+
+        webp = client.get('/api/cover/variant-story.jpg?size=thumb', headers={'Accept': 'image/webp,*/*'})
+        assert webp.content_type == 'image/webp'
+        assert Image.open(io.BytesIO(webp.data)).size == (150, 200)
+        assert 'Accept' in webp.headers['Vary']
+
+        repeat = client.get('/api/cover/variant-story.jpg?size=grid', headers={'If-None-Match': grid.headers['ETag']})
+        assert repeat.status_code == 304
+        assert client.get('/api/cover/variant-story.jpg?size=huge').status_code == 400
+
     def test_cover_generates_if_missing(self, client: FlaskClient, app: Flask) -> None:
         """Cover is generated if not found."""
         with app.app_context():
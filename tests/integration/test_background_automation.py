@@ -0,0 +1,145 @@
+from __future__ import annotations
+import pytest
+from pathlib import Path
+from flask import Flask
+from sqlalchemy import event
+
+
+@pytest.fixture
+def story_dirs(app: Flask, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> dict[str, Path]:
+    """Point every module that imports the directory helpers by name at the test data dir."""
+    import app.utils as utils_module
+    import app.services.story_processor as story_processor_module
+    import app.services.migration.migrate_covers_to_id_prefix as covers_module
+
+    data_dir = temp_dir / "data"
+    dirs = {'epub': data_dir / "epubs", 'json': data_dir / "html", 'cover': data_dir / "covers"}
+    for module in (utils_module, story_processor_module):
+        monkeypatch.setattr(module, "get_epub_directory", lambda: str(dirs['epub']))
+        monkeypatch.setattr(module, "get_html_directory", lambda: str(dirs['json']))
+    monkeypatch.setattr(covers_module, "get_cover_directory", lambda: str(dirs['cover']))
+    return dirs
+
+
+def _add_stories(dirs: dict[str, Path], count: int, formats: tuple[str, ...] = ('epub', 'json')) -> list[int]:
+    from app.models import db, Author, Story, StoryFormat
+
+    author = Author.query.filter_by(name='Heal Test Author').first()
+    if not author:
+        author = Author(name='Heal Test Author')
+        db.session.add(author)
+        db.session.flush()
+
+    ids = []
+    for _ in range(count):
+        story = Story(title='Heal Story', author_id=author.id, filename_base='heal_story')
+        db.session.add(story)
+        db.session.flush()
+        (dirs['cover'] / f"{story.id}_heal_story.jpg").write_bytes(b'jpg')
+        for format_type in formats:
+            path = dirs[format_type] / f"{story.id}_heal_story.{format_type}"
+            path.write_text('{}')
+            db.session.add(StoryFormat(story_id=story.id, format_type=format_type, file_path=str(path), file_size=2))
+        ids.append(story.id)
+    db.session.commit()
+    return ids
+
+
+def _clear_library() -> None:
+    from app.models import db, Story, FormatQueueItem
+
+    for story in Story.query.all():
+        db.session.delete(story)
+    FormatQueueItem.query.delete()
+    db.session.commit()
+
+
+def _count_queries(app: Flask, fn) -> int:
+    from app.models import db
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, 'before_cursor_execute', _record)
+    return len(statements)
+
+
+@pytest.mark.integration
+class TestHealMissingFormats:
+    """BackgroundAutomation._heal_missing_formats() runs as set-based queries."""
+
+    def test_query_count_is_constant(self, app: Flask, story_dirs: dict[str, Path]) -> None:
+        """A healthy library costs the same number of queries at any size."""
+        from app.services.background_automation import BackgroundAutomation
+
+        automation = BackgroundAutomation(app)
+        with app.app_context():
+            _clear_library()
+
+            _add_stories(story_dirs, 3)
+            small = _count_queries(app, automation._heal_missing_formats)
+
+            _add_stories(story_dirs, 30)
+            large = _count_queries(app, automation._heal_missing_formats)
+
+        assert small == large
+        assert large <= 5
+
+    def test_queues_missing_formats_once(self, app: Flask, story_dirs: dict[str, Path]) -> None:
+        """Stories with only one format get exactly one pending generation job."""
+        from app.models import FormatQueueItem
+        from app.services.background_automation import BackgroundAutomation
+
+        automation = BackgroundAutomation(app)
+        with app.app_context():
+            _clear_library()
+
+            [json_only] = _add_stories(story_dirs, 1, formats=('json',))
+            [epub_only] = _add_stories(story_dirs, 1, formats=('epub',))
+            _add_stories(story_dirs, 2)
+
+            automation._heal_missing_formats()
+            automation._heal_missing_formats()
+
+            jobs = sorted(
+                (job.story_id, job.job_type)
+                for job in FormatQueueItem.query.filter_by(status='pending').all()
+            )
+
+        assert jobs == sorted([(json_only, 'generate_epub'), (epub_only, 'generate_json')])
+
+
+@pytest.mark.integration
+class TestCleanupOrphanedCovers:
+    """BackgroundAutomation._cleanup_orphaned_covers() removes covers with nothing referencing them."""
+
+    def test_orphan_and_its_variants_are_removed(self, app: Flask, story_dirs: dict[str, Path],
+                                                 monkeypatch: pytest.MonkeyPatch) -> None:
+        """An orphaned cover's .variants files go with it; a referenced cover's stay."""
+        import app.utils as utils_module
+        from app.services.background_automation import BackgroundAutomation
+
+        monkeypatch.setattr(utils_module, "get_cover_directory", lambda: str(story_dirs['cover']))
+        variants = story_dirs['cover'] / '.variants'
+        for path in story_dirs.values():
+            path.mkdir(parents=True, exist_ok=True)
+        variants.mkdir(exist_ok=True)
+
+        with app.app_context():
+            _clear_library()
+            [story_id] = _add_stories(story_dirs, 1)
+            (story_dirs['cover'] / 'gone_story.jpg').write_bytes(b'jpg')
+            for stem in ('gone_story', f'{story_id}_heal_story'):
+                (variants / f'{stem}.thumb.webp').write_bytes(b'webp')
+
+            BackgroundAutomation(app)._cleanup_orphaned_covers()
+
+        assert sorted(p.name for p in story_dirs['cover'].glob('*.jpg')) == [f'{story_id}_heal_story.jpg']
+        assert [p.name for p in variants.iterdir()] == [f'{story_id}_heal_story.thumb.webp']
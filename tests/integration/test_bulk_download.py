@@ -0,0 +1,102 @@
+from __future__ import annotations
+import base64
+import io
+import json
+import sys
+import zipfile
+import pytest
+from pathlib import Path
+from flask import Flask
+from flask.testing import FlaskClient
+
+
+def _add_stories(app: Flask, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    from app.models import db, Author, Story, StoryFormat
+
+    data_dir = temp_dir / 'data'
+    monkeypatch.setattr(sys.modules['app.blueprints.api.routes'], 'get_cover_directory',
+                        lambda: str(data_dir / 'covers'))
+
+    with app.app_context():
+        for story in Story.query.all():
+            db.session.delete(story)
+        author = Author.query.filter_by(name='Bulk Author').first() or Author(name='Bulk Author')
+        db.session.add(author)
+        db.session.flush()
+
+        ids = []
+        for name in ('first', 'second'):
+            epub_path = data_dir / 'epubs' / f'{name}.epub'
+            epub_path.write_bytes(f'PK\x03\x04{name}'.encode())
+            json_path = data_dir / 'html' / f'{name}.json'
+            json_path.write_text(json.dumps({'title': name}))
+            story = Story(title=name, author_id=author.id, filename_base=name)
+            story.formats.append(StoryFormat(format_type='epub', file_path=str(epub_path)))
+            story.formats.append(StoryFormat(format_type='json', file_path=str(json_path)))
+            db.session.add(story)
+            db.session.flush()
+            (data_dir / 'covers' / f'{story.id}_{name}.jpg').write_bytes(b'\xff\xd8cover')
+            ids.append(story.id)
+        db.session.commit()
+        return ids
+
+
+@pytest.mark.integration
+class TestBulkDownload:
+    """Test /api/download/bulk in its zip and legacy JSON forms."""
+
+    def test_zip_streams_manifest_and_files(self, client: FlaskClient, app: Flask, temp_dir: Path,
+                                            monkeypatch: pytest.MonkeyPatch) -> None:
+        """format=zip streams a manifest plus each story's files from disk."""
+        first_id, second_id = _add_stories(app, temp_dir, monkeypatch)
+
+        response = client.get(f'/api/download/bulk?ids={first_id},{second_id}&format=zip')
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            assert zf.namelist()[0] == 'manifest.json'
+            manifest = json.loads(zf.read('manifest.json'))
+            entry = manifest['stories'][str(first_id)]
+            assert zf.read(entry['epub']) == b'PK\x03\x04first'
+            assert zf.read(entry['cover']) == b'\xff\xd8cover'
+            assert json.loads(zf.read(entry['html'])) == {'title': 'first'}
+            assert entry['epub_filename'] == 'first.epub'
+        assert manifest['unchanged'] == []
+
+    def test_if_none_match_skips_unchanged_stories(self, client: FlaskClient, app: Flask, temp_dir: Path,
+                                                   monkeypatch: pytest.MonkeyPatch) -> None:
+        """Stories whose ETag the client already has are listed, not resent."""
+        first_id, second_id = _add_stories(app, temp_dir, monkeypatch)
+        ids = f'{first_id},{second_id}'
+
+        full = client.get(f'/api/download/bulk?ids={ids}').get_json()
+        first_etag = full['stories'][str(first_id)]['etag']
+        assert base64.b64decode(full['stories'][str(second_id)]['epub']) == b'PK\x03\x04second'
+
+        response = client.get(f'/api/download/bulk?ids={ids}', headers={'If-None-Match': f'"{first_etag}"'})
+        data = response.get_json()
+
+        assert data['unchanged'] == [first_id]
+        assert list(data['stories']) == [str(second_id)]
+
+    def test_manifest_omits_files_that_cannot_be_read(self, client: FlaskClient, app: Flask, temp_dir: Path,
+                                                      monkeypatch: pytest.MonkeyPatch) -> None:
+        """A file that can't be opened is left out of both the archive and the manifest."""
+        import builtins
+
+        first_id, _ = _add_stories(app, temp_dir, monkeypatch)
+        real_open = builtins.open
+
+        def failing_open(path, *args, **kwargs):
+            if str(path).endswith('first.epub'):
+                raise PermissionError(13, 'Permission denied', str(path))
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(sys.modules['app.blueprints.api.routes'], 'open', failing_open, raising=False)
+        response = client.get(f'/api/download/bulk?ids={first_id}&format=zip')
+
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            entry = json.loads(zf.read('manifest.json'))['stories'][str(first_id)]
+            assert 'epub' not in entry and 'epub_filename' not in entry
+            assert sorted(zf.namelist()) == sorted(['manifest.json', entry['html'], entry['cover']])
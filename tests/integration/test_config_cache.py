@@ -0,0 +1,87 @@
+from __future__ import annotations
+import pytest
+from contextlib import contextmanager
+from flask import Flask
+from flask.testing import FlaskClient
+
+
+@contextmanager
+def _count_queries(app: Flask):
+    from sqlalchemy import event
+    from app.models import db
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def _clear_credentials() -> None:
+    from app.models import db, WebAuthnCredential
+
+    for credential in WebAuthnCredential.query.all():
+        db.session.delete(credential)
+    db.session.commit()
+
+
+@pytest.mark.integration
+class TestConfigCache:
+    """The auth gate reads AppConfig and passkey state from an in-process cache."""
+
+    def test_steady_state_gate_runs_no_queries(self, app: Flask) -> None:
+        """Once loaded, the snapshot is served without touching the database."""
+        from app.services.config_cache import get_config_snapshot
+
+        with app.app_context():
+            _clear_credentials()
+            get_config_snapshot()
+            with _count_queries(app) as statements:
+                for _ in range(5):
+                    get_config_snapshot()
+            assert statements == []
+
+    def test_commits_invalidate_the_snapshot(self, client: FlaskClient, app: Flask) -> None:
+        """Registering a passkey locks the app at once, and a bulk delete unlocks it."""
+        from app.models import db, WebAuthnCredential
+        from app.services.config_cache import get_config_snapshot
+
+        with app.app_context():
+            _clear_credentials()
+            assert get_config_snapshot().credential_count == 0
+            assert client.get('/settings/').status_code == 200
+
+            db.session.add(WebAuthnCredential(credential_id=b'cache-test', public_key=b'key'))
+            db.session.commit()
+            assert get_config_snapshot().credential_count == 1
+            assert client.get('/settings/').status_code == 302
+
+            WebAuthnCredential.query.delete()
+            db.session.commit()
+            assert get_config_snapshot().credential_count == 0
+
+    def test_load_overlapping_a_commit_is_not_cached(self, app: Flask) -> None:
+        """A snapshot loaded while an invalidation happened is used once, then reloaded."""
+        from unittest.mock import patch
+        from app.services import config_cache
+
+        real_snapshot = config_cache.ConfigSnapshot
+
+        def commit_mid_load(**kwargs):
+            config_cache.invalidate_config_cache()
+            return real_snapshot(**kwargs)
+
+        with app.app_context():
+            config_cache.invalidate_config_cache()
+            with patch.object(config_cache, 'ConfigSnapshot', side_effect=commit_mid_load):
+                config_cache.get_config_snapshot()
+            with _count_queries(app) as statements:
+                config_cache.get_config_snapshot()
+            assert statements
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import pytest
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from flask import Flask
+import app.services.download_queue_worker as worker_module
+from app.services.download_queue_worker import DownloadQueueWorker
+
+
+def _enqueue(count: int) -> list[int]:
+    from app.models import db, DownloadQueueItem
+
+    DownloadQueueItem.query.delete()
+    items = [
+        DownloadQueueItem(url=f'https://www.literotica.com/s/queued-{n}', formats=json.dumps(['epub']), status='pending')
+        for n in range(count)
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+    return [item.id for item in items]
+
+
+def _statuses(app: Flask, ids: list[int]) -> list[str]:
+    from app.models import db, DownloadQueueItem
+
+    with app.app_context():
+        db.session.expire_all()
+        return [db.session.get(DownloadQueueItem, item_id).status for item_id in ids]
+
+
+def _fake_download(barrier: threading.Barrier):
+    def download(url: str) -> tuple:
+        barrier.wait()
+        return ('content', url.rsplit('/', 1)[-1], 'Author', 'Romance', [], None, 1, None, None)
+    return download
+
+
+@pytest.mark.integration
+class TestDownloadQueueWorker:
+    """DownloadQueueWorker runs several fetch slots and a separate file stage."""
+
+    def test_slots_download_concurrently_and_drain_queue(self, app: Flask) -> None:
+        """Two slots fetch at once and keep claiming until the queue is empty."""
+        with app.app_context():
+            ids = _enqueue(4)
+
+        # Every download waits for a second one to be in flight at the same time.
+        barrier = threading.Barrier(2, timeout=5)
+        worker = DownloadQueueWorker(app, poll_interval=60, slots=2)
+
+        with patch('app.services.story_downloader.download_story', side_effect=_fake_download(barrier)) as download, \
+                patch('app.services.story_processor._create_story_files', return_value={'success': True}) as create_files, \
+                patch('app.services.notifier.send_notification'), \
+                patch.object(worker_module, 'global_rate_limiter', MagicMock()):
+            worker.start()
+            try:
+                deadline = time.time() + 10
+                while time.time() < deadline and _statuses(app, ids) != ['completed'] * 4:
+                    time.sleep(0.05)
+            finally:
+                worker.stop()
+
+        assert _statuses(app, ids) == ['completed'] * 4
+        assert download.call_count == 4
+        assert create_files.call_count == 4
+        assert not barrier.broken
+
+    def test_file_stage_failure_requeues_item(self, app: Flask) -> None:
+        """A file-creation error sends the item back for another attempt."""
+        from app.models import db, DownloadQueueItem
+
+        worker = DownloadQueueWorker(app, slots=1)
+
+        with app.app_context():
+            [item_id] = _enqueue(1)
+            assert worker.queue.claim_next().id == item_id
+            job = {'item_id': item_id, 'combined_urls': None, 'files': {}}
+            with patch('app.services.story_processor._create_story_files',
+                       return_value={'success': False, 'message': 'disk full'}):
+                worker._finish_item(job)
+
+            item = db.session.get(DownloadQueueItem, item_id)
+            assert item.status == 'pending'
+            assert item.retry_count == 1
+            assert 'disk full' in item.error_message
+
+    def test_daily_cap_is_not_overshot_by_parallel_slots(self, app: Flask, monkeypatch) -> None:
+        """Two slots racing at cap-1 claim only one item between them."""
+        monkeypatch.setenv('MAX_DAILY_DOWNLOADS', '1')
+        with app.app_context():
+            ids = _enqueue(2)
+
+        worker = DownloadQueueWorker(app, slots=2)
+        release_download = threading.Event()
+        start = threading.Barrier(2, timeout=5)
+        results: dict[str, bool] = {}
+
+        def blocked_download(url: str) -> tuple:
+            release_download.wait(5)
+            return ('content', 'Title', 'Author', 'Romance', [], None, 1, None, None)
+
+        def run_slot(name: str) -> None:
+            start.wait()
+            with app.app_context():
+                results[name] = worker._process_next_item()
+
+        with patch('app.services.story_downloader.download_story', side_effect=blocked_download), \
+                patch.object(worker_module, 'global_rate_limiter', MagicMock()):
+            threads = {name: threading.Thread(target=run_slot, args=(name,)) for name in ('a', 'b')}
+            for thread in threads.values():
+                thread.start()
+            # The slot that lost the race returns straight away; the winner is still downloading.
+            deadline = time.time() + 5
+            while len(results) < 1 and time.time() < deadline:
+                time.sleep(0.05)
+            assert sorted(_statuses(app, ids)) == ['processing', 'rate_limited']
+
+            release_download.set()
+            for thread in threads.values():
+                thread.join(timeout=5)
+            worker.stop()
+
+        assert sorted(results.values()) == [False, True]
+
+    def test_lease_held_while_waiting_for_file_stage(self, app: Flask) -> None:
+        """An item queued for the file stage keeps its lease until the stage takes it."""
+        from datetime import datetime, timedelta
+        from app.models import db, DownloadQueueItem
+
+        worker = DownloadQueueWorker(app, slots=1)
+        worker.queue.lease = timedelta(seconds=0.3)
+
+        with app.app_context():
+            [item_id] = _enqueue(1)
+            with patch('app.services.story_downloader.download_story',
+                       return_value=('content', 'Title', 'Author', 'Romance', [], None, 1, None, None)), \
+                    patch.object(worker_module, 'global_rate_limiter', MagicMock()):
+                assert worker._process_next_item() is True
+
+            # Several lease periods pass with no file thread running.
+            time.sleep(1)
+            item = db.session.get(DownloadQueueItem, item_id, populate_existing=True)
+            assert item.status == 'processing'
+            assert item.lease_expires_at > datetime.utcnow()
+
+            job = worker._file_jobs.get_nowait()
+            with patch('app.services.story_processor._create_story_files', return_value={'success': True}), \
+                    patch('app.services.notifier.send_notification'):
+                worker._finish_item(job)
+            assert db.session.get(DownloadQueueItem, item_id, populate_existing=True).status == 'completed'
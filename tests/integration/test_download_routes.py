@@ -117,3 +117,45 @@ class TestDownloadFile:
         response = client.get('/download/nonexistent-story.html')
 
         assert response.status_code == 404
+
+
+@pytest.mark.integration
+class TestExportAll:
+    """Test /download/export/all streaming zip."""
+
+    def test_export_all_streams_stored_zip(self, client: FlaskClient, app: Flask, temp_dir: Path,
+                                           monkeypatch: pytest.MonkeyPatch) -> None:
+        """Every story EPUB is streamed into the zip under its friendly name."""
+        import io
+        import sys
+        import zipfile
+        from app.models import db, Author, Story, StoryFormat
+
+        epub_dir = temp_dir / 'data' / 'epubs'
+        # app.blueprints re-exports the blueprint under the package's name, so go via sys.modules.
+        downloads_module = sys.modules['app.blueprints.downloads.routes']
+        monkeypatch.setattr(downloads_module, 'get_epub_directory', lambda: str(epub_dir))
+
+        with app.app_context():
+            for story in Story.query.all():
+                db.session.delete(story)
+            author = Author.query.filter_by(name='Export Author').first() or Author(name='Export Author')
+            db.session.add(author)
+            db.session.flush()
+            for title in ('Alpha', 'Beta'):
+                epub_path = epub_dir / f'{title.lower()}.epub'
+                epub_path.write_bytes(f'PK\x03\x04{title} epub'.encode())
+                story = Story(title=title, author_id=author.id, filename_base=title.lower())
+                story.formats.append(StoryFormat(format_type='epub', file_path=str(epub_path)))
+                db.session.add(story)
+            db.session.commit()
+
+        response = client.get('/download/export/all')
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/zip'
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            assert sorted(zf.namelist()) == ['Export Author - Alpha.epub', 'Export Author - Beta.epub']
+            assert zf.read('Export Author - Beta.epub') == b'PK\x03\x04Beta epub'
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+import pytest
+import json
+from pathlib import Path
+from unittest.mock import patch
+from flask import Flask
+from app.services.migration import file_scanner as file_scanner_module
+from app.services.migration.file_scanner import FileScanner
+
+
+def _write_story(html_dir: Path, name: str, title: str, chapters: int = 1) -> Path:
+    path = html_dir / f"{name}.json"
+    path.write_text(json.dumps({
+        'title': title,
+        'author': 'Index Author',
+        'source_url': f'https://www.literotica.com/s/{name}',
+        'chapters': [{'number': i + 1, 'paragraphs': ['text']} for i in range(chapters)],
+    }))
+    return path
+
+
+@pytest.fixture
+def html_dir(app: Flask, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the scanner (which imports its directory helpers by name) at the test data dir."""
+    data_dir = temp_dir / "data"
+    monkeypatch.setattr(file_scanner_module, "get_html_directory", lambda: str(data_dir / "html"))
+    monkeypatch.setattr(file_scanner_module, "get_epub_directory", lambda: str(data_dir / "epubs"))
+    return data_dir / "html"
+
+
+@pytest.mark.integration
+class TestFileScannerIndex:
+    """FileScanner only parses story JSON that changed since the last scan."""
+
+    def test_warm_scan_does_not_parse_unchanged_files(self, app: Flask, html_dir: Path) -> None:
+        """A second scan of an unchanged directory is served from the index."""
+        with app.app_context():
+            _write_story(html_dir, '1_first', 'First')
+            _write_story(html_dir, '2_second', 'Second', chapters=3)
+
+            with patch.object(file_scanner_module.json, 'load', wraps=json.load) as loader:
+                cold = FileScanner().scan_story_files()
+                assert loader.call_count == 2
+
+            with patch.object(file_scanner_module.json, 'load', wraps=json.load) as loader:
+                warm = FileScanner().scan_story_files()
+                assert loader.call_count == 0
+
+            assert warm == cold
+            second = next(g for g in warm if g['filename_base'] == 'second')
+            assert second['story_id'] == 2
+            assert second['formats'][0]['metadata']['title'] == 'Second'
+            assert second['formats'][0]['metadata']['chapter_count'] == 3
+
+    def test_modified_file_is_reparsed(self, app: Flask, html_dir: Path) -> None:
+        """Changing a file's size or mtime refreshes its indexed metadata."""
+        with app.app_context():
+            _write_story(html_dir, '3_story', 'Old Title')
+            FileScanner().scan_story_files()
+
+            _write_story(html_dir, '3_story', 'A Much Longer New Title')
+            groups = FileScanner().scan_story_files()
+
+            assert groups[0]['formats'][0]['metadata']['title'] == 'A Much Longer New Title'
+
+    def test_deleted_and_corrupt_files(self, app: Flask, html_dir: Path) -> None:
+        """Deleted files leave the index and corrupt files are skipped."""
+        from app.models import StoryFileIndexEntry
+
+        with app.app_context():
+            gone = _write_story(html_dir, '4_gone', 'Gone')
+            (html_dir / '5_broken.json').write_text('{not json')
+
+            groups = FileScanner().scan_story_files()
+            assert [g['filename_base'] for g in groups] == ['gone']
+
+            gone.unlink()
+            assert FileScanner().scan_story_files() == []
+
+            indexed = {row.path for row in StoryFileIndexEntry.query.all()}
+            assert str(gone) not in indexed
+            assert str(html_dir / '5_broken.json') in indexed
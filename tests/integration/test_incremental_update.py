@@ -0,0 +1,156 @@
+from __future__ import annotations
+import hashlib
+import json
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from flask import Flask
+from lxml import etree
+
+
+def _add_series_story(temp_dir: Path) -> int:
+    from app.models import db, Author, Story, StoryFormat
+    from app.services.epub_generator import create_epub_file
+    from app.services.html_generator import create_html_file
+    from app.services.story_downloader import join_story_chapters
+
+    author = Author.query.filter_by(name='Series Author').first() or Author(name='Series Author')
+    db.session.add(author)
+    db.session.flush()
+
+    content = join_story_chapters([('Part One', 'First text.\n\n'), ('Part Two', 'Second text.\n\n')])
+    with patch('app.services.epub_generator.generate_cover_image'), \
+            patch('app.services.html_generator.generate_cover_image'), \
+            patch('app.services.epub_generator.send_notification'), \
+            patch('app.services.html_generator.send_notification'):
+        epub_path = create_epub_file('Series', 'Series Author', content, str(temp_dir), filename_base='series')
+        json_path = create_html_file('Series', 'Series Author', content, str(temp_dir), filename_base='series',
+                                     page_count=2)
+
+    story = Story(title='Series', author_id=author.id, filename_base='series', chapter_count=2,
+                  literotica_page_count=2, auto_update_enabled=True,
+                  literotica_url='https://www.literotica.com/s/part-one',
+                  literotica_series_url='https://www.literotica.com/series/se/123')
+    story.formats.append(StoryFormat(format_type='json', file_path=json_path))
+    story.formats.append(StoryFormat(format_type='epub', file_path=epub_path))
+    db.session.add(story)
+    db.session.commit()
+    return story.id
+
+
+def _clear_stories() -> None:
+    from app.models import db, Story
+
+    for story in Story.query.all():
+        db.session.delete(story)
+    db.session.commit()
+
+
+@pytest.mark.integration
+class TestIncrementalSeriesUpdate:
+    """A series that gained parts is extended in place rather than re-downloaded."""
+
+    def test_new_part_is_appended(self, app: Flask, temp_dir: Path) -> None:
+        """Only the new part is fetched; the JSON and EPUB gain it and keep the old chapters."""
+        from app.models import db, Story
+        from app.services.story_downloader import join_story_chapters
+        from app.services.story_update_checker import StoryUpdateChecker
+
+        with app.app_context():
+            _clear_stories()
+            story_id = _add_series_story(temp_dir)
+            epub_path = temp_dir / 'series.epub'
+            with zipfile.ZipFile(epub_path) as zf:
+                chapter_1 = zf.read('EPUB/chapter_1.xhtml')
+
+            parts = [{'part_number': n, 'title': title, 'url': f'https://www.literotica.com/s/part-{n}'}
+                     for n, title in enumerate(['Part One', 'Part Two', 'Part Three'], 1)]
+            series_info = {'total_parts': 3, 'parts': parts, 'series_title': 'Series', 'description': ''}
+            checker = StoryUpdateChecker()
+
+            with patch('app.services.series_page_checker.SeriesPageChecker.check_series_parts',
+                       return_value=series_info), \
+                    patch('app.services.story_downloader._download_single_chapter',
+                          return_value=('Third text.\n\n', {'page_count': 1})) as fetch, \
+                    patch('app.services.story_update_checker.download_story') as full_download:
+                story = db.session.get(Story, story_id)
+                update_info = checker.check_for_updates_via_series(story)
+                assert checker.update_story(story, update_info)
+
+            full_download.assert_not_called()
+            assert fetch.call_args.args[0] == 'https://www.literotica.com/s/part-3'
+
+            story = db.session.get(Story, story_id)
+            assert (story.chapter_count, story.literotica_page_count) == (3, 3)
+            full_content = join_story_chapters([('Part One', 'First text.\n\n'), ('Part Two', 'Second text.\n\n'),
+                                                ('Part Three', 'Third text.\n\n')])
+            assert story.content_hash == hashlib.sha256(full_content.encode('utf-8')).hexdigest()
+            data = json.loads((temp_dir / 'series.json').read_text())
+            assert [c['title'] for c in data['chapters']] == ['Part One', 'Part Two', 'Part Three']
+            assert data['chapters'][2]['paragraphs'] == ['Third text.']
+
+            with zipfile.ZipFile(epub_path) as zf:
+                assert zf.testzip() is None
+                assert zf.namelist()[0] == 'mimetype'
+                assert zf.read('EPUB/chapter_1.xhtml') == chapter_1
+                assert b'Third text.' in zf.read('EPUB/chapter_3.xhtml')
+                opf = etree.fromstring(zf.read('EPUB/content.opf'))
+                ns = {'opf': 'http://www.idpf.org/2007/opf'}
+                spine = opf.xpath('//opf:spine/opf:itemref/@idref', namespaces=ns)
+                assert spine[-1] not in spine[:-1]
+                assert opf.xpath(f'//opf:item[@id="{spine[-1]}"]/@href', namespaces=ns) == ['chapter_3.xhtml']
+                assert 'Chapter 3: Part Three' in zf.read('EPUB/nav.xhtml').decode()
+                assert 'Chapter 3: Part Three' in zf.read('EPUB/toc.ncx').decode()
+
+
+@pytest.mark.integration
+class TestChangedChapterUpdate:
+    """Per-chapter digests limit an update to the chapters that actually changed."""
+
+    def test_only_the_edited_chapter_is_rewritten(self, app: Flask, temp_dir: Path) -> None:
+        """Whitespace drift is not an update; an edit rewrites just that chapter's EPUB member and JSON entry."""
+        from app.models import db, Story
+        from app.services.chapter_hashes import chapter_digests, save_chapter_hashes, stored_chapter_hashes
+        from app.services.story_downloader import join_story_chapters
+        from app.services.story_update_checker import StoryUpdateChecker
+
+        with app.app_context():
+            _clear_stories()
+            story_id = _add_series_story(temp_dir)
+            original = join_story_chapters([('Part One', 'First text.\n\n'), ('Part Two', 'Second text.\n\n')])
+            story = db.session.get(Story, story_id)
+            story.content_hash = hashlib.sha256(original.encode('utf-8')).hexdigest()
+            save_chapter_hashes(story_id, chapter_digests(original))
+            db.session.commit()
+
+            epub_path = temp_dir / 'series.epub'
+            with zipfile.ZipFile(epub_path) as zf:
+                chapter_1 = zf.read('EPUB/chapter_1.xhtml')
+            checker = StoryUpdateChecker()
+
+            def download(content):
+                return (content, 'Series', 'Series Author', None, [], None, 2, None, None)
+
+            respaced = join_story_chapters([('Part One', 'First  text.\n\n'), ('Part Two', 'Second text.\n\n\n')])
+            # Long enough to pass the update's minimum-content check.
+            revised = 'Second, revised. ' * 40
+            edited = join_story_chapters([('Part One', 'First text.\n\n'), ('Part Two', f'{revised}\n\n')])
+            with patch('app.services.story_update_checker.download_story', return_value=download(respaced)):
+                assert checker.check_for_updates(db.session.get(Story, story_id), probe=False) is None
+
+            with patch('app.services.story_update_checker.download_story', return_value=download(edited)), \
+                    patch('app.services.story_update_checker.create_epub_file') as rebuild:
+                story = db.session.get(Story, story_id)
+                update_info = checker.check_for_updates(story, probe=False)
+                assert update_info['changed_chapters'] == [2]
+                assert checker.update_story(story, update_info)
+            rebuild.assert_not_called()
+
+            with zipfile.ZipFile(epub_path) as zf:
+                assert zf.testzip() is None
+                assert zf.read('EPUB/chapter_1.xhtml') == chapter_1
+                assert b'Second, revised.' in zf.read('EPUB/chapter_2.xhtml')
+            data = json.loads((temp_dir / 'series.json').read_text())
+            assert data['chapters'][1]['paragraphs'] == [revised.strip()]
+            assert stored_chapter_hashes(story_id) == {d.number: d.hash for d in chapter_digests(edited)}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+import pytest
+import threading
+from datetime import datetime, timedelta
+from flask import Flask
+from app.services.job_queue import JobQueue
+
+
+def _add_items(count: int, **fields) -> list[int]:
+    from app.models import db, FormatQueueItem, Story, Author
+
+    FormatQueueItem.query.delete()
+    author = Author.query.filter_by(name='Queue Test Author').first()
+    if not author:
+        author = Author(name='Queue Test Author')
+        db.session.add(author)
+        db.session.flush()
+    story = Story(title='Queue Story', author_id=author.id, filename_base='queue_story')
+    db.session.add(story)
+    db.session.flush()
+
+    base = datetime.utcnow() - timedelta(hours=1)
+    items = [
+        FormatQueueItem(story_id=story.id, job_type='generate_epub', created_at=base + timedelta(seconds=n), **fields)
+        for n in range(count)
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+    return [item.id for item in items]
+
+
+@pytest.mark.integration
+class TestJobQueue:
+    """JobQueue claims rows atomically and recovers them through lease expiry."""
+
+    def test_claims_oldest_first_then_runs_dry(self, app: Flask) -> None:
+        """Each claim takes the oldest pending row and marks it processing."""
+        from app.models import FormatQueueItem
+
+        with app.app_context():
+            ids = _add_items(2)
+            queue = JobQueue(FormatQueueItem)
+
+            first = queue.claim_next(progress_message='Starting...')
+            assert first.id == ids[0]
+            assert first.status == 'processing'
+            assert first.progress_message == 'Starting...'
+            assert first.lease_expires_at > datetime.utcnow()
+
+            assert queue.claim_next().id == ids[1]
+            assert queue.claim_next() is None
+
+    def test_scheduled_items_wait(self, app: Flask) -> None:
+        """Download items scheduled in the future are not claimable yet."""
+        import json
+        from app.models import db, DownloadQueueItem
+
+        with app.app_context():
+            DownloadQueueItem.query.delete()
+            db.session.add(DownloadQueueItem(
+                url='https://www.literotica.com/s/later', formats=json.dumps(['epub']),
+                scheduled_after=datetime.utcnow() + timedelta(hours=1),
+            ))
+            db.session.commit()
+
+            assert JobQueue(DownloadQueueItem).claim_next() is None
+
+    def test_lapsed_lease_is_reclaimed(self, app: Flask) -> None:
+        """A processing row is claimable again only once its lease has expired."""
+        from app.models import db, FormatQueueItem
+
+        with app.app_context():
+            [item_id] = _add_items(1)
+            queue = JobQueue(FormatQueueItem)
+            queue.claim_next()
+            assert queue.claim_next() is None
+
+            item = db.session.get(FormatQueueItem, item_id)
+            item.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+
+            reclaimed = queue.claim_next()
+            assert reclaimed.id == item_id
+            assert reclaimed.retry_count == 1
+
+    def test_lease_reclaims_count_against_max_retries(self, app: Flask) -> None:
+        """A row whose lease keeps lapsing is failed once its retries are used up."""
+        from app.models import db, FormatQueueItem
+
+        with app.app_context():
+            [item_id] = _add_items(1, max_retries=1)
+            queue = JobQueue(FormatQueueItem)
+
+            for expected_retries in (0, 1):
+                item = queue.claim_next()
+                assert (item.id, item.retry_count) == (item_id, expected_retries)
+                item.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+                db.session.commit()
+
+            assert queue.claim_next() is None
+            item = db.session.get(FormatQueueItem, item_id, populate_existing=True)
+            assert item.status == 'failed'
+            assert 'stopped responding' in item.error_message
+
+    def test_renew_extends_lease(self, app: Flask) -> None:
+        """renew() pushes the lease of a held row forward."""
+        from app.models import db, FormatQueueItem
+
+        with app.app_context():
+            _add_items(1)
+            queue = JobQueue(FormatQueueItem, lease=timedelta(seconds=30))
+            item = queue.claim_next()
+            first_expiry = item.lease_expires_at
+
+            queue.lease = timedelta(minutes=10)
+            queue.renew(item.id)
+            db.session.refresh(item)
+
+            assert item.lease_expires_at > first_expiry + timedelta(minutes=5)
+
+    def test_concurrent_claims_never_overlap(self, app: Flask) -> None:
+        """Threads racing on the same queue each get distinct rows."""
+        from app.models import FormatQueueItem
+
+        with app.app_context():
+            ids = _add_items(20)
+
+        queue = JobQueue(FormatQueueItem)
+        claimed: list[int] = []
+        lock = threading.Lock()
+        start = threading.Barrier(4)
+
+        def claim_all() -> None:
+            start.wait()
+            with app.app_context():
+                while (item := queue.claim_next()) is not None:
+                    with lock:
+                        claimed.append(item.id)
+
+        threads = [threading.Thread(target=claim_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        assert sorted(claimed) == sorted(ids)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+import pytest
+from pathlib import Path
+from flask import Flask
+from app.services.library import project_library_dicts
+
+
+@pytest.mark.integration
+class TestLibraryProjection:
+    """project_library_dicts() builds the same dicts as Story.to_library_dict()."""
+
+    def test_matches_orm_serializer(self, app: Flask, temp_dir: Path) -> None:
+        """Every key matches for a story with tags, formats, a category and sources, and for a bare one."""
+        from app.models import db, Author, Category, Story, StoryFormat, StorySource
+
+        with app.app_context():
+            for story in Story.query.all():
+                db.session.delete(story)
+            author = Author.query.filter_by(name='Projection Author').first() or Author(name='Projection Author')
+            category = Category.query.filter_by(name='Romance').first() or Category(name='Romance')
+            db.session.add_all([author, category])
+            db.session.flush()
+
+            full = Story(title='Full', author_id=author.id, category_id=category.id, filename_base='full',
+                         literotica_series_url='https://example.com/series/1', chapter_count=3,
+                         is_combined=True, rating=4, in_queue=True)
+            full.formats.append(StoryFormat(format_type='epub', file_path=str(temp_dir / 'full.epub'), file_size=123))
+            full.formats.append(StoryFormat(format_type='json', file_path=str(temp_dir / 'full.json')))
+            full.sources = [StorySource(url=f'https://example.com/s/{i}', position=i) for i in (1, 0)]
+            bare = Story(title='Bare', author_id=author.id, filename_base='bare')
+            db.session.add_all([full, bare])
+            db.session.flush()
+            full.set_tags(['beta', 'alpha'])
+            db.session.commit()
+
+            projected = {d['id']: d for d in project_library_dicts()}
+            for story in (full, bare):
+                expected = story.to_library_dict()
+                actual = projected[story.id]
+                assert sorted(actual.pop('tags')) == sorted(expected.pop('tags'))
+                assert sorted(actual.pop('formats')) == sorted(expected.pop('formats'))
+                assert actual == expected
+            assert projected[full.id]['source_urls'] == ['https://example.com/s/0', 'https://example.com/s/1']
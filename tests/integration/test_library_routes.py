@@ -23,12 +23,14 @@ class TestIndexRoute:
         """Index page displays available stories."""
         with app.app_context():
             from app.utils import get_html_directory
+            from app.services.migration.sync_checker import SyncChecker
 
             json_path = Path(get_html_directory()) / "test-story.json"
             json_path.write_text(json.dumps({
                 'title': 'Test Story',
                 'author': 'Test Author'
             }))
+            SyncChecker().add_orphaned_files()
 
             response = client.get('/')
 
@@ -100,6 +102,54 @@ class TestIndexRoute:
             assert data['success'] == 'true'
 
 
+@pytest.mark.integration
+class TestSyncBanner:
+    """Sync status on / and /sync-banner comes from the background snapshot."""
+
+    def test_index_does_not_run_sync_check(self, client: FlaskClient) -> None:
+        """Rendering the homepage never walks the filesystem."""
+        with patch('app.services.migration.sync_checker.SyncChecker.check_sync') as mock_check:
+            response = client.get('/')
+
+        assert response.status_code == 200
+        mock_check.assert_not_called()
+
+    def test_banner_hidden_without_snapshot(self, client: FlaskClient, app: Flask) -> None:
+        """No banner is shown before the first background check has run."""
+        from app.models import db, AppConfig
+        from app.services.migration.sync_checker import SYNC_SNAPSHOT_KEY
+
+        with app.app_context():
+            AppConfig.query.filter_by(key=SYNC_SNAPSHOT_KEY).delete()
+            db.session.commit()
+
+        with patch('app.services.migration.sync_checker.SyncChecker.check_sync') as mock_check:
+            response = client.get('/sync-banner')
+
+        assert response.status_code == 204
+        mock_check.assert_not_called()
+
+    def test_banner_renders_cached_snapshot(self, client: FlaskClient, app: Flask) -> None:
+        """A stored out-of-sync snapshot is rendered without re-checking."""
+        from app.services.migration.sync_checker import save_sync_snapshot
+
+        with app.app_context():
+            save_sync_snapshot({
+                'in_sync': False,
+                'orphaned_db_count': 2,
+                'broken_format_paths_count': 0,
+                'orphaned_files_count': 0,
+                'duplicate_files_count': 0,
+            })
+
+        with patch('app.services.migration.sync_checker.SyncChecker.check_sync') as mock_check:
+            response = client.get('/sync-banner')
+
+        assert response.status_code == 200
+        assert b'missing from disk' in response.data
+        mock_check.assert_not_called()
+
+
 @pytest.mark.integration
 class TestLibraryFilter:
     """Test /library/filter endpoint."""
@@ -223,12 +273,14 @@ class TestLibraryFilter:
         """Search is case-insensitive."""
         with app.app_context():
             from app.utils import get_html_directory
+            from app.services.migration.sync_checker import SyncChecker
 
             story = Path(get_html_directory()) / "story.json"
             story.write_text(json.dumps({
                 'title': 'Test Story TITLE',
                 'author': 'Author'
             }))
+            SyncChecker().add_orphaned_files()
 
             response = client.get('/library/filter?search=TEST')
 
@@ -244,6 +296,7 @@ class TestReadStory:
         """Read story from JSON file."""
         with app.app_context():
             from app.utils import get_html_directory
+            from app.services.migration.sync_checker import SyncChecker
 
             json_path = Path(get_html_directory()) / "test-story.json"
             json_path.write_text(json.dumps({
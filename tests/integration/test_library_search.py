@@ -0,0 +1,235 @@
+from __future__ import annotations
+import json
+import pytest
+from pathlib import Path
+from flask import Flask
+from app.services.library import get_stories_page
+
+
+def _add_story(temp_dir: Path, title: str, author_name: str, paragraphs: list[str]) -> int:
+    from app.models import db, Author, Story, StoryFormat
+
+    author = Author.query.filter_by(name=author_name).first() or Author(name=author_name)
+    db.session.add(author)
+    db.session.flush()
+
+    json_path = temp_dir / f'{title.lower().replace(" ", "_")}.json'
+    json_path.write_text(json.dumps({'title': title, 'chapters': [{'number': 1, 'paragraphs': paragraphs}]}))
+    story = Story(title=title, author_id=author.id, filename_base=title.lower().replace(' ', '_'))
+    story.formats.append(StoryFormat(format_type='json', file_path=str(json_path)))
+    db.session.add(story)
+    db.session.commit()
+    return story.id
+
+
+def _clear_stories() -> None:
+    from app.models import db, Story
+
+    for story in Story.query.all():
+        db.session.delete(story)
+    db.session.commit()
+
+
+@pytest.mark.integration
+class TestLibrarySearch:
+    """get_stories_page(search=...) queries the FTS5 index kept in sync on commit."""
+
+    def test_body_prefix_search_ranks_and_highlights(self, app: Flask, temp_dir: Path) -> None:
+        """Story text is searchable by prefix, title hits rank first and snippets are escaped."""
+        with app.app_context():
+            _clear_stories()
+            body_id = _add_story(temp_dir, 'Quiet Harbor', 'Search Author',
+                                 ['The <em>lighthouse</em> keeper & his dog.'])
+            title_id = _add_story(temp_dir, 'Lighthouse Nights', 'Search Author', ['Nothing to see.'])
+
+            stories, total = get_stories_page(search='lighth')
+
+            assert total == 2
+            assert [s['id'] for s in stories] == [title_id, body_id]
+            assert '<mark>lighthouse</mark> keeper &amp; his dog' in stories[1]['search_snippet']
+
+    def test_index_follows_renames_and_deletes(self, app: Flask, temp_dir: Path) -> None:
+        """Renaming an author re-indexes their stories and deleting a story drops it."""
+        import uuid
+        from app.models import db, Author, Story
+
+        # The test DB outlives a run and authors.name is unique, so use fresh names.
+        run = uuid.uuid4().hex[:8]
+        with app.app_context():
+            _clear_stories()
+            story_id = _add_story(temp_dir, 'Renamed One', f'Old Pen Name {run}', ['Some text.'])
+
+            Author.query.filter_by(name=f'Old Pen Name {run}').one().name = f'Zephyrine Quill {run}'
+            db.session.commit()
+            assert [s['id'] for s in get_stories_page(search='zephyrine')[0]] == [story_id]
+
+            db.session.delete(db.session.get(Story, story_id))
+            db.session.commit()
+            assert get_stories_page(search='zephyrine') == ([], 0)
+
+    def test_unindexed_changes_skip_reindex(self, app: Flask, temp_dir: Path) -> None:
+        """Commits that only touch unindexed columns don't re-read the story JSON."""
+        from datetime import datetime
+        from unittest.mock import patch
+        from app.models import db, Story
+
+        with app.app_context():
+            _clear_stories()
+            story_id = _add_story(temp_dir, 'Often Opened', 'Search Author', ['x'])
+
+            with patch('app.services.search_index.refresh_search_index') as refresh:
+                story = db.session.get(Story, story_id)
+                story.last_opened_at = datetime.utcnow()
+                story.rating = 4
+                db.session.commit()
+                refresh.assert_not_called()
+
+                story.title = 'Often Opened, Retitled'
+                db.session.commit()
+                refresh.assert_called_once_with({story_id})
+
+    def test_sync_rebuilds_missing_entries(self, app: Flask, temp_dir: Path) -> None:
+        """sync_search_index() re-indexes stories whose entries are missing."""
+        from app.models import db
+        from sqlalchemy import text
+        from app.services.search_index import sync_search_index
+
+        with app.app_context():
+            _clear_stories()
+            story_id = _add_story(temp_dir, 'Backfilled', 'Search Author', ['A marmalade sky.'])
+            with db.engine.begin() as conn:
+                conn.execute(text('DELETE FROM story_search'))
+            assert get_stories_page(search='marmalade')[1] == 0
+
+            assert sync_search_index()['indexed'] == 1
+            assert [s['id'] for s in get_stories_page(search='marmalade')[0]] == [story_id]
+
+
+@pytest.mark.integration
+class TestLibrarySort:
+    """Author and category sorts page in SQL, case-insensitively."""
+
+    def test_author_sort_pages_case_insensitively(self, app: Flask, temp_dir: Path) -> None:
+        """Stories come back ordered by author name regardless of case, a page at a time."""
+        with app.app_context():
+            _clear_stories()
+            ids = {name: _add_story(temp_dir, f'By {name}', name, ['x']) for name in ('charlie', 'Alpha', 'bravo')}
+
+            first_page, total = get_stories_page(sort_by='author', sort_order='asc', per_page=2)
+            second_page, _ = get_stories_page(sort_by='author', sort_order='asc', per_page=2, page=2)
+            descending, _ = get_stories_page(sort_by='author', sort_order='desc', per_page=3)
+
+            assert total == 3
+            assert [s['author'] for s in first_page + second_page] == ['Alpha', 'bravo', 'charlie']
+            assert [s['id'] for s in descending] == [ids['charlie'], ids['bravo'], ids['Alpha']]
+
+    def test_category_sort_with_category_filter(self, app: Flask, temp_dir: Path) -> None:
+        """Category sorting puts uncategorized stories first ascending and combines with the filter."""
+        from app.models import db, Category, Story
+
+        with app.app_context():
+            _clear_stories()
+            romance = Category.query.filter_by(name='Romance').first() or Category(name='Romance')
+            db.session.add(romance)
+            db.session.flush()
+            loose_id = _add_story(temp_dir, 'Loose', 'Sort Author', ['x'])
+            filed_id = _add_story(temp_dir, 'Filed', 'Sort Author', ['x'])
+            db.session.get(Story, filed_id).category_id = romance.id
+            db.session.commit()
+
+            stories, _ = get_stories_page(sort_by='category', sort_order='asc')
+            filtered, total = get_stories_page(sort_by='category', category='Romance')
+
+            assert [s['id'] for s in stories] == [loose_id, filed_id]
+            assert total == 1 and filtered[0]['category'] == 'Romance'
+
+
+@pytest.mark.integration
+class TestKeysetPaging:
+    """get_stories_after() and the OPDS feeds page by (sort value, id) cursors."""
+
+    def test_cursor_pages_match_offset_pages(self, app: Flask, temp_dir: Path) -> None:
+        """Walking cursors yields the same order as offset paging, NULL sort values included."""
+        from app.models import db, Story
+        from app.services.library import get_stories_after
+
+        with app.app_context():
+            _clear_stories()
+            ids = [_add_story(temp_dir, f'Paged {i}', 'Paging Author', ['x']) for i in range(7)]
+            for story_id, rating in zip(ids, [3, None, 5, 3, None, 1, 3]):
+                db.session.get(Story, story_id).rating = rating
+            db.session.commit()
+
+            for sort_order in ('asc', 'desc'):
+                expected = [s['id'] for s in get_stories_page(sort_by='rating', sort_order=sort_order, per_page=7)[0]]
+                walked, cursor = [], None
+                while True:
+                    page, cursor = get_stories_after(cursor, per_page=3, sort_by='rating', sort_order=sort_order)
+                    walked += [s['id'] for s in page]
+                    if cursor is None:
+                        break
+                assert walked == expected
+
+    def test_filter_route_links_next_page_by_cursor(self, client, app: Flask, temp_dir: Path) -> None:
+        """/library/filter hands out a cursor next_url and serves the following page from it."""
+        import re
+        import html as html_module
+        from unittest.mock import patch
+
+        with app.app_context():
+            _clear_stories()
+            for i in range(3):
+                _add_story(temp_dir, f'Scrolled {i}', 'Paging Author', ['x'])
+
+        with patch('app.blueprints.library.routes.PER_PAGE', 2):
+            first = client.get('/library/filter?sort_by=name&sort_order=asc').get_data(as_text=True)
+            next_url = html_module.unescape(re.search(r'hx-get="(/library/filter[^"]+)"', first).group(1))
+            assert 'cursor=' in next_url and 'page=' not in next_url
+            second = client.get(next_url).get_data(as_text=True)
+
+        assert 'Scrolled 0' in first and 'Scrolled 1' in first
+        assert 'Scrolled 2' in second and 'Scrolled 0' not in second
+
+    def test_opds_catalog_follows_next_links(self, client, app: Flask, temp_dir: Path) -> None:
+        """The OPDS catalog links pages with ?after= and reaches every story once."""
+        import re
+        from unittest.mock import MagicMock, patch
+        from app.models import db, StoryFormat
+
+        def opds_config(key: str):
+            return MagicMock(get_value=MagicMock(return_value=key == 'opds_enabled'))
+
+        with app.app_context():
+            _clear_stories()
+            for i in range(5):
+                story_id = _add_story(temp_dir, f'Feed {i}', 'Paging Author', ['x'])
+                db.session.add(StoryFormat(story_id=story_id, format_type='epub', file_path=str(temp_dir / f'{i}.epub')))
+            db.session.commit()
+
+        titles, url = [], '/opds/catalog'
+        with patch('app.models.AppConfig.query') as config_query, \
+                patch('app.blueprints.opds.routes.PAGE_SIZE', 2):
+            config_query.filter_by.side_effect = lambda key: MagicMock(first=lambda: opds_config(key))
+            while url:
+                feed = client.get(url).get_data(as_text=True)
+                titles += re.findall(r'<title>(Feed \d)</title>', feed)
+                match = re.search(r'<link rel="next" href="http://localhost([^"]+)"', feed)
+                url = match.group(1).replace('&amp;', '&') if match else None
+
+        assert titles == [f'Feed {i}' for i in range(5)]
+
+    def test_opds_rejects_malformed_cursors(self, client) -> None:
+        """Cursors that don't decode, or decode to the wrong shape, get a 400 rather than a 500."""
+        import base64
+        import json
+        from unittest.mock import MagicMock, patch
+
+        def cursor(values) -> str:
+            return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+        with patch('app.models.AppConfig.query') as config_query:
+            config_query.filter_by.side_effect = lambda key: MagicMock(
+                first=lambda: MagicMock(get_value=MagicMock(return_value=key == 'opds_enabled')))
+            for after in ('not-a-cursor', cursor(['a', 'x']), cursor(['a', None]), cursor([['a'], 1]),
+                          cursor(['a', True]), cursor(['a'])):
+                assert client.get(f'/opds/catalog?after={after}').status_code == 400, after
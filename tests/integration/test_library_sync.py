@@ -0,0 +1,112 @@
+from __future__ import annotations
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+
+def _reset_library(titles: list[str]) -> list[int]:
+    from app.models import db, Author, Story, StoryTombstone
+
+    for story in Story.query.all():
+        db.session.delete(story)
+    db.session.commit()
+    StoryTombstone.query.delete()
+
+    author = Author.query.filter_by(name='Sync Author').first()
+    if not author:
+        author = Author(name='Sync Author')
+        db.session.add(author)
+        db.session.flush()
+    stories = [Story(title=title, author_id=author.id, filename_base=title.lower().replace(' ', '_')) for title in titles]
+    db.session.add_all(stories)
+    db.session.commit()
+    return [story.id for story in stories]
+
+
+@pytest.mark.integration
+class TestLibraryDeltaSync:
+    """/api/library?since= returns only what changed after the cursor."""
+
+    def test_delta_returns_only_changed_stories(self, client: FlaskClient, app: Flask) -> None:
+        """An edit after the cursor comes back alone, and the next cursor is quiet."""
+        from app.models import db, Story
+
+        with app.app_context():
+            first_id, second_id = _reset_library(['First Story', 'Second Story'])
+
+        full = client.get('/api/library').get_json()
+        assert {s['id'] for s in full['stories']} == {first_id, second_id}
+
+        with app.app_context():
+            db.session.get(Story, second_id).rating = 5
+            db.session.commit()
+
+        delta = client.get(f"/api/library?since={full['cursor']}").get_json()
+        assert [s['id'] for s in delta['stories']] == [second_id]
+        assert delta['stories'][0]['rating'] == 5
+        assert delta['deleted'] == []
+
+        quiet = client.get(f"/api/library?since={delta['cursor']}").get_json()
+        assert quiet == {'stories': [], 'deleted': [], 'cursor': delta['cursor']}
+
+    def test_related_changes_and_deletions(self, client: FlaskClient, app: Flask) -> None:
+        """Tag edits bump the story and deleted stories come back as tombstones."""
+        from app.models import db, Story
+
+        with app.app_context():
+            tagged_id, doomed_id = _reset_library(['Tagged Story', 'Doomed Story'])
+
+        cursor = client.get('/api/library').get_json()['cursor']
+
+        with app.app_context():
+            db.session.get(Story, tagged_id).set_tags(['Fresh Tag'])
+            db.session.delete(db.session.get(Story, doomed_id))
+            db.session.commit()
+
+        delta = client.get(f'/api/library?since={cursor}').get_json()
+        assert [s['id'] for s in delta['stories']] == [tagged_id]
+        assert delta['stories'][0]['tags'] == ['Fresh Tag']
+        assert delta['deleted'] == [doomed_id]
+
+    def test_etag_and_bad_cursor(self, client: FlaskClient, app: Flask) -> None:
+        """A matching If-None-Match gets 304 and an unknown cursor gets 400."""
+        with app.app_context():
+            _reset_library(['Cached Story'])
+
+        first = client.get('/api/library')
+        assert first.headers['ETag'].startswith('W/')
+
+        repeat = client.get('/api/library', headers={'If-None-Match': first.headers['ETag']})
+        assert repeat.status_code == 304
+
+        assert client.get('/api/library?since=not-a-cursor').status_code == 400
+
+    def test_change_committed_after_cursor_is_not_lost(self, client: FlaskClient, app: Flask) -> None:
+        """A change flushed before a cursor was issued but committed after it still reaches the delta."""
+        from sqlalchemy.orm import Session
+        from app.models import db, Story
+
+        with app.app_context():
+            story_id, = _reset_library(['Slow Writer'])
+
+            with Session(db.engine) as slow:
+                slow.get(Story, story_id).rating = 2
+                slow.flush()
+                cursor = client.get('/api/library').get_json()['cursor']
+                slow.commit()
+
+        delta = client.get(f'/api/library?since={cursor}').get_json()
+        assert [(s['id'], s['rating']) for s in delta['stories']] == [(story_id, 2)]
+
+    def test_legacy_cursor_gets_full_listing(self, client: FlaskClient, app: Flask) -> None:
+        """A timestamp cursor from before change sequences gets everything plus a new cursor."""
+        import base64
+
+        with app.app_context():
+            ids = _reset_library(['Old Client Story'])
+
+        legacy = base64.urlsafe_b64encode(b'v1:2026-01-01T00:00:00').decode().rstrip('=')
+        data = client.get(f'/api/library?since={legacy}').get_json()
+
+        assert [s['id'] for s in data['stories']] == ids
+        assert 'deleted' not in data and data['cursor'] != legacy
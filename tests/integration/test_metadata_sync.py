@@ -0,0 +1,64 @@
+from __future__ import annotations
+import json
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from flask import Flask
+
+
+def _add_story_with_files(temp_dir: Path, title: str) -> int:
+    from app.models import db, Author, Story, StoryFormat
+    from app.services.epub_generator import create_epub_file
+
+    author = Author.query.filter_by(name='Sync Author').first() or Author(name='Sync Author')
+    db.session.add(author)
+    db.session.flush()
+
+    base = title.lower().replace(' ', '_')
+    json_path = temp_dir / f'{base}.json'
+    json_path.write_text(json.dumps({'title': title, 'author': 'Sync Author', 'tags': [],
+                                     'chapters': [{'number': 1, 'paragraphs': ['Text.']}]}))
+    with patch('app.services.epub_generator.generate_cover_image'), \
+            patch('app.services.epub_generator.send_notification'):
+        epub_path = create_epub_file(title, 'Sync Author', 'Text.', str(temp_dir), filename_base=base)
+
+    story = Story(title=title, author_id=author.id, filename_base=base)
+    story.formats.append(StoryFormat(format_type='json', file_path=str(json_path)))
+    story.formats.append(StoryFormat(format_type='epub', file_path=epub_path))
+    db.session.add(story)
+    db.session.commit()
+    return story.id
+
+
+@pytest.mark.integration
+class TestMetadataSync:
+    """sync_metadata_to_files() patches stale files and skips ones it has already checked."""
+
+    def test_unchanged_files_are_skipped_unread(self, app: Flask, temp_dir: Path) -> None:
+        """A second sync opens no files; a DB rename is then patched into the EPUB's OPF."""
+        from app.models import db, Story
+        from app.services.bulk_format_generator import BulkFormatGeneratorService
+
+        with app.app_context():
+            for story in Story.query.all():
+                db.session.delete(story)
+            db.session.commit()
+            story_id = _add_story_with_files(temp_dir, 'Synced Story')
+            service = BulkFormatGeneratorService()
+
+            assert service.sync_metadata_to_files()['synced'] == 0
+
+            with patch('zipfile.ZipFile', side_effect=AssertionError('file was opened')):
+                result = service.sync_metadata_to_files()
+            assert (result['already_ok'], result['errors']) == (1, [])
+
+            story = db.session.get(Story, story_id)
+            story.title = 'Renamed Story'
+            db.session.commit()
+            assert service.sync_metadata_to_files()['synced'] == 1
+
+            epub_path = next(f.file_path for f in story.formats if f.format_type == 'epub')
+            with zipfile.ZipFile(epub_path) as zf:
+                assert b'<dc:title>Renamed Story</dc:title>' in zf.read('EPUB/content.opf')
+                assert zf.infolist()[0].filename == 'mimetype'
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import pytest
+import json
+from pathlib import Path
+from flask import Flask
+from sqlalchemy import inspect
+
+
+def _make_story(title: str, json_path: Path, legacy_json: str | None = None):
+    from app.models import db, Author, Story, StoryFormat
+
+    author = Author.query.filter_by(name='Storage Test Author').first()
+    if not author:
+        author = Author(name='Storage Test Author')
+        db.session.add(author)
+        db.session.flush()
+    story = Story(title=title, author_id=author.id, filename_base=title.replace(' ', '_'))
+    db.session.add(story)
+    db.session.flush()
+    db.session.add(StoryFormat(
+        story_id=story.id,
+        format_type='json',
+        file_path=str(json_path),
+        file_size=json_path.stat().st_size if json_path.exists() else None,
+        json_data=legacy_json,
+    ))
+    db.session.commit()
+    return story.id
+
+
+@pytest.mark.integration
+class TestStoryFormatJsonStorage:
+    """StoryFormat.json_data is deferred and the on-disk JSON is authoritative."""
+
+    def test_story_query_does_not_load_json_data(self, app: Flask, temp_dir: Path) -> None:
+        """Loading stories with their formats leaves the legacy JSON column unloaded."""
+        from app.models import db, Story
+
+        with app.app_context():
+            json_path = temp_dir / "deferred.json"
+            json_path.write_text(json.dumps({'title': 'Deferred', 'chapters': []}))
+            story_id = _make_story('Deferred Story', json_path, legacy_json='{"title": "Deferred"}')
+            db.session.expunge_all()
+
+            story = db.session.get(Story, story_id)
+            fmt = story.formats[0]
+            assert 'json_data' in inspect(fmt).unloaded
+            assert 'file_path' not in inspect(fmt).unloaded
+
+            db.session.delete(story)
+            db.session.commit()
+
+    def test_load_json_data_prefers_file_on_disk(self, app: Flask, temp_dir: Path) -> None:
+        """load_json_data() reads the file rather than the stale DB copy."""
+        from app.models import db, Story
+
+        with app.app_context():
+            json_path = temp_dir / "on_disk.json"
+            json_path.write_text(json.dumps({'title': 'From Disk'}))
+            story_id = _make_story('On Disk Story', json_path, legacy_json='{"title": "From DB"}')
+
+            story = db.session.get(Story, story_id)
+            assert story.formats[0].load_json_data() == {'title': 'From Disk'}
+
+            db.session.delete(story)
+            db.session.commit()
+
+    def test_load_json_data_falls_back_to_legacy_column(self, app: Flask, temp_dir: Path) -> None:
+        """Rows written before the migration still resolve when the file is gone."""
+        from app.models import db, Story
+
+        with app.app_context():
+            story_id = _make_story('Legacy Story', temp_dir / "missing.json", legacy_json='{"title": "From DB"}')
+
+            story = db.session.get(Story, story_id)
+            assert story.formats[0].load_json_data() == {'title': 'From DB'}
+
+            db.session.delete(story)
+            db.session.commit()
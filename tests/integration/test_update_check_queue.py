@@ -0,0 +1,68 @@
+from __future__ import annotations
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from flask.testing import FlaskClient
+
+
+def _add_stories(count: int) -> list[int]:
+    from app.models import db, AppConfig, Author, Story
+
+    # The test DB outlives a run and app_config.key is unique, so reuse the row.
+    config = AppConfig.query.filter_by(key='auto_update_enabled').first() \
+        or AppConfig(key='auto_update_enabled', value_type='bool')
+    config.set_value(True)
+    db.session.add(config)
+    author = Author.query.filter_by(name='Queue Author').first() or Author(name='Queue Author')
+    db.session.add(author)
+    db.session.flush()
+    stories = [
+        Story(title=f'Queued {n}', author_id=author.id, filename_base=f'queued_{n}', auto_update_enabled=True,
+              literotica_url=f'https://www.literotica.com/s/queued-{n}')
+        for n in range(count)
+    ]
+    db.session.add_all(stories)
+    db.session.commit()
+    return [story.id for story in stories]
+
+
+@pytest.mark.integration
+class TestUpdateCheckQueue:
+    """check_all_stories_for_updates() queues one job per story for UpdateCheckWorker."""
+
+    def test_run_is_queued_processed_and_reported_once(self, app: Flask, client: FlaskClient) -> None:
+        """Stories are enqueued once, checked across slots, and the run's summary is sent when it drains."""
+        from app.models import db, Story
+        from app.services.story_update_checker import check_all_stories_for_updates
+        from app.services.update_check_worker import UpdateCheckWorker
+
+        with app.app_context():
+            for story in Story.query.all():
+                db.session.delete(story)
+            db.session.commit()
+            story_ids = _add_stories(3)
+
+        run_id = check_all_stories_for_updates(app)
+        assert run_id
+        # Stories still pending from the first run are not queued a second time.
+        assert check_all_stories_for_updates(app) is None
+
+        def check(story):
+            if story.id != story_ids[0]:
+                return None
+            return {'has_update': True, 'old_chapter_count': 1, 'new_chapter_count': 2}
+
+        with patch('app.services.story_update_checker.StoryUpdateChecker.check_for_updates_via_series',
+                   autospec=True, side_effect=lambda self, story: check(story)), \
+                patch('app.services.story_update_checker.StoryUpdateChecker.update_story', return_value=True), \
+                patch('app.services.notifier.send_notification') as notify, \
+                patch('app.services.story_update_checker._check_watched_authors_for_new_stories') as authors:
+            UpdateCheckWorker(app, slots=2).run_until_idle()
+
+        notify.assert_called_once_with('Story updates found (1):\n- Queued 0: 1 -> 2 chapters')
+        authors.assert_called_once()
+
+        response = client.get('/api/settings/update-check-progress')
+        data = response.get_json()
+        assert (data['run_id'], data['total'], data['done'], data['remaining']) == (run_id, 3, 3, 0)
+        assert data['by_result'] == {'updated': 1, 'unchanged': 2}
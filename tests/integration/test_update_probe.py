@@ -0,0 +1,84 @@
+from __future__ import annotations
+import pytest
+from unittest.mock import MagicMock, patch
+from flask import Flask
+
+
+def _response(status_code: int, page_count: int = 2, etag: str = '"v1"') -> MagicMock:
+    response = MagicMock(status_code=status_code, headers={'ETag': etag}, charset_encoding='utf-8')
+    response.text = (
+        '<html><body><div itemprop="articleBody"><p>First page text.</p></div>'
+        + ''.join(f'<a class="_pagination__item_x" href="/s/probed?page={n}">{n}</a>' for n in range(2, page_count + 1))
+        + '</body></html>'
+    )
+    return response
+
+
+def _add_story() -> int:
+    from app.models import db, Author, Story
+
+    author = Author.query.filter_by(name='Probe Author').first() or Author(name='Probe Author')
+    db.session.add(author)
+    db.session.flush()
+    story = Story(title='Probed', author_id=author.id, filename_base='probed', content_hash='a' * 64,
+                  literotica_url='https://www.literotica.com/s/probed', literotica_page_count=2)
+    db.session.add(story)
+    db.session.commit()
+    return story.id
+
+
+@pytest.mark.integration
+class TestUpdateProbe:
+    """check_for_updates() probes the first page and only downloads the story when it changed."""
+
+    def test_probe_skips_or_triggers_full_download(self, app: Flask) -> None:
+        """An unchanged page or a 304 costs one request; a new page count triggers the download."""
+        from app.models import db, Story
+        from app.services.story_update_checker import StoryUpdateChecker
+
+        with app.app_context():
+            for story in Story.query.all():
+                db.session.delete(story)
+            db.session.commit()
+            story_id = _add_story()
+            checker = StoryUpdateChecker()
+            session = MagicMock()
+
+            with patch('app.services.http_client.get_session', return_value=session), \
+                    patch('app.services.http_client.global_rate_limiter'), \
+                    patch('app.services.story_update_checker.download_story') as download:
+                download.return_value = (None,) * 9
+
+                session.get.return_value = _response(200)
+                assert checker.check_for_updates(db.session.get(Story, story_id)) is None
+                assert db.session.get(Story, story_id).update_probe_etag == '"v1"'
+
+                session.get.return_value = _response(304)
+                assert checker.check_for_updates(db.session.get(Story, story_id)) is None
+                assert session.get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+                download.assert_not_called()
+
+                session.get.return_value = _response(200, page_count=3, etag='"v2"')
+                checker.check_for_updates(db.session.get(Story, story_id))
+                download.assert_called_once()
+                # The download failed, so the new state isn't saved and the next probe looks again.
+                assert db.session.get(Story, story_id).update_probe_etag == '"v1"'
+
+    def test_story_without_series_takes_one_token(self, app: Flask) -> None:
+        """The series-less path is paced by the probe alone, one rate-limit token per story."""
+        from app.models import db, Story
+        from app.services.story_update_checker import StoryUpdateChecker
+
+        with app.app_context():
+            for story in Story.query.all():
+                db.session.delete(story)
+            db.session.commit()
+            story_id = _add_story()
+            session = MagicMock()
+            session.get.return_value = _response(304)
+
+            with patch('app.services.http_client.get_session', return_value=session), \
+                    patch('app.services.http_client.global_rate_limiter') as limiter:
+                assert StoryUpdateChecker().check_for_updates_via_series(db.session.get(Story, story_id)) is None
+
+            assert limiter.wait_if_needed.call_count == 1
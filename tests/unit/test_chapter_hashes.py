@@ -0,0 +1,25 @@
+from __future__ import annotations
+import pytest
+from app.services.chapter_hashes import chapter_digests, changed_chapters
+from app.services.story_downloader import join_story_chapters
+
+
+@pytest.mark.unit
+class TestChapterDigests:
+    """chapter_digests() hashes each chapter separately, ignoring whitespace."""
+
+    def test_only_the_edited_chapter_changes(self) -> None:
+        """Re-spaced text keeps its digest; an edit changes just that chapter's."""
+        original = chapter_digests(join_story_chapters([('One', 'First  text.\n\n'), ('Two', 'Second text.\n\n')]))
+        respaced = chapter_digests(join_story_chapters([('One', 'First text.\n\n\n'), ('Two', ' Second text.\n\n')]))
+        edited = chapter_digests(join_story_chapters([('One', 'First text.\n\n'), ('Two', 'Second, edited.\n\n')]))
+        stored = {d.number: d.hash for d in original}
+
+        assert [(d.number, d.title, d.word_count) for d in original] == [(1, 'One', 2), (2, 'Two', 2)]
+        assert changed_chapters(stored, respaced) == []
+        assert changed_chapters(stored, edited) == [2]
+
+    def test_unchaptered_story_is_one_chapter(self) -> None:
+        """Content without chapter markers is digested as a single untitled chapter."""
+        digests = chapter_digests('Just one page of text.')
+        assert [(d.number, d.title, d.word_count) for d in digests] == [(1, None, 5)]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from app.services.cover_generator import CoverRenderer, generate_cover_image, render_covers
+
+
+@pytest.mark.unit
+class TestRenderCovers:
+    """render_covers() draws the same covers as generate_cover_image(), in bulk."""
+
+    def test_pool_output_matches_single_render(self, temp_dir: Path) -> None:
+        """Covers rendered in pool workers are byte-identical to ones drawn inline."""
+        jobs = [(f'Pooled Title {i}', 'Pool Author', str(temp_dir / f'pooled_{i}.jpg'), None) for i in range(8)]
+
+        results = dict(render_covers(jobs, workers=2))
+
+        assert results == {path: None for _, _, path, _ in jobs}
+        for title, author, path, _ in jobs:
+            expected = temp_dir / 'expected.jpg'
+            generate_cover_image(title, author, str(expected))
+            assert Path(path).read_bytes() == expected.read_bytes()
+
+    def test_pool_children_start_without_background_workers(self, temp_dir: Path, monkeypatch) -> None:
+        """SKIP_BACKGROUND_WORKERS is set while the pool runs and restored afterwards."""
+        monkeypatch.delenv('SKIP_BACKGROUND_WORKERS', raising=False)
+        jobs = [(f'Env Title {i}', 'Pool Author', str(temp_dir / f'env_{i}.jpg'), None) for i in range(8)]
+        seen = []
+
+        def record(*args, **kwargs):
+            seen.append(os.environ.get('SKIP_BACKGROUND_WORKERS'))
+            return real_pool(*args, **kwargs)
+
+        from app.services import cover_generator
+        real_pool = cover_generator.ProcessPoolExecutor
+        with patch.object(cover_generator, 'ProcessPoolExecutor', side_effect=record):
+            assert all(error is None for _, error in render_covers(jobs, workers=2))
+
+        assert seen == ['true']
+        assert 'SKIP_BACKGROUND_WORKERS' not in os.environ
+
+    def test_failures_are_reported_per_cover(self, temp_dir: Path) -> None:
+        """A cover that cannot be saved yields an error without stopping the rest."""
+        good = str(temp_dir / 'good.jpg')
+        bad = str(temp_dir / 'missing_dir' / 'bad.jpg')
+
+        results = dict(render_covers([('Good', 'A', good, None), ('Bad', 'A', bad, None)], workers=1))
+
+        assert results[good] is None and Path(good).exists()
+        assert results[bad]
+
+    def test_category_badge_follows_renderer_setting(self, temp_dir: Path) -> None:
+        """The category badge is drawn only when the renderer has show_category set."""
+        plain, badged = temp_dir / 'plain.jpg', temp_dir / 'badged.jpg'
+
+        CoverRenderer(show_category=False).render('Same Title', 'Author', str(plain), 'Romance')
+        CoverRenderer(show_category=True).render('Same Title', 'Author', str(badged), 'Romance')
+
+        assert plain.read_bytes() != badged.read_bytes()
@@ -339,7 +339,7 @@ class TestCreateEpubFile:
         """Error notification sent on failure."""
         with patch('app.services.epub_generator.generate_cover_image'):
             with patch('app.services.epub_generator.send_notification') as mock_notify:
-                with patch('app.services.epub_generator.epub.write_epub', side_effect=Exception("Write failed")):
+                with patch('app.services.epub_generator.EpubWriter.close', side_effect=Exception("Write failed")):
                     with pytest.raises(Exception):
                         create_epub_file(
                             story_title="Fail Test",
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import os
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from lxml import etree
+from app.services.epub_generator import create_epub_file
+
+
+def _create(temp_dir: Path, content: str, **kwargs) -> str:
+    with patch('app.services.epub_generator.generate_cover_image'), \
+            patch('app.services.epub_generator.send_notification'):
+        return create_epub_file(story_title='Writer <Test>', story_author='Ann & Co', story_content=content,
+                                output_directory=str(temp_dir), **kwargs)
+
+
+@pytest.mark.unit
+class TestEpubWriter:
+    """create_epub_file() writes a well-formed EPUB 3 package directly."""
+
+    def test_package_is_well_formed_and_complete(self, temp_dir: Path) -> None:
+        """Mimetype comes first uncompressed, every XML file parses and the OPF lists each entry."""
+        cover = temp_dir / 'cover.jpg'
+        cover.write_bytes(b'\xFF\xD8\xFF\xE0')
+        sentinel = '\x1e'
+        content = (f'Preamble {{braces}} & more.'
+                   f'{sentinel}CHAPTER:1{sentinel}First\n\nOne <em>emphasis</em><br/>line.'
+                   f'{sentinel}CHAPTER:2{sentinel}Second\n\nTwo.')
+
+        epub_path = _create(temp_dir, content, cover_image_path=str(cover), story_category='Romance',
+                            story_tags=['tag'], story_description='About <it>')
+
+        with zipfile.ZipFile(epub_path) as zf:
+            first = zf.infolist()[0]
+            assert (first.filename, first.compress_type) == ('mimetype', zipfile.ZIP_STORED)
+            for name in zf.namelist():
+                if name.endswith(('.xhtml', '.opf', '.ncx', '.xml')):
+                    etree.fromstring(zf.read(name))
+
+            opf = etree.fromstring(zf.read('EPUB/content.opf'))
+            ns = {'opf': 'http://www.idpf.org/2007/opf', 'dc': 'http://purl.org/dc/elements/1.1/'}
+            hrefs = {f'EPUB/{href}' for href in opf.xpath('//opf:manifest/opf:item/@href', namespaces=ns)}
+            assert hrefs == set(zf.namelist()) - {'mimetype', 'META-INF/container.xml', 'EPUB/content.opf'}
+            assert opf.xpath('//opf:spine/opf:itemref/@idref', namespaces=ns) == \
+                ['nav', 'chapter_0', 'chapter_1', 'chapter_2', 'chapter_3']
+            assert opf.xpath('//dc:title/text()', namespaces=ns) == ['Writer <Test>']
+
+            nav = zf.read('EPUB/nav.xhtml').decode()
+            assert 'Chapter 2: Second' in nav and 'Introduction' in nav
+            # The bare & in the preamble was repaired rather than written as-is.
+            assert b'{braces} &amp; more' in zf.read('EPUB/intro.xhtml')
+
+    def test_failed_write_leaves_no_file(self, temp_dir: Path) -> None:
+        """When the book cannot be finished, neither the EPUB nor its temp file remains."""
+        with patch('app.services.epub_generator.format_story_content', side_effect=ValueError('bad')):
+            with pytest.raises(ValueError):
+                _create(temp_dir, 'Only a preamble.')
+
+        assert list(temp_dir.iterdir()) == []
+
+    def test_book_gets_umask_permissions(self, temp_dir: Path) -> None:
+        """The finished book is readable per the umask, like a file created with open()."""
+        umask = os.umask(0)
+        os.umask(umask)
+
+        epub_path = _create(temp_dir, 'Just one page.')
+
+        assert os.stat(epub_path).st_mode & 0o777 == 0o666 & ~umask
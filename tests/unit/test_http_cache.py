@@ -0,0 +1,119 @@
+from __future__ import annotations
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+from curl_cffi.requests import Response
+from curl_cffi.requests.headers import Headers
+from app.services.http_cache import CachingSession, ResponseCache, response_ttl
+
+
+def _response(url: str, body: bytes = b'<html>page</html>', status: int = 200, **headers: str) -> Response:
+    response = Response()
+    response.url = url
+    response.status_code = status
+    response.headers = Headers({k.replace('_', '-'): v for k, v in headers.items()})
+    response.content = body
+    return response
+
+
+def _session(cache: ResponseCache, **headers: str) -> tuple[CachingSession, MagicMock]:
+    upstream = MagicMock()
+    upstream.get.side_effect = lambda url, **kwargs: _response(url, **headers)
+    return CachingSession(upstream, cache), upstream
+
+
+@pytest.mark.unit
+class TestResponseTtl:
+    """response_ttl() honours Cache-Control and Expires, capped at the default."""
+
+    def test_headers_decide_lifetime(self) -> None:
+        """max-age and Expires shorten the lifetime; no-store and Vary: * prevent caching."""
+        assert response_ttl({}, 300) == 300
+        assert response_ttl({'cache-control': 'public, max-age=60'}, 300) == 60
+        assert response_ttl({'cache-control': 'max-age=86400'}, 300) == 300
+        assert response_ttl({'expires': 'Sat, 17 Oct 2026 12:02:00 GMT',
+                             'date': 'Sat, 17 Oct 2026 12:00:00 GMT'}, 300) == 120
+        assert response_ttl({'expires': '0'}, 300) is None
+        assert response_ttl({'cache-control': 'private, no-store'}, 300) is None
+        assert response_ttl({'cache-control': 'no-cache'}, 300) is None
+        assert response_ttl({'vary': '*'}, 300) is None
+
+
+@pytest.mark.unit
+class TestCachingSession:
+    """CachingSession answers repeated GETs from the cache and counts hits and misses."""
+
+    def test_repeated_get_is_served_from_cache(self) -> None:
+        """The second GET of a URL doesn't reach the wrapped session and gets its own Response."""
+        cache = ResponseCache()
+        session, upstream = _session(cache, content_type='text/html; charset=utf-8')
+
+        first = session.get('https://example.com/s/story', timeout=10)
+        second = session.get('https://example.com/s/story', timeout=10)
+        second.encoding = 'latin-1'
+
+        assert upstream.get.call_count == 1
+        assert second is not first
+        assert second.text == '<html>page</html>' and second.headers['content-type'].startswith('text/html')
+        assert (cache.stats()['hits'], cache.stats()['misses'], cache.stats()['stores']) == (1, 1, 1)
+
+    def test_conditional_and_uncacheable_requests_reach_upstream(self) -> None:
+        """Conditional requests bypass the cache; no-store and non-200 responses aren't stored."""
+        cache = ResponseCache()
+        session, upstream = _session(cache)
+        session.get('https://example.com/a')
+        session.get('https://example.com/a', headers={'If-None-Match': '"v1"'})
+        assert upstream.get.call_count == 2
+        assert cache.stats()['bypassed'] == 1
+
+        no_store, upstream = _session(cache, cache_control='no-store')
+        no_store.get('https://example.com/b')
+        no_store.get('https://example.com/b')
+        assert upstream.get.call_count == 2
+
+        upstream.get.side_effect = lambda url, **kwargs: _response(url, status=404)
+        no_store.get('https://example.com/c')
+        no_store.get('https://example.com/c')
+        assert upstream.get.call_count == 4
+
+    def test_accept_header_is_part_of_the_key(self) -> None:
+        """An HTML and a JSON request for the same URL are cached separately."""
+        session, upstream = _session(ResponseCache())
+        session.get('https://example.com/api', headers={'Accept': 'application/json'})
+        session.get('https://example.com/api')
+        session.get('https://example.com/api', headers={'Accept': 'application/json', 'Referer': 'x'})
+        assert upstream.get.call_count == 2
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """ResponseCache stays within its caps and can persist to SQLite."""
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """Past max_entries or max_bytes the least recently used entries go first."""
+        cache = ResponseCache(max_entries=2, max_bytes=1000)
+        session, upstream = _session(cache)
+        for url in ('https://example.com/1', 'https://example.com/2', 'https://example.com/1',
+                    'https://example.com/3', 'https://example.com/1', 'https://example.com/2'):
+            session.get(url)
+        # 1, 2, (hit 1), 3 evicts 2, (hit 1), 2 is fetched again.
+        assert upstream.get.call_count == 4
+        assert cache.stats()['evictions'] == 2
+
+        big = ResponseCache(max_bytes=100)
+        session, upstream = _session(big)
+        upstream.get.side_effect = lambda url, **kwargs: _response(url, body=b'x' * 60)
+        session.get('https://example.com/big')
+        assert big.stats()['entries'] == 0
+
+    def test_disk_tier_survives_a_new_cache(self, temp_dir: Path) -> None:
+        """Entries written to HTTP_CACHE_PATH are found by a fresh cache on the same file."""
+        db_path = str(temp_dir / 'http_cache.sqlite3')
+        session, _ = _session(ResponseCache(db_path=db_path))
+        session.get('https://example.com/series/se/1')
+
+        cache = ResponseCache(db_path=db_path)
+        session, upstream = _session(cache)
+        assert session.get('https://example.com/series/se/1').text == '<html>page</html>'
+        assert upstream.get.call_count == 0
+        assert cache.stats()['disk_hits'] == 1
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import pytest
+from pathlib import Path
+from bs4 import BeautifulSoup
+from app.services.page_extractor import extract_story_page
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "sample_html_response.html"
+
+SERIES_PAGE = '''<html><head><meta property="og:description" content=" Desc &amp; more "></head><body>
+<h1 class="_title_a">Ch. 01 &amp;amp; More</h1>
+<a class="_author__title_b" href="/authors/writer">Writer</a>
+<nav class="_breadcrumbs_c"><span itemprop="name">Home</span><span itemprop="name">Taboo Tales</span></nav>
+<div class="_article__content_d">
+<p data-hk="1"><p align="center">Centered <em>text</em> &amp; more</p></p>
+<p>Line<br>break <span class="x"></span></p>
+</div>
+<a class="_tags__link_e">Tag One</a><a class="_tags__link_e">incl</a>
+<a class="_pagination__item_f" href="/s/story?page=2">2</a>
+<a class="_pagination__item_f" href="/s/story?page=4">4</a>
+<section class="_panel_g"><h3 class="_heading_h">READ MORE OF THIS SERIES</h3>
+<a href="/series/se/42">Series</a>
+<div class="_data_list_i">
+<div class="_item_j"><span>Previous Part</span><a href="/s/prev">prev</a></div>
+<div class="_item_j"><span>Next Part</span><a href="/s/next?ref=1">next</a></div>
+</div></section>
+<div class="_stats__item_k"><i class="_star_l"></i>4.61</div>
+<div class="_stats__item_k"><i class="_diagram_l"></i>12,345</div>
+</body></html>'''
+
+
+def _legacy_paragraphs(markup: str) -> list[str]:
+    soup = BeautifulSoup(markup, "html.parser")
+    content_div = soup.find("div", class_=lambda c: c and "_article__content_" in str(c))
+    paragraphs = [p.decode_contents().strip() for p in content_div.find_all("p") if not p.find("p")]
+    return [p for p in paragraphs if p]
+
+
+@pytest.mark.unit
+class TestExtractStoryPage:
+    """extract_story_page() pulls a story page's fields in one lxml pass."""
+
+    def test_fixture_page(self) -> None:
+        """The sample page yields the same metadata the bs4 walk produced."""
+        page = extract_story_page(FIXTURE.read_text())
+
+        assert page['title'] == 'Test Story Title'
+        assert page['author'] == 'TestAuthor'
+        assert page['author_url'] == 'https://www.literotica.com/members/testauthor123'
+        assert page['category'] == 'Romance'
+        assert page['tags'] == ['Romance', 'Love', 'Passion']
+        assert len(page['paragraphs']) == 5
+        assert page['next_page_url'] is None
+
+    def test_paragraph_html_matches_bs4(self) -> None:
+        """Paragraph markup is byte-identical to decode_contents(), wrapper <p> included."""
+        page = extract_story_page(SERIES_PAGE)
+
+        assert page['paragraphs'] == _legacy_paragraphs(SERIES_PAGE)
+        assert page['paragraphs'] == [
+            'Centered <em>text</em> &amp; more',
+            'Line<br/>break <span class="x"></span>',
+        ]
+
+    def test_navigation_and_stats(self) -> None:
+        """Pagination, series links and stats come from the same parse."""
+        page = extract_story_page(SERIES_PAGE)
+
+        assert page['title'] == 'Ch. 01 & More'
+        assert page['category'] == 'I/T'
+        assert page['tags'] == ['I/T', 'Tag One']
+        assert page['description'] == 'Desc & more'
+        assert page['next_page_url'] == 'https://www.literotica.com/s/story?page=2'
+        assert page['page_count'] == 4
+        assert page['series_url'] == 'https://www.literotica.com/series/se/42'
+        assert page['next_part_url'] == 'https://www.literotica.com/s/next'
+        assert page['score'] == 4.61
+        assert page['views'] == 12345
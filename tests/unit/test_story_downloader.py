@@ -0,0 +1,82 @@
+from __future__ import annotations
+import pytest
+import threading
+from unittest.mock import MagicMock, patch
+from app.services import story_downloader
+from app.services.series_page_checker import SeriesPageChecker
+from tests.helpers.literotica_mocks import create_mock_literotica_response
+
+
+class _FakeSession:
+    """Session stub that serves canned pages after a short simulated network wait."""
+
+    def __init__(self, pages: dict[str, str], latency: float = 0.05) -> None:
+        self.pages = pages
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, url: str, timeout: int = 10) -> MagicMock:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Simulated network latency, so overlapping requests are observable.
+        threading.Event().wait(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+        response = MagicMock()
+        response.text = self.pages[url]
+        response.charset_encoding = 'utf-8'
+        return response
+
+
+def _series(num_parts: int) -> tuple[dict, dict[str, str]]:
+    parts = []
+    pages = {}
+    for n in range(1, num_parts + 1):
+        url = f'https://www.literotica.com/s/part-{n}'
+        parts.append({'url': url, 'title': f'Part {n}'})
+        pages[url] = create_mock_literotica_response(title=f'Part {n}', content=[f'Body of part {n}.'])
+    return {'series_title': 'Parallel Series Ch. 01', 'parts': parts}, pages
+
+
+@pytest.mark.unit
+class TestSeriesDownload:
+    """_download_from_series_page() fetches known part URLs concurrently."""
+
+    def test_parts_fetched_concurrently_in_order(self) -> None:
+        """Parts overlap on the network but are assembled in series order."""
+        series_info, pages = _series(8)
+        session = _FakeSession(pages)
+        limiter = MagicMock()
+
+        with patch.object(SeriesPageChecker, 'check_series_parts', return_value=series_info), \
+                patch.object(story_downloader, 'global_rate_limiter', limiter), \
+                patch.object(story_downloader, '_page_pause') as serial_sleep:
+            result = story_downloader._download_from_series_page('https://www.literotica.com/series/se/1', session)
+
+        content, title, author = result[:3]
+        chapters = story_downloader.split_story_chapters(content)[1:]
+        assert [c.split('\n\n')[0] for c in chapters] == [f'Part {n}' for n in range(1, 9)]
+        assert 'Body of part 8.' in chapters[7]
+        assert title == 'Parallel Series'
+        assert author == 'TestAuthor'
+        assert result[6] == 8
+
+        assert session.max_in_flight > 1
+        assert limiter.wait_if_needed.call_count == 8
+        serial_sleep.assert_not_called()
+
+    def test_failed_part_aborts_download(self) -> None:
+        """A part that yields no content fails the whole series download."""
+        series_info, pages = _series(3)
+        pages[series_info['parts'][1]['url']] = '<html><body></body></html>'
+
+        with patch.object(SeriesPageChecker, 'check_series_parts', return_value=series_info), \
+                patch.object(story_downloader, 'global_rate_limiter', MagicMock()):
+            result = story_downloader._download_from_series_page(
+                'https://www.literotica.com/series/se/1', _FakeSession(pages, latency=0)
+            )
+
+        assert result is None
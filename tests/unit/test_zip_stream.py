@@ -0,0 +1,111 @@
+from __future__ import annotations
+import io
+import zipfile
+import pytest
+from pathlib import Path
+import app.services.zip_stream as zip_stream
+from app.services.zip_stream import patch_zip, stream_zip
+
+
+@pytest.mark.unit
+class TestStreamZip:
+    """stream_zip() yields a valid STORED archive without data descriptors."""
+
+    def test_archive_round_trips(self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Small files, large files and in-memory entries all read back intact."""
+        monkeypatch.setattr(zip_stream, 'SINGLE_READ_LIMIT', 1024)
+        monkeypatch.setattr(zip_stream, 'ZIP_CHUNK_SIZE', 700)
+        small = temp_dir / 'small.epub'
+        small.write_bytes(b'small epub')
+        large = temp_dir / 'large.epub'
+        large.write_bytes(bytes(range(256)) * 20)
+
+        chunks = list(stream_zip([
+            ('Small – Story.epub', str(small)),
+            ('Large.epub', str(large)),
+            ('missing.epub', str(temp_dir / 'missing.epub')),
+            ('manifest.json', b'{"stories": 2}'),
+        ]))
+
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == ['Small – Story.epub', 'Large.epub', 'manifest.json']
+            assert zf.read('Large.epub') == large.read_bytes()
+            assert zf.read('manifest.json') == b'{"stories": 2}'
+            for info in zf.infolist():
+                assert info.compress_type == zipfile.ZIP_STORED
+                assert not info.flag_bits & 0x08
+
+        # The large file is copied in chunks rather than held whole.
+        assert max(len(chunk) for chunk in chunks) < len(large.read_bytes())
+
+
+def _raw_member(path: Path, name: str) -> bytes:
+    """A member's compressed bytes as stored in the archive."""
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(name)
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset + 26)
+        name_len, extra_len = int.from_bytes(f.read(2), 'little'), int.from_bytes(f.read(2), 'little')
+        f.seek(name_len + extra_len, 1)
+        return f.read(info.compress_size)
+
+
+@pytest.mark.unit
+class TestPatchZip:
+    """patch_zip() rewrites chosen members and copies the rest still compressed."""
+
+    def test_only_patched_members_change(self, temp_dir: Path) -> None:
+        """Patched members get new content; the others keep their exact compressed bytes and order."""
+        book = temp_dir / 'book.epub'
+        with zipfile.ZipFile(book, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+            zf.writestr('EPUB/content.opf', '<dc:title>Old</dc:title>')
+            zf.writestr('EPUB/chapter_1.xhtml', 'chapter text ' * 500)
+        chapter_before = _raw_member(book, 'EPUB/chapter_1.xhtml')
+
+        assert patch_zip(str(book), {'EPUB/content.opf': lambda data: data.replace(b'Old', b'New')})
+
+        with zipfile.ZipFile(book) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == ['mimetype', 'EPUB/content.opf', 'EPUB/chapter_1.xhtml']
+            assert zf.getinfo('mimetype').compress_type == zipfile.ZIP_STORED
+            assert zf.read('EPUB/content.opf') == b'<dc:title>New</dc:title>'
+        assert _raw_member(book, 'EPUB/chapter_1.xhtml') == chapter_before
+        assert [p.name for p in temp_dir.iterdir()] == ['book.epub']
+
+    def test_patched_file_keeps_its_mode(self, temp_dir: Path) -> None:
+        """The rewritten archive has the original file's permissions, not mkstemp's 0600."""
+        book = temp_dir / 'book.epub'
+        with zipfile.ZipFile(book, 'w') as zf:
+            zf.writestr('EPUB/content.opf', 'old')
+        book.chmod(0o644)
+
+        assert patch_zip(str(book), {'EPUB/content.opf': lambda data: b'new'})
+        assert book.stat().st_mode & 0o777 == 0o644
+
+    def test_unchanged_patch_leaves_file_alone(self, temp_dir: Path) -> None:
+        """When no patch changes anything the archive is not rewritten."""
+        book = temp_dir / 'book.epub'
+        with zipfile.ZipFile(book, 'w') as zf:
+            zf.writestr('EPUB/content.opf', 'same')
+        before = book.stat().st_mtime_ns
+
+        assert not patch_zip(str(book), {'EPUB/content.opf': lambda data: data, 'missing': lambda data: b'x'})
+        assert book.stat().st_mtime_ns == before
+
+    def test_additions_are_appended(self, temp_dir: Path) -> None:
+        """New members go after the existing ones; reusing an existing name is refused."""
+        book = temp_dir / 'book.epub'
+        with zipfile.ZipFile(book, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+            zf.writestr('EPUB/chapter_1.xhtml', 'one')
+
+        assert patch_zip(str(book), {}, additions={'EPUB/chapter_2.xhtml': b'two ' * 100})
+
+        with zipfile.ZipFile(book) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == ['mimetype', 'EPUB/chapter_1.xhtml', 'EPUB/chapter_2.xhtml']
+            assert zf.read('EPUB/chapter_2.xhtml') == b'two ' * 100
+        with pytest.raises(ValueError):
+            patch_zip(str(book), {}, additions={'EPUB/chapter_1.xhtml': b'again'})